@@ -0,0 +1,34 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, List
+
+
+class KeyedLock:
+    """KeyedLock serializes work per key instead of globally.
+
+    Threads using the same key wait for each other, threads using different keys run concurrently. The lock of a key
+    is dropped once no thread holds or waits for it, so the registry does not grow with every key ever used.
+    """
+
+    def __init__(self):
+        self._registry_lock = threading.Lock()
+        # key -> [lock, number of threads holding or waiting for it]
+        self._locks: Dict[Hashable, List] = {}
+
+    @contextmanager
+    def __call__(self, *key: Hashable):
+        with self._registry_lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._registry_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    def __len__(self) -> int:
+        with self._registry_lock:
+            return len(self._locks)
@@ -8,6 +8,7 @@ from iris.domain.status.status_update_dto import StatusUpdateDTO
 
 class CourseChatStatusUpdateDTO(StatusUpdateDTO):
     result: Optional[str] = None
+    result_delta: Optional[str] = Field(alias="resultDelta", default=None)
     suggestions: List[str] = []
     accessed_memories: List[MemoryDTO] = Field(alias="accessedMemories", default=[])
     created_memories: List[MemoryDTO] = Field(alias="createdMemories", default=[])
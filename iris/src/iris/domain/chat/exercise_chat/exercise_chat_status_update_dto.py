@@ -1,8 +1,11 @@
 from typing import List, Optional
 
+from pydantic import Field
+
 from iris.domain.status.status_update_dto import StatusUpdateDTO
 
 
 class ExerciseChatStatusUpdateDTO(StatusUpdateDTO):
     result: Optional[str] = None
+    result_delta: Optional[str] = Field(alias="resultDelta", default=None)
     suggestions: List[str] = []
@@ -1,3 +1,7 @@
+from typing import Optional
+
+from pydantic import Field
+
 from iris.domain.status.status_update_dto import StatusUpdateDTO
 
 
@@ -10,3 +14,6 @@ class LectureChatStatusUpdateDTO(StatusUpdateDTO):
 
     result: str
     """The result message or status of the lecture chat pipeline operation."""
+
+    result_delta: Optional[str] = Field(alias="resultDelta", default=None)
+    """The next part of the answer while it is generated, the result of the final update replaces it."""
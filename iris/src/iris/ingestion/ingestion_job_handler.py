@@ -1,4 +1,4 @@
-from asyncio import Semaphore
+from threading import Lock
 
 
 class IngestionJobHandler:
@@ -9,27 +9,26 @@ class IngestionJobHandler:
 
     def __init__(self):
         self.job_list = {}
-        self.semaphore = Semaphore(1)
+        self.lock = Lock()
 
     def add_job(self, process, course_id: int, lecture_id: int, lecture_unit_id: int):
-        self.semaphore.acquire()
-        old_process = None
-        course_dict = self.job_list.get(course_id)
-        if course_dict:
-            lecture_dict = course_dict.get(lecture_id)
-            if lecture_dict:
-                old_process = lecture_dict.get(lecture_unit_id)
-        if old_process is None:
-            self.job_list.setdefault(course_id, {}).setdefault(lecture_id, {})[
-                lecture_unit_id
-            ] = process
-        else:
-            old_process.terminate()
-            old_process.join()
-            print("old process terminated")
-            print(old_process)
-            self.job_list.setdefault(course_id, {}).setdefault(lecture_id, {})[
-                lecture_unit_id
-            ] = process
-        process.start()
-        self.semaphore.release()
+        with self.lock:
+            old_process = None
+            course_dict = self.job_list.get(course_id)
+            if course_dict:
+                lecture_dict = course_dict.get(lecture_id)
+                if lecture_dict:
+                    old_process = lecture_dict.get(lecture_unit_id)
+            if old_process is None:
+                self.job_list.setdefault(course_id, {}).setdefault(lecture_id, {})[
+                    lecture_unit_id
+                ] = process
+            else:
+                old_process.terminate()
+                old_process.join()
+                print("old process terminated")
+                print(old_process)
+                self.job_list.setdefault(course_id, {}).setdefault(lecture_id, {})[
+                    lecture_unit_id
+                ] = process
+            process.start()
@@ -0,0 +1,152 @@
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+from enum import IntEnum
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of ingestion jobs running at the same time
+INGESTION_WORKERS = int(os.environ.get("INGESTION_WORKERS", "5"))
+
+
+class IngestionPriority(IntEnum):
+    """Lower values are run first. Small interactive updates must not wait behind bulk lecture re-ingestion."""
+
+    FAQ = 0
+    DELETION = 1
+    LECTURE = 2
+
+
+class _Job:
+    def __init__(
+        self,
+        fn: Callable,
+        args: tuple,
+        key: Optional[Hashable],
+        units: tuple,
+        priority: IngestionPriority,
+        sequence: int,
+    ):
+        self.fn = fn
+        self.args = args
+        self.key = key
+        self.units = units
+        self.priority = priority
+        self.sequence = sequence
+        self.cancelled = False
+        self.submitted_at = time.perf_counter()
+
+
+class IngestionWorkQueue:
+    """
+    A priority queue of ingestion jobs processed by a fixed number of worker threads.
+
+    Jobs with the same priority run in submission order. A job submitted with a key replaces a pending job with the
+    same key, e.g. a lecture unit that is re-ingested before its previous ingestion even started. A job submitted with
+    supersedes cancels the pending jobs with these keys, e.g. the ingestion of a lecture unit that is deleted.
+    Jobs that share a key never run concurrently and always run in submission order, whatever their priority: a job
+    whose earlier jobs are still running is put back until they are done.
+    """
+
+    def __init__(self, workers: int = INGESTION_WORKERS, name: str = "ingestion"):
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, _Job] = {}
+        # key -> jobs with this key that are not cancelled or done, in submission order
+        self._order: Dict[Hashable, deque] = defaultdict(deque)
+        # Jobs taken from the queue before their earlier jobs with the same key were done
+        self._waiting: List[_Job] = []
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{name}-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        priority: IngestionPriority,
+        fn: Callable,
+        *args,
+        key: Optional[Hashable] = None,
+        supersedes: Iterable[Hashable] = (),
+    ):
+        units = tuple(
+            dict.fromkeys(((key,) if key is not None else ()) + tuple(supersedes))
+        )
+        job = _Job(fn, args, key, units, priority, next(self._sequence))
+        with self._lock:
+            for unit in units:
+                previous = self._pending.pop(unit, None)
+                if previous is not None:
+                    self._cancel(previous)
+                    logger.info("Replacing pending ingestion job %s", unit)
+            if key is not None:
+                self._pending[key] = job
+            for unit in units:
+                self._order[unit].append(job)
+        self._queue.put((priority, job.sequence, job))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def join(self):
+        """Block until all submitted jobs are done."""
+        self._queue.join()
+
+    def _cancel(self, job: _Job):
+        job.cancelled = True
+        self._finish(job)
+
+    def _finish(self, job: _Job):
+        """Remove a cancelled or done job from the order of its keys and put back the jobs that waited for it."""
+        for unit in job.units:
+            order = self._order.get(unit)
+            if order is not None and job in order:
+                order.remove(job)
+                if not order:
+                    del self._order[unit]
+        waiting, self._waiting = self._waiting, []
+        for waiting_job in waiting:
+            self._queue.put((waiting_job.priority, waiting_job.sequence, waiting_job))
+
+    def _is_next(self, job: _Job) -> bool:
+        return all(self._order[unit][0] is job for unit in job.units)
+
+    def _work(self):
+        while True:
+            priority, _, job = self._queue.get()
+            ran = False
+            try:
+                with self._lock:
+                    if job.cancelled:
+                        continue
+                    if not self._is_next(job):
+                        self._waiting.append(job)
+                        continue
+                    if job.key is not None and self._pending.get(job.key) is job:
+                        del self._pending[job.key]
+                ran = True
+                logger.debug(
+                    "Starting %s job %s after %.2fs in the queue (%d pending)",
+                    priority.name,
+                    job.key or job.fn.__name__,
+                    time.perf_counter() - job.submitted_at,
+                    self._queue.qsize(),
+                )
+                job.fn(*job.args)
+            except Exception as e:
+                logger.error("Error in ingestion job: %s", e)
+                logger.error(traceback.format_exc())
+            finally:
+                if ran:
+                    with self._lock:
+                        self._finish(job)
+                self._queue.task_done()
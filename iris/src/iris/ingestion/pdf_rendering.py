@@ -0,0 +1,23 @@
+import base64
+from typing import Optional, Tuple
+
+import fitz
+
+# More pixels thus more details and better quality for the image interpretation
+PAGE_RENDER_ZOOM = 5
+
+
+def render_page(pdf_path: str, page_num: int) -> Tuple[str, Optional[str]]:
+    """
+    Extract the text of a page and, if it contains images, render it to a base64 encoded jpg.
+
+    Runs in a worker process, so it only depends on the path of the PDF and keeps its imports minimal.
+    """
+    with fitz.open(pdf_path) as doc:
+        page = doc.load_page(page_num)
+        page_text = page.get_text()
+        if not page.get_images(full=False):
+            return page_text, None
+        pix = page.get_pixmap(matrix=fitz.Matrix(PAGE_RENDER_ZOOM, PAGE_RENDER_ZOOM))
+        img_base64 = base64.b64encode(pix.tobytes("jpg")).decode("utf-8")
+        return page_text, img_base64
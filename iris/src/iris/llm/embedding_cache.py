@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Optional
+
+from ..common.singleton import Singleton
+from .external.model import EmbeddingModel
+
+logger = logging.getLogger(__name__)
+
+# Set to an empty string to disable the persistent cache
+EMBEDDING_CACHE_PATH = os.environ.get(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "iris",
+        "embedding_cache.sqlite3",
+    ),
+)
+# Seconds to wait for a write of another ingestion process, after that the provider is used instead of the cache
+EMBEDDING_CACHE_TIMEOUT = float(os.environ.get("EMBEDDING_CACHE_TIMEOUT", "1"))
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(metaclass=Singleton):
+    """EmbeddingCache persists embeddings keyed by (model, sha256(text)) in a SQLite database.
+
+    Re-ingesting unchanged content is served from the cache instead of the embedding provider. The cache also
+    tracks how many embeddings were served from it and estimates the provider time this saved. Errors of the cache
+    database are logged and the texts are embedded by the provider instead.
+    """
+
+    def __init__(self, path: Optional[str] = EMBEDDING_CACHE_PATH):
+        self.path = path
+        self._open()
+        if hasattr(os, "register_at_fork"):
+            # Forked ingestion processes must neither use the connection of their parent nor wait on a lock held by
+            # one of its threads
+            os.register_at_fork(after_in_child=self._open)
+        self.hits = 0
+        self.misses = 0
+        self.embed_seconds = 0.0
+
+    def _open(self):
+        self._lock = threading.Lock()
+        self._connection = None
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=EMBEDDING_CACHE_TIMEOUT, check_same_thread=False
+            )
+            # Readers do not block the writer of another ingestion process and vice versa
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text_hash))"
+            )
+            connection.commit()
+            self._connection = connection
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(
+                "Embedding cache %s is not available, embedding without it: %s",
+                self.path,
+                e,
+            )
+
+    @property
+    def seconds_per_embedding(self) -> float:
+        """Average provider time per embedded text, used to estimate the time saved by cache hits."""
+        return self.embed_seconds / self.misses if self.misses else 0.0
+
+    def get_many(self, model: str, texts: list[str]) -> dict[int, list[float]]:
+        """Returns the cached embeddings by the index of their text."""
+        if self._connection is None or not texts:
+            return {}
+        hashes = [_text_hash(text) for text in texts]
+        found = {}
+        try:
+            with self._lock:
+                # Stay well below SQLite's limit of host parameters per statement
+                for start in range(0, len(hashes), 500):
+                    part = list(set(hashes[start : start + 500]))
+                    rows = self._connection.execute(
+                        "SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                        f"AND text_hash IN ({', '.join('?' * len(part))})",
+                        [model, *part],
+                    ).fetchall()
+                    found.update(rows)
+        except sqlite3.Error as e:
+            logger.warning("Failed to read cached embeddings of %s: %s", model, e)
+            return {}
+        return {
+            index: array("f", found[text_hash]).tolist()
+            for index, text_hash in enumerate(hashes)
+            if text_hash in found
+        }
+
+    def put_many(self, model: str, texts: list[str], vectors: list[list[float]]):
+        if self._connection is None or not texts:
+            return
+        rows = [
+            (model, _text_hash(text), array("f", vector).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        try:
+            with self._lock:
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                        rows,
+                    )
+        except sqlite3.Error as e:
+            logger.warning(
+                "Failed to cache %d embeddings of %s: %s", len(rows), model, e
+            )
+
+    def embed_many(self, llm: EmbeddingModel, texts: list[str]) -> list[list[float]]:
+        """
+        Embed the texts with the given model, only sending texts without a cached embedding to the provider.
+        """
+        if not texts:
+            return []
+        start = time.perf_counter()
+        vectors: list[Optional[list[float]]] = [None] * len(texts)
+        for index, vector in self.get_many(llm.model, texts).items():
+            vectors[index] = vector
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        # Identical texts within one call are embedded once
+        unique = list(dict.fromkeys(texts[index] for index in missing))
+
+        embed_seconds = 0.0
+        if unique:
+            embed_start = time.perf_counter()
+            embedded = dict(zip(unique, llm.embed_many(unique)))
+            embed_seconds = time.perf_counter() - embed_start
+            self.put_many(llm.model, unique, [embedded[text] for text in unique])
+            for index in missing:
+                vectors[index] = embedded[texts[index]]
+
+        hits = len(texts) - len(missing)
+        saved = hits * self.seconds_per_embedding
+        self.hits += hits
+        self.misses += len(unique)
+        self.embed_seconds += embed_seconds
+        logger.info(
+            "Embedded %d texts with %s: %d cache hits, %d sent to the provider in %.2fs, ~%.2fs saved (%.2fs total)",
+            len(texts),
+            llm.model,
+            hits,
+            len(unique),
+            embed_seconds,
+            saved,
+            time.perf_counter() - start,
+        )
+        return vectors
@@ -14,6 +14,7 @@ from ...llm.external.openai_embeddings import (
     DirectOpenAIEmbeddingModel,
 )
 from .cohere_client import CohereAzureClient
+from .cross_encoder import CrossEncoderReranker
 
 AnyLlm = Union[
     DirectOpenAICompletionModel,
@@ -24,4 +25,5 @@ AnyLlm = Union[
     AzureOpenAIEmbeddingModel,
     OllamaModel,
     CohereAzureClient,
+    CrossEncoderReranker,
 ]
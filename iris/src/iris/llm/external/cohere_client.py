@@ -1,10 +1,12 @@
 from typing import Literal
 
 import cohere
-from pydantic import BaseModel, ConfigDict
+from pydantic import ConfigDict
 
+from ...llm.external.model import RerankModel
 
-class CohereAzureClient(BaseModel):
+
+class CohereAzureClient(RerankModel):
     """CohereAzureClient provides an interface to interact with the Cohere API using Azure endpoints."""
 
     type: Literal["cohere_azure"]
@@ -23,3 +25,10 @@ class CohereAzureClient(BaseModel):
         return self._client.rerank(
             query=query, documents=documents, top_n=top_n, model=self.model
         )
+
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        response = self.rerank(query=query, documents=documents, top_n=len(documents))
+        scores = [0.0] * len(documents)
+        for result in response.results:
+            scores[result.index] = result.relevance_score
+        return scores
@@ -0,0 +1,56 @@
+from typing import Any, Literal
+
+from pydantic import PrivateAttr
+
+from ...llm.external.model import RerankModel
+
+
+class CrossEncoderReranker(RerankModel):
+    """
+    CrossEncoderReranker scores documents locally with a sentence-transformers cross-encoder, e.g.
+    cross-encoder/ms-marco-MiniLM-L-6-v2 or a multilingual model such as BAAI/bge-reranker-v2-m3.
+    Requires the sentence-transformers package.
+    """
+
+    type: Literal["cross_encoder"]
+    device: str = "cpu"
+    batch_size: int = 32
+    max_length: int = 512
+    _encoder: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, context) -> None:  # pylint: disable=unused-argument
+        try:
+            from sentence_transformers import (  # pylint: disable=import-outside-toplevel
+                CrossEncoder,
+            )
+        except ImportError as e:
+            raise ImportError(
+                "The cross_encoder reranker requires the sentence-transformers package"
+            ) from e
+        self._encoder = CrossEncoder(
+            self.model, device=self.device, max_length=self.max_length
+        )
+
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        return self.score_many([(query, documents)])[0]
+
+    def score_many(self, requests: list[tuple[str, list[str]]]) -> list[list[float]]:
+        """Score the documents of all requests together, the model runs over all pairs in shared batches"""
+        pairs = [
+            (query, document) for query, documents in requests for document in documents
+        ]
+        if not pairs:
+            return [[] for _ in requests]
+        scores = self._encoder.predict(
+            pairs, batch_size=self.batch_size, show_progress_bar=False
+        )
+        results, start = [], 0
+        for _, documents in requests:
+            results.append(
+                [float(score) for score in scores[start : start + len(documents)]]
+            )
+            start += len(documents)
+        return results
+
+    def __str__(self):
+        return f"CrossEncoder('{self.model}')"
@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, Optional, Sequence, Type, Union
 
 from langchain_core.tools import BaseTool
@@ -55,6 +56,29 @@ class ChatModel(LanguageModel, metaclass=ABCMeta):
             f"The LLM {str(self)} does not support chat completion"
         )
 
+    def stream_chat(
+        self,
+        messages: list[PyrisMessage],
+        arguments: CompletionArguments,
+        tools: Optional[
+            Sequence[Union[Dict[str, Any], Type[BaseModel], Callable, BaseTool]]
+        ],
+        on_delta: Callable[[str], None],
+    ) -> PyrisMessage:
+        """
+        Create a completion from the chat messages and pass the text of the answer to on_delta while it is
+        generated. Returns the complete message like chat, models with a streaming endpoint override this.
+        """
+        message = self.chat(messages, arguments, tools)
+        text = (
+            getattr(message.contents[0], "text_content", None)
+            if message.contents
+            else None
+        )
+        if text:
+            on_delta(text)
+        return message
+
 
 class EmbeddingModel(LanguageModel, metaclass=ABCMeta):
     """Abstract class for the llm embedding wrappers"""
@@ -70,6 +94,10 @@ class EmbeddingModel(LanguageModel, metaclass=ABCMeta):
         """Create an embedding from the text"""
         raise NotImplementedError(f"The LLM {str(self)} does not support embeddings")
 
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Create embeddings for multiple texts, models with a batch endpoint override this"""
+        return [self.embed(text) for text in texts]
+
 
 class ImageGenerationModel(LanguageModel, metaclass=ABCMeta):
     """Abstract class for the llm image generation wrappers"""
@@ -93,3 +121,22 @@ class ImageGenerationModel(LanguageModel, metaclass=ABCMeta):
         raise NotImplementedError(
             f"The LLM {str(self)} does not support image generation"
         )
+
+
+class RerankModel(BaseModel, metaclass=ABCMeta):
+    """Abstract class for the rerank wrappers"""
+
+    id: str
+    model: str
+
+    @abstractmethod
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        """Score the relevance of every document for the query, higher scores are more relevant"""
+        raise NotImplementedError(f"The reranker {str(self)} does not support scoring")
+
+    def score_many(self, requests: list[tuple[str, list[str]]]) -> list[list[float]]:
+        """Score several (query, documents) requests concurrently, backends that can batch them override this"""
+        if len(requests) <= 1:
+            return [self.score(query, documents) for query, documents in requests]
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            return list(executor.map(lambda request: self.score(*request), requests))
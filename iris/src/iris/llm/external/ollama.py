@@ -361,5 +361,11 @@ class OllamaModel(
         )
         return list(response)
 
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        response = self._client.embed(
+            model=self.model, input=texts, options=self.options
+        )
+        return [list(embedding) for embedding in response["embeddings"]]
+
     def __str__(self):
         return f"Ollama('{self.model}')"
@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 import time
 from datetime import datetime
 from typing import (
@@ -19,6 +20,7 @@ from openai import APIConnectionError  # Added for retry logic
 from openai import (
     APIError,
     APITimeoutError,
+    BadRequestError,
     ContentFilterFinishReasonError,
     OpenAI,
     RateLimitError,
@@ -27,7 +29,7 @@ from openai.lib.azure import AzureOpenAI
 from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageParam
 from openai.types.shared_params import ResponseFormatJSONObject
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from iris.domain.data.text_message_content_dto import TextMessageContentDTO
 
@@ -213,10 +215,82 @@ def convert_to_iris_message(
     )
 
 
+def create_chat_params(
+    model: str,
+    messages: list[ChatCompletionMessageParam],
+    arguments: CompletionArguments,
+    tools: Optional[
+        Sequence[Union[Dict[str, Any], Type[BaseModel], Callable, BaseTool]]
+    ],
+) -> dict[str, Any]:
+    """
+    Create the parameters of a chat completion request.
+
+    Args:
+        model: The model name to use for the completion
+        messages: The messages in OpenAI's format
+        arguments: The completion arguments
+        tools: Optional tools the model can call
+
+    Returns:
+        The keyword arguments for chat.completions.create
+    """
+    params = {"model": model, "messages": messages}
+
+    if arguments.temperature is not None:
+        params["temperature"] = arguments.temperature
+
+    if arguments.max_tokens is not None:
+        params["max_tokens"] = arguments.max_tokens
+
+    if arguments.response_format == "JSON":
+        params["response_format"] = ResponseFormatJSONObject(type="json_object")
+
+    if tools:
+        params["tools"] = [convert_to_openai_tool(tool) for tool in tools]
+        logging.info("Using tools: %s", tools)
+    return params
+
+
+def log_empty_message(
+    message: Optional[ChatCompletionMessage], finish_reason: Optional[str]
+) -> None:
+    """Log why the model returned a message without content."""
+    if message is None or message.content is None or len(message.content) == 0:
+        logging.error("Model returned an empty message")
+        logging.error("Finish reason: %s", finish_reason)
+        if message is not None and message.refusal is not None:
+            logging.error("Refusal: %s", message.refusal)
+
+
+# Guards the lazy creation of the clients, only taken until a model has its client
+_client_lock = threading.Lock()
+
+# First Azure OpenAI API version that accepts stream_options, older versions reject streamed requests using it
+AZURE_STREAM_OPTIONS_API_VERSION = "2024-09-01"
+
+
 class OpenAIChatModel(ChatModel):
     """A chat model implementation that uses the OpenAI API for generating completions."""
 
     api_key: str
+    _client: Optional[OpenAI] = PrivateAttr(default=None)
+
+    @property
+    def client(self) -> OpenAI:
+        """
+        The client of this model, created on first use and shared by all threads afterwards so that requests reuse
+        the pooled connections of its HTTP client instead of opening a new TLS connection per call.
+        """
+        if self._client is None:
+            with _client_lock:
+                if self._client is None:
+                    self._client = self.get_client()
+        return self._client
+
+    def supports_stream_options(self) -> bool:
+        """Whether the API accepts stream_options, which adds the token usage to a streamed completion."""
+        return True
 
     def chat(
         self,
@@ -230,83 +304,145 @@ class OpenAIChatModel(ChatModel):
         retries = 5
         backoff_factor = 2
         initial_delay = 1
-        client = self.get_client()
-        try:
-            # Maximum wait time: 1 + 2 + 4 + 8 + 16 = 31 seconds
-
-            for message in messages:
-                if message.sender == "SYSTEM":
-                    print("SYSTEM MESSAGE: " + message.contents[0].text_content)
-                    break
-
-            messages = convert_to_open_ai_messages(messages)
-
-            for attempt in range(retries):
-                try:
-                    params = {"model": self.model, "messages": messages}
-
-                    if arguments.temperature is not None:
-                        params["temperature"] = arguments.temperature
-
-                    if arguments.max_tokens is not None:
-                        params["max_tokens"] = arguments.max_tokens
-
-                    if arguments.response_format == "JSON":
-                        params["response_format"] = ResponseFormatJSONObject(
-                            type="json_object"
-                        )
-
-                    if tools:
-                        params["tools"] = [
-                            convert_to_openai_tool(tool) for tool in tools
-                        ]
-                        logging.info("Using tools: %s", tools)
-
-                    response = client.chat.completions.create(**params)
-                    choice = response.choices[0]
-                    usage = response.usage
-                    if choice.finish_reason == "content_filter":
-                        # I figured that an openai error would be automatically raised if the content filter activated,
-                        # but it seems that that is not the case.
-                        # We don't want to retry because the same message will likely be rejected again.
-                        # Raise an exception to trigger the global error handler and report a fatal error to the client.
-                        raise ContentFilterFinishReasonError()
-
-                    if (
-                        choice.message is None
-                        or choice.message.content is None
-                        or len(choice.message.content) == 0
-                    ):
-                        logging.error("Model returned an empty message")
-                        logging.error("Finish reason: %s", choice.finish_reason)
-                        if (
-                            choice.message is not None
-                            and choice.message.refusal is not None
-                        ):
-                            logging.error("Refusal: %s", choice.message.refusal)
-
-                    return convert_to_iris_message(choice.message, usage, self.model)
-                except (
-                    APIError,
-                    APITimeoutError,
-                    APIConnectionError,  # Added to retry on connection errors
-                    RateLimitError,
-                ):
-                    wait_time = initial_delay * (backoff_factor**attempt)
-                    logging.exception("OpenAI error on attempt %s:", attempt + 1)
-                    logging.info("Retrying in %s seconds...", wait_time)
-                    time.sleep(wait_time)
-            raise RuntimeError(
-                f"Failed to get response from OpenAI after {retries} retries"
-            )
-        finally:
-            # Ensure HTTP resources are released to avoid ResourceWarning on shutdown
-            close = getattr(client, "close", None)
-            if callable(close):
-                try:
-                    close()
-                except Exception:
-                    logging.debug("Failed to close OpenAI client", exc_info=True)
+        client = self.client
+        # Maximum wait time: 1 + 2 + 4 + 8 + 16 = 31 seconds
+
+        for message in messages:
+            if message.sender == "SYSTEM":
+                print("SYSTEM MESSAGE: " + message.contents[0].text_content)
+                break
+
+        messages = convert_to_open_ai_messages(messages)
+
+        for attempt in range(retries):
+            try:
+                params = create_chat_params(self.model, messages, arguments, tools)
+                response = client.chat.completions.create(**params)
+                choice = response.choices[0]
+                usage = response.usage
+                if choice.finish_reason == "content_filter":
+                    # I figured that an openai error would be automatically raised if the content filter activated,
+                    # but it seems that that is not the case.
+                    # We don't want to retry because the same message will likely be rejected again.
+                    # Raise an exception to trigger the global error handler and report a fatal error to the client.
+                    raise ContentFilterFinishReasonError()
+
+                log_empty_message(choice.message, choice.finish_reason)
+
+                return convert_to_iris_message(choice.message, usage, self.model)
+            except (
+                APIError,
+                APITimeoutError,
+                APIConnectionError,  # Added to retry on connection errors
+                RateLimitError,
+            ):
+                wait_time = initial_delay * (backoff_factor**attempt)
+                logging.exception("OpenAI error on attempt %s:", attempt + 1)
+                logging.info("Retrying in %s seconds...", wait_time)
+                time.sleep(wait_time)
+        raise RuntimeError(
+            f"Failed to get response from OpenAI after {retries} retries"
+        )
+
+    def stream_chat(
+        self,
+        messages: list[PyrisMessage],
+        arguments: CompletionArguments,
+        tools: Optional[
+            Sequence[Union[Dict[str, Any], Type[BaseModel], Callable, BaseTool]]
+        ],
+        on_delta: Callable[[str], None],
+    ) -> PyrisMessage:
+        retries = 5
+        backoff_factor = 2
+        initial_delay = 1
+        client = self.client
+
+        open_ai_messages = convert_to_open_ai_messages(messages)
+
+        for attempt in range(retries):
+            streamed = False
+            try:
+                params = create_chat_params(
+                    self.model, open_ai_messages, arguments, tools
+                )
+                params["stream"] = True
+                if self.supports_stream_options():
+                    # The last chunk carries the token usage of the whole completion
+                    params["stream_options"] = {"include_usage": True}
+                content = []
+                tool_calls: dict[int, dict] = {}
+                usage = None
+                finish_reason = None
+                with client.chat.completions.create(**params) as stream:
+                    for chunk in stream:
+                        if chunk.usage is not None:
+                            usage = chunk.usage
+                        if not chunk.choices:
+                            continue
+                        choice = chunk.choices[0]
+                        finish_reason = choice.finish_reason or finish_reason
+                        if choice.delta.content:
+                            content.append(choice.delta.content)
+                            # Text before the first tool call is streamed as well, e.g. "Let me check the
+                            # repository", the client shows it until the result of the run replaces the deltas.
+                            # Text after a tool call is not part of the answer.
+                            if not tool_calls:
+                                streamed = True
+                                on_delta(choice.delta.content)
+                        for tool_call in choice.delta.tool_calls or []:
+                            call = tool_calls.setdefault(
+                                tool_call.index,
+                                {
+                                    "id": None,
+                                    "type": "function",
+                                    "function": {"name": "", "arguments": ""},
+                                },
+                            )
+                            call["id"] = tool_call.id or call["id"]
+                            if tool_call.function is not None:
+                                call["function"]["name"] += (
+                                    tool_call.function.name or ""
+                                )
+                                call["function"]["arguments"] += (
+                                    tool_call.function.arguments or ""
+                                )
+                if finish_reason == "content_filter":
+                    raise ContentFilterFinishReasonError()
+
+                message = ChatCompletionMessage(
+                    role="assistant",
+                    content="".join(content) or None,
+                    tool_calls=[tool_calls[index] for index in sorted(tool_calls)]
+                    or None,
+                )
+                log_empty_message(message, finish_reason)
+
+                return convert_to_iris_message(message, usage, self.model)
+            except BadRequestError:
+                # The request itself is rejected, e.g. by a deployment that does not support streaming
+                if streamed:
+                    raise
+                logging.exception(
+                    "Streaming request rejected by %s, falling back to chat", self
+                )
+                return self.chat(messages, arguments, tools)
+            except (
+                APIError,
+                APITimeoutError,
+                APIConnectionError,
+                RateLimitError,
+            ):
+                # A retry would send the beginning of the answer again
+                if streamed:
+                    raise
+                wait_time = initial_delay * (backoff_factor**attempt)
+                logging.exception("OpenAI error on attempt %s:", attempt + 1)
+                logging.info("Retrying in %s seconds...", wait_time)
+                time.sleep(wait_time)
+        raise RuntimeError(
+            f"Failed to get response from OpenAI after {retries} retries"
+        )
 
 
 class DirectOpenAIChatModel(OpenAIChatModel):
@@ -329,6 +465,9 @@ class AzureOpenAIChatModel(OpenAIChatModel):
     azure_deployment: str
     api_version: str
 
+    def supports_stream_options(self) -> bool:
+        return self.api_version[:10] >= AZURE_STREAM_OPTIONS_API_VERSION
+
     def get_client(self) -> OpenAI:
         return AzureOpenAI(
             azure_endpoint=self.endpoint,
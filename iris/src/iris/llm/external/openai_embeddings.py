@@ -13,6 +13,12 @@ from openai import (
 
 from ...llm.external.model import EmbeddingModel
 
+# OpenAI accepts up to 2048 inputs and 300k tokens per embedding request
+EMBEDDING_BATCH_SIZE = 512
+EMBEDDING_BATCH_TOKENS = 200_000
+# Conservative estimate, avoids tokenizing every text twice
+CHARS_PER_TOKEN = 3
+
 
 class OpenAIEmbeddingModel(EmbeddingModel):
     """OpenAIEmbeddingModel provides methods to generate text embeddings using the OpenAI API.
@@ -24,6 +30,37 @@ class OpenAIEmbeddingModel(EmbeddingModel):
     _client: OpenAIEmbeddings
 
     def embed(self, text: str) -> list[float]:
+        return self._with_retries(lambda: self._client.embed_query(text))
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        embeddings = []
+        for batch in self._batches(texts):
+            embeddings += self._with_retries(
+                lambda batch=batch: self._client.embed_documents(
+                    batch, chunk_size=len(batch)
+                )
+            )
+        return embeddings
+
+    @staticmethod
+    def _batches(texts: list[str]):
+        """Split the texts into requests limited by the number of texts and their estimated tokens"""
+        batch, batch_tokens = [], 0
+        for text in texts:
+            tokens = len(text) // CHARS_PER_TOKEN + 1
+            if batch and (
+                len(batch) >= EMBEDDING_BATCH_SIZE
+                or batch_tokens + tokens > EMBEDDING_BATCH_TOKENS
+            ):
+                yield batch
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _with_retries(request):
         retries = 5
         backoff_factor = 2
         initial_delay = 1
@@ -31,7 +68,7 @@ class OpenAIEmbeddingModel(EmbeddingModel):
 
         for attempt in range(retries):
             try:
-                return self._client.embed_query(text)
+                return request()
             except (
                 APIError,
                 APITimeoutError,
@@ -33,6 +33,8 @@ class IrisLangchainChatModel(BaseChatModel):
     tools: Optional[
         Sequence[Union[Dict[str, Any], Type[BaseModel], Callable, BaseTool]]
     ] = Field(default_factory=list, alias="tools")
+    # Receives the text of the answer while it is generated, the request is streamed if set
+    on_delta: Optional[Callable[[str], None]] = None
 
     def __init__(
         self,
@@ -82,9 +84,14 @@ class IrisLangchainChatModel(BaseChatModel):
     ) -> ChatResult:
         iris_messages = [convert_langchain_message_to_iris_message(m) for m in messages]
         self.completion_args.stop = stop
-        iris_message = self.request_handler.chat(
-            iris_messages, self.completion_args, self.tools
-        )
+        if self.on_delta is None:
+            iris_message = self.request_handler.chat(
+                iris_messages, self.completion_args, self.tools
+            )
+        else:
+            iris_message = self.request_handler.stream_chat(
+                iris_messages, self.completion_args, self.tools, self.on_delta
+            )
         base_message = convert_iris_message_to_langchain_message(iris_message)
         chat_generation = ChatGeneration(message=base_message)
         self.tokens = TokenUsageDTO(
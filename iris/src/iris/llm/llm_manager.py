@@ -1,5 +1,5 @@
 import os
-from typing import Annotated
+from typing import Annotated, Optional
 
 import yaml
 from pydantic import BaseModel, Discriminator
@@ -22,12 +22,24 @@ class LlmManager(metaclass=Singleton):
 
     def __init__(self):
         self.entries = []
+        self._by_id: dict[str, LanguageModel] = {}
+        self._by_model: dict[type, dict[str, LanguageModel]] = {}
         self.load_llms()
 
     def get_llm_by_id(self, llm_id):
-        for llm in self.entries:
-            if llm.id == llm_id:
-                return llm
+        return self._by_id.get(llm_id)
+
+    def get_llm_by_model(self, model_type: type, model: str) -> Optional[LanguageModel]:
+        """Return the first configured llm of the given type with the given model version"""
+        index = self._by_model.get(model_type)
+        if index is None:
+            # Built once per requested type, the model types decide membership with isinstance
+            index = {}
+            for llm in self.entries:
+                if isinstance(llm, model_type):
+                    index.setdefault(llm.model, llm)
+            self._by_model[model_type] = index
+        return index.get(model)
 
     def load_llms(self):
         """Load the llms from the config file"""
@@ -39,3 +51,7 @@ class LlmManager(metaclass=Singleton):
             loaded_llms = yaml.safe_load(file)
 
         self.entries = LlmList(llms=loaded_llms).llms
+        self._by_id = {}
+        for llm in self.entries:
+            self._by_id.setdefault(llm.id, llm)
+        self._by_model = {}
@@ -15,6 +15,7 @@ from pydantic import BaseModel, ConfigDict
 from iris.common.pyris_message import PyrisMessage
 from iris.domain.data.image_message_content_dto import ImageMessageContentDTO
 from iris.llm.completion_arguments import CompletionArguments
+from iris.llm.embedding_cache import EmbeddingCache
 from iris.llm.external.model import LanguageModel
 from iris.llm.llm_manager import LlmManager
 from iris.llm.request_handler.request_handler_interface import RequestHandler
@@ -53,6 +54,23 @@ class BasicRequestHandler(RequestHandler):
     ) -> PyrisMessage:
         llm = self.llm_manager.get_llm_by_id(self.model_id)
         message = llm.chat(messages, arguments, tools)
+        return self._add_token_costs(llm, message)
+
+    def stream_chat(
+        self,
+        messages: list[PyrisMessage],
+        arguments: CompletionArguments,
+        tools: Optional[
+            Sequence[Union[Dict[str, Any], Type[BaseModel], Callable, BaseTool]]
+        ],
+        on_delta: Callable[[str], None],
+    ) -> PyrisMessage:
+        llm = self.llm_manager.get_llm_by_id(self.model_id)
+        message = llm.stream_chat(messages, arguments, tools, on_delta)
+        return self._add_token_costs(llm, message)
+
+    @staticmethod
+    def _add_token_costs(llm, message: PyrisMessage) -> PyrisMessage:
         message.token_usage.cost_per_million_input_token = (
             llm.cost_per_million_input_token
         )
@@ -65,6 +83,10 @@ class BasicRequestHandler(RequestHandler):
         llm = self.llm_manager.get_llm_by_id(self.model_id)
         return llm.embed(text)
 
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        llm = self.llm_manager.get_llm_by_id(self.model_id)
+        return EmbeddingCache().embed_many(llm, texts)
+
     def split_text_semantically(
         self,
         text: str,
@@ -1,3 +1,4 @@
+import logging
 from typing import Any, Callable, Dict, Literal, Optional, Sequence, Type, Union
 
 from langchain_core.tools import BaseTool
@@ -5,6 +6,7 @@ from pydantic import BaseModel, ConfigDict
 
 from iris.common.pyris_message import PyrisMessage
 from iris.llm.completion_arguments import CompletionArguments
+from iris.llm.embedding_cache import EmbeddingCache
 from iris.llm.external.model import (
     ChatModel,
     CompletionModel,
@@ -14,6 +16,8 @@ from iris.llm.external.model import (
 from iris.llm.llm_manager import LlmManager
 from iris.llm.request_handler.request_handler_interface import RequestHandler
 
+logger = logging.getLogger(__name__)
+
 
 class ModelVersionRequestHandler(RequestHandler):
     """Request handler that selects the first model with a matching version."""
@@ -47,6 +51,23 @@ class ModelVersionRequestHandler(RequestHandler):
     ) -> PyrisMessage:
         llm = self._select_model(ChatModel)
         message = llm.chat(messages, arguments, tools)
+        return self._add_token_costs(llm, message)
+
+    def stream_chat(
+        self,
+        messages: list[PyrisMessage],
+        arguments: CompletionArguments,
+        tools: Optional[
+            Sequence[Union[Dict[str, Any], Type[BaseModel], Callable, BaseTool]]
+        ],
+        on_delta: Callable[[str], None],
+    ) -> PyrisMessage:
+        llm = self._select_model(ChatModel)
+        message = llm.stream_chat(messages, arguments, tools, on_delta)
+        return self._add_token_costs(llm, message)
+
+    @staticmethod
+    def _add_token_costs(llm: ChatModel, message: PyrisMessage) -> PyrisMessage:
         message.token_usage.model_info = llm.model
         message.token_usage.cost_per_million_input_token = (
             llm.cost_per_million_input_token
@@ -60,6 +81,10 @@ class ModelVersionRequestHandler(RequestHandler):
         llm = self._select_model(EmbeddingModel)
         return llm.embed(text)
 
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        llm = self._select_model(EmbeddingModel)
+        return EmbeddingCache().embed_many(llm, texts)
+
     def split_text_semantically(
         self,
         text: str,
@@ -80,26 +105,12 @@ class ModelVersionRequestHandler(RequestHandler):
 
     def _select_model(self, type_filter: type) -> LanguageModel:
         """Select the first model that matches the requested version"""
-        # Get all LLMs from the manager
-        all_llms = self.llm_manager.entries
-
-        # Filter LLMs by type and model name
-        matching_llms = [
-            llm
-            for llm in all_llms
-            if isinstance(llm, type_filter) and llm.model == self.version
-        ]
-
-        if not matching_llms:
+        llm = self.llm_manager.get_llm_by_model(type_filter, self.version)
+        if llm is None:
             raise ValueError(
                 f"No {type_filter.__name__} found with model name {self.version}"
             )
-
-        # Select the first matching LLM
-        llm = matching_llms[0]
-
-        # Print the selected model for the logs
-        print(f"Selected {llm.description}")
+        logger.debug("Selected %s", llm.description)
         return llm
 
     def bind_tools(
@@ -46,11 +46,36 @@ class RequestHandler(BaseModel, metaclass=ABCMeta):
         """Create a completion from the chat messages"""
         raise NotImplementedError
 
+    def stream_chat(
+        self,
+        messages: list[any],
+        arguments: CompletionArguments,
+        tools: Optional[
+            Sequence[Union[Dict[str, Any], Type[BaseModel], Callable, BaseTool]]
+        ],
+        on_delta: Callable[[str], None],
+    ) -> PyrisMessage:
+        """Create a completion from the chat messages and pass the text of the answer to on_delta while it is
+        generated"""
+        message = self.chat(messages, arguments, tools)
+        text = (
+            getattr(message.contents[0], "text_content", None)
+            if message.contents
+            else None
+        )
+        if text:
+            on_delta(text)
+        return message
+
     @abstractmethod
     def embed(self, text: str) -> list[float]:
         """Create an embedding from the text"""
         raise NotImplementedError
 
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Create embeddings for multiple texts"""
+        return [self.embed(text) for text in texts]
+
     @abstractmethod
     def bind_tools(
         self,
@@ -1,4 +1,5 @@
-from typing import Any, Callable, Dict, List, Optional, Sequence, Type, Union
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, ConfigDict
@@ -8,6 +9,10 @@ from iris.domain.data.image_message_content_dto import ImageMessageContentDTO
 from iris.llm import CompletionArguments, RequestHandler
 from iris.llm.external.model import LanguageModel
 from iris.llm.llm_manager import LlmManager
+from iris.llm.rerank_score_cache import RerankScoreCache
+
+# Id of the configured reranker used by the retrieval pipelines, e.g. a cohere_azure or a local cross_encoder
+RERANK_MODEL_ID = os.environ.get("RERANK_MODEL_ID", "cohere")
 
 
 class RerankRequestHandler(RequestHandler):
@@ -53,28 +58,55 @@ class RerankRequestHandler(RequestHandler):
         raise NotImplementedError
 
     def rerank(self, query, documents: List, top_n: int, content_field_name: str):
-        if not documents:
-            return []
-        valid_documents = [
-            doc
-            for doc in documents
-            if doc is not None and getattr(doc, content_field_name, None) is not None
+        return self.rerank_many(query, [(documents, content_field_name)], top_n)[0]
+
+    def rerank_many(
+        self, query: str, candidates: List[Tuple[List, str]], top_n: int
+    ) -> List[List]:
+        """
+        Rerank several candidate lists for the same query, each given with the field that holds the document text.
+        Documents already scored for this query are taken from the RerankScoreCache, all others are scored with a
+        single call to the reranker.
+        """
+        candidates = [
+            (
+                [
+                    doc
+                    for doc in documents or []
+                    if doc is not None
+                    and getattr(doc, content_field_name, None) is not None
+                ],
+                content_field_name,
+            )
+            for documents, content_field_name in candidates
+        ]
+        contents = [
+            [getattr(doc, content_field_name) for doc in documents]
+            for documents, content_field_name in candidates
         ]
-        if not valid_documents:
-            return []
-
-        document_contents = list(
-            map(lambda x: getattr(x, content_field_name), valid_documents)
-        )
-
-        cohere_client = self.llm_manager.get_llm_by_id(self.model_id)
-
-        _, reranked_results, _ = cohere_client.rerank(
-            query=query,
-            documents=document_contents,
-            top_n=top_n,
-        )
-        ranked_documents = []
-        for result in reranked_results[1]:
-            ranked_documents.append(valid_documents[result.index])
-        return ranked_documents
+
+        cache = RerankScoreCache()
+        scores: dict[str, float] = {}
+        uncached = []
+        for texts in contents:
+            scores.update(cache.get_many(self.model_id, query, texts))
+            uncached.append(
+                [text for text in dict.fromkeys(texts) if text not in scores]
+            )
+
+        requests = [(query, texts) for texts in uncached if texts]
+        if requests:
+            reranker = self.llm_manager.get_llm_by_id(self.model_id)
+            for (_, texts), text_scores in zip(requests, reranker.score_many(requests)):
+                cache.put_many(self.model_id, query, texts, text_scores)
+                scores.update(zip(texts, text_scores))
+
+        ranked = []
+        for (documents, _), texts in zip(candidates, contents):
+            order = sorted(
+                range(len(documents)),
+                key=lambda index: scores[texts[index]],
+                reverse=True,
+            )
+            ranked.append([documents[index] for index in order[:top_n]])
+        return ranked
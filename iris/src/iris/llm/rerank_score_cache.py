@@ -0,0 +1,54 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from ..common.singleton import Singleton
+
+# Number of (query, document) scores kept, the least recently used ones are dropped first
+RERANK_SCORE_CACHE_SIZE = int(os.environ.get("RERANK_SCORE_CACHE_SIZE", "20000"))
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RerankScoreCache(metaclass=Singleton):
+    """RerankScoreCache keeps relevance scores keyed by (reranker, query, sha256(document)) in memory.
+
+    A chat turn ranks the same candidates several times for the same question, e.g. in a retrieval sub-pipeline and
+    again after merging the results of all sub-pipelines. Only documents without a score are sent to the reranker.
+    """
+
+    def __init__(self, max_size: int = RERANK_SCORE_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._scores: OrderedDict[tuple, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(
+        self, reranker: str, query: str, documents: list[str]
+    ) -> dict[str, float]:
+        """Returns the cached scores by document."""
+        keys = [(reranker, query, _text_hash(document)) for document in documents]
+        found = {}
+        with self._lock:
+            for document, key in zip(documents, keys):
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                    found[document] = score
+            self.hits += len(found)
+            self.misses += len(documents) - len(found)
+        return found
+
+    def put_many(
+        self, reranker: str, query: str, documents: list[str], scores: list[float]
+    ):
+        keys = [(reranker, query, _text_hash(document)) for document in documents]
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._scores[key] = score
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
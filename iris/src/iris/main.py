@@ -1,13 +1,19 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse, ORJSONResponse
-from starlette.background import BackgroundTask
-from starlette.responses import Response
+from starlette.concurrency import run_in_threadpool
 
 import iris.sentry as sentry
 from iris.config import settings
+from iris.pipeline.chat.course_chat_pipeline import CourseChatPipeline
+from iris.pipeline.chat.exercise_chat_agent_pipeline import ExerciseChatAgentPipeline
+from iris.pipeline.pipeline_instance_pool import pipeline_instances
+from iris.vector_database.database import VectorDatabase
+from iris.web.logging_middleware import RequestLoggingMiddleware
+from iris.web.pipeline_executor import pipeline_executor
 from iris.web.routers.health import router as health_router
 from iris.web.routers.ingestion_status import router as ingestion_status_router
 from iris.web.routers.pipelines import router as pipelines_router
@@ -17,7 +23,26 @@ settings.set_env_vars()
 
 sentry.init()
 
-app = FastAPI(default_response_class=ORJSONResponse)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Connect to Weaviate and bootstrap the collection schemas before the first request needs them
+    try:
+        await run_in_threadpool(VectorDatabase)
+    except Exception as e:
+        logging.error("Failed to initialize the vector database: %s", e)
+    # Build the chat pipelines ahead of the first requests
+    for pipeline_class in (CourseChatPipeline, ExerciseChatAgentPipeline):
+        try:
+            await run_in_threadpool(pipeline_instances.prewarm, pipeline_class)
+        except Exception as e:
+            logging.error("Failed to prewarm %s: %s", pipeline_class.__name__, e)
+    yield
+    # Let accepted pipeline runs finish before the process exits
+    await run_in_threadpool(pipeline_executor.shutdown)
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 
 def custom_openapi():
@@ -52,29 +77,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-def log_info(req_body, res_body):
-    logging.info(req_body)
-    logging.info(res_body)
-
-
-@app.middleware("http")
-async def some_middleware(request: Request, call_next):
-    req_body = await request.body()
-    response = await call_next(request)
-
-    res_body = b""
-    async for chunk in response.body_iterator:
-        res_body += chunk
-
-    task = BackgroundTask(log_info, req_body, res_body)
-    return Response(
-        content=res_body,
-        status_code=response.status_code,
-        headers=dict(response.headers),
-        media_type=response.media_type,
-        background=task,
-    )
-
+app.add_middleware(RequestLoggingMiddleware)
 
 app.include_router(health_router)
 app.include_router(pipelines_router)
@@ -18,6 +18,7 @@ from iris.llm.langchain import IrisLangchainChatModel
 from iris.pipeline import Pipeline
 from iris.pipeline.shared.utils import generate_structured_tools_from_functions
 from iris.vector_database.database import VectorDatabase
+from iris.web.status.result_stream import ResultStream
 from iris.web.status.status_update import StatusCallback
 
 logger = logging.getLogger(__name__)
@@ -44,6 +45,7 @@ class AgentPipelineExecutionState(Generic[DTO, VARIANT]):
     result: str
     llm: Any | None
     prompt: ChatPromptTemplate | None
+    result_stream: Optional[ResultStream]
     tokens: List[TokenUsageDTO]
 
 
@@ -232,6 +234,13 @@ class AbstractAgentPipeline(ABC, Pipeline, Generic[DTO, VARIANT]):
         """
         return state.result
 
+    def reset_request_state(self) -> None:
+        """
+        Optional hook to clear the state a run left on the pipeline before the pipeline is reused for the next run.
+        Subclasses that keep request scoped data outside of the execution state must override this.
+        """
+        return
+
     def on_agent_step(  # pylint: disable=unused-argument
         self, state: AgentPipelineExecutionState[DTO, VARIANT], step: dict[str, Any]
     ) -> None:
@@ -306,6 +315,7 @@ class AbstractAgentPipeline(ABC, Pipeline, Generic[DTO, VARIANT]):
         state.result = ""
         state.llm = None
         state.prompt = None
+        state.result_stream = None
         state.tokens = []
 
         state.memiris_wrapper = MemirisWrapper(
@@ -318,11 +328,15 @@ class AbstractAgentPipeline(ABC, Pipeline, Generic[DTO, VARIANT]):
 
         # Create LLM from variant's agent_model
         completion_args = CompletionArguments(temperature=0.5, max_tokens=2000)
+        # The answer is streamed to clients whose status updates accept partial results
+        if hasattr(callback.status, "result_delta"):
+            state.result_stream = ResultStream(callback)
         state.llm = IrisLangchainChatModel(
             request_handler=ModelVersionRequestHandler(
                 version=state.variant.agent_model
             ),
             completion_args=completion_args,
+            on_delta=state.result_stream,
         )
 
         system_message = self.build_system_message(state)
@@ -346,6 +360,8 @@ class AbstractAgentPipeline(ABC, Pipeline, Generic[DTO, VARIANT]):
 
         # 7.2. Run the agent with the provided DTO
         state.result = self.execute_agent(state)
+        if state.result_stream:
+            state.result_stream.flush()
 
         # 7.3. Run post agent hook
         self.post_agent_hook(state)
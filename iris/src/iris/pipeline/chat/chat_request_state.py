@@ -0,0 +1,17 @@
+class ChatRequestStateMixin:
+    """
+    Request scoped state of the chat pipelines that answer with citations and suggestions: the event of the run and
+    the token usage their citation and suggestion pipelines and retrievers collect. Pipelines that keep more request
+    scoped data extend reset_request_state and call super().
+    """
+
+    def reset_request_state(self) -> None:
+        """
+        Clear the event and the token usage the last run left on the pipeline and its sub-pipelines.
+        """
+        self.event = None
+        self.citation_pipeline.tokens = []
+        self.suggestion_pipeline.tokens = None
+        for retriever in (self.lecture_retriever, self.faq_retriever):
+            if retriever is not None:
+                retriever.tokens = []
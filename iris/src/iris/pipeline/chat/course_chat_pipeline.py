@@ -1,7 +1,9 @@
+import contextvars
 import json
 import logging
 import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Callable, List, Optional, cast
 
@@ -39,15 +41,22 @@ from ..shared.utils import (
     datetime_to_string,
     format_custom_instructions,
 )
+from .chat_request_state import ChatRequestStateMixin
 from .interaction_suggestion_pipeline import (
     InteractionSuggestionPipeline,
 )
 
 logger = logging.getLogger(__name__)
 
+# Send the answer of the agent to the client before citations and suggestions are added
+COURSE_CHAT_PROVISIONAL_ANSWER = (
+    os.environ.get("COURSE_CHAT_PROVISIONAL_ANSWER", "True").lower() == "true"
+)
+
 
 class CourseChatPipeline(
-    AbstractAgentPipeline[CourseChatPipelineExecutionDTO, CourseChatVariant]
+    ChatRequestStateMixin,
+    AbstractAgentPipeline[CourseChatPipelineExecutionDTO, CourseChatVariant],
 ):
     """
     Course chat pipeline that answers course related questions from students.
@@ -188,7 +197,9 @@ class CourseChatPipeline(
             )
 
         if allow_lecture_tool:
-            self.lecture_retriever = LectureRetrieval(state.db.client)
+            # The retrievers are kept for the next runs of a pooled pipeline
+            if self.lecture_retriever is None:
+                self.lecture_retriever = LectureRetrieval(state.db.client)
             tool_list.append(
                 create_tool_lecture_content_retrieval(
                     self.lecture_retriever,
@@ -202,7 +213,8 @@ class CourseChatPipeline(
             )
 
         if allow_faq_tool:
-            self.faq_retriever = FaqRetrieval(state.db.client)
+            if self.faq_retriever is None:
+                self.faq_retriever = FaqRetrieval(state.db.client)
             tool_list.append(
                 create_tool_faq_content_retrieval(
                     self.faq_retriever,
@@ -372,23 +384,47 @@ class CourseChatPipeline(
     ) -> str:
         """
         Post-processing after agent execution including citations and suggestions.
+        Unless it was already streamed, the answer is sent as a result delta first. The suggestions are generated
+        from it while the citations are added.
 
         Returns:
             str: The final result
         """
-        # Process citations if we have them
-        if hasattr(state, "lecture_content_storage") and hasattr(state, "faq_storage"):
-            state.result = self._process_citations(
+        result_stream = getattr(state, "result_stream", None)
+        if (
+            COURSE_CHAT_PROVISIONAL_ANSWER
+            and state.result
+            and not (result_stream and result_stream.streamed)
+        ):
+            # Deltas are shown until the result of done replaces them, they are not stored as a message
+            state.callback.stream(state.result)
+        state.callback.in_progress("Adding citations ...")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Citations only add links, so the suggestions do not have to wait for them.
+            # The copied context keeps the suggestions in the trace of this run.
+            suggestions_future = executor.submit(
+                contextvars.copy_context().run,
+                self._generate_suggestions,
                 state,
                 state.result,
-                state.lecture_content_storage,
-                state.faq_storage,
                 state.dto,
-                state.variant,
             )
 
-        # Generate suggestions
-        suggestions = self._generate_suggestions(state, state.result, state.dto)
+            # Process citations if we have them
+            if hasattr(state, "lecture_content_storage") and hasattr(
+                state, "faq_storage"
+            ):
+                state.result = self._process_citations(
+                    state,
+                    state.result,
+                    state.lecture_content_storage,
+                    state.faq_storage,
+                    state.dto,
+                    state.variant,
+                )
+
+            suggestions = suggestions_future.result()
 
         state.callback.done(
             "Response created",
@@ -438,10 +474,6 @@ class CourseChatPipeline(
                 variant=variant.id,
                 base_url=base_url,
             )
-        if hasattr(self.citation_pipeline, "tokens") and self.citation_pipeline.tokens:
-            for token in self.citation_pipeline.tokens:
-                self._track_tokens(state, token)
-
         if faq_storage.get("faqs"):
             base_url = dto.settings.artemis_base_url if dto.settings else ""
             output = self.citation_pipeline(
@@ -451,6 +483,9 @@ class CourseChatPipeline(
                 variant=variant.id,
                 base_url=base_url,
             )
+        if hasattr(self.citation_pipeline, "tokens") and self.citation_pipeline.tokens:
+            for token in self.citation_pipeline.tokens:
+                self._track_tokens(state, token)
 
         return output
 
@@ -502,6 +537,7 @@ class CourseChatPipeline(
         dto: CourseChatPipelineExecutionDTO,
         variant: CourseChatVariant,
         callback: CourseChatStatusCallback,
+        event: Optional[str] = None,
     ):
         """
         Run the course chat pipeline.
@@ -510,9 +546,12 @@ class CourseChatPipeline(
             dto: The pipeline execution data transfer object
             variant: The variant configuration
             callback: The status callback
+            event: Optional event type, overrides the event the pipeline was created with
         """
         try:
             logger.info("Running course chat pipeline...")
+            if event is not None:
+                self.event = event
 
             # Call the parent __call__ method which handles the complete execution
             super().__call__(dto, variant, callback)
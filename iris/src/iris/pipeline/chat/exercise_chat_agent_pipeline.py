@@ -1,7 +1,7 @@
 import logging
 import os
 from datetime import datetime
-from typing import Any, Callable, List, cast
+from typing import Any, Callable, List, Optional, cast
 
 import pytz
 from jinja2 import Environment, FileSystemLoader, select_autoescape
@@ -39,6 +39,7 @@ from ...web.status.status_update import ExerciseChatStatusCallback
 from ..abstract_agent_pipeline import AbstractAgentPipeline, AgentPipelineExecutionState
 from ..shared.citation_pipeline import CitationPipeline, InformationType
 from ..shared.utils import datetime_to_string, format_custom_instructions
+from .chat_request_state import ChatRequestStateMixin
 from .code_feedback_pipeline import CodeFeedbackPipeline
 from .interaction_suggestion_pipeline import InteractionSuggestionPipeline
 
@@ -47,7 +48,8 @@ logger.setLevel(logging.INFO)
 
 
 class ExerciseChatAgentPipeline(
-    AbstractAgentPipeline[ExerciseChatPipelineExecutionDTO, ExerciseChatVariant]
+    ChatRequestStateMixin,
+    AbstractAgentPipeline[ExerciseChatPipelineExecutionDTO, ExerciseChatVariant],
 ):
     """
     Exercise chat agent pipeline that answers exercises related questions from students.
@@ -56,6 +58,8 @@ class ExerciseChatAgentPipeline(
     suggestion_pipeline: InteractionSuggestionPipeline
     code_feedback_pipeline: CodeFeedbackPipeline
     citation_pipeline: CitationPipeline
+    lecture_retriever: Optional[LectureRetrieval]
+    faq_retriever: Optional[FaqRetrieval]
     jinja_env: Environment
     system_prompt_template: Any
     guide_prompt_template: Any
@@ -70,6 +74,9 @@ class ExerciseChatAgentPipeline(
         self.suggestion_pipeline = InteractionSuggestionPipeline(variant="exercise")
         self.code_feedback_pipeline = CodeFeedbackPipeline()
         self.citation_pipeline = CitationPipeline()
+        # Created on first use and kept for the next runs of a pooled pipeline
+        self.lecture_retriever = None
+        self.faq_retriever = None
 
         # Setup Jinja2 template environment
         template_dir = os.path.join(
@@ -191,10 +198,11 @@ class ExerciseChatAgentPipeline(
 
         # Add lecture content retrieval if available
         if should_allow_lecture_tool(state.db, dto.course.id):
-            lecture_retriever = LectureRetrieval(state.db.client)
+            if self.lecture_retriever is None:
+                self.lecture_retriever = LectureRetrieval(state.db.client)
             tool_list.append(
                 create_tool_lecture_content_retrieval(
-                    lecture_retriever,
+                    self.lecture_retriever,
                     dto.course.id,
                     dto.settings.artemis_base_url if dto.settings else "",
                     callback,
@@ -206,10 +214,11 @@ class ExerciseChatAgentPipeline(
 
         # Add FAQ retrieval if available
         if should_allow_faq_tool(state.db, dto.course.id):
-            faq_retriever = FaqRetrieval(state.db.client)
+            if self.faq_retriever is None:
+                self.faq_retriever = FaqRetrieval(state.db.client)
             tool_list.append(
                 create_tool_faq_content_retrieval(
-                    faq_retriever,
+                    self.faq_retriever,
                     dto.course.id,
                     dto.course.name,
                     dto.settings.artemis_base_url if dto.settings else "",
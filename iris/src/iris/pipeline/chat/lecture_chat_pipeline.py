@@ -28,6 +28,7 @@ from ...llm import (
 from ...llm.langchain import IrisLangchainChatModel
 from ...retrieval.lecture.lecture_retrieval import LectureRetrieval
 from ...vector_database.database import VectorDatabase
+from ...web.status.result_stream import ResultStream
 from ...web.status.status_update import LectureChatCallback
 from ..pipeline import Pipeline
 from ..shared.citation_pipeline import CitationPipeline
@@ -74,6 +75,7 @@ class LectureChatPipeline(Pipeline[LectureChatVariant]):
     pipeline: Runnable
     prompt: ChatPromptTemplate
     callback: LectureChatCallback
+    result_stream: ResultStream
     variant: str
 
     def __init__(
@@ -97,8 +99,11 @@ class LectureChatPipeline(Pipeline[LectureChatVariant]):
 
         request_handler = ModelVersionRequestHandler(version=model)
 
+        self.result_stream = ResultStream(callback)
         self.llm = IrisLangchainChatModel(
-            request_handler=request_handler, completion_args=completion_args
+            request_handler=request_handler,
+            completion_args=completion_args,
+            on_delta=self.result_stream,
         )
         # Create the pipelines
         self.db = VectorDatabase()
@@ -171,6 +176,7 @@ class LectureChatPipeline(Pipeline[LectureChatVariant]):
         self.prompt = ChatPromptTemplate.from_messages(prompt_val)
         try:
             response = (self.prompt | self.pipeline).invoke({})
+            self.result_stream.flush()
             self._append_tokens(self.llm.tokens, PipelineEnum.IRIS_CHAT_LECTURE_MESSAGE)
             response_with_citation = self.citation_pipeline(
                 self.lecture_content,
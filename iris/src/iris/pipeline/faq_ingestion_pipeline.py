@@ -95,27 +95,28 @@ class FaqIngestionPipeline(AbstractIngestion, Pipeline[FaqIngestionVariant]):
 
     def batch_update(self, faq: FaqDTO):
         """
-        Batch update the faq into the database
-        This method is thread-safe and can only be executed by one thread at a time.
-        Weaviate limitation.
+        Batch update the faq into the database.
+        The faq is embedded first, only the write is serialized per faq.
         """
-        with batch_update_lock:
-            with self.collection.batch.rate_limit(requests_per_minute=600) as batch:
-                try:
-                    embed_chunk = self.llm_embedding.embed(
-                        f"{faq.question_title} : {faq.question_answer}"
-                    )
-                    faq_dict = faq.model_dump()
-
+        try:
+            # Goes through the embedding cache, so unchanged faqs are not re-embedded
+            embed_chunk = self.llm_embedding.embed_many(
+                [f"{faq.question_title} : {faq.question_answer}"]
+            )[0]
+            faq_dict = faq.model_dump()
+            with batch_update_lock(
+                "faq", self.dto.settings.artemis_base_url, faq.course_id, faq.faq_id
+            ):
+                with self.collection.batch.rate_limit(requests_per_minute=600) as batch:
                     batch.add_object(properties=faq_dict, vector=embed_chunk)
 
-                except Exception as e:
-                    logger.error("Error updating faq: %s", e)
-                    self.callback.error(
-                        f"Failed to ingest faqs into the database: {e}",
-                        exception=e,
-                        tokens=self.tokens,
-                    )
+        except Exception as e:
+            logger.error("Error updating faq: %s", e)
+            self.callback.error(
+                f"Failed to ingest faqs into the database: {e}",
+                exception=e,
+                tokens=self.tokens,
+            )
 
     def delete_old_faqs(self, faqs: list[FaqDTO]):
         """
@@ -1,9 +1,16 @@
 import base64
+import functools
+import multiprocessing
 import os
 import tempfile
-import threading
 import traceback
 from asyncio.log import logger
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from typing import List, Optional
 
 import fitz
@@ -27,11 +34,13 @@ from ..domain.data.image_message_content_dto import ImageMessageContentDTO
 from ..domain.data.lecture_unit_page_dto import LectureUnitPageDTO
 from ..domain.data.text_message_content_dto import TextMessageContentDTO
 from ..ingestion.abstract_ingestion import AbstractIngestion
+from ..ingestion.pdf_rendering import render_page
 from ..llm import (
     CompletionArguments,
     ModelVersionRequestHandler,
 )
 from ..llm.langchain import IrisLangchainChatModel
+from ..vector_database.database import batch_update_lock, lecture_unit_key
 from ..vector_database.lecture_unit_page_chunk_schema import (
     LectureUnitPageChunkSchema,
     init_lecture_unit_page_chunk_schema,
@@ -39,7 +48,12 @@ from ..vector_database.lecture_unit_page_chunk_schema import (
 from ..web.status import ingestion_status_callback
 from . import Pipeline
 
-batch_update_lock = threading.Lock()
+# Worker processes rendering PDF pages
+INGESTION_RENDER_PROCESSES = int(
+    os.environ.get("INGESTION_RENDER_PROCESSES", min(4, os.cpu_count() or 1))
+)
+# Concurrent LLM requests (image interpretation and merging) per ingested lecture unit
+INGESTION_LLM_CONCURRENCY = int(os.environ.get("INGESTION_LLM_CONCURRENCY", "8"))
 
 
 def cleanup_temporary_file(file_path):
@@ -72,6 +86,18 @@ def save_pdf(pdf_file_base64):
     return temp_pdf_file_path
 
 
+@functools.cache
+def load_merge_prompt() -> str:
+    prompt_file_path = os.path.join(
+        os.path.dirname(__file__),
+        "prompts",
+        "content_image_interpretation_merge_prompt.txt",
+    )
+    with open(prompt_file_path, "r", encoding="utf-8") as file:
+        logger.info("Loading ingestion prompt...")
+        return file.read()
+
+
 def create_page_data(
     page_num, page_splits, lecture_unit_dto, course_language, base_url
 ):
@@ -229,26 +255,32 @@ class LectureUnitPageIngestionPipeline(
 
     def batch_update(self, chunks):
         """
-        Batch update the chunks into the database
-        This method is thread-safe and can only be executed by one thread at a time.
-        Weaviate limitation.
+        Batch update the chunks into the database.
+        The chunks are embedded first, only the write is serialized per lecture unit.
         """
-        with batch_update_lock:
-            with self.collection.batch.rate_limit(requests_per_minute=600) as batch:
-                try:
-                    for _, chunk in enumerate(chunks):
-                        embed_chunk = self.llm_embedding.embed(
-                            chunk[LectureUnitPageChunkSchema.PAGE_TEXT_CONTENT.value]
-                        )
+        try:
+            embeddings = self.llm_embedding.embed_many(
+                [
+                    chunk[LectureUnitPageChunkSchema.PAGE_TEXT_CONTENT.value]
+                    for chunk in chunks
+                ]
+            )
+            with batch_update_lock(
+                *lecture_unit_key(
+                    self.dto.settings.artemis_base_url, self.dto.lecture_unit
+                )
+            ):
+                with self.collection.batch.rate_limit(requests_per_minute=600) as batch:
+                    for chunk, embed_chunk in zip(chunks, embeddings):
                         batch.add_object(properties=chunk, vector=embed_chunk)
-                except Exception as e:
-                    logger.error("Error updating lecture unit: %s", e)
-                    traceback.print_exc()
-                    self.callback.error(
-                        f"Failed to ingest lectures into the database: {e}",
-                        exception=e,
-                        tokens=self.tokens,
-                    )
+        except Exception as e:
+            logger.error("Error updating lecture unit: %s", e)
+            traceback.print_exc()
+            self.callback.error(
+                f"Failed to ingest lectures into the database: {e}",
+                exception=e,
+                tokens=self.tokens,
+            )
 
     def chunk_data(
         self,
@@ -259,33 +291,45 @@ class LectureUnitPageIngestionPipeline(
         """
         Chunk the data from the lecture into smaller pieces
         """
-        doc = fitz.open(lecture_pdf)
-        self.course_language = self.get_course_language(
-            doc.load_page(min(5, doc.page_count - 1)).get_text()
-        )
-        data = []
+        with fitz.open(lecture_pdf) as doc:
+            page_count = doc.page_count
+            language_sample = doc.load_page(min(5, page_count - 1)).get_text()
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=512, chunk_overlap=102
         )
-        old_page_text = ""
-        for page_num in range(doc.page_count):
-            page = doc.load_page(page_num)
-            page_text = page.get_text()
-            if page.get_images(full=False):
-                # more pixels thus more details and better quality
-                matrix = fitz.Matrix(5, 5)
-                pix = page.get_pixmap(matrix=matrix)
-                img_bytes = pix.tobytes("jpg")
-                img_base64 = base64.b64encode(img_bytes).decode("utf-8")
-                image_interpretation = self.interpret_image(
-                    img_base64,
-                    old_page_text,
+        report_every = max(1, page_count // 10)
+        page_texts: List[Optional[str]] = [None] * page_count
+        with ProcessPoolExecutor(
+            max_workers=max(1, min(INGESTION_RENDER_PROCESSES, page_count)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as render_pool, ThreadPoolExecutor(
+            max_workers=INGESTION_LLM_CONCURRENCY
+        ) as llm_pool:
+            language = llm_pool.submit(self.get_course_language, language_sample)
+            renders = [
+                render_pool.submit(render_page, lecture_pdf, page_num)
+                for page_num in range(page_count)
+            ]
+            pages = {
+                llm_pool.submit(
+                    self.process_page,
+                    renders[page_num],
+                    renders[page_num - 1] if page_num > 0 else None,
+                    language,
                     lecture_unit_slide_dto.lecture_name,
-                    self.course_language,
-                )
-                page_text = self.merge_page_content_and_image_interpretation(
-                    page_text, image_interpretation
-                )
+                ): page_num
+                for page_num in range(page_count)
+            }
+            for finished, future in enumerate(as_completed(pages), start=1):
+                page_texts[pages[future]] = future.result()
+                if finished % report_every == 0 or finished == page_count:
+                    self.callback.in_progress(
+                        f"Chunking and interpreting lecture ({finished}/{page_count} slides)..."
+                    )
+            self.course_language = language.result()
+
+        data = []
+        for page_num, page_text in enumerate(page_texts):
             page_splits = text_splitter.create_documents([page_text])
             data.extend(
                 create_page_data(
@@ -296,9 +340,33 @@ class LectureUnitPageIngestionPipeline(
                     base_url,
                 )
             )
-            old_page_text = page_text
         return data
 
+    def process_page(
+        self,
+        render: Future,
+        previous_render: Optional[Future],
+        course_language: Future,
+        name_of_lecture: str,
+    ) -> str:
+        """
+        Interpret the images of a rendered page and merge the interpretation into its text.
+        The previous page's extracted text is used as context, so pages can be interpreted independently.
+        """
+        page_text, img_base64 = render.result()
+        if img_base64 is None:
+            return page_text
+        previous_page_text = previous_render.result()[0] if previous_render else ""
+        image_interpretation = self.interpret_image(
+            img_base64,
+            previous_page_text,
+            name_of_lecture,
+            course_language.result(),
+        )
+        return self.merge_page_content_and_image_interpretation(
+            page_text, image_interpretation
+        )
+
     def interpret_image(
         self,
         img_base64: str,
@@ -343,19 +411,9 @@ class LectureUnitPageIngestionPipeline(
         """
         Merge the text and image together
         """
-        dirname = os.path.dirname(__file__)
-        prompt_file_path = os.path.join(
-            dirname,
-            ".",
-            "prompts",
-            "content_image_interpretation_merge_prompt.txt",
-        )
-        with open(prompt_file_path, "r", encoding="utf-8") as file:
-            logger.info("Loading ingestion prompt...")
-            lecture_ingestion_prompt = file.read()
         prompt = ChatPromptTemplate.from_messages(
             [
-                ("system", lecture_ingestion_prompt),
+                ("system", load_merge_prompt()),
             ]
         )
         prompt_val = prompt.format_messages(
@@ -363,12 +421,17 @@ class LectureUnitPageIngestionPipeline(
             image_interpretation=image_interpretation,
         )
         prompt = ChatPromptTemplate.from_messages(prompt_val)
+        # Pages are merged concurrently, so every call needs its own model to track its tokens
+        llm = IrisLangchainChatModel(
+            request_handler=self.llm.request_handler,
+            completion_args=self.llm.completion_args,
+        )
         clean_output = clean(
-            (prompt | self.pipeline).invoke({}),
+            (prompt | llm | StrOutputParser()).invoke({}),
             bullets=True,
             extra_whitespace=True,
         )
-        self._append_tokens(self.llm.tokens, PipelineEnum.IRIS_LECTURE_INGESTION)
+        self._append_tokens(llm.tokens, PipelineEnum.IRIS_LECTURE_INGESTION)
         return clean_output
 
     def get_course_language(self, page_content: str) -> str:
@@ -9,7 +9,11 @@ from iris.pipeline.lecture_unit_summary_pipeline import (
     LectureUnitSummaryPipeline,
 )
 from iris.pipeline.sub_pipeline import SubPipeline
-from iris.vector_database.database import VectorDatabase, batch_update_lock
+from iris.vector_database.database import (
+    VectorDatabase,
+    batch_update_lock,
+    lecture_unit_key,
+)
 from iris.vector_database.lecture_unit_schema import (
     LectureUnitSchema,
     init_lecture_unit_schema,
@@ -56,7 +60,7 @@ class LectureUnitPipeline(SubPipeline):
 
         embedding = self.llm_embedding.embed(lecture_unit.lecture_unit_summary)
 
-        with batch_update_lock:
+        with batch_update_lock(*lecture_unit_key(lecture_unit.base_url, lecture_unit)):
             self.lecture_unit_collection.data.insert(
                 properties={
                     LectureUnitSchema.COURSE_ID.value: lecture_unit.course_id,
@@ -1,10 +1,11 @@
-from typing import Tuple
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List
 
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import Runnable
 from weaviate.classes.query import Filter
 from weaviate.client import WeaviateClient
+from weaviate.collections.classes.internal import Object
 
 from iris.common.pipeline_enum import PipelineEnum
 from iris.domain.lecture.lecture_unit_dto import LectureUnitDTO
@@ -16,7 +17,13 @@ from iris.llm.langchain import IrisLangchainChatModel
 from iris.pipeline.prompts.lecture_unit_segment_summary_prompt import (
     lecture_unit_segment_summary_prompt,
 )
+from iris.pipeline.shared.batch_summarizer import BatchSummarizer
 from iris.pipeline.sub_pipeline import SubPipeline
+from iris.vector_database.database import (
+    batch_update_lock,
+    lecture_unit_key,
+    raise_on_failed_objects,
+)
 from iris.vector_database.lecture_transcription_schema import (
     LectureTranscriptionSchema,
     init_lecture_transcription_schema,
@@ -30,6 +37,12 @@ from iris.vector_database.lecture_unit_segment_schema import (
     init_lecture_unit_segment_schema,
 )
 
+logger = logging.getLogger(__name__)
+
+# Upper bound of slide chunks and transcription chunks fetched for a single lecture unit (Weaviate's default
+# QUERY_MAXIMUM_RESULTS)
+LECTURE_UNIT_FETCH_LIMIT = 10000
+
 
 class LectureUnitSegmentSummaryPipeline(SubPipeline):
     """LectureUnitSegmentSummaryPipeline processes lecture unit segments by summarizing the transcription and slide
@@ -40,8 +53,6 @@ class LectureUnitSegmentSummaryPipeline(SubPipeline):
     """
 
     llm: IrisLangchainChatModel
-    pipeline: Runnable
-    prompt: ChatPromptTemplate
 
     def __init__(
         self,
@@ -67,67 +78,69 @@ class LectureUnitSegmentSummaryPipeline(SubPipeline):
         self.llm = IrisLangchainChatModel(
             request_handler=request_handler, completion_args=completion_args
         )
-        self.pipeline = self.llm | StrOutputParser()
+        self.summarizer = BatchSummarizer(
+            self.llm, PipelineEnum.IRIS_LECTURE_SUMMARY_PIPELINE
+        )
         self.tokens = []
 
     def __call__(self) -> [str]:
-        slide_number_start, slide_number_end = self._get_slide_range()
-
-        summaries = []
-        for slide_index in range(slide_number_start, slide_number_end + 1):
-            transcriptions = self._get_transcriptions(slide_index)
-            slides = self._get_slides(slide_index)
-            summary = self._create_summary(transcriptions, slides)
-            summaries.append(summary)
-            self._upsert_lecture_object(slide_index, summary)
-        return summaries, self.tokens
-
-    def _get_transcriptions(self, slide_number: int):
-        transcription_filter = self._get_lecture_transcription_filter()
-        transcription_filter &= Filter.by_property(
-            LectureTranscriptionSchema.PAGE_NUMBER.value
-        ).equal(slide_number)
-        return self.lecture_transcription_collection.query.fetch_objects(
-            filters=transcription_filter
-        ).objects
-
-    def _get_slides(self, slide_number: int):
-        slide_filter = self._get_lecture_slide_filter()
-        slide_filter &= Filter.by_property(
-            LectureUnitPageChunkSchema.PAGE_NUMBER.value
-        ).equal(slide_number)
-        return self.lecture_unit_page_chunk_collection.query.fetch_objects(
-            filters=slide_filter
-        ).objects
-
-    def _get_slide_range(self) -> Tuple[int, int]:
-        slides = self.lecture_unit_page_chunk_collection.query.fetch_objects(
-            filters=self._get_lecture_slide_filter()
-        ).objects
+        start = time.perf_counter()
+        slides = self._group_by_page(
+            self._fetch_all(
+                self.lecture_unit_page_chunk_collection,
+                self._get_lecture_slide_filter(),
+            ),
+            LectureUnitPageChunkSchema.PAGE_NUMBER.value,
+        )
+        transcriptions = self._group_by_page(
+            self._fetch_all(
+                self.lecture_transcription_collection,
+                self._get_lecture_transcription_filter(),
+            ),
+            LectureTranscriptionSchema.PAGE_NUMBER.value,
+        )
+        # The slides define the segments, only lecture units without slides are segmented by their transcription
+        page_numbers = slides.keys() or transcriptions.keys() or [0]
+        slide_indices = range(min(page_numbers), max(page_numbers) + 1)
 
-        if len(slides) != 0:
-            slide_numbers = [
-                int(slide.properties.get(LectureUnitPageChunkSchema.PAGE_NUMBER.value))
-                for slide in slides
+        summaries, tokens = self.summarizer(
+            [
+                self._create_prompt(
+                    transcriptions.get(slide_index, []), slides.get(slide_index, [])
+                )
+                for slide_index in slide_indices
             ]
-            return min(slide_numbers), max(slide_numbers)
+        )
+        self.tokens.extend(tokens)
+        embeddings = self.llm_embedding.embed_many(summaries)
+        self._upsert_segments(slide_indices, summaries, embeddings)
+        logger.info(
+            "Summarized %d segments of lecture unit %s in %.2fs",
+            len(slide_indices),
+            self.lecture_unit_dto.lecture_unit_id,
+            time.perf_counter() - start,
+        )
+        return summaries, self.tokens
 
-        transcriptions = self.lecture_transcription_collection.query.fetch_objects(
-            filters=self._get_lecture_transcription_filter()
+    @staticmethod
+    def _fetch_all(collection, filters) -> List[Object]:
+        objects = collection.query.fetch_objects(
+            filters=filters, limit=LECTURE_UNIT_FETCH_LIMIT
         ).objects
+        if len(objects) >= LECTURE_UNIT_FETCH_LIMIT:
+            logger.warning(
+                "Lecture unit has more than %d objects in %s, segments may be incomplete",
+                LECTURE_UNIT_FETCH_LIMIT,
+                collection.name,
+            )
+        return objects
 
-        if len(transcriptions) != 0:
-            slide_numbers = [
-                int(
-                    transcription.properties.get(
-                        LectureTranscriptionSchema.PAGE_NUMBER.value
-                    )
-                )
-                for transcription in transcriptions
-            ]
-            return min(slide_numbers), max(slide_numbers)
-
-        return 0, 0
+    @staticmethod
+    def _group_by_page(objects: List[Object], page_property: str) -> Dict[int, List]:
+        pages = defaultdict(list)
+        for obj in objects:
+            pages[int(obj.properties.get(page_property))].append(obj)
+        return pages
 
     def _get_lecture_slide_filter(self):
         slide_filter = Filter.by_property(
@@ -161,7 +174,7 @@ class LectureUnitSegmentSummaryPipeline(SubPipeline):
             ).equal(self.lecture_unit_dto.base_url)
         return transcription_filter
 
-    def _create_summary(self, transcriptions, slides) -> str:
+    def _create_prompt(self, transcriptions, slides) -> str:
         transcriptions_slide_text = ""
         for transcription in transcriptions:
             transcriptions_slide_text += f"{transcription.properties[LectureTranscriptionSchema.SEGMENT_TEXT.value]}\n"
@@ -169,31 +182,22 @@ class LectureUnitSegmentSummaryPipeline(SubPipeline):
         slide_text = ""
         for slide in slides:
             slide_text += f"{slide.properties[LectureUnitPageChunkSchema.PAGE_TEXT_CONTENT.value]}\n"
-        self.prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    lecture_unit_segment_summary_prompt(
-                        self.lecture_unit_dto.lecture_name,
-                        self.lecture_unit_dto.course_name,
-                        transcription_content=transcriptions_slide_text,
-                        slide_content=slide_text,
-                    ),
-                ),
-            ]
+        return lecture_unit_segment_summary_prompt(
+            self.lecture_unit_dto.lecture_name,
+            self.lecture_unit_dto.course_name,
+            transcription_content=transcriptions_slide_text,
+            slide_content=slide_text,
         )
-        formatted_prompt = self.prompt.format_messages()
-        self.prompt = ChatPromptTemplate.from_messages(formatted_prompt)
-        try:
-            response = (self.prompt | self.pipeline).invoke({})
-            self._append_tokens(
-                self.llm.tokens, PipelineEnum.IRIS_LECTURE_SUMMARY_PIPELINE
-            )
-            return response
-        except Exception as e:
-            raise e
 
-    def _upsert_lecture_object(self, slide_number: int, summary: str):
+    def _upsert_segments(
+        self,
+        slide_numbers: range,
+        summaries: List[str],
+        embeddings: List[List[float]],
+    ):
+        """
+        Insert or replace the segments of the lecture unit with a single lookup and a single batch.
+        """
         lecture_filter = Filter.by_property(
             LectureUnitSegmentSchema.COURSE_ID.value
         ).equal(self.lecture_unit_dto.course_id)
@@ -203,78 +207,38 @@ class LectureUnitSegmentSummaryPipeline(SubPipeline):
         lecture_filter &= Filter.by_property(
             LectureUnitSegmentSchema.LECTURE_UNIT_ID.value
         ).equal(self.lecture_unit_dto.lecture_unit_id)
-        lecture_filter &= Filter.by_property(
-            LectureUnitSegmentSchema.PAGE_NUMBER.value
-        ).equal(slide_number)
         if self.lecture_unit_dto.base_url is not None:
             lecture_filter &= Filter.by_property(
                 LectureUnitSegmentSchema.BASE_URL.value
             ).equal(self.lecture_unit_dto.base_url)
 
-        lectures = self.lecture_unit_segment_collection.query.fetch_objects(
-            filters=lecture_filter, limit=1
-        ).objects
-
-        # transcriptions = self._get_transcriptions(slide_number)
-        # slides = self._get_slides(slide_number)
-
-        if len(lectures) == 0:
-            # Insert new lecture
-            self.lecture_unit_segment_collection.data.insert(
-                properties={
-                    LectureUnitSegmentSchema.COURSE_ID.value: self.lecture_unit_dto.course_id,
-                    LectureUnitSegmentSchema.LECTURE_ID.value: self.lecture_unit_dto.lecture_id,
-                    LectureUnitSegmentSchema.LECTURE_UNIT_ID.value: self.lecture_unit_dto.lecture_unit_id,
-                    LectureUnitSegmentSchema.SEGMENT_SUMMARY.value: summary,
-                    LectureUnitSegmentSchema.PAGE_NUMBER.value: slide_number,
-                    LectureUnitSegmentSchema.BASE_URL.value: self.lecture_unit_dto.base_url,
-                },
-                vector=self.llm_embedding.embed(summary),
+        existing = {
+            int(segment.properties.get(LectureUnitSegmentSchema.PAGE_NUMBER.value)): (
+                segment.uuid
             )
-            # lecture = self.lecture_unit_segment_collection.query
-            # .fetch_objects(filters=lecture_filter, limit=1).objects[0]
-            # transcription_references = []
-            # for transcription in transcriptions.objects:
-            #     transcription_reference = DataReference(
-            #         from_uuid=lecture.objects[0].uuid.int,
-            #         from_property=LectureUnitSegmentSchema.value,
-            #         to_uuid=transcription.uuid.int
-            #     )
-            #     transcription_references.append(transcription_reference)
-            # slide_references = []
-            # for slide in slides.objects:
-            #     slide_reference = DataReference(
-            #         from_uuid=lecture.objects[0].uuid.int,
-            #         from_property=LectureUnitSegmentSchema.SLIDES.value,
-            #         to_uuid=slide.uuid.int
-            #     )
-            #     slide_references.append(slide_reference)
-            #
-            # self.lecture_unit_segment_collection.data.reference_add_many(transcription_references)
-            # self.lecture_unit_segment_collection.data.reference_add_many(slide_references)
-            return
-
-        # Update existing lecture
-        # transcription_uuids = [t.uuid for t in transcriptions]
-        # slide_uuids = [s.uuid for s in slides]
-        lecture_uuid = lectures[0].uuid
-
-        self.lecture_unit_segment_collection.data.update(
-            uuid=lecture_uuid,
-            properties={
-                LectureUnitSegmentSchema.SEGMENT_SUMMARY.value: summary,
-            },
-            vector=self.llm_embedding.embed(summary),
-        )
-
-        # self.lecture_unit_segment_collection.data.reference_replace(
-        #     from_uuid=lecture_uuid,
-        #     from_property=LectureUnitSegmentSchema.TRANSCRIPTIONS.value,
-        #     to=transcription_uuids
-        # )
-        #
-        # self.lecture_unit_segment_collection.data.reference_replace(
-        #     from_uuid=lecture_uuid,
-        #     from_property=LectureUnitSegmentSchema.SLIDES.value,
-        #     to=slide_uuids
-        # )
+            for segment in self._fetch_all(
+                self.lecture_unit_segment_collection, lecture_filter
+            )
+        }
+
+        with batch_update_lock(
+            *lecture_unit_key(self.lecture_unit_dto.base_url, self.lecture_unit_dto)
+        ):
+            with self.lecture_unit_segment_collection.batch.dynamic() as batch:
+                for slide_number, summary, embedding in zip(
+                    slide_numbers, summaries, embeddings
+                ):
+                    # Adding an object with the uuid of an existing segment replaces it
+                    batch.add_object(
+                        properties={
+                            LectureUnitSegmentSchema.COURSE_ID.value: self.lecture_unit_dto.course_id,
+                            LectureUnitSegmentSchema.LECTURE_ID.value: self.lecture_unit_dto.lecture_id,
+                            LectureUnitSegmentSchema.LECTURE_UNIT_ID.value: self.lecture_unit_dto.lecture_unit_id,
+                            LectureUnitSegmentSchema.SEGMENT_SUMMARY.value: summary,
+                            LectureUnitSegmentSchema.PAGE_NUMBER.value: slide_number,
+                            LectureUnitSegmentSchema.BASE_URL.value: self.lecture_unit_dto.base_url,
+                        },
+                        vector=embedding,
+                        uuid=existing.get(slide_number),
+                    )
+            raise_on_failed_objects(self.lecture_unit_segment_collection)
@@ -0,0 +1,84 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Idle instances kept per pipeline class, 0 builds a new pipeline for every run
+PIPELINE_INSTANCE_POOL_SIZE = int(os.environ.get("PIPELINE_INSTANCE_POOL_SIZE", "8"))
+
+P = TypeVar("P")
+
+
+class PipelineInstancePool:
+    """
+    Keeps constructed pipelines for reuse, so that a run does not build its sub-pipelines, request handlers and
+    prompt templates again. A pipeline is used by one run at a time: take hands out an idle instance or builds a new
+    one, release clears the state the run left behind with reset_request_state and keeps the instance for the next
+    run. Instances whose reset fails are dropped.
+    """
+
+    def __init__(self, max_idle: int = PIPELINE_INSTANCE_POOL_SIZE):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: Dict[type, deque] = defaultdict(deque)
+        self.created: Dict[str, int] = defaultdict(int)
+        self.reused: Dict[str, int] = defaultdict(int)
+        self.construction_seconds: Dict[str, float] = defaultdict(float)
+
+    def take(self, pipeline_class: Type[P]) -> P:
+        with self._lock:
+            idle = self._idle[pipeline_class]
+            if idle:
+                self.reused[pipeline_class.__name__] += 1
+                return idle.pop()
+        return self._create(pipeline_class)
+
+    def release(self, pipeline) -> None:
+        try:
+            reset = getattr(pipeline, "reset_request_state", None)
+            if reset is not None:
+                reset()
+        except Exception as e:
+            logger.warning("Dropping %s after a failed reset: %s", pipeline, e)
+            return
+        with self._lock:
+            idle = self._idle[type(pipeline)]
+            if len(idle) < self.max_idle:
+                idle.append(pipeline)
+
+    def prewarm(self, pipeline_class: type, count: int = 1) -> None:
+        """Build pipelines ahead of the first runs, e.g. at startup."""
+        pipelines = [self._create(pipeline_class) for _ in range(count)]
+        for pipeline in pipelines:
+            self.release(pipeline)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                pipeline_class.__name__: {
+                    "idle": len(idle),
+                    "created": self.created[pipeline_class.__name__],
+                    "reused": self.reused[pipeline_class.__name__],
+                    "construction_seconds": self.construction_seconds[
+                        pipeline_class.__name__
+                    ],
+                }
+                for pipeline_class, idle in self._idle.items()
+            }
+
+    def _create(self, pipeline_class: Type[P]) -> P:
+        start = time.perf_counter()
+        pipeline = pipeline_class()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.created[pipeline_class.__name__] += 1
+            self.construction_seconds[pipeline_class.__name__] += elapsed
+        logger.debug("Built %s in %.0fms", pipeline_class.__name__, elapsed * 1000)
+        return pipeline
+
+
+pipeline_instances = PipelineInstancePool()
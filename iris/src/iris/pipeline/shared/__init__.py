@@ -1 +1,2 @@
+from ...pipeline.shared.batch_summarizer import BatchSummarizer
 from ...pipeline.shared.summary_pipeline import SummaryPipeline
@@ -0,0 +1,68 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import StrOutputParser
+
+from ...common.pipeline_enum import PipelineEnum
+from ...common.token_usage_dto import TokenUsageDTO
+from ...llm.langchain import IrisLangchainChatModel
+
+logger = logging.getLogger(__name__)
+
+# Concurrent LLM requests of a single batch summarization
+SUMMARY_CONCURRENCY = int(os.environ.get("SUMMARY_CONCURRENCY", "8"))
+
+
+class BatchSummarizer:
+    """
+    Runs independent summary prompts against the same chat model with bounded concurrency.
+
+    Every prompt gets its own IrisLangchainChatModel bound to the request handler of the given model, so the token
+    usage of concurrent requests is not mixed up. Summaries and token usages are returned in the order of the prompts.
+    """
+
+    def __init__(
+        self,
+        llm: IrisLangchainChatModel,
+        pipeline: PipelineEnum,
+        max_concurrency: int = SUMMARY_CONCURRENCY,
+    ):
+        self.llm = llm
+        self.pipeline = pipeline
+        self.max_concurrency = max(1, max_concurrency)
+
+    def _summarize(self, prompt: str) -> Tuple[str, TokenUsageDTO]:
+        llm = IrisLangchainChatModel(
+            request_handler=self.llm.request_handler,
+            completion_args=self.llm.completion_args,
+        )
+        summary = (llm | StrOutputParser()).invoke([SystemMessage(content=prompt)])
+        llm.tokens.pipeline = self.pipeline
+        return summary, llm.tokens
+
+    def __call__(self, prompts: List[str]) -> Tuple[List[str], List[TokenUsageDTO]]:
+        """
+        Summarize all prompts, each prompt is sent as the system message of its own request.
+        The first failing request raises after the remaining requests have finished.
+        """
+        if not prompts:
+            return [], []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(prompts))
+        ) as executor:
+            results = list(executor.map(self._summarize, prompts))
+        logger.info(
+            "Summarized %d segments for %s in %.2fs (max %d concurrent requests)",
+            len(prompts),
+            self.pipeline.value,
+            time.perf_counter() - start,
+            self.max_concurrency,
+        )
+        summaries = [summary for summary, _ in results]
+        tokens = [token for _, token in results]
+        return summaries, tokens
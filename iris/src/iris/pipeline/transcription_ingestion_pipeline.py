@@ -2,9 +2,6 @@ from asyncio.log import logger
 from functools import reduce
 from typing import Any, Dict, List, Optional
 
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import Runnable
 from weaviate import WeaviateClient
 from weaviate.classes.query import Filter
 
@@ -24,8 +21,13 @@ from iris.llm.langchain import IrisLangchainChatModel
 from iris.pipeline.prompts.transcription_ingestion_prompts import (
     transcription_summary_prompt,
 )
+from iris.pipeline.shared.batch_summarizer import BatchSummarizer
 from iris.pipeline.sub_pipeline import SubPipeline
-from iris.vector_database.database import batch_update_lock
+from iris.vector_database.database import (
+    batch_update_lock,
+    lecture_unit_key,
+    raise_on_failed_objects,
+)
 from iris.vector_database.lecture_transcription_schema import (
     LectureTranscriptionSchema,
     init_lecture_transcription_schema,
@@ -43,8 +45,6 @@ class TranscriptionIngestionPipeline(SubPipeline):
     """
 
     llm: IrisLangchainChatModel
-    pipeline: Runnable
-    prompt: ChatPromptTemplate
 
     def __init__(
         self,
@@ -64,7 +64,9 @@ class TranscriptionIngestionPipeline(SubPipeline):
         self.llm = IrisLangchainChatModel(
             request_handler=request_handler, completion_args=completion_args
         )
-        self.pipeline = self.llm | StrOutputParser()
+        self.summarizer = BatchSummarizer(
+            self.llm, PipelineEnum.IRIS_VIDEO_TRANSCRIPTION_INGESTION
+        )
         self.tokens = []
 
     def __call__(self) -> (str, []):
@@ -114,21 +116,29 @@ class TranscriptionIngestionPipeline(SubPipeline):
         )
 
     def batch_insert(self, chunks):
-        with batch_update_lock:
-            with self.collection.batch.dynamic() as batch:
-                try:
-                    for chunk in chunks:
-                        embed_chunk = self.llm_embedding.embed(
-                            chunk[LectureTranscriptionSchema.SEGMENT_TEXT.value]
-                        )
+        try:
+            embeddings = self.llm_embedding.embed_many(
+                [
+                    chunk[LectureTranscriptionSchema.SEGMENT_TEXT.value]
+                    for chunk in chunks
+                ]
+            )
+            with batch_update_lock(
+                *lecture_unit_key(
+                    self.dto.settings.artemis_base_url, self.dto.lecture_unit
+                )
+            ):
+                with self.collection.batch.dynamic() as batch:
+                    for chunk, embed_chunk in zip(chunks, embeddings):
                         batch.add_object(properties=chunk, vector=embed_chunk)
-                except Exception as e:
-                    logger.error("Error embedding lecture transcription chunk: %s", e)
-                    self.callback.error(
-                        f"Failed to ingest lecture transcriptions into the database: {e}",
-                        exception=e,
-                        tokens=self.tokens,
-                    )
+                raise_on_failed_objects(self.collection)
+        except Exception as e:
+            logger.error("Error embedding lecture transcription chunk: %s", e)
+            self.callback.error(
+                f"Failed to ingest lecture transcriptions into the database: {e}",
+                exception=e,
+                tokens=self.tokens,
+            )
 
     def chunk_transcription(
         self, transcription: LectureUnitPageDTO
@@ -244,33 +254,17 @@ class TranscriptionIngestionPipeline(SubPipeline):
         return self.replace_separator_char(text, "")
 
     def summarize_chunks(self, chunks: List[Dict[str, Any]]):
-        chunks_with_summaries = []
-        for chunk in chunks:
-            self.prompt = ChatPromptTemplate.from_messages(
-                [
-                    (
-                        "system",
-                        transcription_summary_prompt(
-                            self.dto.lecture_unit.lecture_name,
-                            chunk[LectureTranscriptionSchema.SEGMENT_TEXT.value],
-                        ),
-                    ),
-                ]
-            )
-            prompt_val = self.prompt.format_messages()
-            self.prompt = ChatPromptTemplate.from_messages(prompt_val)
-            try:
-                response = (self.prompt | self.pipeline).invoke({})
-                self._append_tokens(
-                    self.llm.tokens,
-                    PipelineEnum.IRIS_VIDEO_TRANSCRIPTION_INGESTION,
+        summaries, tokens = self.summarizer(
+            [
+                transcription_summary_prompt(
+                    self.dto.lecture_unit.lecture_name,
+                    chunk[LectureTranscriptionSchema.SEGMENT_TEXT.value],
                 )
-                chunks_with_summaries.append(
-                    {
-                        **chunk,
-                        LectureTranscriptionSchema.SEGMENT_SUMMARY.value: response,
-                    }
-                )
-            except Exception as e:
-                raise e
-        return chunks_with_summaries
+                for chunk in chunks
+            ]
+        )
+        self.tokens.extend(tokens)
+        return [
+            {**chunk, LectureTranscriptionSchema.SEGMENT_SUMMARY.value: summary}
+            for chunk, summary in zip(chunks, summaries)
+        ]
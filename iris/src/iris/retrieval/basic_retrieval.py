@@ -25,6 +25,7 @@ from ..common.message_converters import (
 from ..common.pyris_message import PyrisMessage
 from ..llm.langchain import IrisLangchainChatModel
 from ..pipeline.sub_pipeline import SubPipeline
+from .retrieval_cache import hybrid_search
 
 logger = logging.getLogger(__name__)
 
@@ -184,14 +185,15 @@ class BaseRetrieval(SubPipeline, ABC):
             if base_url:
                 filter_weaviate &= Filter.by_property(base_url_property).equal(base_url)
 
-        vec = self.llm_embedding.embed(query)
-        return self.collection.query.hybrid(
-            query=query,
+        return hybrid_search(
+            self.collection,
+            self.llm_embedding,
+            query,
+            filter_weaviate,
+            (course_id, base_url, course_id_property, base_url_property),
             alpha=hybrid_factor,
-            vector=vec,
             return_properties=schema_properties,
             limit=result_limit,
-            filters=filter_weaviate,
         )
 
     @traceable(name="Retrieval: Run Parallel Rewrite Tasks")
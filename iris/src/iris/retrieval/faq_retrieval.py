@@ -16,6 +16,7 @@ from ..pipeline.prompts.lecture_retrieval_prompts import (
 )
 from ..vector_database.faq_schema import FaqSchema, init_faq_schema
 from .basic_retrieval import BaseRetrieval, merge_retrieved_chunks
+from .retrieval_cache import hybrid_search
 
 logger = logging.getLogger(__name__)
 
@@ -96,15 +97,15 @@ class FaqRetrieval(BaseRetrieval):
         filter_weaviate = Filter.by_property("course_id").equal(course_id)
 
         if search_text:
-            vec = self.llm_embedding.embed(search_text)
-
-            response = self.collection.query.hybrid(
-                query=search_text,
-                vector=vec,
+            response = hybrid_search(
+                self.collection,
+                self.llm_embedding,
+                search_text,
+                filter_weaviate,
+                (course_id,),
                 alpha=hybrid_factor,
                 return_properties=self.get_schema_properties(),
                 limit=result_limit,
-                filters=filter_weaviate,
             )
         else:
 
@@ -1,5 +1,5 @@
 from asyncio.log import logger
-from typing import List
+from typing import List, Optional
 
 from langchain_core.output_parsers import StrOutputParser
 from langsmith import traceable
@@ -21,9 +21,12 @@ from iris.llm import (
 )
 from iris.llm.langchain import IrisLangchainChatModel
 from iris.llm.request_handler.rerank_request_handler import (
+    RERANK_MODEL_ID,
     RerankRequestHandler,
 )
 from iris.pipeline.sub_pipeline import SubPipeline
+from iris.retrieval.lecture.lecture_retrieval_utils import fetch_lecture_units
+from iris.retrieval.retrieval_cache import QueryEmbeddingMemo, hybrid_search
 from iris.vector_database.lecture_unit_page_chunk_schema import (
     LectureUnitPageChunkSchema,
     init_lecture_unit_page_chunk_schema,
@@ -70,7 +73,7 @@ class LecturePageChunkRetrieval(SubPipeline):
             request_handler=request_handler, completion_args=completion_args
         )
         self.llm_embedding = ModelVersionRequestHandler("text-embedding-3-small")
-        self.cohere_client = RerankRequestHandler("cohere")
+        self.cohere_client = RerankRequestHandler(RERANK_MODEL_ID)
 
         self.pipeline = self.llm | StrOutputParser()
         self.lecture_unit_page_chunk_collection = init_lecture_unit_page_chunk_schema(
@@ -90,16 +93,19 @@ class LecturePageChunkRetrieval(SubPipeline):
         result_limit: int = 10,
         hybrid_factor: float = 0.9,
         top_n_reranked_results: int = 7,
+        embedding_memo: Optional[QueryEmbeddingMemo] = None,
     ) -> list[LectureUnitPageChunkRetrievalDTO]:
         """
         Retrieve lecture data from the database.
         """
+        embedding_memo = embedding_memo or QueryEmbeddingMemo(self.llm_embedding)
 
         basic_lecture_chunks = self.search_in_db(
             query=rewritten_student_query,
             hybrid_factor=0.9,
             result_limit=result_limit,
             lecture_unit_dto=lecture_unit,
+            llm_embedding=embedding_memo,
         )
 
         hyde_lecture_chunks = self.search_in_db(
@@ -107,6 +113,7 @@ class LecturePageChunkRetrieval(SubPipeline):
             hybrid_factor=0.9,
             result_limit=result_limit,
             lecture_unit_dto=lecture_unit,
+            llm_embedding=embedding_memo,
         )
 
         unique = {}
@@ -114,10 +121,20 @@ class LecturePageChunkRetrieval(SubPipeline):
             unique[segment.uuid] = segment
         results = list(unique.values())
 
+        lecture_units = fetch_lecture_units(
+            self.lecture_unit_collection,
+            [self.lecture_unit_key(chunk.properties) for chunk in results],
+        )
         page_chunks = [
-            dto
+            self.generate_retrieval_dtos(
+                chunk.properties, str(chunk.uuid), lecture_unit
+            )
             for chunk in results
-            if (dto := self.generate_retrieval_dtos(chunk.properties, str(chunk.uuid)))
+            if (
+                lecture_unit := lecture_units.get(
+                    self.lecture_unit_key(chunk.properties)
+                )
+            )
             is not None
         ]
 
@@ -136,6 +153,7 @@ class LecturePageChunkRetrieval(SubPipeline):
         hybrid_factor: float,
         result_limit: int,
         lecture_unit_dto: LectureUnitRetrievalDTO,
+        llm_embedding=None,
     ):
         """
         Search the database for the given query.
@@ -161,66 +179,51 @@ class LecturePageChunkRetrieval(SubPipeline):
                 LectureUnitPageChunkSchema.BASE_URL.value
             ).equal(lecture_unit_dto.base_url)
 
-        vec = self.llm_embedding.embed(query)
-        return_value = self.lecture_unit_page_chunk_collection.query.hybrid(
-            query=query,
+        return_value = hybrid_search(
+            self.lecture_unit_page_chunk_collection,
+            llm_embedding or self.llm_embedding,
+            query,
+            filter_weaviate,
+            (
+                lecture_unit_dto.course_id,
+                lecture_unit_dto.lecture_id,
+                lecture_unit_dto.base_url,
+            ),
             alpha=hybrid_factor,
-            vector=vec,
             limit=result_limit,
-            filters=filter_weaviate,
         )
         return return_value.objects
 
-    def generate_retrieval_dtos(self, lecture_page_chunk, uuid):
-        lecture_unit_filter = Filter.by_property(
-            LectureUnitSchema.COURSE_ID.value
-        ).equal(lecture_page_chunk[LectureUnitPageChunkSchema.COURSE_ID.value])
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.LECTURE_ID.value
-        ).equal(lecture_page_chunk[LectureUnitPageChunkSchema.LECTURE_ID.value])
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.LECTURE_UNIT_ID.value
-        ).equal(lecture_page_chunk[LectureUnitPageChunkSchema.LECTURE_UNIT_ID.value])
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.BASE_URL.value
-        ).equal(lecture_page_chunk[LectureUnitPageChunkSchema.BASE_URL.value])
-
-        lecture_units = self.lecture_unit_collection.query.fetch_objects(
-            filters=lecture_unit_filter
-        ).objects
-        if len(lecture_units) == 0:
-            return None
-        else:
-            lecture_unit = lecture_units[0].properties
-            lecture_transcription_dto = LectureUnitPageChunkRetrievalDTO(
-                uuid=uuid,
-                course_id=lecture_unit[LectureUnitSchema.COURSE_ID.value],
-                course_name=lecture_unit[LectureUnitSchema.COURSE_DESCRIPTION.value],
-                course_description=lecture_unit[
-                    LectureUnitSchema.COURSE_DESCRIPTION.value
-                ],
-                lecture_id=lecture_page_chunk[
-                    LectureUnitPageChunkSchema.LECTURE_ID.value
-                ],
-                lecture_name=lecture_unit[LectureUnitSchema.LECTURE_NAME.value],
-                lecture_unit_id=lecture_page_chunk[
-                    LectureUnitPageChunkSchema.LECTURE_ID.value
-                ],
-                lecture_unit_name=lecture_unit[
-                    LectureUnitSchema.LECTURE_UNIT_NAME.value
-                ],
-                lecture_unit_link=lecture_unit[
-                    LectureUnitSchema.LECTURE_UNIT_LINK.value
-                ],
-                course_language=lecture_page_chunk[
-                    LectureUnitPageChunkSchema.COURSE_LANGUAGE.value
-                ],
-                page_number=lecture_page_chunk[
-                    LectureUnitPageChunkSchema.PAGE_NUMBER.value
-                ],
-                page_text_content=lecture_page_chunk[
-                    LectureUnitPageChunkSchema.PAGE_TEXT_CONTENT.value
-                ],
-                base_url=lecture_page_chunk[LectureUnitPageChunkSchema.BASE_URL.value],
-            )
-            return lecture_transcription_dto
+    @staticmethod
+    def lecture_unit_key(lecture_page_chunk) -> tuple:
+        return (
+            lecture_page_chunk[LectureUnitPageChunkSchema.COURSE_ID.value],
+            lecture_page_chunk[LectureUnitPageChunkSchema.LECTURE_ID.value],
+            lecture_page_chunk[LectureUnitPageChunkSchema.LECTURE_UNIT_ID.value],
+            lecture_page_chunk[LectureUnitPageChunkSchema.BASE_URL.value],
+        )
+
+    def generate_retrieval_dtos(self, lecture_page_chunk, uuid, lecture_unit):
+        return LectureUnitPageChunkRetrievalDTO(
+            uuid=uuid,
+            course_id=lecture_unit[LectureUnitSchema.COURSE_ID.value],
+            course_name=lecture_unit[LectureUnitSchema.COURSE_DESCRIPTION.value],
+            course_description=lecture_unit[LectureUnitSchema.COURSE_DESCRIPTION.value],
+            lecture_id=lecture_page_chunk[LectureUnitPageChunkSchema.LECTURE_ID.value],
+            lecture_name=lecture_unit[LectureUnitSchema.LECTURE_NAME.value],
+            lecture_unit_id=lecture_page_chunk[
+                LectureUnitPageChunkSchema.LECTURE_ID.value
+            ],
+            lecture_unit_name=lecture_unit[LectureUnitSchema.LECTURE_UNIT_NAME.value],
+            lecture_unit_link=lecture_unit[LectureUnitSchema.LECTURE_UNIT_LINK.value],
+            course_language=lecture_page_chunk[
+                LectureUnitPageChunkSchema.COURSE_LANGUAGE.value
+            ],
+            page_number=lecture_page_chunk[
+                LectureUnitPageChunkSchema.PAGE_NUMBER.value
+            ],
+            page_text_content=lecture_page_chunk[
+                LectureUnitPageChunkSchema.PAGE_TEXT_CONTENT.value
+            ],
+            base_url=lecture_page_chunk[LectureUnitPageChunkSchema.BASE_URL.value],
+        )
@@ -32,6 +32,7 @@ from iris.llm.request_handler.model_version_request_handler import (
     ModelVersionRequestHandler,
 )
 from iris.llm.request_handler.rerank_request_handler import (
+    RERANK_MODEL_ID,
     RerankRequestHandler,
 )
 from iris.pipeline.prompts.lecture_retrieval_prompts import (
@@ -48,12 +49,14 @@ from iris.pipeline.sub_pipeline import SubPipeline
 from iris.retrieval.lecture.lecture_page_chunk_retrieval import (
     LecturePageChunkRetrieval,
 )
+from iris.retrieval.lecture.lecture_retrieval_utils import fetch_objects_by_keys
 from iris.retrieval.lecture.lecture_transcription_retrieval import (
     LectureTranscriptionRetrieval,
 )
 from iris.retrieval.lecture.lecture_unit_segment_retrieval import (
     LectureUnitSegmentRetrieval,
 )
+from iris.retrieval.retrieval_cache import QueryEmbeddingMemo, RetrievalResultCache
 from iris.vector_database.lecture_transcription_schema import (
     LectureTranscriptionSchema,
     init_lecture_transcription_schema,
@@ -104,7 +107,7 @@ class LectureRetrieval(SubPipeline):
         self.lecture_transcription_pipeline = LectureTranscriptionRetrieval(client)
         self.lecture_unit_page_chunk_pipeline = LecturePageChunkRetrieval(client)
 
-        self.cohere_client = RerankRequestHandler("cohere")
+        self.cohere_client = RerankRequestHandler(RERANK_MODEL_ID)
 
     def __call__(
         self,
@@ -139,6 +142,8 @@ class LectureRetrieval(SubPipeline):
             exercise_title,
         )
 
+        # The segment and transcription pipelines search with the same queries, each text is embedded once
+        embedding_memo = QueryEmbeddingMemo(self.llm_embedding)
         (
             lecture_unit_segments,
             lecture_transcriptions,
@@ -150,15 +155,23 @@ class LectureRetrieval(SubPipeline):
             rewritten_lecture_transcriptions_query,
             hypothetical_lecture_pages_answer_query,
             hypothetical_lecture_transcriptions_answer_query,
+            embedding_memo,
+        )
+        logger.info(
+            "Lecture retrieval embedded %d queries (%d reused), search cache: %s",
+            embedding_memo.misses,
+            embedding_memo.hits,
+            RetrievalResultCache().stats(),
         )
 
-        for lecture_unit_segment in lecture_unit_segments:
-            lecture_transcriptions += self.get_lecture_transcription_of_lecture_unit(
-                lecture_unit_segment
-            )
-            lecture_unit_page_chunks += self.get_lecture_page_chunks_of_lecture_unit(
-                lecture_unit_segment
-            )
+        # The sub-pipelines return their results already ranked for the query
+        ranked_counts = (len(lecture_transcriptions), len(lecture_unit_page_chunks))
+        lecture_transcriptions += self.get_transcriptions_of_segments(
+            lecture_unit_segments
+        )
+        lecture_unit_page_chunks += self.get_page_chunks_of_segments(
+            lecture_unit_segments
+        )
 
         # Remove duplicate lecture transcriptions
         unique_transcriptions = {}
@@ -172,18 +185,22 @@ class LectureRetrieval(SubPipeline):
             unique_page_chunks[page_chunk.uuid] = page_chunk
         lecture_unit_page_chunks = list(unique_page_chunks.values())
 
-        lecture_transcriptions = self.cohere_client.rerank(
-            query,
-            lecture_transcriptions,
-            top_n=7,
-            content_field_name="segment_text",
-        )
-        lecture_unit_page_chunks = self.cohere_client.rerank(
-            query,
-            lecture_unit_page_chunks,
-            top_n=7,
-            content_field_name="page_text_content",
-        )
+        # Only lists that the segments extended are ranked again, the scores of the already ranked documents are
+        # cached, so only the added ones are sent to the reranker, all lists in one call
+        candidates = [
+            (documents, content_field_name)
+            for documents, content_field_name, ranked_count in (
+                (lecture_transcriptions, "segment_text", ranked_counts[0]),
+                (lecture_unit_page_chunks, "page_text_content", ranked_counts[1]),
+            )
+            if len(documents) > ranked_count
+        ]
+        if candidates:
+            reranked = iter(self.cohere_client.rerank_many(query, candidates, top_n=7))
+            if len(lecture_transcriptions) > ranked_counts[0]:
+                lecture_transcriptions = next(reranked)
+            if len(lecture_unit_page_chunks) > ranked_counts[1]:
+                lecture_unit_page_chunks = next(reranked)
 
         return LectureRetrievalDTO(
             lecture_unit_segments=lecture_unit_segments,
@@ -663,6 +680,7 @@ class LectureRetrieval(SubPipeline):
         lecture_transcriptions_query: str,
         hypothetical_lecture_pages_answer_query: str,
         hypothetical_lecture_transcriptions_answer_query: str,
+        embedding_memo: QueryEmbeddingMemo = None,
     ):
         """
         Call the different pipelines for lecture content retrieval.
@@ -674,6 +692,7 @@ class LectureRetrieval(SubPipeline):
                 lecture_transcriptions_query,
                 hypothetical_lecture_transcriptions_answer_query,
                 lecture_unit,
+                embedding_memo=embedding_memo,
             )
             lecture_transcriptions_future = executor.submit(
                 self.lecture_transcription_pipeline,
@@ -681,6 +700,7 @@ class LectureRetrieval(SubPipeline):
                 lecture_transcriptions_query,
                 hypothetical_lecture_transcriptions_answer_query,
                 lecture_unit,
+                embedding_memo=embedding_memo,
             )
             lecture_unit_page_chunks_future = executor.submit(
                 self.lecture_unit_page_chunk_pipeline,
@@ -688,6 +708,7 @@ class LectureRetrieval(SubPipeline):
                 lecture_pages_query,
                 hypothetical_lecture_pages_answer_query,
                 lecture_unit,
+                embedding_memo=embedding_memo,
             )
 
             lecture_unit_segments: List[LectureUnitSegmentRetrievalDTO] = (
@@ -706,29 +727,37 @@ class LectureRetrieval(SubPipeline):
             lecture_unit_page_chunks,
         )
 
-    def get_lecture_transcription_of_lecture_unit(
-        self, lecture_unit_segment: LectureUnitSegmentRetrievalDTO
-    ):
-        transcription_filter = Filter.by_property(
-            LectureTranscriptionSchema.COURSE_ID.value
-        ).equal(lecture_unit_segment.course_id)
-        transcription_filter &= Filter.by_property(
-            LectureTranscriptionSchema.LECTURE_ID.value
-        ).equal(lecture_unit_segment.lecture_id)
-        transcription_filter &= Filter.by_property(
-            LectureTranscriptionSchema.LECTURE_UNIT_ID.value
-        ).equal(lecture_unit_segment.lecture_unit_id)
-        transcription_filter &= Filter.by_property(
-            LectureTranscriptionSchema.PAGE_NUMBER.value
-        ).equal(lecture_unit_segment.page_number)
-        transcription_filter &= Filter.by_property(
-            LectureTranscriptionSchema.BASE_URL.value
-        ).equal(lecture_unit_segment.base_url)
-
-        lecture_transcriptions = (
-            self.lecture_transcription_collection.query.fetch_objects(
-                filters=transcription_filter
-            ).objects
+    @staticmethod
+    def lecture_unit_segment_key(
+        lecture_unit_segment: LectureUnitSegmentRetrievalDTO,
+    ) -> tuple:
+        return (
+            lecture_unit_segment.course_id,
+            lecture_unit_segment.lecture_id,
+            lecture_unit_segment.lecture_unit_id,
+            lecture_unit_segment.page_number,
+            lecture_unit_segment.base_url,
+        )
+
+    def get_transcriptions_of_segments(
+        self, lecture_unit_segments: List[LectureUnitSegmentRetrievalDTO]
+    ) -> List[LectureTranscriptionRetrievalDTO]:
+        """
+        Fetch the transcriptions of the pages of all segments in a single query.
+        """
+        transcriptions = fetch_objects_by_keys(
+            self.lecture_transcription_collection,
+            (
+                LectureTranscriptionSchema.COURSE_ID.value,
+                LectureTranscriptionSchema.LECTURE_ID.value,
+                LectureTranscriptionSchema.LECTURE_UNIT_ID.value,
+                LectureTranscriptionSchema.PAGE_NUMBER.value,
+                LectureTranscriptionSchema.BASE_URL.value,
+            ),
+            [
+                self.lecture_unit_segment_key(segment)
+                for segment in lecture_unit_segments
+            ],
         )
 
         return [
@@ -762,32 +791,31 @@ class LectureRetrieval(SubPipeline):
                 ],
                 base_url=lecture_unit_segment.base_url,
             )
-            for transcription in lecture_transcriptions
+            for lecture_unit_segment in lecture_unit_segments
+            for transcription in transcriptions.get(
+                self.lecture_unit_segment_key(lecture_unit_segment), []
+            )
         ]
 
-    def get_lecture_page_chunks_of_lecture_unit(
-        self, lecture_unit_segment: LectureUnitSegmentRetrievalDTO
-    ):
-        page_chunk_filter = Filter.by_property(
-            LectureUnitPageChunkSchema.COURSE_ID.value
-        ).equal(lecture_unit_segment.course_id)
-        page_chunk_filter &= Filter.by_property(
-            LectureUnitPageChunkSchema.LECTURE_ID.value
-        ).equal(lecture_unit_segment.lecture_id)
-        page_chunk_filter &= Filter.by_property(
-            LectureUnitPageChunkSchema.LECTURE_UNIT_ID.value
-        ).equal(lecture_unit_segment.lecture_unit_id)
-        page_chunk_filter &= Filter.by_property(
-            LectureUnitPageChunkSchema.PAGE_NUMBER.value
-        ).equal(lecture_unit_segment.page_number)
-        page_chunk_filter &= Filter.by_property(
-            LectureUnitPageChunkSchema.BASE_URL.value
-        ).equal(lecture_unit_segment.base_url)
-
-        lecture_page_chunks = (
-            self.lecture_unit_page_chunk_collection.query.fetch_objects(
-                filters=page_chunk_filter
-            ).objects
+    def get_page_chunks_of_segments(
+        self, lecture_unit_segments: List[LectureUnitSegmentRetrievalDTO]
+    ) -> List[LectureUnitPageChunkRetrievalDTO]:
+        """
+        Fetch the page chunks of the pages of all segments in a single query.
+        """
+        page_chunks = fetch_objects_by_keys(
+            self.lecture_unit_page_chunk_collection,
+            (
+                LectureUnitPageChunkSchema.COURSE_ID.value,
+                LectureUnitPageChunkSchema.LECTURE_ID.value,
+                LectureUnitPageChunkSchema.LECTURE_UNIT_ID.value,
+                LectureUnitPageChunkSchema.PAGE_NUMBER.value,
+                LectureUnitPageChunkSchema.BASE_URL.value,
+            ),
+            [
+                self.lecture_unit_segment_key(segment)
+                for segment in lecture_unit_segments
+            ],
         )
 
         return [
@@ -806,5 +834,8 @@ class LectureRetrieval(SubPipeline):
                 chunk.properties[LectureUnitPageChunkSchema.PAGE_TEXT_CONTENT.value],
                 lecture_unit_segment.base_url,
             )
-            for chunk in lecture_page_chunks
+            for lecture_unit_segment in lecture_unit_segments
+            for chunk in page_chunks.get(
+                self.lecture_unit_segment_key(lecture_unit_segment), []
+            )
         ]
@@ -1,8 +1,27 @@
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence
+
+from weaviate.collections import Collection
 from weaviate.collections.classes.filters import Filter
+from weaviate.collections.classes.internal import Object
 
 from ...vector_database.database import VectorDatabase
 from ...vector_database.lecture_unit_schema import LectureUnitSchema
 
+logger = logging.getLogger(__name__)
+
+# Upper bound of objects fetched by a single batched join query
+JOIN_QUERY_LIMIT = 1000
+
+LECTURE_UNIT_KEY = (
+    LectureUnitSchema.COURSE_ID.value,
+    LectureUnitSchema.LECTURE_ID.value,
+    LectureUnitSchema.LECTURE_UNIT_ID.value,
+    LectureUnitSchema.BASE_URL.value,
+)
+
 
 def should_allow_lecture_tool(db: VectorDatabase, course_id: int) -> bool:
     """
@@ -27,3 +46,94 @@ def should_allow_lecture_tool(db: VectorDatabase, course_id: int) -> bool:
         ],  # Requesting a minimal property
     )
     return len(result.objects) > 0
+
+
+def _key_filter(properties: Sequence[str], key: tuple):
+    return Filter.all_of(
+        [Filter.by_property(name).equal(value) for name, value in zip(properties, key)]
+    )
+
+
+def fetch_objects_by_keys(
+    collection: Collection,
+    properties: Sequence[str],
+    keys: Iterable[tuple],
+    limit: int = JOIN_QUERY_LIMIT,
+) -> Dict[tuple, List[Object]]:
+    """
+    Fetch all objects whose values of the given properties match one of the keys.
+
+    Instead of one query per key, a single query narrows every property down to the values that occur in the
+    keys (contains_any) and the exact keys are joined in memory. Keys containing None are skipped. If the
+    batched query hits its limit, any key may be cut short and every key is fetched one by one instead.
+
+    Args:
+        collection (Collection): The collection to query.
+        properties (Sequence[str]): The property names that form the key.
+        keys (Iterable[tuple]): The keys, with values in the order of the properties.
+        limit (int): The maximum number of objects fetched by the batched query.
+
+    Returns:
+        Dict[tuple, List[Object]]: The matching objects per key, keys without a match are missing.
+    """
+    keys = {tuple(key) for key in keys if all(value is not None for value in key)}
+    if not keys:
+        return {}
+    start = time.perf_counter()
+    filters = Filter.all_of(
+        [
+            Filter.by_property(name).contains_any(sorted({key[i] for key in keys}))
+            for i, name in enumerate(properties)
+        ]
+    )
+    objects = collection.query.fetch_objects(filters=filters, limit=limit).objects
+    queries = 1
+
+    matches: Dict[tuple, List[Object]] = defaultdict(list)
+    if len(objects) < limit:
+        for obj in objects:
+            key = tuple(obj.properties.get(name) for name in properties)
+            if key in keys:
+                matches[key].append(obj)
+    else:
+        logger.warning(
+            "Batched query on %s hit the limit of %d objects, fetching %d keys one by one",
+            collection.name,
+            limit,
+            len(keys),
+        )
+        for key in keys:
+            found = collection.query.fetch_objects(
+                filters=_key_filter(properties, key)
+            ).objects
+            queries += 1
+            if found:
+                matches[key] = list(found)
+
+    logger.debug(
+        "Fetched %d objects for %d keys from %s in %d queries (%.1f ms)",
+        sum(len(found) for found in matches.values()),
+        len(keys),
+        collection.name,
+        queries,
+        (time.perf_counter() - start) * 1000,
+    )
+    return dict(matches)
+
+
+def fetch_lecture_units(
+    collection: Collection,
+    keys: Iterable[tuple],
+    properties: Sequence[str] = LECTURE_UNIT_KEY,
+) -> Dict[tuple, dict]:
+    """
+    Fetch the lecture units for (course_id, lecture_id, lecture_unit_id, base_url) keys in a single query.
+    Pass a prefix of LECTURE_UNIT_KEY as properties to join on fewer properties.
+
+    Returns:
+        Dict[tuple, dict]: The properties of the lecture unit per key.
+    """
+    return {
+        key: objects[0].properties
+        for key, objects in fetch_objects_by_keys(collection, properties, keys).items()
+    }
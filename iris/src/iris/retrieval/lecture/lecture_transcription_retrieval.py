@@ -1,4 +1,5 @@
 from asyncio.log import logger
+from typing import Optional
 
 from langchain_core.output_parsers import StrOutputParser
 from weaviate import WeaviateClient
@@ -16,9 +17,12 @@ from iris.llm.request_handler.model_version_request_handler import (
     ModelVersionRequestHandler,
 )
 from iris.llm.request_handler.rerank_request_handler import (
+    RERANK_MODEL_ID,
     RerankRequestHandler,
 )
 from iris.pipeline.sub_pipeline import SubPipeline
+from iris.retrieval.lecture.lecture_retrieval_utils import fetch_lecture_units
+from iris.retrieval.retrieval_cache import QueryEmbeddingMemo, hybrid_search
 from iris.vector_database.lecture_transcription_schema import (
     LectureTranscriptionSchema,
     init_lecture_transcription_schema,
@@ -44,7 +48,7 @@ class LectureTranscriptionRetrieval(SubPipeline):
         self.pipeline = self.llm | StrOutputParser()
         self.collection = init_lecture_transcription_schema(client)
         self.lecture_unit_collection = init_lecture_unit_schema(client)
-        self.cohere_client = RerankRequestHandler("cohere")
+        self.cohere_client = RerankRequestHandler(RERANK_MODEL_ID)
         self.tokens = []
 
     def __call__(
@@ -56,27 +60,44 @@ class LectureTranscriptionRetrieval(SubPipeline):
         result_limit: int = 10,
         hybrid_factor: float = 0.9,
         top_n_reranked_results: int = 7,
+        embedding_memo: Optional[QueryEmbeddingMemo] = None,
     ):
+        embedding_memo = embedding_memo or QueryEmbeddingMemo(self.llm_embedding)
         results_rewritten_query = self.search_in_db(
-            lecture_unit_dto, rewritten_query, hybrid_factor, result_limit
+            lecture_unit_dto,
+            rewritten_query,
+            hybrid_factor,
+            result_limit,
+            embedding_memo,
         )
         results_hypothetical_answer = self.search_in_db(
-            lecture_unit_dto, hypothetical_answer, hybrid_factor, result_limit
+            lecture_unit_dto,
+            hypothetical_answer,
+            hybrid_factor,
+            result_limit,
+            embedding_memo,
         )
 
         unique = {}
         for segment in results_hypothetical_answer + results_rewritten_query:
             unique[segment.uuid] = segment
         results = list(unique.values())
+        lecture_units = fetch_lecture_units(
+            self.lecture_unit_collection,
+            [self.lecture_unit_key(segment.properties) for segment in results],
+        )
         lecture_transcription_retrieval_dtos = []
         for lecture_transcription_segment in results:
-            lecture_transcription_retrieval_dto = self.generate_retrieval_dtos(
-                lecture_transcription_segment.properties,
-                str(lecture_transcription_segment.uuid),
+            lecture_unit = lecture_units.get(
+                self.lecture_unit_key(lecture_transcription_segment.properties)
             )
-            if lecture_transcription_retrieval_dto is not None:
+            if lecture_unit is not None:
                 lecture_transcription_retrieval_dtos.append(
-                    lecture_transcription_retrieval_dto
+                    self.generate_retrieval_dtos(
+                        lecture_transcription_segment.properties,
+                        str(lecture_transcription_segment.uuid),
+                        lecture_unit,
+                    )
                 )
 
         reranked_answers = self.cohere_client.rerank(
@@ -94,6 +115,7 @@ class LectureTranscriptionRetrieval(SubPipeline):
         query: str,
         hybrid_factor: float,
         result_limit: int,
+        llm_embedding=None,
     ):
         """
         Search the database for the given query.
@@ -120,79 +142,62 @@ class LectureTranscriptionRetrieval(SubPipeline):
                 LectureTranscriptionSchema.BASE_URL.value
             ).equal(lecture_unit_dto.base_url)
 
-        vec = self.llm_embedding.embed(query)
-        return_value = self.collection.query.hybrid(
-            query=query,
+        return_value = hybrid_search(
+            self.collection,
+            llm_embedding or self.llm_embedding,
+            query,
+            filter_weaviate,
+            (
+                lecture_unit_dto.course_id,
+                lecture_unit_dto.lecture_id,
+                lecture_unit_dto.base_url,
+            ),
             alpha=hybrid_factor,
-            vector=vec,
             limit=result_limit,
-            filters=filter_weaviate,
         )
         return return_value.objects
 
-    def generate_retrieval_dtos(self, lecture_transcription_segment, uuid):
-        lecture_unit_filter = Filter.by_property(
-            LectureUnitSchema.COURSE_ID.value
-        ).equal(
-            lecture_transcription_segment[LectureTranscriptionSchema.COURSE_ID.value]
-        )
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.LECTURE_ID.value
-        ).equal(
-            lecture_transcription_segment[LectureTranscriptionSchema.LECTURE_ID.value]
-        )
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.LECTURE_UNIT_ID.value
-        ).equal(
+    @staticmethod
+    def lecture_unit_key(lecture_transcription_segment) -> tuple:
+        return (
+            lecture_transcription_segment[LectureTranscriptionSchema.COURSE_ID.value],
+            lecture_transcription_segment[LectureTranscriptionSchema.LECTURE_ID.value],
             lecture_transcription_segment[
                 LectureTranscriptionSchema.LECTURE_UNIT_ID.value
-            ]
-        )
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.BASE_URL.value
-        ).equal(
-            lecture_transcription_segment[LectureTranscriptionSchema.BASE_URL.value]
+            ],
+            lecture_transcription_segment[LectureTranscriptionSchema.BASE_URL.value],
         )
 
-        lecture_units = self.lecture_unit_collection.query.fetch_objects(
-            filters=lecture_unit_filter
-        ).objects
-        if len(lecture_units) == 0:
-            return None
-        else:
-            lecture_unit = lecture_units[0].properties
-            lecture_transcription_dto = LectureTranscriptionRetrievalDTO(
-                uuid=uuid,
-                course_id=lecture_unit[LectureUnitSchema.COURSE_ID.value],
-                course_name=lecture_unit[LectureUnitSchema.COURSE_NAME.value],
-                course_description=lecture_unit[
-                    LectureUnitSchema.COURSE_DESCRIPTION.value
-                ],
-                lecture_id=lecture_unit[LectureUnitSchema.LECTURE_ID.value],
-                lecture_name=lecture_unit[LectureUnitSchema.LECTURE_NAME.value],
-                lecture_unit_id=lecture_unit[LectureUnitSchema.LECTURE_UNIT_ID.value],
-                lecture_unit_name=lecture_unit[
-                    LectureUnitSchema.LECTURE_UNIT_NAME.value
-                ],
-                video_link=lecture_unit[LectureUnitSchema.VIDEO_LINK.value],
-                language=lecture_transcription_segment[
-                    LectureTranscriptionSchema.LANGUAGE.value
-                ],
-                segment_start_time=lecture_transcription_segment[
-                    LectureTranscriptionSchema.SEGMENT_START_TIME.value
-                ],
-                segment_end_time=lecture_transcription_segment[
-                    LectureTranscriptionSchema.SEGMENT_END_TIME.value
-                ],
-                page_number=lecture_transcription_segment[
-                    LectureTranscriptionSchema.PAGE_NUMBER.value
-                ],
-                segment_summary=lecture_transcription_segment[
-                    LectureTranscriptionSchema.SEGMENT_SUMMARY.value
-                ],
-                segment_text=lecture_transcription_segment[
-                    LectureTranscriptionSchema.SEGMENT_TEXT.value
-                ],
-                base_url=lecture_unit[LectureUnitSchema.BASE_URL.value],
-            )
-            return lecture_transcription_dto
+    def generate_retrieval_dtos(
+        self, lecture_transcription_segment, uuid, lecture_unit
+    ):
+        return LectureTranscriptionRetrievalDTO(
+            uuid=uuid,
+            course_id=lecture_unit[LectureUnitSchema.COURSE_ID.value],
+            course_name=lecture_unit[LectureUnitSchema.COURSE_NAME.value],
+            course_description=lecture_unit[LectureUnitSchema.COURSE_DESCRIPTION.value],
+            lecture_id=lecture_unit[LectureUnitSchema.LECTURE_ID.value],
+            lecture_name=lecture_unit[LectureUnitSchema.LECTURE_NAME.value],
+            lecture_unit_id=lecture_unit[LectureUnitSchema.LECTURE_UNIT_ID.value],
+            lecture_unit_name=lecture_unit[LectureUnitSchema.LECTURE_UNIT_NAME.value],
+            video_link=lecture_unit[LectureUnitSchema.VIDEO_LINK.value],
+            language=lecture_transcription_segment[
+                LectureTranscriptionSchema.LANGUAGE.value
+            ],
+            segment_start_time=lecture_transcription_segment[
+                LectureTranscriptionSchema.SEGMENT_START_TIME.value
+            ],
+            segment_end_time=lecture_transcription_segment[
+                LectureTranscriptionSchema.SEGMENT_END_TIME.value
+            ],
+            page_number=lecture_transcription_segment[
+                LectureTranscriptionSchema.PAGE_NUMBER.value
+            ],
+            segment_summary=lecture_transcription_segment[
+                LectureTranscriptionSchema.SEGMENT_SUMMARY.value
+            ],
+            segment_text=lecture_transcription_segment[
+                LectureTranscriptionSchema.SEGMENT_TEXT.value
+            ],
+            base_url=lecture_unit[LectureUnitSchema.BASE_URL.value],
+        )
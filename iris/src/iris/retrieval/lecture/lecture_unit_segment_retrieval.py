@@ -1,4 +1,5 @@
 from asyncio.log import logger
+from typing import Optional
 
 from langchain_core.output_parsers import StrOutputParser
 from weaviate import WeaviateClient
@@ -16,9 +17,15 @@ from iris.llm.request_handler.model_version_request_handler import (
     ModelVersionRequestHandler,
 )
 from iris.llm.request_handler.rerank_request_handler import (
+    RERANK_MODEL_ID,
     RerankRequestHandler,
 )
 from iris.pipeline.sub_pipeline import SubPipeline
+from iris.retrieval.lecture.lecture_retrieval_utils import (
+    LECTURE_UNIT_KEY,
+    fetch_lecture_units,
+)
+from iris.retrieval.retrieval_cache import QueryEmbeddingMemo, hybrid_search
 from iris.vector_database.lecture_unit_schema import (
     LectureUnitSchema,
     init_lecture_unit_schema,
@@ -44,7 +51,7 @@ class LectureUnitSegmentRetrieval(SubPipeline):
         self.pipeline = self.llm | StrOutputParser()
         self.collection = init_lecture_unit_segment_schema(client)
         self.lecture_unit_collection = init_lecture_unit_schema(client)
-        self.cohere_client = RerankRequestHandler("cohere")
+        self.cohere_client = RerankRequestHandler(RERANK_MODEL_ID)
         self.tokens = []
 
     def __call__(
@@ -56,27 +63,46 @@ class LectureUnitSegmentRetrieval(SubPipeline):
         result_limit: int = 10,
         hybrid_factor: float = 0.9,
         top_n_reranked_results: int = 7,
+        embedding_memo: Optional[QueryEmbeddingMemo] = None,
     ):
+        embedding_memo = embedding_memo or QueryEmbeddingMemo(self.llm_embedding)
         results_rewritten_query = self.search_in_db(
-            lecture_unit_dto, rewritten_query, hybrid_factor, result_limit
+            lecture_unit_dto,
+            rewritten_query,
+            hybrid_factor,
+            result_limit,
+            embedding_memo,
         )
         results_hypothetical_answer = self.search_in_db(
-            lecture_unit_dto, hypothetical_answer, hybrid_factor, result_limit
+            lecture_unit_dto,
+            hypothetical_answer,
+            hybrid_factor,
+            result_limit,
+            embedding_memo,
         )
         unique = {}
         for segment in results_hypothetical_answer + results_rewritten_query:
             unique[segment.uuid] = segment
         results = list(unique.values())
+        lecture_units = fetch_lecture_units(
+            self.lecture_unit_collection,
+            [self.lecture_unit_key(segment.properties) for segment in results],
+            properties=LECTURE_UNIT_KEY[:3],
+        )
         lecture_unit_segment_retrieval_dtos = []
         for lecture_unit_segment in results:
-            lecture_unit_segment_retrieval_dto = self.generate_retrieval_dtos(
-                lecture_unit_segment.properties, str(lecture_unit_segment.uuid)
+            lecture_unit = lecture_units.get(
+                self.lecture_unit_key(lecture_unit_segment.properties)
             )
-            if lecture_unit_segment_retrieval_dto is None:
+            if lecture_unit is None:
                 continue
 
             lecture_unit_segment_retrieval_dtos.append(
-                lecture_unit_segment_retrieval_dto
+                self.generate_retrieval_dtos(
+                    lecture_unit_segment.properties,
+                    str(lecture_unit_segment.uuid),
+                    lecture_unit,
+                )
             )
 
         reranked_answers = self.cohere_client.rerank(
@@ -94,6 +120,7 @@ class LectureUnitSegmentRetrieval(SubPipeline):
         query: str,
         hybrid_factor: float,
         result_limit: int,
+        llm_embedding=None,
     ):
         """
         Search the database for the given query.
@@ -120,35 +147,31 @@ class LectureUnitSegmentRetrieval(SubPipeline):
                 LectureUnitSegmentSchema.BASE_URL.value
             ).equal(lecture_unit_dto.base_url)
 
-        vec = self.llm_embedding.embed(query)
-        return_value = self.collection.query.hybrid(
-            query=query,
+        return_value = hybrid_search(
+            self.collection,
+            llm_embedding or self.llm_embedding,
+            query,
+            filter_weaviate,
+            (
+                lecture_unit_dto.course_id,
+                lecture_unit_dto.lecture_id,
+                lecture_unit_dto.base_url,
+            ),
             alpha=hybrid_factor,
-            vector=vec,
             limit=result_limit,
-            filters=filter_weaviate,
         )
         return return_value.objects
 
-    def generate_retrieval_dtos(self, lecture_unit_segment, uuid: str):
-        lecture_unit_filter = Filter.by_property(
-            LectureUnitSchema.COURSE_ID.value
-        ).equal(lecture_unit_segment[LectureUnitSegmentSchema.COURSE_ID.value])
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.LECTURE_ID.value
-        ).equal(lecture_unit_segment[LectureUnitSegmentSchema.LECTURE_ID.value])
-        lecture_unit_filter &= Filter.by_property(
-            LectureUnitSchema.LECTURE_UNIT_ID.value
-        ).equal(lecture_unit_segment[LectureUnitSegmentSchema.LECTURE_UNIT_ID.value])
-
-        lecture_units = self.lecture_unit_collection.query.fetch_objects(
-            filters=lecture_unit_filter
-        ).objects
-        if len(lecture_units) == 0:
-            return None
+    @staticmethod
+    def lecture_unit_key(lecture_unit_segment) -> tuple:
+        return (
+            lecture_unit_segment[LectureUnitSegmentSchema.COURSE_ID.value],
+            lecture_unit_segment[LectureUnitSegmentSchema.LECTURE_ID.value],
+            lecture_unit_segment[LectureUnitSegmentSchema.LECTURE_UNIT_ID.value],
+        )
 
-        lecture_unit = lecture_units[0].properties
-        lecture_unit_segment_retrieval_dto = LectureUnitSegmentRetrievalDTO(
+    def generate_retrieval_dtos(self, lecture_unit_segment, uuid: str, lecture_unit):
+        return LectureUnitSegmentRetrievalDTO(
             uuid=uuid,
             course_id=lecture_unit_segment[LectureUnitSegmentSchema.COURSE_ID.value],
             course_name=lecture_unit[LectureUnitSchema.COURSE_NAME.value],
@@ -169,4 +192,3 @@ class LectureUnitSegmentRetrieval(SubPipeline):
             ],
             base_url=lecture_unit_segment[LectureUnitSegmentSchema.BASE_URL.value],
         )
-        return lecture_unit_segment_retrieval_dto
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from ..common.singleton import Singleton
+
+# Seconds a hybrid search result is served from the cache, 0 disables the cache
+RETRIEVAL_CACHE_TTL = float(os.environ.get("RETRIEVAL_CACHE_TTL", "300"))
+# Number of search results kept, the least recently used ones are dropped first
+RETRIEVAL_CACHE_SIZE = int(os.environ.get("RETRIEVAL_CACHE_SIZE", "2048"))
+
+
+class QueryEmbeddingMemo:
+    """
+    Embeds every distinct query text once during a single retrieval request. The sub-pipelines of a request share
+    the memo and run concurrently, so a text that is already being embedded is waited for instead of sent again.
+    """
+
+    def __init__(self, llm_embedding):
+        self.llm_embedding = llm_embedding
+        self._lock = threading.Lock()
+        self._embeddings: dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, text: str) -> list[float]:
+        with self._lock:
+            embedding = self._embeddings.get(text)
+            owner = embedding is None
+            if owner:
+                embedding = self._embeddings[text] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                embedding.set_result(self.llm_embedding.embed(text))
+            except Exception as e:
+                embedding.set_exception(e)
+        return embedding.result()
+
+
+class RetrievalResultCache(metaclass=Singleton):
+    """
+    RetrievalResultCache keeps the results of recent hybrid searches per collection for a limited time, so that
+    repeated questions neither embed the query nor query Weaviate again. Ingestion and deletion invalidate the
+    collections they write to.
+    """
+
+    def __init__(
+        self, ttl: float = RETRIEVAL_CACHE_TTL, max_size: int = RETRIEVAL_CACHE_SIZE
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        # Searches that started before an invalidation of their collection are not cached
+        self._generations: dict[str, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_search(
+        self, collection_name: str, key: tuple, search: Callable[[], Any]
+    ):
+        if self.ttl <= 0:
+            return search()
+        key = (collection_name, *key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generations[collection_name]
+
+        result = search()
+
+        with self._lock:
+            if self._generations[collection_name] == generation:
+                self._entries[key] = (time.monotonic() + self.ttl, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, *collection_names: str):
+        """Drop the cached results of the given collections, e.g. after new lecture content was ingested."""
+        with self._lock:
+            for collection_name in collection_names:
+                self._generations[collection_name] += 1
+            for key in [key for key in self._entries if key[0] in collection_names]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+
+def hybrid_search(
+    collection,
+    llm_embedding,
+    query: str,
+    filters,
+    filter_key: tuple,
+    **kwargs,
+):
+    """
+    Run a hybrid search on the collection, served from the RetrievalResultCache if the same search ran recently.
+
+    :param llm_embedding: Embeds the query on a cache miss, a request handler or a QueryEmbeddingMemo
+    :param filters: The Weaviate filters of the search
+    :param filter_key: The values the filters were built from, Weaviate filters cannot be compared themselves
+    :param kwargs: The remaining arguments of collection.query.hybrid, e.g. alpha and limit
+    """
+    key = (
+        filter_key,
+        hashlib.sha256(query.encode("utf-8")).hexdigest(),
+        tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(kwargs.items())
+        ),
+    )
+    return RetrievalResultCache().get_or_search(
+        collection.name,
+        key,
+        lambda: collection.query.hybrid(
+            query=query,
+            vector=llm_embedding.embed(query),
+            filters=filters,
+            **kwargs,
+        ),
+    )
@@ -5,6 +5,7 @@ import threading
 import weaviate
 from weaviate.classes.query import Filter
 
+from iris.common.keyed_lock import KeyedLock
 from iris.config import settings
 
 from .faq_schema import init_faq_schema
@@ -12,14 +13,43 @@ from .lecture_transcription_schema import init_lecture_transcription_schema
 from .lecture_unit_page_chunk_schema import init_lecture_unit_page_chunk_schema
 from .lecture_unit_schema import init_lecture_unit_schema
 from .lecture_unit_segment_schema import init_lecture_unit_segment_schema
+from .schema_registry import SchemaRegistry
 
 logger = logging.getLogger(__name__)
-batch_update_lock = threading.Lock()
+# Serializes writes to the same ingestion unit, e.g. batch_update_lock(*lecture_unit_key(base_url, lecture_unit))
+batch_update_lock = KeyedLock()
+
+
+def lecture_unit_key(artemis_base_url: str, lecture_unit) -> tuple:
+    """
+    The key of a lecture unit for batch_update_lock and the ingestion queue. artemis_base_url is the base URL from the
+    execution settings, LectureUnitDTO.base_url is set from it.
+    """
+    return (
+        "lecture_unit",
+        artemis_base_url,
+        lecture_unit.course_id,
+        lecture_unit.lecture_id,
+        lecture_unit.lecture_unit_id,
+    )
+
+
+def raise_on_failed_objects(collection) -> None:
+    """
+    Raise if objects of the last batch of the collection failed. The batch context managers only collect the errors.
+    """
+    failed_objects = collection.batch.failed_objects
+    if failed_objects:
+        raise RuntimeError(
+            f"{len(failed_objects)} objects failed to be inserted into {collection.name}: "
+            f"{failed_objects[0].message}"
+        )
 
 
 class VectorDatabase:
     """
-    Class to interact with the Weaviate vector database
+    Class to interact with the Weaviate vector database.
+    The client and the collection handles are shared by all instances, the schemas are bootstrapped by the first one.
     """
 
     _lock = threading.Lock()
@@ -47,6 +77,7 @@ class VectorDatabase:
         """
         Delete a collection from the database
         """
+        SchemaRegistry().invalidate(collection_name)
         if self.client.collections.delete(collection_name):
             logger.info("Collection %s deleted", collection_name)
         else:
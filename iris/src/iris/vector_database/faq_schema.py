@@ -9,6 +9,8 @@ from weaviate.collections.classes.config import (
     VectorDistances,
 )
 
+from iris.vector_database.schema_registry import registered_schema
+
 
 class FaqSchema(Enum):
     """
@@ -25,6 +27,7 @@ class FaqSchema(Enum):
     QUESTION_ANSWER = "question_answer"
 
 
+@registered_schema(FaqSchema.COLLECTION_NAME.value)
 def init_faq_schema(client: WeaviateClient) -> Collection:
     """
     Initialize the schema for the faqs
@@ -9,6 +9,8 @@ from weaviate.collections.classes.config import (
     VectorDistances,
 )
 
+from iris.vector_database.schema_registry import registered_schema
+
 
 class LectureTranscriptionSchema(Enum):
     """
@@ -28,6 +30,7 @@ class LectureTranscriptionSchema(Enum):
     BASE_URL = "base_url"
 
 
+@registered_schema(LectureTranscriptionSchema.COLLECTION_NAME.value)
 def init_lecture_transcription_schema(client: WeaviateClient) -> Collection:
     if client.collections.exists(LectureTranscriptionSchema.COLLECTION_NAME.value):
         return client.collections.get(LectureTranscriptionSchema.COLLECTION_NAME.value)
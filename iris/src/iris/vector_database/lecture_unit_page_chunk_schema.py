@@ -9,6 +9,8 @@ from weaviate.collections.classes.config import (
     VectorDistances,
 )
 
+from iris.vector_database.schema_registry import registered_schema
+
 
 class LectureUnitPageChunkSchema(Enum):
     """
@@ -26,6 +28,7 @@ class LectureUnitPageChunkSchema(Enum):
     PAGE_VERSION = "attachment_version"
 
 
+@registered_schema(LectureUnitPageChunkSchema.COLLECTION_NAME.value)
 def init_lecture_unit_page_chunk_schema(client: WeaviateClient) -> Collection:
     """
     Initialize the schema for the lecture unit page chunks
@@ -9,6 +9,8 @@ from weaviate.collections.classes.config import (
     VectorDistances,
 )
 
+from iris.vector_database.schema_registry import registered_schema
+
 
 class LectureUnitSchema(Enum):
     """
@@ -30,6 +32,7 @@ class LectureUnitSchema(Enum):
     VIDEO_LINK = "video_link"
 
 
+@registered_schema(LectureUnitSchema.COLLECTION_NAME.value)
 def init_lecture_unit_schema(client: WeaviateClient) -> Collection:
     if client.collections.exists(LectureUnitSchema.COLLECTION_NAME.value):
         return client.collections.get(LectureUnitSchema.COLLECTION_NAME.value)
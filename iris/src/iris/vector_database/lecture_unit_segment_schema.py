@@ -16,6 +16,7 @@ from iris.vector_database.lecture_transcription_schema import (
 from iris.vector_database.lecture_unit_page_chunk_schema import (
     LectureUnitPageChunkSchema,
 )
+from iris.vector_database.schema_registry import registered_schema
 
 
 class LectureUnitSegmentSchema(Enum):
@@ -34,6 +35,7 @@ class LectureUnitSegmentSchema(Enum):
     BASE_URL = "base_url"
 
 
+@registered_schema(LectureUnitSegmentSchema.COLLECTION_NAME.value)
 def init_lecture_unit_segment_schema(client: WeaviateClient) -> Collection:
     if client.collections.exists(LectureUnitSegmentSchema.COLLECTION_NAME.value):
         return client.collections.get(LectureUnitSegmentSchema.COLLECTION_NAME.value)
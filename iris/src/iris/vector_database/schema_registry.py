@@ -0,0 +1,59 @@
+import functools
+import logging
+import threading
+from typing import Callable
+
+from weaviate import WeaviateClient
+from weaviate.collections import Collection
+
+from iris.common.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaRegistry(metaclass=Singleton):
+    """
+    Bootstraps every collection schema once per process and hands out the cached collection handles afterwards.
+    Checking and creating a schema takes several requests to Weaviate, the cached handles take none.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: dict[tuple[int, str], Collection] = {}
+
+    def get(
+        self,
+        client: WeaviateClient,
+        collection_name: str,
+        init_schema: Callable[[WeaviateClient], Collection],
+    ) -> Collection:
+        key = (id(client), collection_name)
+        collection = self._collections.get(key)
+        if collection is None:
+            # Pipelines of concurrent requests must not create the same collection twice
+            with self._lock:
+                collection = self._collections.get(key)
+                if collection is None:
+                    collection = init_schema(client)
+                    self._collections[key] = collection
+                    logger.info("Collection %s initialized", collection_name)
+        return collection
+
+    def invalidate(self, collection_name: str):
+        """Forget the handle of a collection, e.g. after it was deleted, so the next use bootstraps it again."""
+        with self._lock:
+            for key in [key for key in self._collections if key[1] == collection_name]:
+                del self._collections[key]
+
+
+def registered_schema(collection_name: str):
+    """Decorates an init_*_schema function, so that it bootstraps its collection once and returns the cached handle."""
+
+    def decorator(init_schema: Callable[[WeaviateClient], Collection]):
+        @functools.wraps(init_schema)
+        def wrapper(client: WeaviateClient) -> Collection:
+            return SchemaRegistry().get(client, collection_name, init_schema)
+
+        return wrapper
+
+    return decorator
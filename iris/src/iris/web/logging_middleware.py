@@ -0,0 +1,138 @@
+import logging
+import os
+import random
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Bytes of each request and response body that are kept for the log
+LOG_BODY_PREVIEW_BYTES = int(os.environ.get("LOG_BODY_PREVIEW_BYTES", "1024"))
+# Share of successful requests whose body previews are logged, failed requests are always logged with previews
+LOG_BODY_SAMPLE_RATE = float(os.environ.get("LOG_BODY_SAMPLE_RATE", "0.1"))
+
+# Values of these JSON fields are never logged, e.g. pdfFile with the base64 encoded lecture slides
+REDACTED_FIELD_PATTERN = re.compile(
+    r"pdf|base64|image|token|secret|password", re.IGNORECASE
+)
+# Long values that look like base64 data are redacted independent of their field name
+BASE64_VALUE_PATTERN = re.compile(r"[A-Za-z0-9+/=_-]{256,}")
+JSON_STRING_FIELD_PATTERN = re.compile(
+    r'"((?:[^"\\]|\\.)*)"(\s*:\s*)"((?:[^"\\]|\\.)*)("?)'
+)
+TEXT_CONTENT_TYPES = ("application/json", "text/", "application/x-www-form-urlencoded")
+
+
+def redact(text: str) -> str:
+    """Replace the values of sensitive or base64 encoded JSON string fields, also if the text is cut off."""
+
+    def replace(match: re.Match) -> str:
+        key, separator, value, closing = match.groups()
+        if REDACTED_FIELD_PATTERN.search(key) or BASE64_VALUE_PATTERN.fullmatch(value):
+            cut = "" if closing else "+"
+            return f'"{key}"{separator}"<redacted {len(value)}{cut} chars>"'
+        return match.group(0)
+
+    return JSON_STRING_FIELD_PATTERN.sub(replace, text)
+
+
+class BodyPreview:
+    """Counts the bytes of a streamed body and keeps only its first bytes."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.head = bytearray()
+        self.size = 0
+        self.content_type = ""
+
+    def add(self, chunk: bytes):
+        self.size += len(chunk)
+        missing = self.limit - len(self.head)
+        if missing > 0:
+            self.head += chunk[:missing]
+
+    def format(self) -> str:
+        if not self.size:
+            return "<empty>"
+        if not self.content_type.startswith(TEXT_CONTENT_TYPES):
+            return f"<{self.size} bytes {self.content_type or 'unknown content type'}>"
+        text = redact(self.head.decode("utf-8", errors="replace"))
+        if self.size > len(self.head):
+            text += f"... <{self.size} bytes>"
+        return text
+
+
+def get_content_type(headers) -> str:
+    for name, value in headers:
+        if name == b"content-type":
+            return value.decode("latin-1")
+    return ""
+
+
+class RequestLoggingMiddleware:
+    """
+    Logs every request with its status, body sizes and duration. The bodies are streamed through unchanged, only
+    a short redacted preview is kept and logged for failed requests and a sample of the successful ones.
+    """
+
+    def __init__(
+        self,
+        app,
+        preview_bytes: int = LOG_BODY_PREVIEW_BYTES,
+        sample_rate: float = LOG_BODY_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.preview_bytes = preview_bytes
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request = BodyPreview(self.preview_bytes)
+        request.content_type = get_content_type(scope["headers"])
+        response = BodyPreview(self.preview_bytes)
+        status_code = 500
+
+        async def receive_and_record():
+            message = await receive()
+            if message["type"] == "http.request":
+                request.add(message.get("body", b""))
+            return message
+
+        async def record_and_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response.content_type = get_content_type(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response.add(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_and_record, record_and_send)
+        finally:
+            self.log(scope, status_code, request, response, time.perf_counter() - start)
+
+    def log(
+        self,
+        scope,
+        status_code: int,
+        request: BodyPreview,
+        response: BodyPreview,
+        duration: float,
+    ):
+        logger.info(
+            "%s %s %d in %.0fms (request %d bytes, response %d bytes)",
+            scope["method"],
+            scope["path"],
+            status_code,
+            duration * 1000,
+            request.size,
+            response.size,
+        )
+        if status_code >= 400 or random.random() < self.sample_rate:
+            logger.info("Request body: %s", request.format())
+            logger.info("Response body: %s", response.format())
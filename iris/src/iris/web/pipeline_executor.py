@@ -0,0 +1,185 @@
+import logging
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Concurrent runs per pipeline type, override with PIPELINE_WORKERS_<TYPE>, e.g. PIPELINE_WORKERS_COURSE_CHAT=32
+DEFAULT_PIPELINE_WORKERS = {
+    "programming-exercise-chat": 16,
+    "course-chat": 16,
+    "text-exercise-chat": 8,
+    "lecture-chat": 8,
+    "competency-extraction": 4,
+    "rewriting": 4,
+    "inconsistency-check": 4,
+    "tutor-suggestion": 4,
+}
+# Runs per pipeline type that may wait for a worker before new runs are rejected
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", "100"))
+# Seconds to wait for accepted runs on shutdown
+PIPELINE_DRAIN_TIMEOUT = float(os.environ.get("PIPELINE_DRAIN_TIMEOUT", "120"))
+# Runs waiting longer than this in the queue are logged as a warning
+PIPELINE_QUEUE_WARNING_SECONDS = 10.0
+
+
+class PipelineRejectedError(Exception):
+    """Raised when a pipeline run is not accepted, either because its queue is full or because Iris shuts down."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class PipelinePool:
+    """
+    Runs the pipelines of one type on a fixed number of threads with a bounded queue in front of them.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"pipeline-{name}"
+        )
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._draining = False
+        self.admitted = 0
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+
+    def submit(self, fn: Callable, *args):
+        with self._lock:
+            if self._draining:
+                self.rejected += 1
+                raise PipelineRejectedError(
+                    f"Iris is shutting down, {self.name} runs are not accepted",
+                    status_code=503,
+                    retry_after=30,
+                )
+            if self.admitted >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PipelineRejectedError(
+                    f"Too many {self.name} runs, {self.running} running and "
+                    f"{self.admitted - self.running} waiting",
+                    status_code=429,
+                    retry_after=5,
+                )
+            self.admitted += 1
+            self.submitted += 1
+        self._executor.submit(self._run, time.perf_counter(), fn, args)
+
+    def _run(self, submitted_at: float, fn: Callable, args: tuple):
+        waited = time.perf_counter() - submitted_at
+        with self._lock:
+            self.running += 1
+            self.queue_seconds += waited
+            self.max_queue_seconds = max(self.max_queue_seconds, waited)
+        if waited > PIPELINE_QUEUE_WARNING_SECONDS:
+            logger.warning("%s run waited %.1fs for a worker", self.name, waited)
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.error("Error running %s pipeline: %s", self.name, e)
+            logger.error(traceback.format_exc())
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.admitted -= 1
+                self.completed += 1
+                self._drained.notify_all()
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "running": self.running,
+                "queued": self.admitted - self.running,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "avg_queue_seconds": self.queue_seconds / started if started else 0.0,
+                "max_queue_seconds": self.max_queue_seconds,
+            }
+
+    def close(self):
+        """Stop accepting runs, the accepted ones keep running."""
+        with self._lock:
+            self._draining = True
+
+    def drain(self, deadline: float) -> bool:
+        """Stop accepting runs and wait until the accepted ones are done or the deadline passed."""
+        with self._lock:
+            self._draining = True
+            drained = self._drained.wait_for(
+                lambda: self.admitted == 0, max(0.0, deadline - time.monotonic())
+            )
+        self._executor.shutdown(wait=drained)
+        return drained
+
+
+class PipelineExecutor:
+    """
+    PipelineExecutor admits pipeline runs per pipeline type: each type has its own worker limit and bounded queue,
+    so a burst of one type neither starves the others nor creates an unbounded number of threads.
+    """
+
+    def __init__(self, queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._pools: Dict[str, PipelinePool] = {}
+        self._closed = False
+
+    def pool(self, name: str, max_workers: Optional[int] = None) -> PipelinePool:
+        """Return the pool of a pipeline type, created with its configured worker limit on first use."""
+        with self._lock:
+            if name not in self._pools:
+                if max_workers is None:
+                    env = f"PIPELINE_WORKERS_{name.upper().replace('-', '_')}"
+                    max_workers = int(
+                        os.environ.get(env, DEFAULT_PIPELINE_WORKERS.get(name, 4))
+                    )
+                self._pools[name] = PipelinePool(name, max_workers, self.queue_size)
+                if self._closed:
+                    self._pools[name].close()
+            return self._pools[name]
+
+    def submit(self, name: str, fn: Callable, *args):
+        """Run fn(*args) in the pool of the pipeline type. Raises PipelineRejectedError if it is not accepted."""
+        self.pool(name).submit(fn, *args)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            pools = list(self._pools.values())
+        return {pool.name: pool.stats() for pool in pools}
+
+    def shutdown(self, timeout: float = PIPELINE_DRAIN_TIMEOUT):
+        """Reject new runs and wait up to timeout seconds for the accepted runs of all pipeline types."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self._closed = True
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+        logger.info("Draining pipeline runs: %s", self.stats())
+        for pool in pools:
+            if not pool.drain(deadline):
+                logger.warning(
+                    "%s runs still active after %.0fs, shutting down anyway",
+                    pool.name,
+                    timeout,
+                )
+
+
+pipeline_executor = PipelineExecutor()
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, Response, status
 
 from iris.dependencies import TokenValidator
+from iris.pipeline.pipeline_instance_pool import pipeline_instances
+from iris.web.pipeline_executor import pipeline_executor
 
 router = APIRouter(prefix="/api/v1/health", tags=["health"])
 
@@ -15,3 +17,17 @@ def health_check():
         content=b"[]",
         media_type="application/json",
     )
+
+
+@router.get(
+    "/metrics",
+    dependencies=[Depends(TokenValidator())],
+)
+def metrics():
+    """
+    Running and queued runs, rejections and queue times per pipeline type, and the reuse of pooled pipeline instances.
+    """
+    return {
+        "pipelines": pipeline_executor.stats(),
+        "pipeline_instances": pipeline_instances.stats(),
+    }
@@ -1,11 +1,9 @@
 import logging
 import traceback
-from threading import Thread
 from typing import List
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sentry_sdk import capture_exception
-from concurrent.futures import ThreadPoolExecutor
 
 from iris.dependencies import TokenValidator
 from iris.domain import (
@@ -46,8 +44,10 @@ from iris.pipeline.inconsistency_check_pipeline import (
     InconsistencyCheckPipeline,
 )
 from iris.pipeline.lecture_ingestion_pipeline import LectureUnitPageIngestionPipeline
+from iris.pipeline.pipeline_instance_pool import pipeline_instances
 from iris.pipeline.rewriting_pipeline import RewritingPipeline
 from iris.pipeline.tutor_suggestion_pipeline import TutorSuggestionPipeline
+from iris.web.pipeline_executor import PipelineRejectedError, pipeline_executor
 from iris.web.status.status_update import (
     CompetencyExtractionCallback,
     CourseChatStatusCallback,
@@ -65,7 +65,24 @@ logger = logging.getLogger(__name__)
 
 
 # This is used to keep prompt user outputs in order (needed for tab-defocus and timer events to show after output that is already being generated)
-prompt_user_executor = ThreadPoolExecutor(max_workers=1)
+pipeline_executor.pool("prompt-user", max_workers=1)
+
+
+def submit_pipeline(pipeline_type: str, worker, *args):
+    """
+    Queue a pipeline run in the pool of its pipeline type.
+    Answers with 429 if too many runs of the type are waiting and with 503 while Iris shuts down.
+    """
+    try:
+        pipeline_executor.submit(pipeline_type, worker, *args)
+    except PipelineRejectedError as e:
+        logger.warning("Rejected %s run: %s", pipeline_type, e)
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+
 
 def run_exercise_chat_pipeline_worker(
     dto: ExerciseChatPipelineExecutionDTO,
@@ -78,7 +95,7 @@ def run_exercise_chat_pipeline_worker(
             base_url=dto.settings.artemis_base_url,
             initial_stages=dto.initial_stages,
         )
-        pipeline = ExerciseChatAgentPipeline()
+        pipeline = pipeline_instances.take(ExerciseChatAgentPipeline)
     except Exception as e:
         logger.error("Error preparing exercise chat pipeline: %s", e)
         logger.error(traceback.format_exc())
@@ -97,6 +114,8 @@ def run_exercise_chat_pipeline_worker(
         logger.error("Error running exercise chat pipeline: %s", e)
         logger.error(traceback.format_exc())
         callback.error("Fatal error.", exception=e)
+    finally:
+        pipeline_instances.release(pipeline)
 
 
 @router.post(
@@ -111,11 +130,13 @@ def run_exercise_chat_pipeline(
     ),
 ):
     variant = validate_pipeline_variant(dto.settings, ExerciseChatAgentPipeline)
-    thread = Thread(
-        target=run_exercise_chat_pipeline_worker,
-        args=(dto, variant, event),
+    submit_pipeline(
+        "programming-exercise-chat",
+        run_exercise_chat_pipeline_worker,
+        dto,
+        variant,
+        event,
     )
-    thread.start()
 
 
 def run_course_chat_pipeline_worker(dto, variant_id, event):
@@ -130,7 +151,7 @@ def run_course_chat_pipeline_worker(dto, variant_id, event):
                 break
         else:
             raise ValueError(f"Unknown variant: {variant_id}")
-        pipeline = CourseChatPipeline(event=event)
+        pipeline = pipeline_instances.take(CourseChatPipeline)
     except Exception as e:
         logger.error("Error preparing exercise chat pipeline: %s", e)
         logger.error(traceback.format_exc())
@@ -138,11 +159,13 @@ def run_course_chat_pipeline_worker(dto, variant_id, event):
         return
 
     try:
-        pipeline(dto=dto, callback=callback, variant=variant)
+        pipeline(dto=dto, callback=callback, variant=variant, event=event)
     except Exception as e:
         logger.error("Error running exercise chat pipeline: %s", e)
         logger.error(traceback.format_exc())
         callback.error("Fatal error.", exception=e)
+    finally:
+        pipeline_instances.release(pipeline)
 
 
 @router.post(
@@ -158,8 +181,7 @@ def run_course_chat_pipeline(
 ):
     variant = validate_pipeline_variant(dto.settings, CourseChatPipeline)
 
-    thread = Thread(target=run_course_chat_pipeline_worker, args=(dto, variant, event))
-    thread.start()
+    submit_pipeline("course-chat", run_course_chat_pipeline_worker, dto, variant, event)
 
 
 def run_text_exercise_chat_pipeline_worker(dto, variant_id):
@@ -221,8 +243,9 @@ def run_text_exercise_chat_pipeline(dto: TextExerciseChatPipelineExecutionDTO):
         dto.execution.settings, TextExerciseChatPipeline
     )
 
-    thread = Thread(target=run_text_exercise_chat_pipeline_worker, args=(dto, variant))
-    thread.start()
+    submit_pipeline(
+        "text-exercise-chat", run_text_exercise_chat_pipeline_worker, dto, variant
+    )
 
 
 @router.post(
@@ -233,8 +256,7 @@ def run_text_exercise_chat_pipeline(dto: TextExerciseChatPipelineExecutionDTO):
 def run_lecture_chat_pipeline(dto: LectureChatPipelineExecutionDTO):
     variant = validate_pipeline_variant(dto.settings, LectureChatPipeline)
 
-    thread = Thread(target=run_lecture_chat_pipeline_worker, args=(dto, variant))
-    thread.start()
+    submit_pipeline("lecture-chat", run_lecture_chat_pipeline_worker, dto, variant)
 
 
 def run_competency_extraction_pipeline_worker(
@@ -271,10 +293,9 @@ def run_competency_extraction_pipeline(dto: CompetencyExtractionPipelineExecutio
         dto.execution.settings, CompetencyExtractionPipeline
     )
 
-    thread = Thread(
-        target=run_competency_extraction_pipeline_worker, args=(dto, variant)
+    submit_pipeline(
+        "competency-extraction", run_competency_extraction_pipeline_worker, dto, variant
     )
-    thread.start()
 
 
 def run_rewriting_pipeline_worker(dto: RewritingPipelineExecutionDTO, variant: str):
@@ -314,8 +335,7 @@ def run_rewriting_pipeline(dto: RewritingPipelineExecutionDTO):
     ).lower()
     logger.info("Rewriting pipeline started with variant: %s and dlo: %s", variant, dto)
 
-    thread = Thread(target=run_rewriting_pipeline_worker, args=(dto, variant))
-    thread.start()
+    submit_pipeline("rewriting", run_rewriting_pipeline_worker, dto, variant)
 
 
 def run_inconsistency_check_pipeline_worker(
@@ -349,8 +369,9 @@ def run_inconsistency_check_pipeline(dto: InconsistencyCheckPipelineExecutionDTO
         dto.execution.settings, InconsistencyCheckPipeline
     )
 
-    thread = Thread(target=run_inconsistency_check_pipeline_worker, args=(dto, variant))
-    thread.start()
+    submit_pipeline(
+        "inconsistency-check", run_inconsistency_check_pipeline_worker, dto, variant
+    )
 
 
 def run_communication_tutor_suggestions_pipeline_worker(
@@ -393,10 +414,12 @@ def run_communication_tutor_suggestions_pipeline(
 ):
     variant = validate_pipeline_variant(dto.settings, TutorSuggestionPipeline)
 
-    thread = Thread(
-        target=run_communication_tutor_suggestions_pipeline_worker, args=(dto, variant)
+    submit_pipeline(
+        "tutor-suggestion",
+        run_communication_tutor_suggestions_pipeline_worker,
+        dto,
+        variant,
     )
-    thread.start()
 
 
 def run_prompt_user_pipeline_worker(
@@ -446,12 +469,7 @@ def run_prompt_user_pipeline(
 ):
     variant = validate_pipeline_variant(dto.settings, PromptUserAgentPipeline)
 
-    prompt_user_executor.submit(
-        run_prompt_user_pipeline_worker,
-        dto,
-        variant,
-        event,
-    )
+    submit_pipeline("prompt-user", run_prompt_user_pipeline_worker, dto, variant, event)
 
 
 @router.get("/{feature}/variants")
@@ -1,7 +1,6 @@
 import traceback
 from asyncio.log import logger
 from multiprocessing import Process
-from threading import Semaphore, Thread
 
 from fastapi import APIRouter, Depends, status
 from sentry_sdk import capture_exception
@@ -18,10 +17,19 @@ from ...domain.ingestion.deletion_pipeline_execution_dto import (
     LecturesDeletionExecutionDto,
 )
 from ...ingestion.ingestion_job_handler import IngestionJobHandler
+from ...ingestion.ingestion_work_queue import IngestionPriority, IngestionWorkQueue
 from ...pipeline.delete_lecture_units_pipeline import LectureUnitDeletionPipeline
 from ...pipeline.faq_ingestion_pipeline import FaqIngestionPipeline
 from ...pipeline.lecture_ingestion_update_pipeline import LectureIngestionUpdatePipeline
-from ...vector_database.database import VectorDatabase
+from ...retrieval.retrieval_cache import RetrievalResultCache
+from ...vector_database.database import VectorDatabase, lecture_unit_key
+from ...vector_database.faq_schema import FaqSchema
+from ...vector_database.lecture_transcription_schema import LectureTranscriptionSchema
+from ...vector_database.lecture_unit_page_chunk_schema import (
+    LectureUnitPageChunkSchema,
+)
+from ...vector_database.lecture_unit_schema import LectureUnitSchema
+from ...vector_database.lecture_unit_segment_schema import LectureUnitSegmentSchema
 from ..status.faq_ingestion_status_callback import FaqIngestionStatus
 from ..status.lecture_deletion_status_callback import (
     LecturesDeletionStatusCallback,
@@ -29,19 +37,41 @@ from ..status.lecture_deletion_status_callback import (
 
 router = APIRouter(prefix="/api/v1/webhooks", tags=["webhooks"])
 
-semaphore = Semaphore(5)
-
 ingestion_job_handler = IngestionJobHandler()
 
+ingestion_queue = IngestionWorkQueue()
+
+# Collections written by lecture ingestion and deletion, cached search results on them become stale
+LECTURE_COLLECTIONS = (
+    LectureUnitSchema.COLLECTION_NAME.value,
+    LectureUnitPageChunkSchema.COLLECTION_NAME.value,
+    LectureTranscriptionSchema.COLLECTION_NAME.value,
+    LectureUnitSegmentSchema.COLLECTION_NAME.value,
+)
+
 
 def run_lecture_update_pipeline_worker(dto: IngestionPipelineExecutionDto):
     """
-    Run the lecture unit ingestion pipeline in a separate thread
+    Run the lecture unit ingestion pipeline in a separate process
     """
-    with semaphore:
-        lecture_ingestion_update_pipeline = LectureIngestionUpdatePipeline(dto)
-        lecture_ingestion_update_pipeline()
-        semaphore.release()
+    lecture_ingestion_update_pipeline = LectureIngestionUpdatePipeline(dto)
+    lecture_ingestion_update_pipeline()
+
+
+def run_lecture_update_pipeline_job(dto: IngestionPipelineExecutionDto):
+    """
+    Start the lecture unit ingestion process and occupy the queue worker until it has finished
+    """
+    process = Process(target=run_lecture_update_pipeline_worker, args=(dto,))
+    ingestion_job_handler.add_job(
+        process=process,
+        course_id=dto.lecture_unit.course_id,
+        lecture_id=dto.lecture_unit.lecture_id,
+        lecture_unit_id=dto.lecture_unit.lecture_unit_id,
+    )
+    process.join()
+    # The ingestion ran in its own process, so the search cache of this process is invalidated here
+    RetrievalResultCache().invalidate(*LECTURE_COLLECTIONS)
 
 
 def run_lecture_deletion_pipeline_worker(dto: LecturesDeletionExecutionDto):
@@ -66,56 +96,56 @@ def run_lecture_deletion_pipeline_worker(dto: LecturesDeletionExecutionDto):
     except Exception as e:
         logger.error("Error while deleting lectures: %s", e)
         logger.error(traceback.format_exc())
+    finally:
+        RetrievalResultCache().invalidate(*LECTURE_COLLECTIONS)
 
 
 def run_faq_update_pipeline_worker(dto: FaqIngestionPipelineExecutionDto):
     """
     Run the exercise chat pipeline in a separate thread
     """
-    with semaphore:
-        try:
-            callback = FaqIngestionStatus(
-                run_id=dto.settings.authentication_token,
-                base_url=dto.settings.artemis_base_url,
-                initial_stages=dto.initial_stages,
-                faq_id=dto.faq.faq_id,
-            )
-            db = VectorDatabase()
-            client = db.get_client()
-            pipeline = FaqIngestionPipeline(client=client, dto=dto, callback=callback)
-            pipeline()
-
-        except Exception as e:
-            logger.error("Error Faq Ingestion pipeline: %s", e)
-            logger.error(traceback.format_exc())
-            capture_exception(e)
-        finally:
-            semaphore.release()
+    try:
+        callback = FaqIngestionStatus(
+            run_id=dto.settings.authentication_token,
+            base_url=dto.settings.artemis_base_url,
+            initial_stages=dto.initial_stages,
+            faq_id=dto.faq.faq_id,
+        )
+        db = VectorDatabase()
+        client = db.get_client()
+        pipeline = FaqIngestionPipeline(client=client, dto=dto, callback=callback)
+        pipeline()
+
+    except Exception as e:
+        logger.error("Error Faq Ingestion pipeline: %s", e)
+        logger.error(traceback.format_exc())
+        capture_exception(e)
+    finally:
+        RetrievalResultCache().invalidate(FaqSchema.COLLECTION_NAME.value)
 
 
 def run_faq_delete_pipeline_worker(dto: FaqDeletionExecutionDto):
     """
     Run the faq deletion in a separate thread
     """
-    with semaphore:
-        try:
-            callback = FaqIngestionStatus(
-                run_id=dto.settings.authentication_token,
-                base_url=dto.settings.artemis_base_url,
-                initial_stages=dto.initial_stages,
-                faq_id=dto.faq.faq_id,
-            )
-            db = VectorDatabase()
-            client = db.get_client()
-            pipeline = FaqIngestionPipeline(client=client, dto=None, callback=callback)
-            pipeline.delete_faq(dto.faq.faq_id, dto.faq.course_id)
-
-        except Exception as e:
-            logger.error("Error Ingestion pipeline: %s", e)
-            logger.error(traceback.format_exc())
-            capture_exception(e)
-        finally:
-            semaphore.release()
+    try:
+        callback = FaqIngestionStatus(
+            run_id=dto.settings.authentication_token,
+            base_url=dto.settings.artemis_base_url,
+            initial_stages=dto.initial_stages,
+            faq_id=dto.faq.faq_id,
+        )
+        db = VectorDatabase()
+        client = db.get_client()
+        pipeline = FaqIngestionPipeline(client=client, dto=None, callback=callback)
+        pipeline.delete_faq(dto.faq.faq_id, dto.faq.course_id)
+
+    except Exception as e:
+        logger.error("Error Ingestion pipeline: %s", e)
+        logger.error(traceback.format_exc())
+        capture_exception(e)
+    finally:
+        RetrievalResultCache().invalidate(FaqSchema.COLLECTION_NAME.value)
 
 
 @router.post(
@@ -129,12 +159,11 @@ def lecture_ingestion_webhook(dto: IngestionPipelineExecutionDto):
     """
     validate_pipeline_variant(dto.settings, LectureIngestionUpdatePipeline)
 
-    process = Process(target=run_lecture_update_pipeline_worker, args=(dto,))
-    ingestion_job_handler.add_job(
-        process=process,
-        course_id=dto.lecture_unit.course_id,
-        lecture_id=dto.lecture_unit.lecture_id,
-        lecture_unit_id=dto.lecture_unit.lecture_unit_id,
+    ingestion_queue.submit(
+        IngestionPriority.LECTURE,
+        run_lecture_update_pipeline_job,
+        dto,
+        key=lecture_unit_key(dto.settings.artemis_base_url, dto.lecture_unit),
     )
 
 
@@ -149,8 +178,16 @@ def lecture_deletion_webhook(dto: LecturesDeletionExecutionDto):
     """
     validate_pipeline_variant(dto.settings, LectureUnitDeletionPipeline)
 
-    thread = Thread(target=run_lecture_deletion_pipeline_worker, args=(dto,))
-    thread.start()
+    # The deletion cancels pending ingestions of its units and runs after those already running
+    ingestion_queue.submit(
+        IngestionPriority.DELETION,
+        run_lecture_deletion_pipeline_worker,
+        dto,
+        supersedes=[
+            lecture_unit_key(dto.settings.artemis_base_url, lecture_unit)
+            for lecture_unit in dto.lecture_units
+        ],
+    )
 
 
 @router.post(
@@ -164,8 +201,12 @@ def faq_ingestion_webhook(dto: FaqIngestionPipelineExecutionDto):
     """
     validate_pipeline_variant(dto.settings, FaqIngestionPipeline)
 
-    thread = Thread(target=run_faq_update_pipeline_worker, args=(dto,))
-    thread.start()
+    ingestion_queue.submit(
+        IngestionPriority.FAQ,
+        run_faq_update_pipeline_worker,
+        dto,
+        key=("faq", dto.settings.artemis_base_url, dto.faq.course_id, dto.faq.faq_id),
+    )
     return
 
 
@@ -180,6 +221,10 @@ def faq_deletion_webhook(dto: FaqDeletionExecutionDto):
     """
     validate_pipeline_variant(dto.settings, FaqIngestionPipeline)
 
-    thread = Thread(target=run_faq_delete_pipeline_worker, args=(dto,))
-    thread.start()
+    ingestion_queue.submit(
+        IngestionPriority.FAQ,
+        run_faq_delete_pipeline_worker,
+        dto,
+        key=("faq", dto.settings.artemis_base_url, dto.faq.course_id, dto.faq.faq_id),
+    )
     return
@@ -0,0 +1,51 @@
+import os
+import threading
+import time
+
+from iris.web.status.status_update import StatusCallback
+
+# Seconds the deltas of a streamed answer are collected before they are sent as one status update
+STATUS_STREAM_INTERVAL = float(os.environ.get("STATUS_STREAM_INTERVAL", "0.1"))
+
+
+class ResultStream:
+    """
+    Forwards the answer of an LLM to the client while it is generated. The deltas are collected and sent as one
+    status update at most every interval seconds, and held back while earlier updates of the run wait to be sent,
+    so a slow Artemis receives fewer and larger updates instead of a growing backlog.
+    """
+
+    def __init__(
+        self, callback: StatusCallback, interval: float = STATUS_STREAM_INTERVAL
+    ):
+        self.callback = callback
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._buffer: list[str] = []
+        self._last_sent = 0.0
+        # Whether any part of the answer was sent
+        self.streamed = False
+
+    def __call__(self, delta: str):
+        with self._lock:
+            self._buffer.append(delta)
+            now = time.monotonic()
+            if (
+                now - self._last_sent >= self.interval
+                and not self.callback.dispatcher.pending
+            ):
+                self._send(now)
+
+    def flush(self):
+        """Send the deltas that are still collected, e.g. once the answer is complete."""
+        with self._lock:
+            self._send(time.monotonic())
+
+    def _send(self, now: float):
+        if not self._buffer:
+            return
+        delta = "".join(self._buffer)
+        self._buffer.clear()
+        self._last_sent = now
+        self.streamed = True
+        self.callback.stream(delta)
@@ -0,0 +1,129 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from sentry_sdk import capture_exception
+
+logger = logging.getLogger(__name__)
+
+# Attempts per status update, retried on connection errors, timeouts and server errors
+STATUS_UPDATE_MAX_ATTEMPTS = int(os.environ.get("STATUS_UPDATE_MAX_ATTEMPTS", "3"))
+STATUS_UPDATE_RETRY_BACKOFF = 0.5
+STATUS_UPDATE_TIMEOUT = 200
+
+# Shared by all runs, so status updates to the same Artemis instance reuse connections
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+
+class _Update:
+    def __init__(self, payload: dict, states: tuple, intermediate: bool):
+        self.payload = payload
+        self.states = states
+        self.intermediate = intermediate
+
+
+class StatusUpdateDispatcher:
+    """
+    Sends the status updates of one run in the background, in the order they were submitted.
+
+    An update that only changes the message of the current stage is intermediate: while it waits to be sent, a newer
+    intermediate update replaces it. Updates that change a stage state or are final (a result, done, error, skip) are
+    never dropped. The worker thread only lives while updates are pending and is not a daemon, so pending updates
+    are delivered before the process exits.
+    """
+
+    def __init__(self, url: str, run_id: str):
+        self.url = url
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending: deque[_Update] = deque()
+        self._worker: Optional[threading.Thread] = None
+        self._last_states: Optional[tuple] = None
+        self.sent = 0
+        self.coalesced = 0
+
+    def submit(self, payload: dict, states: tuple, final: bool):
+        """
+        Queue a snapshot of the status. states are the stage states of the snapshot, used to detect intermediate
+        updates. final updates are never replaced.
+        """
+        with self._lock:
+            update = _Update(payload, states, states == self._last_states and not final)
+            self._last_states = states
+            if update.intermediate and self._pending and self._pending[-1].intermediate:
+                self._pending[-1] = update
+                self.coalesced += 1
+            else:
+                self._pending.append(update)
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name=f"status-{self.run_id[:8]}"
+                )
+                self._worker.start()
+
+    @property
+    def pending(self) -> int:
+        """Number of updates waiting to be sent."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all submitted updates are sent. Returns False if the timeout expired first."""
+        with self._lock:
+            return self._idle.wait_for(
+                lambda: not self._pending and self._worker is None, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    self._idle.notify_all()
+                    if self.coalesced:
+                        logger.debug(
+                            "Sent %d status updates for run %s, %d coalesced",
+                            self.sent,
+                            self.run_id,
+                            self.coalesced,
+                        )
+                    return
+                update = self._pending.popleft()
+            self._send(update.payload)
+
+    def _send(self, payload: dict):
+        for attempt in range(1, STATUS_UPDATE_MAX_ATTEMPTS + 1):
+            try:
+                _session.post(
+                    self.url,
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {self.run_id}",
+                    },
+                    json=payload,
+                    timeout=STATUS_UPDATE_TIMEOUT,
+                ).raise_for_status()
+                self.sent += 1
+                return
+            except requests.exceptions.RequestException as e:
+                response = getattr(e, "response", None)
+                retryable = response is None or response.status_code >= 500
+                if not retryable or attempt == STATUS_UPDATE_MAX_ATTEMPTS:
+                    logger.error("Error sending status update: %s", e)
+                    capture_exception(e)
+                    return
+                logger.warning(
+                    "Error sending status update (attempt %d/%d): %s",
+                    attempt,
+                    STATUS_UPDATE_MAX_ATTEMPTS,
+                    e,
+                )
+                time.sleep(STATUS_UPDATE_RETRY_BACKOFF * 2 ** (attempt - 1))
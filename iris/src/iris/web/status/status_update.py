@@ -2,10 +2,6 @@ import logging
 from abc import ABC
 from typing import List, Optional
 
-import requests
-
-from iris.domain.chat.prompt_user_chat.prompt_user_chat_status_update_dto import PromptUserChatStatusUpdateDTO
-from iris.domain.data.verdict_dto import VerdictDTO
 from memiris import Memory
 from memiris.api.memory_dto import MemoryDTO
 from sentry_sdk import capture_exception, capture_message
@@ -17,9 +13,13 @@ from iris.domain.chat.course_chat.course_chat_status_update_dto import (
 from iris.domain.chat.exercise_chat.exercise_chat_status_update_dto import (
     ExerciseChatStatusUpdateDTO,
 )
+from iris.domain.chat.prompt_user_chat.prompt_user_chat_status_update_dto import (
+    PromptUserChatStatusUpdateDTO,
+)
 from iris.domain.communication.communication_tutor_suggestion_status_update_dto import (
     TutorSuggestionStatusUpdateDTO,
 )
+from iris.domain.data.verdict_dto import VerdictDTO
 from iris.domain.status.competency_extraction_status_update_dto import (
     CompetencyExtractionStatusUpdateDTO,
 )
@@ -38,6 +38,7 @@ from iris.domain.status.status_update_dto import StatusUpdateDTO
 from iris.domain.status.text_exercise_chat_status_update_dto import (
     TextExerciseChatStatusUpdateDTO,
 )
+from iris.web.status.status_dispatcher import StatusUpdateDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,8 @@ class StatusCallback(ABC):
     current_stage_index: Optional[int]
 
     api_url: str = "api/iris/public/pyris/pipelines"
+    # Set while done, error or skip send their update, which is never replaced by a later one
+    _final_update: bool = False
 
     def __init__(
         self,
@@ -68,22 +71,35 @@ class StatusCallback(ABC):
         self.status = status
         self.stage = stage
         self.current_stage_index = current_stage_index
+        self.dispatcher = StatusUpdateDispatcher(url, run_id)
 
     def on_status_update(self):
-        """Send a status update to the Artemis API."""
+        """
+        Send a status update to the Artemis API.
+        The update is sent in the background, so slow responses from Artemis do not block the pipeline.
+        """
+        self.dispatcher.submit(
+            self.status.model_dump(by_alias=True),
+            tuple(stage.state for stage in self.status.stages),
+            self._final_update
+            or getattr(self.status, "result", None) is not None
+            or getattr(self.status, "result_delta", None) is not None,
+        )
+
+    def _on_final_status_update(self):
+        """
+        Send the update of done, error or skip. Unlike an update that only changes the message, it is kept even if
+        the stage states did not change, so the suggestions, memories or tokens it carries are not lost.
+        """
+        self._final_update = True
         try:
-            requests.post(
-                self.url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.run_id}",
-                },
-                json=self.status.model_dump(by_alias=True),
-                timeout=200,
-            ).raise_for_status()
-        except requests.exceptions.RequestException as e:
-            logger.error("Error sending status update: %s", e)
-            capture_exception(e)
+            self.on_status_update()
+        finally:
+            self._final_update = False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all status updates of this run are sent."""
+        return self.dispatcher.flush(timeout)
 
     def get_next_stage(self):
         """Return the next stage in the status, or None if there are no more stages."""
@@ -98,19 +114,29 @@ class StatusCallback(ABC):
         return self.status.stages[self.current_stage_index]
 
     def in_progress(self, message: Optional[str] = None):
-        """Transition the current stage to IN_PROGRESS and update the status."""
+        """
+        Transition the current stage to IN_PROGRESS and update the status.
+        """
         if self.stage.state == StageStateEnum.NOT_STARTED:
             self.stage.state = StageStateEnum.IN_PROGRESS
-            self.stage.message = message
-            self.on_status_update()
-        elif self.stage.state == StageStateEnum.IN_PROGRESS:
-            self.stage.message = message
-            self.on_status_update()
-        else:
+        elif self.stage.state != StageStateEnum.IN_PROGRESS:
             raise ValueError(
                 "Invalid state transition to in_progress. current state is ",
                 self.stage.state,
             )
+        self.stage.message = message
+        self.on_status_update()
+
+    def stream(self, delta: str):
+        """
+        Send the next part of the answer while it is generated. The deltas are appended by the client, the result of
+        the following done replaces them.
+        """
+        if self.stage.state == StageStateEnum.NOT_STARTED:
+            self.stage.state = StageStateEnum.IN_PROGRESS
+        self.status.result_delta = delta
+        self.on_status_update()
+        self.status.result_delta = None
 
     def done(
         self,
@@ -167,7 +193,7 @@ class StatusCallback(ABC):
             if start_next_stage:
                 self.stage.state = StageStateEnum.IN_PROGRESS
 
-        self.on_status_update()
+        self._on_final_status_update()
 
         self.status.result = None
         if hasattr(self.status, "suggestions"):
@@ -209,7 +235,7 @@ class StatusCallback(ABC):
 
         # Update the status after setting the stages to SKIPPED
         self.stage = self.status.stages[-1]
-        self.on_status_update()
+        self._on_final_status_update()
         logger.error(
             "Error occurred in job %s in stage %s: %s",
             self.run_id,
@@ -240,7 +266,7 @@ class StatusCallback(ABC):
             self.stage = next_stage
             if start_next_stage:
                 self.stage.state = StageStateEnum.IN_PROGRESS
-        self.on_status_update()
+        self._on_final_status_update()
 
 
 class CourseChatStatusCallback(StatusCallback):
@@ -483,11 +509,13 @@ class PromptUserStatusCallback(StatusCallback):
     """Status callback for prompt user pipeline."""
 
     def __init__(
-            self, run_id: str, base_url: str, initial_stages: List[StageDTO] = None, event: str | None = None
+        self,
+        run_id: str,
+        base_url: str,
+        initial_stages: List[StageDTO] = None,
+        event: str | None = None,
     ):
-        url = (
-            f"{base_url}/{self.api_url}/prompt-user/runs/{run_id}/status"
-        )
+        url = f"{base_url}/{self.api_url}/prompt-user/runs/{run_id}/status"
         current_stage_index = len(initial_stages) if initial_stages else 0
         stages = initial_stages or []
         stages += [
@@ -499,4 +527,4 @@ class PromptUserStatusCallback(StatusCallback):
         ]
         status = PromptUserChatStatusUpdateDTO(stages=stages, event=event)
         stage = stages[current_stage_index]
-        super().__init__(url, run_id, status, stage, current_stage_index)
\ No newline at end of file
+        super().__init__(url, run_id, status, stage, current_stage_index)
@@ -0,0 +1,222 @@
+"""
+Time-to-first-token of the chat answers: a local OpenAI compatible server generates an answer token by token and a
+local Artemis records when the first text of the answer arrives in a status update. Runs the LangChain adapter with
+the status callback of the exercise, course and lecture chat, once without streaming (the former behavior, the
+answer arrives with the final result) and once streamed through a ResultStream:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/answer_streaming_benchmark.py --latency 0.4 --tokens 300 --token-time 0.01
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.messages import HumanMessage
+from openai import OpenAI
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.llm import CompletionArguments
+from iris.llm.external.openai_chat import DirectOpenAIChatModel
+from iris.llm.langchain import IrisLangchainChatModel
+from iris.llm.request_handler.request_handler_interface import RequestHandler
+from iris.web.status.result_stream import ResultStream
+from iris.web.status.status_update import (
+    CourseChatStatusCallback,
+    ExerciseChatStatusCallback,
+    LectureChatCallback,
+)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler, **settings):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.__dict__.update(settings)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # noqa: N802
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        tokens = [f"token{i} " for i in range(self.server.tokens)]
+        usage = {
+            "prompt_tokens": 100,
+            "completion_tokens": len(tokens),
+            "total_tokens": 100 + len(tokens),
+        }
+        time.sleep(self.server.latency)
+        if not request.get("stream"):
+            time.sleep(self.server.token_time * len(tokens))
+            self.send_json(
+                {
+                    "id": "chatcmpl",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "benchmark",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {
+                                "role": "assistant",
+                                "content": "".join(tokens),
+                            },
+                        }
+                    ],
+                    "usage": usage,
+                }
+            )
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for index, token in enumerate(tokens):
+            finish_reason = "stop" if index == len(tokens) - 1 else None
+            self.send_event(
+                [
+                    {
+                        "index": 0,
+                        "delta": {"content": token},
+                        "finish_reason": finish_reason,
+                    }
+                ]
+            )
+            time.sleep(self.server.token_time)
+        self.send_event([], usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def send_json(self, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_event(self, choices: list, usage=None):
+        chunk = {
+            "id": "chatcmpl",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "benchmark",
+            "choices": choices,
+            "usage": usage,
+        }
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class MockArtemisHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        now = time.perf_counter()
+        if body.get("resultDelta") or body.get("result"):
+            self.server.first_text = self.server.first_text or now
+        self.server.updates += 1
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class DirectRequestHandler(RequestHandler):
+    model: DirectOpenAIChatModel
+
+    def complete(self, prompt, arguments, image=None):
+        raise NotImplementedError
+
+    def chat(self, messages, arguments, tools):
+        return self.model.chat(messages, arguments, tools)
+
+    def stream_chat(self, messages, arguments, tools, on_delta):
+        return self.model.stream_chat(messages, arguments, tools, on_delta)
+
+    def embed(self, text):
+        raise NotImplementedError
+
+    def bind_tools(self, tools):
+        raise NotImplementedError
+
+
+def run(openai_url: str, artemis: MockServer, create_callback, streamed: bool):
+    model = DirectOpenAIChatModel(
+        id="benchmark",
+        name="Benchmark",
+        description="Benchmark",
+        model="benchmark",
+        type="openai_chat",
+        api_key="benchmark",
+    )
+    model._client = OpenAI(  # pylint: disable=protected-access
+        api_key="benchmark", base_url=f"{openai_url}/v1"
+    )
+    callback = create_callback(artemis.base_url)
+    result_stream = ResultStream(callback) if streamed else None
+    llm = IrisLangchainChatModel(
+        request_handler=DirectRequestHandler(model=model),
+        completion_args=CompletionArguments(),
+        on_delta=result_stream,
+    )
+    artemis.first_text = None
+    artemis.updates = 0
+
+    start = time.perf_counter()
+    answer = llm.invoke([HumanMessage(content="Explain recursion")]).content
+    if result_stream:
+        result_stream.flush()
+    callback.done("Done", final_result=answer, tokens=[llm.tokens])
+    callback.flush()
+    return (
+        artemis.first_text - start,
+        time.perf_counter() - start,
+        artemis.updates,
+        llm.tokens,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.4)
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--token-time", type=float, default=0.01)
+    args = parser.parse_args()
+    openai_server = MockServer(
+        MockOpenAIHandler,
+        latency=args.latency,
+        tokens=args.tokens,
+        token_time=args.token_time,
+    )
+    artemis_server = MockServer(MockArtemisHandler, first_text=None, updates=0)
+    callbacks = {
+        "exercise chat": lambda url: ExerciseChatStatusCallback("run", url, []),
+        "course chat": lambda url: CourseChatStatusCallback("run", url, []),
+        "lecture chat": lambda url: LectureChatCallback("run", url, []),
+    }
+    print(
+        f"{args.latency}s until the first token, {args.tokens} tokens at {args.token_time}s each"
+    )
+    for name, create_callback in callbacks.items():
+        for streamed in (False, True):
+            first, total, updates, tokens = run(
+                openai_server.base_url, artemis_server, create_callback, streamed
+            )
+            print(
+                f"  {name:14} {'streamed' if streamed else 'blocking':9} first text after {first:5.2f} s  "
+                f"answer complete after {total:5.2f} s  {updates:3} status updates  "
+                f"{tokens.num_input_tokens}/{tokens.num_output_tokens} tokens"
+            )
@@ -0,0 +1,117 @@
+"""
+Time-to-first-answer of the course chat after the agent finished: runs CourseChatPipeline.post_agent_hook with
+stubbed citation and suggestion pipelines that take as long as the LLM calls they replace, and reports when the
+client first receives the answer and when the final answer with citations and suggestions arrives.
+
+The former behavior (both citation passes and the suggestions one after another, then a single done) is run with
+the same stubs for comparison:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/course_chat_post_agent_benchmark.py --citation 1.5 --suggestions 1.0
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.pipeline.chat import course_chat_pipeline
+from iris.pipeline.chat.course_chat_pipeline import CourseChatPipeline
+from iris.web.status.status_update import CourseChatStatusCallback
+
+
+class TimingCallback(CourseChatStatusCallback):
+    def __init__(self):
+        super().__init__(run_id="run", base_url="http://artemis")
+        self.start = time.perf_counter()
+        self.first_answer = None
+        self.final_answer = None
+
+    def on_status_update(self):
+        if self.status.result is None and self.status.result_delta is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        if self.first_answer is None:
+            self.first_answer = elapsed
+        if self.status.suggestions:
+            self.final_answer = elapsed
+
+
+class SlowCitationPipeline:
+    def __init__(self, duration: float):
+        self.duration = duration
+        self.tokens = []
+
+    def __call__(self, information, answer, information_type, **kwargs):
+        time.sleep(self.duration)
+        return f"{answer} [{information_type.value}]"
+
+
+class SlowSuggestionPipeline:
+    def __init__(self, duration: float):
+        self.duration = duration
+        self.tokens = None
+
+    def __call__(self, dto):
+        time.sleep(self.duration)
+        return ["What else?"]
+
+
+def create_pipeline_and_state(args):
+    pipeline = object.__new__(CourseChatPipeline)
+    pipeline.citation_pipeline = SlowCitationPipeline(args.citation)
+    pipeline.suggestion_pipeline = SlowSuggestionPipeline(args.suggestions)
+    callback = TimingCallback()
+    callback.in_progress("Thinking ...")
+    state = SimpleNamespace(
+        result="The answer",
+        callback=callback,
+        tokens=[],
+        dto=SimpleNamespace(chat_history=[], settings=None),
+        variant=SimpleNamespace(id="default"),
+        lecture_content_storage={"content": "lectures"},
+        faq_storage={"faqs": ["faq"]},
+    )
+    return pipeline, state
+
+
+def serial(args):
+    pipeline, state = create_pipeline_and_state(args)
+    state.result = pipeline._process_citations(  # pylint: disable=protected-access
+        state,
+        state.result,
+        state.lecture_content_storage,
+        state.faq_storage,
+        state.dto,
+        state.variant,
+    )
+    suggestions = pipeline._generate_suggestions(  # pylint: disable=protected-access
+        state, state.result, state.dto
+    )
+    state.callback.done(
+        "Response created", final_result=state.result, suggestions=suggestions
+    )
+    return state.callback
+
+
+def concurrent(args):
+    course_chat_pipeline.COURSE_CHAT_PROVISIONAL_ANSWER = True
+    pipeline, state = create_pipeline_and_state(args)
+    pipeline.post_agent_hook(state)
+    return state.callback
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--citation", type=float, default=1.5)
+    parser.add_argument("--suggestions", type=float, default=1.0)
+    args = parser.parse_args()
+    print(
+        f"{args.citation}s per citation pass (lectures and FAQs), {args.suggestions}s for the suggestions"
+    )
+    for name, run in [("serial", serial), ("provisional answer", concurrent)]:
+        callback = run(args)
+        print(
+            f"  {name:20} first answer after {callback.first_answer:5.2f} s  "
+            f"final answer after {callback.final_answer:5.2f} s"
+        )
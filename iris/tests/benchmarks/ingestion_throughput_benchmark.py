@@ -0,0 +1,92 @@
+"""
+Throughput of concurrent ingestion jobs for several courses, and how long an FAQ update waits behind them.
+
+Every simulated job embeds its chunks (sleeping for the embedding latency) and then writes them to the vector database
+(sleeping for the write latency). Compares the former setup (one process-wide lock around embedding and writing)
+with per-lecture-unit locks around the write only, both run through the IngestionWorkQueue:
+
+    poetry run python tests/benchmarks/ingestion_throughput_benchmark.py --courses 4 --units 5
+"""
+
+import argparse
+import threading
+import time
+
+from iris.common.keyed_lock import KeyedLock
+from iris.ingestion.ingestion_work_queue import IngestionPriority, IngestionWorkQueue
+
+
+def global_lock_job(lock: threading.Lock, embed: float, write: float):
+    def job(course_id: int, unit_id: int):
+        with lock:
+            time.sleep(embed)
+            time.sleep(write)
+
+    return job
+
+
+def keyed_lock_job(lock: KeyedLock, embed: float, write: float):
+    def job(course_id: int, unit_id: int):
+        time.sleep(embed)
+        with lock("lecture_unit", course_id, unit_id):
+            time.sleep(write)
+
+    return job
+
+
+def measure(name: str, job, args, workers: int):
+    work_queue = IngestionWorkQueue(workers=workers, name=name)
+    start = time.perf_counter()
+    for course_id in range(args.courses):
+        for unit_id in range(args.units):
+            work_queue.submit(
+                IngestionPriority.LECTURE,
+                job,
+                course_id,
+                unit_id,
+                key=(course_id, unit_id),
+            )
+    # An FAQ update arriving while the bulk re-ingestion is queued
+    faq_done = threading.Event()
+    faq_submitted = time.perf_counter()
+
+    def faq_job():
+        job("faq", 0)
+        faq_done.set()
+
+    work_queue.submit(IngestionPriority.FAQ, faq_job)
+    faq_done.wait()
+    faq_wait = time.perf_counter() - faq_submitted
+    work_queue.join()
+    elapsed = time.perf_counter() - start
+    jobs = args.courses * args.units
+    print(
+        f"  {name:<38} {elapsed:6.2f} s  {jobs / elapsed:6.2f} units/s  "
+        f"faq waited {faq_wait:5.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--courses", type=int, default=4)
+    parser.add_argument("--units", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--embed", type=float, default=0.3)
+    parser.add_argument("--write", type=float, default=0.05)
+    args = parser.parse_args()
+    print(
+        f"{args.courses} courses x {args.units} lecture units, {args.workers} workers, "
+        f"{args.embed}s embedding + {args.write}s write per unit"
+    )
+    measure(
+        "global lock around embed and write",
+        global_lock_job(threading.Lock(), args.embed, args.write),
+        args,
+        args.workers,
+    )
+    measure(
+        "per-unit lock around write",
+        keyed_lock_job(KeyedLock(), args.embed, args.write),
+        args,
+        args.workers,
+    )
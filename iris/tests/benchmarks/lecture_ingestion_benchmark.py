@@ -0,0 +1,128 @@
+"""
+Wall time of chunking and interpreting a lecture PDF in LectureUnitPageIngestionPipeline.chunk_data.
+
+Builds a synthetic PDF with text and an image on every page and replaces the LLM with a stub that sleeps for a fixed
+latency, so the numbers show the effect of rendering in worker processes and overlapping the LLM requests:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/lecture_ingestion_benchmark.py --pages 40 --latency 2
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import fitz
+from pydantic import PrivateAttr
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.pyris_message import IrisMessageRole, PyrisMessage
+from iris.common.token_usage_dto import TokenUsageDTO
+from iris.domain.data.lecture_unit_page_dto import LectureUnitPageDTO
+from iris.domain.data.text_message_content_dto import TextMessageContentDTO
+from iris.llm import CompletionArguments, RequestHandler
+from iris.llm.langchain import IrisLangchainChatModel
+from iris.pipeline import lecture_ingestion_pipeline
+from iris.pipeline.lecture_ingestion_pipeline import LectureUnitPageIngestionPipeline
+
+
+class StubRequestHandler(RequestHandler):
+    """Answers every chat request after a fixed latency and records the peak number of requests in flight."""
+
+    latency: float
+    in_flight: int = 0
+    peak: int = 0
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, latency: float):
+        super().__init__(latency=latency)
+
+    def chat(self, messages, arguments, tools=None) -> PyrisMessage:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        return PyrisMessage(
+            sender=IrisMessageRole.ASSISTANT,
+            contents=[TextMessageContentDTO(text_content="English")],
+            token_usage=TokenUsageDTO(numInputTokens=100, numOutputTokens=20),
+        )
+
+    def complete(self, prompt, arguments, image=None) -> str:
+        raise NotImplementedError
+
+    def embed(self, text: str) -> list[float]:
+        raise NotImplementedError
+
+    def bind_tools(self, tools):
+        raise NotImplementedError
+
+
+class StubCallback:
+    def in_progress(self, message=None, **_kwargs):
+        print(f"    {message}")
+
+
+def synthetic_pdf(path: str, pages: int):
+    image = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+    image.clear_with(128)
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Slide {page_num}: " + "lecture content " * 20)
+        page.insert_image(fitz.Rect(72, 200, 400, 500), pixmap=image)
+    doc.save(path)
+
+
+def pipeline_with(handler: StubRequestHandler) -> LectureUnitPageIngestionPipeline:
+    pipeline = LectureUnitPageIngestionPipeline.__new__(
+        LectureUnitPageIngestionPipeline
+    )
+    pipeline.llm_chat = handler
+    pipeline.llm = IrisLangchainChatModel(
+        request_handler=handler, completion_args=CompletionArguments()
+    )
+    pipeline.callback = StubCallback()
+    pipeline.tokens = []
+    pipeline.course_language = None
+    return pipeline
+
+
+def measure(name: str, pdf_path: str, latency: float, concurrency: int, processes: int):
+    lecture_ingestion_pipeline.INGESTION_LLM_CONCURRENCY = concurrency
+    lecture_ingestion_pipeline.INGESTION_RENDER_PROCESSES = processes
+    handler = StubRequestHandler(latency)
+    pipeline = pipeline_with(handler)
+    lecture_unit = LectureUnitPageDTO(
+        courseId=1, lectureId=1, lectureUnitId=1, lectureName="Benchmark"
+    )
+    start = time.perf_counter()
+    chunks = pipeline.chunk_data(pdf_path, lecture_unit, "https://artemis.example")
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:<34} {elapsed:7.2f} s  {len(chunks)} chunks  "
+        f"{len(pipeline.tokens)} LLM calls  peak {handler.peak} in flight"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=2.0)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "lecture.pdf")
+        synthetic_pdf(pdf, args.pages)
+        print(f"{args.pages} pages with images, {args.latency}s per LLM request")
+        measure("sequential (1 process, 1 request)", pdf, args.latency, 1, 1)
+        measure(
+            "concurrent (defaults)",
+            pdf,
+            args.latency,
+            int(os.environ.get("INGESTION_LLM_CONCURRENCY", "8")),
+            min(4, os.cpu_count() or 1),
+        )
@@ -0,0 +1,135 @@
+"""
+Latency and peak memory of a lecture ingestion request with a large base64 encoded PDF, once with the former
+middleware that buffered and logged the full request and response bodies and once with RequestLoggingMiddleware:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/logging_middleware_benchmark.py --megabytes 50
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import logging
+import os
+import time
+import tracemalloc
+
+from fastapi import FastAPI, Request
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.web.logging_middleware import RequestLoggingMiddleware
+
+
+def log_info(req_body, res_body):
+    logging.info(req_body)
+    logging.info(res_body)
+
+
+def create_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/v1/webhooks/lectures/fullIngestion", status_code=202)
+    async def ingestion(request: Request):
+        await request.body()
+        return {"accepted": True}
+
+    if middleware == "buffering":
+
+        @app.middleware("http")
+        async def some_middleware(request: Request, call_next):
+            req_body = await request.body()
+            response = await call_next(request)
+
+            res_body = b""
+            async for chunk in response.body_iterator:
+                res_body += chunk
+
+            task = BackgroundTask(log_info, req_body, res_body)
+            return Response(
+                content=res_body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                media_type=response.media_type,
+                background=task,
+            )
+
+    else:
+        app.add_middleware(RequestLoggingMiddleware, sample_rate=1.0)
+    return app
+
+
+async def post(app: FastAPI, body: bytes, chunk_size: int):
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/webhooks/lectures/fullIngestion",
+        "raw_path": b"/api/v1/webhooks/lectures/fullIngestion",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        if chunks:
+            return {
+                "type": "http.request",
+                "body": chunks.pop(0),
+                "more_body": bool(chunks),
+            }
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    del body
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+
+def measure(name: str, body: bytes, args):
+    app = create_app(name)
+    log = io.StringIO()
+    handler = logging.StreamHandler(log)
+    logging.getLogger().addHandler(handler)
+    tracemalloc.start()
+    start = time.perf_counter()
+    status = asyncio.run(post(app, body, args.chunk_kb * 1024))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logging.getLogger().removeHandler(handler)
+    print(
+        f"  {name:<10} {status}  {elapsed * 1000:8.1f} ms  peak {peak / 2**20:7.1f} MB  "
+        f"logged {len(log.getvalue()) / 2**20:7.2f} MB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--megabytes", type=int, default=50)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.INFO)
+    pdf = base64.b64encode(os.urandom(args.megabytes * 2**20 * 3 // 4)).decode()
+    body = json.dumps(
+        {"pyrisLectureUnit": {"lectureUnitName": "Intro", "pdfFile": pdf}}
+    ).encode()
+    del pdf
+    print(f"Ingestion request with {len(body) / 2**20:.0f} MB body")
+    measure("buffering", body, args)
+    measure("streaming", body, args)
@@ -0,0 +1,185 @@
+"""
+Per-call overhead of OpenAIChatModel.chat against a local OpenAI compatible server over TLS, once with a new client
+per call (the former behavior, closed after each call) and once with the long-lived client of the model:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/openai_client_benchmark.py --calls 200 --threads 8
+
+Requires the openssl command line tool to create a self-signed certificate.
+"""
+
+import argparse
+import json
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+from openai import OpenAI
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.pyris_message import IrisMessageRole, PyrisMessage
+from iris.domain.data.text_message_content_dto import TextMessageContentDTO
+from iris.llm import CompletionArguments
+from iris.llm.external.openai_chat import DirectOpenAIChatModel
+
+COMPLETION = json.dumps(
+    {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "benchmark",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "Hello!"},
+            }
+        ],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+    }
+).encode()
+
+
+class MockOpenAI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, certificate: Path, key: Path):
+        super().__init__(("127.0.0.1", 0), MockOpenAIHandler)
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(certificate, key)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.connections = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"https://localhost:{self.server_address[1]}/v1"
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalChatModel(DirectOpenAIChatModel):
+    base_url: str
+    certificate: str
+
+    def get_client(self) -> OpenAI:
+        return OpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=httpx.Client(verify=self.certificate),
+        )
+
+
+class ClientPerCallChatModel(LocalChatModel):
+    """The former behavior: a new client for every call, closed afterwards."""
+
+    def chat(self, messages, arguments, tools):
+        client = self.get_client()
+        self._client = client
+        try:
+            return super().chat(messages, arguments, tools)
+        finally:
+            client.close()
+
+
+def create_certificate(directory: Path):
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost",
+            "-keyout",
+            str(directory / "key.pem"),
+            "-out",
+            str(directory / "cert.pem"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return directory / "cert.pem", directory / "key.pem"
+
+
+def measure(name: str, model_class, certificate: Path, key: Path, args):
+    server = MockOpenAI(certificate, key)
+    model = model_class(
+        id="benchmark",
+        name="Benchmark",
+        description="Benchmark",
+        model="benchmark",
+        type="openai_chat",
+        api_key="benchmark",
+        base_url=server.base_url,
+        certificate=str(certificate),
+    )
+    messages = [
+        PyrisMessage(
+            sender=IrisMessageRole.USER,
+            contents=[TextMessageContentDTO(textContent="Hi")],
+            sendAt=datetime.now(),
+        )
+    ]
+
+    def call(_):
+        model.chat(messages, CompletionArguments(), None)
+
+    start = time.perf_counter()
+    for i in range(args.calls):
+        call(i)
+    sequential = time.perf_counter() - start
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(call, range(args.calls)))
+    concurrent = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+    print(
+        f"  {name:<16} sequential {sequential / args.calls * 1000:6.2f} ms/call  "
+        f"{args.threads} threads {concurrent / args.calls * 1000:6.2f} ms/call  "
+        f"{server.connections} TLS connections"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        certificate, key = create_certificate(Path(directory))
+        print(f"{args.calls} chat calls sequentially and from {args.threads} threads")
+        measure("client per call", ClientPerCallChatModel, certificate, key, args)
+        measure("shared client", LocalChatModel, certificate, key, args)
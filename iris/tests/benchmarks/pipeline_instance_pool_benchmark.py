@@ -0,0 +1,71 @@
+"""
+Per-request setup cost of the course and exercise chat pipelines. The former behavior builds a new pipeline with its
+sub-pipelines, request handlers and prompt templates for every request, the pool hands out a pipeline that a previous
+request released. The first construction in the process is reported separately as the cold start, it also loads the
+LLM configuration and the modules the pipelines use on first construction.
+
+The benchmark writes its own LLM configuration with placeholder keys, requests are not sent:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/pipeline_instance_pool_benchmark.py --requests 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.pipeline.chat.course_chat_pipeline import CourseChatPipeline
+from iris.pipeline.chat.exercise_chat_agent_pipeline import ExerciseChatAgentPipeline
+from iris.pipeline.pipeline_instance_pool import PipelineInstancePool
+
+# Every model the chat pipelines select, the example configuration has no API keys
+LLM_CONFIG = """
+- {type: openai_chat, id: mini, name: Mini, description: Mini, model: gpt-4.1-mini, api_key: key}
+- {type: openai_chat, id: large, name: Large, description: Large, model: gpt-4.1, api_key: key}
+- {type: openai_chat, id: nano, name: Nano, description: Nano, model: gpt-4.1-nano, api_key: key}
+- {type: openai_embedding, id: embedding, name: Embedding, description: Embedding, model: text-embedding-3-small,
+   api_key: key}
+"""
+
+
+def measure(setup, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        setup()
+    return (time.perf_counter() - start) / requests
+
+
+def pooled(pool: PipelineInstancePool, pipeline_class):
+    def setup():
+        pool.release(pool.take(pipeline_class))
+
+    return setup
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    with tempfile.NamedTemporaryFile("w", suffix=".yml", delete=False) as config:
+        config.write(LLM_CONFIG)
+    os.environ["LLM_CONFIG_PATH"] = config.name
+    print(f"{args.requests} requests per pipeline")
+
+    for pipeline_class in (CourseChatPipeline, ExerciseChatAgentPipeline):
+        start = time.perf_counter()
+        pipeline_class()
+        cold = time.perf_counter() - start
+        former = measure(pipeline_class, args.requests)
+
+        pool = PipelineInstancePool()
+        pool.prewarm(pipeline_class)
+        warm = measure(pooled(pool, pipeline_class), args.requests)
+        stats = pool.stats()[pipeline_class.__name__]
+        print(
+            f"  {pipeline_class.__name__:26} cold start {cold * 1000:7.2f} ms  "
+            f"former per request {former * 1000:6.2f} ms  pooled per request {warm * 1000:6.3f} ms  "
+            f"saved {(former - warm) * 1000:6.2f} ms  built {stats['created']}"
+        )
@@ -0,0 +1,127 @@
+"""
+Load test of the pipeline endpoints: fires a burst of requests at /api/v1/pipelines/rewriting/run with a stubbed
+pipeline and reports how many runs were accepted or rejected, the queue times and the peak number of threads.
+
+The former behavior (one thread per request) is simulated with the same stub for comparison:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/pipeline_load_test.py --requests 1000 --duration 0.2
+"""
+
+import argparse
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.web import pipeline_executor as executor_module
+from iris.web.routers import pipelines
+
+BODY = {
+    "execution": {
+        "settings": {"authenticationToken": "run", "artemisBaseUrl": "http://artemis"}
+    },
+    "courseId": 1,
+    "toBeRewritten": "Some text",
+}
+
+
+class ThreadPeak:
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def _watch(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        return self.peak
+
+
+def stub_pipeline(duration: float):
+    def run(_dto, _variant):
+        time.sleep(duration)
+
+    return run
+
+
+def thread_per_request(args):
+    peak = ThreadPeak()
+    start = time.perf_counter()
+    threads = []
+    for _ in range(args.requests):
+        thread = threading.Thread(
+            target=stub_pipeline(args.duration), args=(None, None)
+        )
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    print(
+        f"  thread per request   {time.perf_counter() - start:6.2f} s  "
+        f"{args.requests} accepted  peak {peak.stop()} threads"
+    )
+
+
+def managed_executor(args):
+    pipelines.validate_pipeline_variant = lambda settings, pipeline_class: "default"
+    pipelines.run_rewriting_pipeline_worker = stub_pipeline(args.duration)
+    executor = executor_module.PipelineExecutor(queue_size=args.queue)
+    executor.pool("rewriting", max_workers=args.workers)
+    pipelines.pipeline_executor = executor
+
+    app = FastAPI()
+    app.include_router(pipelines.router)
+    client = TestClient(app, headers={"Authorization": "secret"})
+
+    peak = ThreadPeak()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as clients:
+        responses = list(
+            clients.map(
+                lambda _: client.post("/api/v1/pipelines/rewriting/run", json=BODY),
+                range(args.requests),
+            )
+        )
+    burst = time.perf_counter() - start
+    executor.shutdown(timeout=60)
+    elapsed = time.perf_counter() - start
+    codes = Counter(response.status_code for response in responses)
+    stats = executor.stats()["rewriting"]
+    print(
+        f"  managed executor     {elapsed:6.2f} s  {codes[202]} accepted  {codes[429]} rejected (429)  "
+        f"peak {peak.stop()} threads  burst answered in {burst:.2f} s"
+    )
+    print(
+        f"                       queue time avg {stats['avg_queue_seconds']:.2f} s  "
+        f"max {stats['max_queue_seconds']:.2f} s"
+    )
+    after = client.post("/api/v1/pipelines/rewriting/run", json=BODY)
+    print(
+        f"                       after shutdown: {after.status_code} {after.headers.get('Retry-After')}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--queue", type=int, default=100)
+    args = parser.parse_args()
+    print(
+        f"{args.requests} requests from {args.clients} clients, {args.duration}s per run, "
+        f"{args.workers} workers and {args.queue} queued runs"
+    )
+    thread_per_request(args)
+    managed_executor(args)
@@ -0,0 +1,239 @@
+"""
+Reranking latency per chat turn and ranking quality on a small fixture set of lecture questions.
+
+A chat turn of LectureRetrieval ranks the results of its three sub-pipelines concurrently and afterwards the merged
+transcriptions and page chunks. The former flow sent every list to the reranker again, one after the other. The new
+flow reuses the cached scores of the already ranked documents, skips lists the segments did not extend and ranks the
+remaining ones with a single call.
+
+The remote reranker is simulated with a fixed latency per request. If sentence-transformers is installed, the local
+cross-encoder is measured as well and its ranking quality (MRR and nDCG@3) is compared to the retrieval order:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/rerank_benchmark.py --remote-latency 0.25 \
+        --model cross-encoder/ms-marco-MiniLM-L-6-v2
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.singleton import Singleton
+from iris.llm.external.model import RerankModel
+from iris.llm.llm_manager import LlmManager
+from iris.llm.request_handler.rerank_request_handler import RerankRequestHandler
+
+TOPICS = {
+    "recursion": "A recursive function calls itself and needs a base case to terminate",
+    "sorting": "Merge sort splits the array, sorts both halves and merges them in O(n log n)",
+    "hashing": "A hash map stores keys in buckets chosen by the hash code of the key",
+    "threads": "Threads share memory, so concurrent writes need locks to avoid race conditions",
+    "inheritance": "A subclass inherits the methods of its superclass and can override them",
+    "complexity": "Big O notation describes how the running time grows with the input size",
+    "graphs": "Breadth first search visits the nodes of a graph level by level using a queue",
+    "exceptions": "Exceptions signal errors and are handled in a try catch block",
+}
+QUESTIONS = {
+    "recursion": "Why does my recursive method never stop?",
+    "sorting": "How does merge sort combine the two halves?",
+    "hashing": "How does a hash map find the bucket for a key?",
+    "threads": "Why do I need a lock when two threads write to the same list?",
+    "inheritance": "Can a subclass change a method of its superclass?",
+    "complexity": "What does O(n log n) say about the running time?",
+    "graphs": "In which order does breadth first search visit the nodes?",
+    "exceptions": "How do I handle an error with try and catch?",
+}
+
+
+def fixture(seed: int = 0):
+    """For every question three candidate lists in retrieval order, with one relevant document each."""
+    rng = random.Random(seed)
+    turns = []
+    for topic, question in QUESTIONS.items():
+        others = [other for other in TOPICS if other != topic]
+        lists = {}
+        for kind, field in (
+            ("pages", "page_text_content"),
+            ("transcriptions", "segment_text"),
+            ("segments", "segment_summary"),
+        ):
+            documents = [
+                SimpleNamespace(
+                    uuid=f"{kind}-{topic}-{other}",
+                    relevant=False,
+                    **{field: f"{TOPICS[other]} ({kind})"},
+                )
+                for other in rng.sample(others, 6)
+            ]
+            # The hybrid search rarely returns the relevant document first
+            documents.insert(
+                rng.randrange(1, len(documents) + 1),
+                SimpleNamespace(
+                    uuid=f"{kind}-{topic}",
+                    relevant=True,
+                    **{field: f"{TOPICS[topic]} ({kind})"},
+                ),
+            )
+            lists[kind] = documents
+        # The transcription a retrieved segment summarizes, not found by the transcription search itself
+        other = rng.choice(others)
+        lists["segment_transcription"] = SimpleNamespace(
+            uuid=f"segment-transcription-{topic}",
+            relevant=False,
+            segment_text=f"{TOPICS[other]} (segment transcription)",
+        )
+        turns.append((question, lists))
+    return turns
+
+
+class RemoteReranker(RerankModel):
+    """Stands in for the Cohere endpoint: one request per list, scored by word overlap after a fixed latency."""
+
+    latency: float
+    requests: int = 0
+
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        self.requests += 1
+        time.sleep(self.latency)
+        words = set(query.lower().split())
+        return [
+            float(len(words & set(document.lower().split()))) for document in documents
+        ]
+
+
+def former_turn(reranker: RerankModel, question: str, lists: dict):
+    def rank(documents, field):
+        scores = reranker.score(
+            question, [getattr(document, field) for document in documents]
+        )
+        order = sorted(
+            range(len(documents)), key=lambda index: scores[index], reverse=True
+        )
+        return [documents[index] for index in order[:7]]
+
+    with ThreadPoolExecutor() as executor:
+        pages = executor.submit(rank, lists["pages"], "page_text_content")
+        transcriptions = executor.submit(rank, lists["transcriptions"], "segment_text")
+        executor.submit(rank, lists["segments"], "segment_summary").result()
+        pages, transcriptions = pages.result(), transcriptions.result()
+    # The segments add the transcription they summarize and a page that is already in the list
+    transcriptions = list(
+        {
+            doc.uuid: doc for doc in transcriptions + [lists["segment_transcription"]]
+        }.values()
+    )
+    pages = list({doc.uuid: doc for doc in pages + pages[:1]}.values())
+    return rank(transcriptions, "segment_text"), rank(pages, "page_text_content")
+
+
+def new_turn(handler: RerankRequestHandler, question: str, lists: dict):
+    with ThreadPoolExecutor() as executor:
+        pages = executor.submit(
+            handler.rerank, question, lists["pages"], 7, "page_text_content"
+        )
+        transcriptions = executor.submit(
+            handler.rerank, question, lists["transcriptions"], 7, "segment_text"
+        )
+        executor.submit(
+            handler.rerank, question, lists["segments"], 7, "segment_summary"
+        ).result()
+        pages, transcriptions = pages.result(), transcriptions.result()
+    ranked_counts = (len(transcriptions), len(pages))
+    transcriptions = list(
+        {
+            doc.uuid: doc for doc in transcriptions + [lists["segment_transcription"]]
+        }.values()
+    )
+    pages = list({doc.uuid: doc for doc in pages + pages[:1]}.values())
+    candidates = [
+        (documents, field)
+        for documents, field, ranked_count in (
+            (transcriptions, "segment_text", ranked_counts[0]),
+            (pages, "page_text_content", ranked_counts[1]),
+        )
+        if len(documents) > ranked_count
+    ]
+    if candidates:
+        reranked = iter(handler.rerank_many(question, candidates, top_n=7))
+        if len(transcriptions) > ranked_counts[0]:
+            transcriptions = next(reranked)
+        if len(pages) > ranked_counts[1]:
+            pages = next(reranked)
+    return transcriptions, pages
+
+
+def quality(rankings: list[list]) -> tuple[float, float]:
+    reciprocal_ranks, ndcgs = [], []
+    for ranking in rankings:
+        position = next(
+            (i for i, document in enumerate(ranking) if document.relevant), None
+        )
+        reciprocal_ranks.append(0.0 if position is None else 1 / (position + 1))
+        ndcgs.append(
+            0.0 if position is None or position >= 3 else 1 / math.log2(position + 2)
+        )
+    return statistics.mean(reciprocal_ranks), statistics.mean(ndcgs)
+
+
+def measure(name: str, run_turn, turns):
+    latencies, rankings = [], []
+    for question, lists in turns:
+        start = time.perf_counter()
+        transcriptions, pages = run_turn(question, lists)
+        latencies.append(time.perf_counter() - start)
+        rankings += [transcriptions, pages]
+    mrr, ndcg = quality(rankings)
+    print(
+        f"  {name:<24} {statistics.mean(latencies) * 1000:7.1f} ms/turn  "
+        f"MRR {mrr:.2f}  nDCG@3 {ndcg:.2f}"
+    )
+
+
+def use_reranker(reranker) -> RerankRequestHandler:
+    manager = SimpleNamespace(get_llm_by_id=lambda model_id: reranker)
+    Singleton._instances = {LlmManager: manager}  # pylint: disable=protected-access
+    return RerankRequestHandler(reranker.id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--remote-latency", type=float, default=0.25)
+    parser.add_argument("--model", default="cross-encoder/ms-marco-MiniLM-L-6-v2")
+    args = parser.parse_args()
+    turns = fixture()
+    print(
+        f"{len(turns)} chat turns, remote reranker latency {args.remote_latency * 1000:.0f} ms"
+    )
+    rankings = [
+        lists[kind] for _, lists in turns for kind in ("transcriptions", "pages")
+    ]
+    mrr, ndcg = quality(rankings)
+    print(f"  {'retrieval order':<24} {'':>15}  MRR {mrr:.2f}  nDCG@3 {ndcg:.2f}")
+
+    remote = RemoteReranker(id="remote", model="remote", latency=args.remote_latency)
+    measure(
+        "remote, former flow", lambda q, lists: former_turn(remote, q, lists), turns
+    )
+    former_requests = remote.requests
+    remote.requests = 0
+    handler = use_reranker(remote)
+    measure("remote, new flow", lambda q, lists: new_turn(handler, q, lists), turns)
+    print(f"  remote requests: former {former_requests}, new {remote.requests}")
+
+    try:
+        from iris.llm.external.cross_encoder import CrossEncoderReranker
+
+        local = CrossEncoderReranker(id="local", model=args.model, type="cross_encoder")
+    except ImportError as e:
+        print(f"  local cross-encoder skipped: {e}")
+    else:
+        measure(
+            "local, former flow", lambda q, lists: former_turn(local, q, lists), turns
+        )
+        handler = use_reranker(local)
+        measure("local, new flow", lambda q, lists: new_turn(handler, q, lists), turns)
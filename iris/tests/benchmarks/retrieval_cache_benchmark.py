@@ -0,0 +1,180 @@
+"""
+Latency of the search stage of LectureRetrieval (the three lecture sub-pipelines searching concurrently with the
+rewritten and hypothetical queries) for a stream of student questions where popular questions repeat.
+
+Embedding and Weaviate are simulated with fixed latencies. The former behavior embeds every query in every
+sub-pipeline and always searches, the new one shares a QueryEmbeddingMemo per request and the RetrievalResultCache
+across requests, with one lecture ingestion invalidating the cache halfway:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/retrieval_cache_benchmark.py --requests 300 --questions 60
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.retrieval.lecture.lecture_page_chunk_retrieval import (
+    LecturePageChunkRetrieval,
+)
+from iris.retrieval.lecture.lecture_transcription_retrieval import (
+    LectureTranscriptionRetrieval,
+)
+from iris.retrieval.lecture.lecture_unit_segment_retrieval import (
+    LectureUnitSegmentRetrieval,
+)
+from iris.retrieval.retrieval_cache import QueryEmbeddingMemo, RetrievalResultCache
+from iris.web.routers.webhooks import LECTURE_COLLECTIONS
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+
+class SlowEmbedder:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = Counter()
+
+    def embed(self, text: str) -> list[float]:
+        self.calls.increment()
+        time.sleep(self.delay)
+        return [0.0]
+
+
+class SlowCollection:
+    def __init__(self, name: str, delay: float, searches: Counter):
+        self.name = name
+        self.delay = delay
+        self.searches = searches
+        self.query = self
+
+    def hybrid(self, **kwargs):
+        self.searches.increment()
+        time.sleep(self.delay)
+        return SimpleNamespace(objects=[])
+
+
+def create_pipelines(args, embedder: SlowEmbedder, searches: Counter):
+    segments = LectureUnitSegmentRetrieval.__new__(LectureUnitSegmentRetrieval)
+    transcriptions = LectureTranscriptionRetrieval.__new__(
+        LectureTranscriptionRetrieval
+    )
+    page_chunks = LecturePageChunkRetrieval.__new__(LecturePageChunkRetrieval)
+    segments.collection = SlowCollection(
+        LECTURE_COLLECTIONS[3], args.search_delay, searches
+    )
+    transcriptions.collection = SlowCollection(
+        LECTURE_COLLECTIONS[2], args.search_delay, searches
+    )
+    page_chunks.lecture_unit_page_chunk_collection = SlowCollection(
+        LECTURE_COLLECTIONS[1], args.search_delay, searches
+    )
+    for pipeline in (segments, transcriptions, page_chunks):
+        pipeline.llm_embedding = embedder
+    return segments, transcriptions, page_chunks
+
+
+def search_stage(pipelines, lecture_unit, question: str, memo):
+    """The searches of LectureRetrieval.call_lecture_pipelines without fetching lecture units and reranking."""
+    segments, transcriptions, page_chunks = pipelines
+    pages_query, pages_answer = f"{question} (pages)", f"{question} (pages answer)"
+    transcriptions_query = f"{question} (transcriptions)"
+    transcriptions_answer = f"{question} (transcriptions answer)"
+
+    def search_twice(pipeline, search, first, second):
+        search(lecture_unit, first, 0.9, 10, memo or pipeline.llm_embedding)
+        search(lecture_unit, second, 0.9, 10, memo or pipeline.llm_embedding)
+
+    def search_page_chunks():
+        for query in (pages_query, pages_answer):
+            page_chunks.search_in_db(
+                query, 0.9, 10, lecture_unit, memo or page_chunks.llm_embedding
+            )
+
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(
+                search_twice,
+                segments,
+                segments.search_in_db,
+                transcriptions_query,
+                transcriptions_answer,
+            ),
+            executor.submit(
+                search_twice,
+                transcriptions,
+                transcriptions.search_in_db,
+                transcriptions_query,
+                transcriptions_answer,
+            ),
+            executor.submit(search_page_chunks),
+        ]
+        for future in futures:
+            future.result()
+
+
+def measure(name: str, cached: bool, workload: list[str], args):
+    cache = RetrievalResultCache()
+    cache.ttl = 300 if cached else 0
+    cache.invalidate(*LECTURE_COLLECTIONS)
+    cache.hits = cache.misses = 0
+    embedder, searches = SlowEmbedder(args.embed_delay), Counter()
+    pipelines = create_pipelines(args, embedder, searches)
+    # search_in_db only reads the fields the filters are built from
+    lecture_unit = SimpleNamespace(
+        course_id=1, lecture_id=None, base_url="https://artemis"
+    )
+    latencies = []
+    memo_hits = memo_lookups = 0
+    for i, question in enumerate(workload):
+        if i == len(workload) // 2:
+            cache.invalidate(*LECTURE_COLLECTIONS)
+        memo = QueryEmbeddingMemo(embedder) if cached else None
+        start = time.perf_counter()
+        search_stage(pipelines, lecture_unit, question, memo)
+        latencies.append(time.perf_counter() - start)
+        if memo:
+            memo_hits += memo.hits
+            memo_lookups += memo.hits + memo.misses
+    stats = cache.stats()
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"  {name:<8} p50 {statistics.median(latencies) * 1000:6.1f} ms  p95 {p95 * 1000:6.1f} ms  "
+        f"{embedder.calls.count:5d} embeddings  {searches.count:5d} searches  "
+        f"memo hit rate {memo_hits / memo_lookups if memo_lookups else 0:4.0%}  "
+        f"cache hit rate {stats['hit_rate']:4.0%}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--questions", type=int, default=60)
+    parser.add_argument("--embed-delay", type=float, default=0.08)
+    parser.add_argument("--search-delay", type=float, default=0.03)
+    args = parser.parse_args()
+    random.seed(0)
+    # Popular questions are asked much more often than the rest
+    weights = [1 / (rank + 1) for rank in range(args.questions)]
+    workload = [
+        f"Question {random.choices(range(args.questions), weights)[0]}"
+        for _ in range(args.requests)
+    ]
+    print(
+        f"{args.requests} requests for {len(set(workload))} distinct questions, embedding "
+        f"{args.embed_delay * 1000:.0f} ms, search {args.search_delay * 1000:.0f} ms"
+    )
+    measure("before", False, workload, args)
+    measure("cached", True, workload, args)
@@ -0,0 +1,122 @@
+"""
+Startup time and per-request constructor overhead of the Weaviate schemas. A fake Weaviate client answers every
+schema request (exists, config.get, create) after a fixed round trip time. A course chat request builds a
+VectorDatabase and a LectureRetrieval with its three sub-retrievers, which initialize 14 schemas in total.
+
+The former behavior (every init_*_schema call checks the schema over the network) calls the undecorated schema
+functions for comparison:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/schema_bootstrap_benchmark.py --rtt 0.003 --requests 50
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import weaviate
+
+from iris.common.singleton import Singleton
+from iris.vector_database.database import VectorDatabase
+from iris.vector_database.faq_schema import init_faq_schema
+from iris.vector_database.lecture_transcription_schema import (
+    init_lecture_transcription_schema,
+)
+from iris.vector_database.lecture_unit_page_chunk_schema import (
+    init_lecture_unit_page_chunk_schema,
+)
+from iris.vector_database.lecture_unit_schema import init_lecture_unit_schema
+from iris.vector_database.lecture_unit_segment_schema import (
+    init_lecture_unit_segment_schema,
+)
+
+# The schemas initialized by VectorDatabase, LectureRetrieval and its sub-retrievers for one course chat request
+REQUEST_SCHEMAS = [
+    init_lecture_unit_page_chunk_schema,
+    init_lecture_transcription_schema,
+    init_lecture_unit_segment_schema,
+    init_lecture_unit_schema,
+    init_faq_schema,
+    init_lecture_unit_schema,
+    init_lecture_transcription_schema,
+    init_lecture_unit_page_chunk_schema,
+    init_lecture_unit_segment_schema,
+    init_lecture_unit_schema,
+    init_lecture_transcription_schema,
+    init_lecture_unit_schema,
+    init_lecture_unit_page_chunk_schema,
+    init_lecture_unit_schema,
+]
+
+
+class AnyName(str):
+    """Matches every property name, so that no schema migration is triggered."""
+
+    def __eq__(self, other):
+        return True
+
+    __hash__ = str.__hash__
+
+
+class FakeWeaviate:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.requests = 0
+        self.collections = self
+
+    def request(self):
+        self.requests += 1
+        time.sleep(self.rtt)
+
+    def exists(self, name):
+        self.request()
+        return True
+
+    def get(self, name):
+        return SimpleNamespace(name=name, config=SimpleNamespace(get=self.get_config))
+
+    def get_config(self, simple=False):
+        self.request()
+        return SimpleNamespace(properties=[SimpleNamespace(name=AnyName())])
+
+    def close(self):
+        pass
+
+
+def measure(client: FakeWeaviate, schemas, requests: int):
+    client.requests = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        for init_schema in schemas:
+            init_schema(client)
+    return (time.perf_counter() - start) / requests, client.requests / requests
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=0.003)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    client = FakeWeaviate(args.rtt)
+    weaviate.connect_to_local = lambda **_kwargs: client
+    print(f"{args.rtt * 1000:.1f} ms per Weaviate request, {args.requests} requests")
+
+    former = [init_schema.__wrapped__ for init_schema in REQUEST_SCHEMAS]
+    per_request, network = measure(client, former, args.requests)
+    print(
+        f"  former     per request {per_request * 1000:7.2f} ms  {network:4.0f} Weaviate requests"
+    )
+
+    Singleton._instances = {}
+    VectorDatabase._client_instance = None
+    client.requests = 0
+    start = time.perf_counter()
+    VectorDatabase()
+    print(
+        f"  registry   startup     {(time.perf_counter() - start) * 1000:7.2f} ms  "
+        f"{client.requests:4d} Weaviate requests"
+    )
+    per_request, network = measure(client, REQUEST_SCHEMAS, args.requests)
+    print(
+        f"  registry   per request {per_request * 1000:7.2f} ms  {network:4.0f} Weaviate requests"
+    )
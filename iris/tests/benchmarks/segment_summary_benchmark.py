@@ -0,0 +1,210 @@
+"""
+Wall time of summarizing the segments and transcription chunks of a 90 minute lecture.
+
+Simulates a lecture with one slide every 90 seconds against in-memory collections with a fixed round trip latency and
+a stubbed LLM with a fixed latency per request. Runs LectureUnitSegmentSummaryPipeline and
+TranscriptionIngestionPipeline.summarize_chunks once with a single request at a time and once with the default
+concurrency:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/segment_summary_benchmark.py --minutes 90 --latency 2
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.pipeline_enum import PipelineEnum
+from iris.common.pyris_message import IrisMessageRole, PyrisMessage
+from iris.common.token_usage_dto import TokenUsageDTO
+from iris.domain.data.text_message_content_dto import TextMessageContentDTO
+from iris.domain.lecture.lecture_unit_dto import LectureUnitDTO
+from iris.llm import CompletionArguments, RequestHandler
+from iris.llm.langchain import IrisLangchainChatModel
+from iris.pipeline.lecture_unit_segment_summary_pipeline import (
+    LectureUnitSegmentSummaryPipeline,
+)
+from iris.pipeline.shared.batch_summarizer import SUMMARY_CONCURRENCY, BatchSummarizer
+from iris.pipeline.transcription_ingestion_pipeline import (
+    TranscriptionIngestionPipeline,
+)
+from iris.vector_database.lecture_transcription_schema import (
+    LectureTranscriptionSchema,
+)
+from iris.vector_database.lecture_unit_page_chunk_schema import (
+    LectureUnitPageChunkSchema,
+)
+
+SECONDS_PER_SLIDE = 90
+DB_LATENCY = 0.005
+
+
+class StubRequestHandler(RequestHandler):
+    latency: float
+
+    def chat(self, messages, arguments, tools=None) -> PyrisMessage:
+        time.sleep(self.latency)
+        return PyrisMessage(
+            sender=IrisMessageRole.ASSISTANT,
+            contents=[TextMessageContentDTO(text_content="A summary of the segment.")],
+            token_usage=TokenUsageDTO(numInputTokens=500, numOutputTokens=100),
+        )
+
+    def complete(self, prompt, arguments, image=None) -> str:
+        raise NotImplementedError
+
+    def embed(self, text: str) -> list[float]:
+        raise NotImplementedError
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        time.sleep(DB_LATENCY)
+        return [[0.0] * 8 for _ in texts]
+
+    def bind_tools(self, tools):
+        raise NotImplementedError
+
+
+class FakeBatch:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        time.sleep(DB_LATENCY)
+        self.collection.round_trips += 1
+
+    def add_object(self, properties, vector=None, uuid=None):
+        self.collection.written += 1
+
+
+class FakeCollection:
+    """Answers every query with all of its objects after DB_LATENCY and counts the round trips."""
+
+    def __init__(self, name, objects):
+        self.name = name
+        self.objects = objects
+        self.round_trips = 0
+        self.written = 0
+        self.query = SimpleNamespace(fetch_objects=self.fetch_objects)
+        self.batch = SimpleNamespace(dynamic=lambda: FakeBatch(self), failed_objects=[])
+
+    def fetch_objects(self, filters=None, limit=None):
+        time.sleep(DB_LATENCY)
+        self.round_trips += 1
+        return SimpleNamespace(objects=self.objects)
+
+
+def lecture(minutes: int):
+    slides, transcriptions = [], []
+    for page in range(1, minutes * 60 // SECONDS_PER_SLIDE + 1):
+        for chunk in range(2):
+            slides.append(
+                SimpleNamespace(
+                    uuid=uuid4(),
+                    properties={
+                        LectureUnitPageChunkSchema.PAGE_NUMBER.value: page,
+                        LectureUnitPageChunkSchema.PAGE_TEXT_CONTENT.value: f"Slide {page} part {chunk}",
+                    },
+                )
+            )
+        transcriptions.append(
+            SimpleNamespace(
+                uuid=uuid4(),
+                properties={
+                    LectureTranscriptionSchema.PAGE_NUMBER.value: page,
+                    LectureTranscriptionSchema.SEGMENT_TEXT.value: "spoken words "
+                    * 150,
+                },
+            )
+        )
+    return slides, transcriptions
+
+
+def segment_pipeline(handler, slides, transcriptions, concurrency):
+    pipeline = LectureUnitSegmentSummaryPipeline.__new__(
+        LectureUnitSegmentSummaryPipeline
+    )
+    pipeline.lecture_unit_dto = LectureUnitDTO(
+        course_id=1,
+        course_name="Course",
+        course_description="",
+        course_language="English",
+        lecture_id=1,
+        lecture_name="Lecture",
+        lecture_unit_id=1,
+        lecture_unit_name="Unit",
+        base_url="https://artemis.example",
+    )
+    pipeline.lecture_unit_page_chunk_collection = FakeCollection("slides", slides)
+    pipeline.lecture_transcription_collection = FakeCollection(
+        "transcriptions", transcriptions
+    )
+    pipeline.lecture_unit_segment_collection = FakeCollection("segments", [])
+    pipeline.llm_embedding = handler
+    pipeline.llm = IrisLangchainChatModel(
+        request_handler=handler, completion_args=CompletionArguments()
+    )
+    pipeline.summarizer = BatchSummarizer(
+        pipeline.llm, PipelineEnum.IRIS_LECTURE_SUMMARY_PIPELINE, concurrency
+    )
+    pipeline.tokens = []
+    return pipeline
+
+
+def transcription_pipeline(handler, concurrency):
+    pipeline = TranscriptionIngestionPipeline.__new__(TranscriptionIngestionPipeline)
+    pipeline.dto = SimpleNamespace(lecture_unit=SimpleNamespace(lecture_name="Lecture"))
+    pipeline.llm = IrisLangchainChatModel(
+        request_handler=handler, completion_args=CompletionArguments()
+    )
+    pipeline.summarizer = BatchSummarizer(
+        pipeline.llm, PipelineEnum.IRIS_VIDEO_TRANSCRIPTION_INGESTION, concurrency
+    )
+    pipeline.tokens = []
+    return pipeline
+
+
+def measure(name: str, args, concurrency: int):
+    handler = StubRequestHandler(latency=args.latency)
+    slides, transcriptions = lecture(args.minutes)
+
+    pipeline = segment_pipeline(handler, slides, transcriptions, concurrency)
+    start = time.perf_counter()
+    summaries, _ = pipeline()
+    segments = time.perf_counter() - start
+    round_trips = sum(
+        collection.round_trips
+        for collection in (
+            pipeline.lecture_unit_page_chunk_collection,
+            pipeline.lecture_transcription_collection,
+            pipeline.lecture_unit_segment_collection,
+        )
+    )
+
+    pipeline = transcription_pipeline(handler, concurrency)
+    chunks = [dict(transcription.properties) for transcription in transcriptions]
+    start = time.perf_counter()
+    pipeline.summarize_chunks(chunks)
+    transcription = time.perf_counter() - start
+
+    print(
+        f"  {name:<28} segments {segments:6.2f} s ({len(summaries)} summaries, {round_trips} db round trips)  "
+        f"transcription {transcription:6.2f} s ({len(chunks)} chunks)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=90)
+    parser.add_argument("--latency", type=float, default=2.0)
+    args = parser.parse_args()
+    print(
+        f"{args.minutes} minute lecture, one slide every {SECONDS_PER_SLIDE}s, "
+        f"{args.latency}s per LLM request"
+    )
+    measure("1 request at a time", args, 1)
+    measure(f"{SUMMARY_CONCURRENCY} concurrent requests", args, SUMMARY_CONCURRENCY)
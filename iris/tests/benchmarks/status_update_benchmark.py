@@ -0,0 +1,100 @@
+"""
+Wall time of an agent loop that reports every tool call through a StatusCallback to a slow Artemis.
+
+Starts a local callback server that answers every status update after a fixed delay and runs a simulated agent
+(one in_progress per tool call plus a fixed amount of work, then done with the final result) once with the former
+blocking requests.post per update and once with the background dispatcher:
+
+    APPLICATION_YML_PATH=application.example.yml LLM_CONFIG_PATH=llm_config.example.yml \
+        poetry run python tests/benchmarks/status_update_benchmark.py --delay 0.5 --tools 20
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.web.status.status_update import CourseChatStatusCallback
+
+
+class SlowArtemis(ThreadingHTTPServer):
+    def __init__(self, delay: float):
+        super().__init__(("127.0.0.1", 0), SlowArtemisHandler)
+        self.delay = delay
+        self.received = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class SlowArtemisHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.delay)
+        self.server.received.append(body)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class BlockingStatusCallback(CourseChatStatusCallback):
+    """The former behavior: every update is posted synchronously."""
+
+    def on_status_update(self):
+        requests.post(
+            self.url,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.run_id}",
+            },
+            json=self.status.model_dump(by_alias=True),
+            timeout=200,
+        ).raise_for_status()
+
+
+def agent(callback: CourseChatStatusCallback, tools: int, work: float):
+    callback.in_progress("Thinking ...")
+    for i in range(tools):
+        callback.in_progress(f"Calling tool {i} ...")
+        time.sleep(work)
+    callback.done("Response created", final_result="The answer.")
+
+
+def measure(name: str, callback_class, args):
+    server = SlowArtemis(args.delay)
+    callback = callback_class(run_id="benchmark-run", base_url=server.base_url)
+    start = time.perf_counter()
+    agent(callback, args.tools, args.work)
+    agent_time = time.perf_counter() - start
+    callback.flush()
+    delivered = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+    final = server.received[-1]["result"]
+    print(
+        f"  {name:<12} agent {agent_time:6.2f} s  all updates delivered {delivered:6.2f} s  "
+        f"{len(server.received)} posts  final result {final!r}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--tools", type=int, default=20)
+    parser.add_argument("--work", type=float, default=0.1)
+    args = parser.parse_args()
+    print(
+        f"{args.tools} tool calls with {args.work}s of work each, "
+        f"Artemis answers after {args.delay}s"
+    )
+    measure("blocking", BlockingStatusCallback, args)
+    measure("dispatcher", CourseChatStatusCallback, args)
@@ -0,0 +1,42 @@
+import threading
+
+from iris.common.keyed_lock import KeyedLock
+
+
+def test_different_keys_do_not_block_each_other():
+    lock = KeyedLock()
+    inside = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with lock("course", 1):
+            inside.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    inside.wait()
+    try:
+        with lock("course", 2):
+            pass
+        acquired_same_key = threading.Event()
+
+        def wait_for_same_key():
+            with lock("course", 1):
+                acquired_same_key.set()
+
+        waiter = threading.Thread(target=wait_for_same_key)
+        waiter.start()
+        assert not acquired_same_key.wait(0.1)
+    finally:
+        release.set()
+    holder.join()
+    waiter.join()
+    assert acquired_same_key.is_set()
+
+
+def test_unused_locks_are_dropped():
+    lock = KeyedLock()
+    with lock("course", 1):
+        assert len(lock) == 1
+    assert len(lock) == 0
@@ -0,0 +1,102 @@
+import threading
+
+from iris.ingestion.ingestion_work_queue import IngestionPriority, IngestionWorkQueue
+
+
+def blocked_queue():
+    """A single-worker queue whose worker is busy until the returned event is set."""
+    work_queue = IngestionWorkQueue(workers=1, name="test")
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    work_queue.submit(IngestionPriority.LECTURE, block)
+    started.wait()
+    return work_queue, release
+
+
+def test_jobs_run_by_priority_then_submission_order():
+    work_queue, release = blocked_queue()
+    order = []
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "lecture 1")
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "lecture 2")
+    work_queue.submit(IngestionPriority.DELETION, order.append, "deletion")
+    work_queue.submit(IngestionPriority.FAQ, order.append, "faq")
+
+    release.set()
+    work_queue.join()
+
+    assert order == ["faq", "deletion", "lecture 1", "lecture 2"]
+
+
+def test_pending_job_is_replaced_by_job_with_same_key():
+    work_queue, release = blocked_queue()
+    order = []
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "old", key=("unit", 1))
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "other", key=("unit", 2))
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "new", key=("unit", 1))
+
+    release.set()
+    work_queue.join()
+
+    assert order == ["other", "new"]
+
+
+def test_failing_job_does_not_stop_the_worker():
+    work_queue = IngestionWorkQueue(workers=1, name="test")
+    done = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    work_queue.submit(IngestionPriority.FAQ, fail)
+    work_queue.submit(IngestionPriority.FAQ, done.append, True)
+    work_queue.join()
+
+    assert done == [True]
+
+
+def test_deletion_cancels_pending_ingestion_of_its_units():
+    work_queue, release = blocked_queue()
+    order = []
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "ingest 1", key=1)
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "ingest 2", key=2)
+    work_queue.submit(
+        IngestionPriority.DELETION, order.append, "delete 1", supersedes=[1]
+    )
+
+    release.set()
+    work_queue.join()
+
+    assert order == ["delete 1", "ingest 2"]
+
+
+def test_jobs_of_the_same_unit_keep_submission_order():
+    work_queue = IngestionWorkQueue(workers=2, name="test")
+    started, release = threading.Event(), threading.Event()
+    order = []
+
+    def ingest():
+        started.set()
+        release.wait()
+        order.append("ingest")
+
+    work_queue.submit(IngestionPriority.LECTURE, ingest, key=1)
+    started.wait()
+    # The deletion has the higher priority and a free worker, but the ingestion of its unit is still running
+    work_queue.submit(
+        IngestionPriority.DELETION, order.append, "delete", supersedes=[1]
+    )
+    work_queue.submit(IngestionPriority.LECTURE, order.append, "re-ingest", key=1)
+    other_done = threading.Event()
+    work_queue.submit(IngestionPriority.LECTURE, other_done.set)
+    # The free worker took the deletion and the re-ingestion before the other job and put them back
+    other_done.wait()
+    assert order == []
+
+    release.set()
+    work_queue.join()
+
+    assert order == ["ingest", "delete", "re-ingest"]
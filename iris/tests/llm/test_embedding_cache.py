@@ -0,0 +1,92 @@
+import multiprocessing
+import sqlite3
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.llm import embedding_cache
+from iris.llm.embedding_cache import EmbeddingCache
+
+
+class FakeEmbeddingModel:
+    """Embeds a text as [len(text), index of the call] and records every batch it receives."""
+
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_many(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(len(self.batches))] for text in texts]
+
+
+def isolated_cache(path) -> EmbeddingCache:
+    # Bypass the singleton so every test gets its own database
+    cache = EmbeddingCache.__new__(EmbeddingCache)
+    cache.__init__(str(path))
+    return cache
+
+
+def test_embed_many_only_sends_uncached_texts(tmp_path):
+    cache = isolated_cache(tmp_path / "cache.sqlite3")
+    llm = FakeEmbeddingModel()
+
+    first = cache.embed_many(llm, ["a", "bb", "a"])
+    second = cache.embed_many(llm, ["bb", "ccc"])
+
+    # Duplicates are embedded once, cached texts are not sent again
+    assert llm.batches == [["a", "bb"], ["ccc"]]
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second == [[2.0, 1.0], [3.0, 2.0]]
+    assert cache.hits == 1
+    assert cache.misses == 3
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    llm = FakeEmbeddingModel()
+    isolated_cache(path).embed_many(llm, ["lecture page"])
+
+    reopened = isolated_cache(path)
+
+    assert reopened.embed_many(llm, ["lecture page"]) == [[12.0, 1.0]]
+    assert len(llm.batches) == 1
+
+
+def test_locked_cache_falls_back_to_the_provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_TIMEOUT", 0.1)
+    path = tmp_path / "cache.sqlite3"
+    cache = isolated_cache(path)
+    # Another ingestion process is writing to the cache
+    other = sqlite3.connect(path)
+    other.execute("BEGIN EXCLUSIVE")
+    llm = FakeEmbeddingModel()
+
+    try:
+        assert cache.embed_many(llm, ["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    finally:
+        other.rollback()
+    assert llm.batches == [["a", "bb"]]
+    # Nothing was cached, the texts are embedded again
+    cache.embed_many(llm, ["a"])
+    assert llm.batches == [["a", "bb"], ["a"]]
+
+
+def embed_in_child(cache, results):
+    results.put(cache.embed_many(FakeEmbeddingModel(), ["lecture page"]))
+
+
+def test_forked_process_does_not_wait_on_the_lock_of_its_parent(tmp_path):
+    cache = isolated_cache(tmp_path / "cache.sqlite3")
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    # A thread of the parent holds the lock while the ingestion process is forked
+    with cache._lock:
+        process = context.Process(target=embed_in_child, args=(cache, results))
+        process.start()
+    process.join(timeout=10)
+    if process.is_alive():
+        process.kill()
+
+    assert process.exitcode == 0
+    assert results.get(timeout=1) == [[12.0, 1.0]]
@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.singleton import Singleton
+from iris.llm.external.model import ChatModel, EmbeddingModel
+from iris.llm.external.openai_chat import DirectOpenAIChatModel
+from iris.llm.llm_manager import LlmManager
+
+LLM_CONFIG = """
+- {type: azure_chat, id: azure-mini, name: Mini, description: Mini on Azure, model: gpt-mini,
+   api_key: key, endpoint: "https://azure", azure_deployment: mini, api_version: "2024-05-01"}
+- {type: openai_chat, id: oai-mini, name: Mini, description: Mini, model: gpt-mini, api_key: key}
+- {type: openai_chat, id: oai-large, name: Large, description: Large, model: gpt-large, api_key: key}
+- {type: openai_embedding, id: oai-embedding, name: Embedding, description: Embedding, model: embedding,
+   api_key: key}
+"""
+
+
+def test_get_llm_by_model_returns_first_match_of_type(tmp_path, monkeypatch):
+    config = tmp_path / "llm_config.yml"
+    config.write_text(LLM_CONFIG)
+    monkeypatch.setenv("LLM_CONFIG_PATH", str(config))
+    monkeypatch.setattr(Singleton, "_instances", {})
+    manager = LlmManager()
+
+    assert manager.get_llm_by_model(ChatModel, "gpt-mini").id == "azure-mini"
+    assert manager.get_llm_by_model(ChatModel, "gpt-large").id == "oai-large"
+    assert manager.get_llm_by_model(EmbeddingModel, "embedding").id == "oai-embedding"
+    assert manager.get_llm_by_model(EmbeddingModel, "gpt-mini") is None
+    assert manager.get_llm_by_model(ChatModel, "unknown") is None
+    assert manager.get_llm_by_id("oai-mini").model == "gpt-mini"
+    assert manager.get_llm_by_id("unknown") is None
+
+
+def test_chat_model_client_is_created_once_and_shared():
+    model = DirectOpenAIChatModel(
+        id="test",
+        name="Test",
+        description="Test",
+        model="gpt-test",
+        type="openai_chat",
+        api_key="test",
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: model.client, range(32)))
+
+    assert all(client is clients[0] for client in clients)
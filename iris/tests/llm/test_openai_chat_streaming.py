@@ -0,0 +1,183 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+from typing import Optional
+
+import httpx
+from openai import BadRequestError
+from openai.types.chat import ChatCompletionChunk
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.pyris_message import IrisMessageRole, PyrisAIMessage, PyrisMessage
+from iris.domain.data.text_message_content_dto import TextMessageContentDTO
+from iris.llm import CompletionArguments
+from iris.llm.external.openai_chat import (
+    AzureOpenAIChatModel,
+    DirectOpenAIChatModel,
+    OpenAIChatModel,
+)
+
+
+def chunk(delta: dict, finish_reason=None, usage=None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-test",
+            "choices": (
+                [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                if delta is not None
+                else []
+            ),
+            "usage": usage,
+        }
+    )
+
+
+def streaming_model(
+    chunks, model: Optional[OpenAIChatModel] = None
+) -> tuple[OpenAIChatModel, list[dict]]:
+    requests = []
+
+    def create(**params):
+        requests.append(params)
+        if isinstance(chunks, Exception):
+            raise chunks
+        return nullcontext(iter(chunks))
+
+    model = model or DirectOpenAIChatModel(
+        id="test",
+        name="Test",
+        description="Test",
+        model="gpt-test",
+        type="openai_chat",
+        api_key="test",
+    )
+    model._client = SimpleNamespace(  # pylint: disable=protected-access
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    return model, requests
+
+
+def stream_chat(model) -> tuple[PyrisMessage, list[str]]:
+    deltas = []
+    message = model.stream_chat(
+        [
+            PyrisMessage(
+                sender=IrisMessageRole.USER,
+                contents=[TextMessageContentDTO(textContent="Hi")],
+            )
+        ],
+        CompletionArguments(),
+        None,
+        deltas.append,
+    )
+    return message, deltas
+
+
+def test_stream_chat_forwards_deltas_and_tracks_usage():
+    model, requests = streaming_model(
+        [
+            chunk({"role": "assistant", "content": ""}),
+            chunk({"content": "Hello"}),
+            chunk({"content": " world"}, finish_reason="stop"),
+            chunk(
+                None,
+                usage={"prompt_tokens": 12, "completion_tokens": 2, "total_tokens": 14},
+            ),
+        ]
+    )
+
+    message, deltas = stream_chat(model)
+
+    assert requests[0]["stream"] is True
+    assert requests[0]["stream_options"] == {"include_usage": True}
+    assert deltas == ["Hello", " world"]
+    assert message.contents[0].text_content == "Hello world"
+    assert message.token_usage.num_input_tokens == 12
+    assert message.token_usage.num_output_tokens == 2
+
+
+def test_stream_chat_assembles_tool_calls_without_forwarding_them():
+    model, _ = streaming_model(
+        [
+            chunk(
+                {
+                    "tool_calls": [
+                        {
+                            "index": 0,
+                            "id": "call",
+                            "type": "function",
+                            "function": {"name": "get_", "arguments": '{"a":'},
+                        }
+                    ]
+                }
+            ),
+            chunk(
+                {
+                    "tool_calls": [
+                        {
+                            "index": 0,
+                            "function": {"name": "lectures", "arguments": " 1}"},
+                        }
+                    ]
+                },
+                finish_reason="tool_calls",
+            ),
+        ]
+    )
+
+    message, deltas = stream_chat(model)
+
+    assert deltas == []
+    assert isinstance(message, PyrisAIMessage)
+    assert message.tool_calls[0].function.name == "get_lectures"
+    assert message.tool_calls[0].function.arguments == {"a": 1}
+
+
+def test_stream_chat_omits_stream_options_for_old_azure_api_versions():
+    azure_model = AzureOpenAIChatModel(
+        id="azure",
+        name="Azure",
+        description="Azure",
+        model="gpt-test",
+        type="azure_chat",
+        api_key="test",
+        endpoint="https://azure",
+        azure_deployment="test",
+        api_version="2024-05-01-preview",
+    )
+    model, requests = streaming_model(
+        [chunk({"content": "Hello"}, finish_reason="stop")], azure_model
+    )
+
+    _, deltas = stream_chat(model)
+
+    assert requests[0]["stream"] is True
+    assert "stream_options" not in requests[0]
+    assert deltas == ["Hello"]
+
+
+def test_stream_chat_falls_back_to_chat_when_streaming_is_rejected(monkeypatch):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    model, requests = streaming_model(
+        BadRequestError(
+            "stream_options is not supported",
+            response=httpx.Response(400, request=request),
+            body=None,
+        )
+    )
+    answer = PyrisMessage(
+        sender=IrisMessageRole.ASSISTANT,
+        contents=[TextMessageContentDTO(textContent="Hi!")],
+    )
+    monkeypatch.setattr(
+        OpenAIChatModel, "chat", lambda self, messages, arguments, tools: answer
+    )
+
+    message, deltas = stream_chat(model)
+
+    assert len(requests) == 1
+    assert message is answer
+    assert deltas == []
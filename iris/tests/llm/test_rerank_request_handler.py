@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.singleton import Singleton
+from iris.llm.llm_manager import LlmManager
+from iris.llm.request_handler.rerank_request_handler import RerankRequestHandler
+
+
+class FakeReranker:
+    """Scores a document by the number of query words it contains and records every batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def score_many(self, requests):
+        self.batches.append(requests)
+        return [
+            [
+                float(sum(word in document.split() for word in query.split()))
+                for document in documents
+            ]
+            for query, documents in requests
+        ]
+
+
+def create_handler(monkeypatch, reranker):
+    manager = SimpleNamespace(get_llm_by_id=lambda model_id: reranker)
+    monkeypatch.setattr(Singleton, "_instances", {LlmManager: manager})
+    return RerankRequestHandler("local")
+
+
+def test_rerank_many_ranks_all_lists_with_one_call(monkeypatch):
+    reranker = FakeReranker()
+    handler = create_handler(monkeypatch, reranker)
+    pages = [
+        SimpleNamespace(text="recursion base case"),
+        SimpleNamespace(text=None),
+        SimpleNamespace(text="monads and recursion in haskell"),
+    ]
+    segments = [
+        SimpleNamespace(summary="unrelated"),
+        SimpleNamespace(summary="haskell monads"),
+    ]
+
+    ranked_pages, ranked_segments = handler.rerank_many(
+        "monads in haskell", [(pages, "text"), (segments, "summary")], top_n=1
+    )
+
+    assert ranked_pages == [pages[2]]
+    assert ranked_segments == [segments[1]]
+    assert len(reranker.batches) == 1
+    assert handler.rerank("anything", [], 3, "text") == []
+
+
+def test_scores_are_reused_for_the_same_query(monkeypatch):
+    reranker = FakeReranker()
+    handler = create_handler(monkeypatch, reranker)
+    first = SimpleNamespace(text="a b")
+    second = SimpleNamespace(text="b c")
+    third = SimpleNamespace(text="a b c")
+
+    handler.rerank("a b", [first, second], 5, "text")
+    ranked = handler.rerank("a b", [second, third, first], 5, "text")
+    handler.rerank("c", [first], 5, "text")
+
+    assert ranked == [third, first, second]
+    assert [batch[0][1] for batch in reranker.batches] == [
+        ["a b", "b c"],
+        ["a b c"],
+        ["a b"],
+    ]
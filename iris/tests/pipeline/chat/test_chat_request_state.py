@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+import pytest
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.pipeline.chat.course_chat_pipeline import CourseChatPipeline
+from iris.pipeline.chat.exercise_chat_agent_pipeline import ExerciseChatAgentPipeline
+
+
+@pytest.mark.parametrize(
+    "pipeline_class", [CourseChatPipeline, ExerciseChatAgentPipeline]
+)
+def test_reset_request_state_clears_event_and_tokens(pipeline_class):
+    pipeline = object.__new__(pipeline_class)
+    pipeline.event = "jol"
+    pipeline.citation_pipeline = SimpleNamespace(tokens=["citation"])
+    pipeline.suggestion_pipeline = SimpleNamespace(tokens="suggestion")
+    pipeline.lecture_retriever = SimpleNamespace(tokens=["lecture"])
+    pipeline.faq_retriever = None
+
+    pipeline.reset_request_state()
+
+    assert pipeline.event is None
+    assert pipeline.citation_pipeline.tokens == []
+    assert pipeline.suggestion_pipeline.tokens is None
+    assert pipeline.lecture_retriever.tokens == []
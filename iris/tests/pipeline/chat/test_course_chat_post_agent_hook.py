@@ -0,0 +1,94 @@
+import threading
+from types import SimpleNamespace
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.pipeline.chat.course_chat_pipeline import CourseChatPipeline
+from iris.web.status.status_update import CourseChatStatusCallback
+
+
+class RecordingCallback(CourseChatStatusCallback):
+    def __init__(self):
+        super().__init__(run_id="run", base_url="http://artemis")
+        self.updates = []
+
+    def on_status_update(self):
+        self.updates.append(
+            (
+                self.status.stages[0].state.value,
+                self.status.result_delta,
+                self.status.result,
+                self.status.suggestions,
+            )
+        )
+
+
+class CitationPipelineStub:
+    def __init__(self, suggestions_started: threading.Event):
+        self.suggestions_started = suggestions_started
+        self.tokens = []
+
+    def __call__(self, information, answer, information_type, **kwargs):
+        # Only returns once the suggestions are generated concurrently
+        assert self.suggestions_started.wait(timeout=5)
+        return f"{answer} [{information_type.value}]"
+
+
+class SuggestionPipelineStub:
+    def __init__(self, suggestions_started: threading.Event):
+        self.suggestions_started = suggestions_started
+        self.tokens = None
+        self.last_messages = []
+
+    def __call__(self, dto):
+        self.suggestions_started.set()
+        self.last_messages.append(dto.last_message)
+        return ["What else?"]
+
+
+def create_pipeline_and_state(result_stream=None):
+    suggestions_started = threading.Event()
+    pipeline = object.__new__(CourseChatPipeline)
+    pipeline.citation_pipeline = CitationPipelineStub(suggestions_started)
+    pipeline.suggestion_pipeline = SuggestionPipelineStub(suggestions_started)
+    callback = RecordingCallback()
+    callback.in_progress("Thinking ...")
+    state = SimpleNamespace(
+        result="The answer",
+        callback=callback,
+        result_stream=result_stream,
+        tokens=[],
+        dto=SimpleNamespace(chat_history=[], settings=None),
+        variant=SimpleNamespace(id="default"),
+        lecture_content_storage={"content": "lectures"},
+        faq_storage={"faqs": ["faq"]},
+    )
+    return pipeline, state
+
+
+def test_answer_is_sent_before_citations_and_suggestions():
+    pipeline, state = create_pipeline_and_state()
+
+    result = pipeline.post_agent_hook(state)
+
+    assert result == "The answer [PARAGRAPHS] [FAQS]"
+    # The answer is only sent as a delta, Artemis stores the result of done as the message
+    assert state.callback.updates[1:] == [
+        ("IN_PROGRESS", "The answer", None, []),
+        ("IN_PROGRESS", None, None, []),
+        ("DONE", None, "The answer [PARAGRAPHS] [FAQS]", ["What else?"]),
+    ]
+    assert pipeline.suggestion_pipeline.last_messages == ["The answer"]
+
+
+def test_streamed_answer_is_not_sent_again():
+    pipeline, state = create_pipeline_and_state(
+        result_stream=SimpleNamespace(streamed=True)
+    )
+
+    pipeline.post_agent_hook(state)
+
+    assert state.callback.updates[1:] == [
+        ("IN_PROGRESS", None, None, []),
+        ("DONE", None, "The answer [PARAGRAPHS] [FAQS]", ["What else?"]),
+    ]
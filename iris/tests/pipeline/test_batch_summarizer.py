@@ -0,0 +1,62 @@
+import threading
+import time
+
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.common.pipeline_enum import PipelineEnum
+from iris.common.pyris_message import IrisMessageRole, PyrisMessage
+from iris.common.token_usage_dto import TokenUsageDTO
+from iris.domain.data.text_message_content_dto import TextMessageContentDTO
+from iris.llm import CompletionArguments, RequestHandler
+from iris.llm.langchain import IrisLangchainChatModel
+from iris.pipeline.shared.batch_summarizer import BatchSummarizer
+
+lock = threading.Lock()
+
+
+class EchoRequestHandler(RequestHandler):
+    """Echoes the prompt, earlier prompts take longer, and records the peak number of concurrent requests."""
+
+    in_flight: int = 0
+    peak: int = 0
+
+    def chat(self, messages, arguments, tools=None) -> PyrisMessage:
+        prompt = messages[0].contents[0].text_content
+        with lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05 / (1 + int(prompt)))
+        with lock:
+            self.in_flight -= 1
+        return PyrisMessage(
+            sender=IrisMessageRole.ASSISTANT,
+            contents=[TextMessageContentDTO(text_content=f"summary {prompt}")],
+            token_usage=TokenUsageDTO(numInputTokens=int(prompt)),
+        )
+
+    def complete(self, prompt, arguments, image=None) -> str:
+        raise NotImplementedError
+
+    def embed(self, text: str) -> list[float]:
+        raise NotImplementedError
+
+    def bind_tools(self, tools):
+        raise NotImplementedError
+
+
+def test_summaries_and_tokens_keep_prompt_order_with_bounded_concurrency():
+    handler = EchoRequestHandler()
+    llm = IrisLangchainChatModel(
+        request_handler=handler, completion_args=CompletionArguments()
+    )
+    summarizer = BatchSummarizer(
+        llm, PipelineEnum.IRIS_LECTURE_SUMMARY_PIPELINE, max_concurrency=3
+    )
+
+    summaries, tokens = summarizer([str(i) for i in range(8)])
+
+    assert summaries == [f"summary {i}" for i in range(8)]
+    assert [token.num_input_tokens for token in tokens] == list(range(8))
+    assert all(
+        token.pipeline == PipelineEnum.IRIS_LECTURE_SUMMARY_PIPELINE for token in tokens
+    )
+    assert handler.peak == 3
@@ -0,0 +1,57 @@
+from iris.pipeline.pipeline_instance_pool import PipelineInstancePool
+
+
+class FakePipeline:
+    built = 0
+
+    def __init__(self):
+        FakePipeline.built += 1
+        self.event = None
+        self.fail_reset = False
+
+    def reset_request_state(self):
+        if self.fail_reset:
+            raise RuntimeError("reset failed")
+        self.event = None
+
+
+def test_released_pipeline_is_reset_and_reused():
+    pool = PipelineInstancePool(max_idle=2)
+    pipeline = pool.take(FakePipeline)
+    pipeline.event = "build_failed"
+    pool.release(pipeline)
+
+    reused = pool.take(FakePipeline)
+
+    assert reused is pipeline
+    assert reused.event is None
+    assert pool.stats()["FakePipeline"]["created"] == 1
+    assert pool.stats()["FakePipeline"]["reused"] == 1
+
+
+def test_pool_drops_failed_resets_and_keeps_at_most_max_idle():
+    pool = PipelineInstancePool(max_idle=1)
+    broken = pool.take(FakePipeline)
+    broken.fail_reset = True
+    pool.release(broken)
+    assert pool.stats()["FakePipeline"]["idle"] == 0
+
+    first, second = pool.take(FakePipeline), pool.take(FakePipeline)
+    pool.release(first)
+    pool.release(second)
+
+    assert pool.stats()["FakePipeline"]["idle"] == 1
+    assert pool.take(FakePipeline) is first
+    assert pool.take(FakePipeline) is not second
+
+
+def test_prewarm_builds_idle_pipelines():
+    pool = PipelineInstancePool(max_idle=4)
+    pool.prewarm(FakePipeline, count=2)
+    built = FakePipeline.built
+
+    pool.take(FakePipeline)
+    pool.take(FakePipeline)
+
+    assert FakePipeline.built == built
+    assert pool.stats()["FakePipeline"]["created"] == 2
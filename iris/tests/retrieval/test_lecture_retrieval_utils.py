@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from iris.retrieval.lecture.lecture_retrieval_utils import (
+    LECTURE_UNIT_KEY,
+    fetch_lecture_units,
+    fetch_objects_by_keys,
+)
+
+
+class FakeCollection:
+    """
+    Collection that ignores filters and returns all objects up to the limit, counting the round trips.
+    """
+
+    name = "LectureUnits"
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.round_trips = 0
+        self.query = self
+
+    def fetch_objects(self, filters=None, limit=None, **_kwargs):
+        self.round_trips += 1
+        return SimpleNamespace(objects=self.objects[:limit])
+
+
+def lecture_unit(course_id, lecture_id, lecture_unit_id, base_url):
+    properties = dict(
+        zip(LECTURE_UNIT_KEY, (course_id, lecture_id, lecture_unit_id, base_url))
+    )
+    properties["lecture_unit_name"] = f"unit {lecture_unit_id}"
+    return SimpleNamespace(properties=properties)
+
+
+def test_fetch_lecture_units_joins_all_keys_in_one_query():
+    collection = FakeCollection(
+        [
+            lecture_unit(1, 10, 100, "https://a"),
+            lecture_unit(1, 10, 101, "https://a"),
+            # Matches every contains_any filter, but none of the keys
+            lecture_unit(1, 10, 100, "https://b"),
+        ]
+    )
+    keys = [
+        (1, 10, 100, "https://a"),
+        (1, 10, 101, "https://a"),
+        (1, 10, 100, "https://a"),
+    ]
+
+    units = fetch_lecture_units(collection, keys)
+
+    assert collection.round_trips == 1
+    assert set(units) == {(1, 10, 100, "https://a"), (1, 10, 101, "https://a")}
+    assert units[(1, 10, 101, "https://a")]["lecture_unit_name"] == "unit 101"
+
+
+def test_fetch_objects_by_keys_skips_incomplete_keys():
+    collection = FakeCollection([])
+
+    assert (
+        fetch_objects_by_keys(collection, LECTURE_UNIT_KEY, [(1, None, 100, "x")]) == {}
+    )
+    assert collection.round_trips == 0
+
+
+def test_fetch_objects_by_keys_falls_back_when_limit_is_hit():
+    collection = FakeCollection(
+        [lecture_unit(1, 10, 100 + i, "https://a") for i in range(3)]
+        # A second object of the first key, cut off by the limit of the batched query
+        + [lecture_unit(1, 10, 100, "https://a")]
+    )
+    keys = [(1, 10, 100 + i, "https://a") for i in range(3)]
+
+    matches = fetch_objects_by_keys(collection, LECTURE_UNIT_KEY, keys, limit=3)
+
+    # The first query is truncated, so every key is fetched on its own
+    assert collection.round_trips == 4
+    assert set(matches) == set(keys)
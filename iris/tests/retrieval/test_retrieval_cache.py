@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from iris.common.singleton import Singleton
+from iris.retrieval.retrieval_cache import (
+    QueryEmbeddingMemo,
+    RetrievalResultCache,
+    hybrid_search,
+)
+
+
+class FakeEmbedder:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.texts = []
+
+    def embed(self, text: str) -> list[float]:
+        self.texts.append(text)
+        time.sleep(self.delay)
+        return [float(len(text))]
+
+
+class FakeCollection:
+    """Collection whose hybrid search returns its arguments and counts the searches."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.searches = 0
+        self.query = self
+
+    def hybrid(self, **kwargs):
+        self.searches += 1
+        return SimpleNamespace(objects=[kwargs])
+
+
+def test_memo_embeds_concurrent_identical_queries_once():
+    embedder = FakeEmbedder(delay=0.05)
+    memo = QueryEmbeddingMemo(embedder)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        vectors = list(executor.map(memo.embed, ["a", "bb", "a", "bb", "a", "ccc"]))
+
+    assert vectors == [[1.0], [2.0], [1.0], [2.0], [1.0], [3.0]]
+    assert sorted(embedder.texts) == ["a", "bb", "ccc"]
+    assert (memo.misses, memo.hits) == (3, 3)
+
+
+def test_hybrid_search_is_cached_per_query_filter_and_arguments(monkeypatch):
+    monkeypatch.setattr(Singleton, "_instances", {})
+    embedder = FakeEmbedder()
+    collection = FakeCollection("Lectures")
+
+    def search(query, course_id=1, limit=10):
+        return hybrid_search(
+            collection, embedder, query, None, (course_id,), alpha=0.9, limit=limit
+        )
+
+    first = search("What is a monad?")
+    assert search("What is a monad?") is first
+    search("What is a monad?", course_id=2)
+    search("What is a monad?", limit=5)
+    search("What is a functor?")
+
+    assert collection.searches == 4
+    assert len(embedder.texts) == 4
+    assert RetrievalResultCache().stats()["hits"] == 1
+
+
+def test_invalidation_drops_results_and_discards_running_searches(monkeypatch):
+    monkeypatch.setattr(Singleton, "_instances", {})
+    cache = RetrievalResultCache()
+    cache.get_or_search("Lectures", ("q",), lambda: "old")
+    cache.get_or_search("Faqs", ("q",), lambda: "faq")
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_search():
+        started.set()
+        release.wait()
+        return "stale"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        running = executor.submit(cache.get_or_search, "Lectures", ("r",), slow_search)
+        started.wait()
+        cache.invalidate("Lectures")
+        release.set()
+        assert running.result() == "stale"
+
+    assert cache.get_or_search("Lectures", ("q",), lambda: "new") == "new"
+    assert cache.get_or_search("Lectures", ("r",), lambda: "fresh") == "fresh"
+    assert cache.get_or_search("Faqs", ("q",), lambda: "other") == "faq"
+
+
+def test_entries_expire_and_least_recently_used_are_evicted(monkeypatch):
+    monkeypatch.setattr(Singleton, "_instances", {})
+    cache = RetrievalResultCache(ttl=0.05, max_size=2)
+    cache.get_or_search("Faqs", ("a",), lambda: "a")
+    cache.get_or_search("Faqs", ("b",), lambda: "b")
+    cache.get_or_search("Faqs", ("a",), lambda: "a2")
+    cache.get_or_search("Faqs", ("c",), lambda: "c")
+
+    assert cache.get_or_search("Faqs", ("a",), lambda: "a3") == "a"
+    assert cache.get_or_search("Faqs", ("b",), lambda: "b2") == "b2"
+    time.sleep(0.06)
+    assert cache.get_or_search("Faqs", ("b",), lambda: "b3") == "b3"
@@ -0,0 +1,23 @@
+from types import SimpleNamespace
+
+import pytest
+
+from iris.vector_database.database import raise_on_failed_objects
+
+
+def collection(failed_objects):
+    return SimpleNamespace(
+        name="LectureUnitSegments",
+        batch=SimpleNamespace(failed_objects=failed_objects),
+    )
+
+
+def test_successful_batch_does_not_raise():
+    raise_on_failed_objects(collection([]))
+
+
+def test_failed_objects_of_a_batch_are_raised():
+    failed = [SimpleNamespace(message="vector dimension mismatch")] * 2
+
+    with pytest.raises(RuntimeError, match="2 objects .* vector dimension mismatch"):
+        raise_on_failed_objects(collection(failed))
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from iris.common.singleton import Singleton
+from iris.vector_database.database import VectorDatabase
+from iris.vector_database.faq_schema import FaqSchema, init_faq_schema
+
+
+class FakeCollections:
+    def __init__(self):
+        self.existing = {}
+        self.requests = 0
+
+    def exists(self, name):
+        self.requests += 1
+        return name in self.existing
+
+    def get(self, name):
+        return self.existing[name]
+
+    def create(self, name, **_kwargs):
+        self.requests += 1
+        self.existing[name] = SimpleNamespace(name=name)
+        return self.existing[name]
+
+    def delete(self, name):
+        return self.existing.pop(name, None) is not None
+
+
+def test_schema_is_bootstrapped_once_per_client(monkeypatch):
+    monkeypatch.setattr(Singleton, "_instances", {})
+    client = SimpleNamespace(collections=FakeCollections())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        collections = list(executor.map(lambda _: init_faq_schema(client), range(32)))
+
+    assert all(collection is collections[0] for collection in collections)
+    assert collections[0].name == FaqSchema.COLLECTION_NAME.value
+    assert client.collections.requests == 2
+
+    other_client = SimpleNamespace(collections=FakeCollections())
+    assert init_faq_schema(other_client) is not collections[0]
+
+
+def test_deleted_collection_is_bootstrapped_again(monkeypatch):
+    monkeypatch.setattr(Singleton, "_instances", {})
+    client = SimpleNamespace(collections=FakeCollections())
+    database = object.__new__(VectorDatabase)
+    database.client = client
+    first = init_faq_schema(client)
+
+    database.delete_collection(FaqSchema.COLLECTION_NAME.value)
+
+    assert init_faq_schema(client) is not first
+    assert FaqSchema.COLLECTION_NAME.value in client.collections.existing
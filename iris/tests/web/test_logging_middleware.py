@@ -0,0 +1,46 @@
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from iris.web.logging_middleware import RequestLoggingMiddleware, redact
+
+
+def test_redact_sensitive_and_base64_fields():
+    text = (
+        '{"pdfFile": "JVBERi0xLjQK", "lectureUnitName": "Intro", '
+        '"settings": {"authenticationToken": "abc"}, "other": "' + "A" * 300 + '"}'
+    )
+
+    redacted = redact(text)
+
+    assert '"pdfFile": "<redacted 12 chars>"' in redacted
+    assert '"authenticationToken": "<redacted 3 chars>"' in redacted
+    assert '"other": "<redacted 300 chars>"' in redacted
+    assert '"lectureUnitName": "Intro"' in redacted
+    # A value cut off by the preview is redacted as well
+    assert redact('{"pdfFile": "JVBERi0x') == '{"pdfFile": "<redacted 8+ chars>"'
+
+
+def test_bodies_pass_through_and_only_previews_are_logged(caplog):
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, preview_bytes=64, sample_rate=1.0)
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.json()
+        return {"size": len(body["pdfFile"])}
+
+    pdf = "JVBERi0xLjQK" * 100_000
+    with caplog.at_level(logging.INFO, logger="iris.web.logging_middleware"):
+        response = TestClient(app).post(
+            "/echo", json={"lectureUnitName": "Intro", "pdfFile": pdf}
+        )
+
+    assert response.json() == {"size": len(pdf)}
+    log = caplog.text
+    assert "POST /echo 200" in log
+    assert "JVBERi0x" not in log
+    assert '"pdfFile":"<redacted' in log
+    assert '"size":1200000' in log
+    assert max(len(record.getMessage()) for record in caplog.records) < 200
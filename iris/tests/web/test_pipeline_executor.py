@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from iris.web.pipeline_executor import (
+    PipelineExecutor,
+    PipelineRejectedError,
+    pipeline_executor,
+)
+from iris.web.routers.health import metrics
+
+
+def test_rejects_runs_beyond_workers_and_queue():
+    executor = PipelineExecutor(queue_size=2)
+    executor.pool("course-chat", max_workers=1)
+    release = threading.Event()
+    for _ in range(3):
+        executor.submit("course-chat", release.wait)
+
+    with pytest.raises(PipelineRejectedError) as error:
+        executor.submit("course-chat", release.wait)
+    assert error.value.status_code == 429
+
+    # Other pipeline types are not affected by the full course chat pool
+    done = threading.Event()
+    executor.submit("lecture-chat", done.set)
+    assert done.wait(1)
+
+    release.set()
+    executor.shutdown(timeout=5)
+    stats = executor.stats()["course-chat"]
+    assert stats["completed"] == 3
+    assert stats["rejected"] == 1
+
+
+def test_shutdown_drains_accepted_runs_and_rejects_new_ones():
+    executor = PipelineExecutor(queue_size=10)
+    executor.pool("rewriting", max_workers=2)
+    finished = []
+    for i in range(5):
+        executor.submit("rewriting", lambda i=i: (time.sleep(0.05), finished.append(i)))
+
+    executor.shutdown(timeout=5)
+
+    assert sorted(finished) == [0, 1, 2, 3, 4]
+    with pytest.raises(PipelineRejectedError) as error:
+        executor.submit("rewriting", lambda: None)
+    assert error.value.status_code == 503
+    with pytest.raises(PipelineRejectedError):
+        executor.submit("tutor-suggestion", lambda: None)
+    stats = executor.stats()["rewriting"]
+    assert stats["running"] == stats["queued"] == 0
+    assert stats["max_queue_seconds"] > 0
+
+
+def test_metrics_route_reports_the_pipeline_pools():
+    done = threading.Event()
+    pipeline_executor.submit("metrics-test", done.set)
+    assert done.wait(1)
+
+    pools = metrics()["pipelines"]
+    assert pools["metrics-test"]["submitted"] == 1
+    assert pools["metrics-test"]["queued"] == 0
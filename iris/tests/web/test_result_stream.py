@@ -0,0 +1,32 @@
+import time
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.web.status.result_stream import ResultStream
+from iris.web.status.status_update import CourseChatStatusCallback
+
+
+class RecordingCallback(CourseChatStatusCallback):
+    def __init__(self):
+        super().__init__(run_id="run", base_url="http://artemis")
+        self.deltas = []
+
+    def on_status_update(self):
+        self.deltas.append(self.status.result_delta)
+
+
+def test_deltas_are_sent_in_batches():
+    callback = RecordingCallback()
+    stream = ResultStream(callback, interval=0.05)
+
+    for i in range(10):
+        stream(f"{i} ")
+    time.sleep(0.06)
+    stream("10 ")
+    stream("11 ")
+    stream.flush()
+    stream.flush()
+
+    assert callback.deltas == ["0 ", "1 2 3 4 5 6 7 8 9 10 ", "11 "]
+    assert callback.stage.state.value == "IN_PROGRESS"
+    assert callback.status.result_delta is None
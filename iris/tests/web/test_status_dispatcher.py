@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# iris.domain has to be imported before iris.llm to resolve their import cycle
+import iris.domain  # noqa: F401  pylint: disable=unused-import
+from iris.web.status import status_dispatcher
+from iris.web.status.status_dispatcher import StatusUpdateDispatcher
+from iris.web.status.status_update import CourseChatStatusCallback
+
+
+class RecordingServer(ThreadingHTTPServer):
+    """Records the JSON bodies it receives, answering after a delay or with the queued status codes."""
+
+    def __init__(self, delay: float = 0.0, statuses=()):
+        super().__init__(("127.0.0.1", 0), RecordingHandler)
+        self.delay = delay
+        self.statuses = list(statuses)
+        self.received = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/status"
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.delay)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 200:
+            self.server.received.append(body)
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_intermediate_updates_are_coalesced_and_final_updates_kept_in_order():
+    server = RecordingServer(delay=0.1)
+    dispatcher = StatusUpdateDispatcher(server.url, "run")
+    try:
+        dispatcher.submit({"message": "start"}, ("IN_PROGRESS",), False)
+        for i in range(20):
+            dispatcher.submit({"message": f"step {i}"}, ("IN_PROGRESS",), False)
+        dispatcher.submit({"message": "done"}, ("DONE",), True)
+        dispatcher.submit({"message": "after done"}, ("DONE",), False)
+        assert dispatcher.flush(timeout=5)
+    finally:
+        server.shutdown()
+
+    messages = [body["message"] for body in server.received]
+    assert messages == ["start", "step 19", "done", "after done"]
+    assert dispatcher.coalesced == 19
+
+
+def test_server_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(status_dispatcher, "STATUS_UPDATE_RETRY_BACKOFF", 0.01)
+    server = RecordingServer(statuses=[503, 200, 404])
+    dispatcher = StatusUpdateDispatcher(server.url, "run")
+    try:
+        dispatcher.submit({"message": "retried"}, ("IN_PROGRESS",), False)
+        dispatcher.submit({"message": "rejected"}, ("DONE",), False)
+        dispatcher.submit({"message": "delivered"}, ("ERROR",), False)
+        assert dispatcher.flush(timeout=5)
+    finally:
+        server.shutdown()
+
+    assert [body["message"] for body in server.received] == ["retried", "delivered"]
+
+
+def test_done_without_state_change_is_not_replaced():
+    server = RecordingServer(delay=0.1)
+    callback = CourseChatStatusCallback(
+        run_id="run", base_url=f"http://127.0.0.1:{server.server_address[1]}"
+    )
+    try:
+        callback.in_progress("Thinking ...")
+        callback.done("Answered", final_result="The answer")
+        callback.done("Memories extracted")
+        # The suggestions arrive after the last stage is done, so the stage states do not change
+        callback.done("Suggestions created", suggestions=["What else?"])
+        callback.stage.message = "Cleaning up"
+        callback.on_status_update()
+        assert callback.flush(timeout=5)
+    finally:
+        server.shutdown()
+
+    assert len(server.received) == 5
+    assert server.received[3]["suggestions"] == ["What else?"]
@@ -1,11 +1,15 @@
-import json, traceback, httpx, grpc, datetime
+import json, traceback, grpc
 
 from grpclocal import model_pb2, model_pb2_grpc
+from logos.dbutils.catalog import Catalog
 from logos.dbutils.dbmanager import DBManager
+from logos.dbutils.usage_log_writer import UsageLogWriter
 from logos.responses import request_setup, get_client_ip_address_from_context, proxy_behaviour, resource_behaviour, \
     get_client_ip
 from logos.scheduling.scheduling_fcfs import FCFSScheduler
 from logos.scheduling.scheduling_manager import SchedulingManager
+from logos.stream_accounting import StreamAccounting
+from logos.upstream_clients import get_client
 
 
 class LogosServicer(model_pb2_grpc.LogosServicer):
@@ -30,6 +34,7 @@ class LogosServicer(model_pb2_grpc.LogosServicer):
 
         with DBManager() as db:
             r, c = db.get_process_id(meta["logos_key"])
+            privacy_level = None
             if c != 200:
                 print("Error while logging a request: ", r)
                 usage_id = None
@@ -39,12 +44,12 @@ class LogosServicer(model_pb2_grpc.LogosServicer):
                     usage_id = None
                 else:
                     usage_id = int(r["log-id"])
+                    privacy_level = r["privacy-level"]
 
         models = request_setup(meta, meta["logos_key"])
         if not models:
-            with DBManager() as db:
-                # Get available providers for this key
-                providers = db.get_providers(meta["logos_key"])
+            # Get available providers for this key
+            providers = Catalog().get_providers(meta["logos_key"])
             # Find most suitable provider
             out = proxy_behaviour(meta, providers, path)
             if isinstance(out[0], dict) and "error" in out[0]:
@@ -56,7 +61,7 @@ class LogosServicer(model_pb2_grpc.LogosServicer):
             policy_id = -1
             classified = dict()
         else:
-            out = resource_behaviour(meta["logos_key"], meta, data, models)
+            out = await resource_behaviour(meta["logos_key"], meta, data, models)
             if isinstance(out[0], dict) and "error" in out[0]:
                 context.set_code(grpc.StatusCode.UNAVAILABLE)
                 context.set_details(f"Upstream error: {out[0]["error"]}")
@@ -65,47 +70,29 @@ class LogosServicer(model_pb2_grpc.LogosServicer):
 
         # Standard request setup
 
-        with DBManager() as db:
-            if usage_id is not None:
-                db.set_forward_timestamp(usage_id)
+        if usage_id is not None:
+            UsageLogWriter().set_forward_timestamp(usage_id)
 
-        full_text = ""
         data["stream"] = True
         data["stream_options"] = {"include_usage": True}
-        last_blob = None
-        ttft = None
+        accounting = None
         try:
             # Try streaming first, fall back to standard response on failure
             for _ in range(2):
+                # Response text is only needed for logs with privacy level FULL
+                accounting = StreamAccounting(
+                    keep_text=usage_id is not None and privacy_level == "FULL",
+                    on_first_token=(lambda: UsageLogWriter().set_time_at_first_token(usage_id))
+                    if usage_id is not None else None,
+                )
                 try:
-                    async with httpx.AsyncClient(timeout=None) as client:
-                        async with client.stream("POST", forward_url, headers=proxy_headers, json=data) as resp:
-                            async for raw_line in resp.aiter_lines():
-                                if not raw_line:
-                                    continue
-
-                                # Parse Data-Chunk
-                                if raw_line.startswith("data: "):
-                                    payload = raw_line.removeprefix("data: ").strip()
-                                    if ttft is None and usage_id is not None:
-                                        ttft = datetime.datetime.now(datetime.timezone.utc)
-                                        with DBManager() as db:
-                                            db.set_time_at_first_token(usage_id)
-                                    if payload == "[DONE]":
-                                        break
-                                    try:
-                                        blob = json.loads(payload)
-                                        choices = blob.get("choices", [])
-                                        if choices and "delta" in choices[0]:
-                                            content = choices[0]["delta"].get("content")
-                                            if content:
-                                                full_text += content
-                                        last_blob = blob
-                                    except Exception:
-                                        pass
-
-                                # Yield to gRPC-Client
-                                yield model_pb2.GenerateResponse(chunk=(raw_line + "\n").encode())
+                    client = get_client(forward_url)
+                    async with client.stream("POST", forward_url, headers=proxy_headers, json=data) as resp:
+                        # Forward the decoded upstream bytes, accounting only inspects them
+                        async for chunk in resp.aiter_bytes():
+                            accounting.feed(chunk)
+                            yield model_pb2.GenerateResponse(chunk=chunk)
+                    accounting.close()
                     break
                 except:
                     traceback.print_exc()
@@ -117,17 +104,18 @@ class LogosServicer(model_pb2_grpc.LogosServicer):
             context.set_details(f"Upstream error: {e}")
             return
 
-        if ttft is None and usage_id is not None:
-            db.set_time_at_first_token(usage_id)
+        if accounting.ttft is None and usage_id is not None:
+            UsageLogWriter().set_time_at_first_token(usage_id)
 
         # Usage-Logging
         if usage_id is not None:
             try:
-                response_for_log = last_blob
+                response_for_log = accounting.first_response
+                full_text = accounting.text()
                 if response_for_log:
                     response_for_log["choices"][0]["delta"]["content"] = full_text
 
-                    usage = response_for_log["usage"] if response_for_log is not None else dict()
+                    usage = accounting.usage
                     usage_tokens = dict()
                     for name in usage:
                         if "tokens_details" in name:
@@ -139,13 +127,13 @@ class LogosServicer(model_pb2_grpc.LogosServicer):
                     if "completion_tokens_details" in usage:
                         for name in usage["completion_tokens_details"]:
                             usage_tokens[name] = usage["completion_tokens_details"][name]
-                    response_for_log["usage"] = response_for_log["usage"]
+                    response_for_log["usage"] = usage
                 else:
                     response_for_log = {"full_text": full_text}
                     usage_tokens = dict()
 
-                with DBManager() as db:
-                    db.set_response_payload(usage_id, response_for_log, provider_id, model_id, usage_tokens, policy_id, classified)
+                UsageLogWriter().set_response_payload(usage_id, response_for_log, provider_id, model_id, usage_tokens,
+                                                      policy_id, classified)
             except Exception:
                 traceback.print_exc()
 
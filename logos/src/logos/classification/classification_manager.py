@@ -1,30 +1,75 @@
 """
 Module handling all classification tasks in Logos.
 """
-import functools
 import logging
-from copy import deepcopy
+import threading
+from dataclasses import dataclass
 from typing import List, Tuple
 
+import numpy as np
+
+from logos.classification.classification_balancer import Balancer
+from logos.classification.classify_ai import AIClassifier
 from logos.classification.classify_policy import PolicyClassifier
 from logos.classification.classify_token import TokenClassifier
-from logos.classification.classify_ai import AIClassifier
 from logos.classification.laura_embedding_classifier import LauraEmbeddingClassifier
+from logos.singleton import singleton
 
 
-def singleton(cls):
+@dataclass(frozen=True)
+class ModelScore:
     """
-    A decorator to make a class a Singleton.
+    Weights of a single model for a single classification request.
     """
-    instances = {}
+    model_id: int
+    latency_weight: float
+    accuracy_weight: float
+    quality_weight: float
+    token_weight: float
+    laura_weight: float
+    combined_weight: float
 
-    @functools.wraps(cls)
-    def get_instance(*args, **kwargs):
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
 
-    return get_instance
+@dataclass(frozen=True)
+class ClassificationResult:
+    """
+    Immutable result of a classification request.
+    ranking holds (model_id, weight, priority, parallel) tuples, best suited model first.
+    """
+    ranking: Tuple[Tuple[int, float, int, int], ...]
+    scores: Tuple[ModelScore, ...]
+
+    def classification_data(self) -> List[dict]:
+        return [
+            {
+                "latency_weight": score.latency_weight,
+                "accuracy_weight": score.accuracy_weight,
+                "quality_weight": score.quality_weight,
+                "token_weight": score.token_weight,
+                "laura_weight": score.laura_weight,
+                "laura_factor": Balancer.LAURA_WEIGHT,
+                "token_factor": Balancer.TOKEN_WEIGHT,
+                "combined_weight": score.combined_weight,
+                "model_id": score.model_id,
+            }
+            for score in self.scores
+        ]
+
+
+class _ModelFeatures:
+    """
+    Read-only feature matrix of all registered models. Replaced as a whole when the models change.
+    """
+    def __init__(self, models: List[dict]) -> None:
+        self.ids = np.array([m["id"] for m in models], dtype=np.int64)
+        self.parallel = [m["parallel"] for m in models]
+        self.privacy = np.array([PolicyClassifier.privacy.index(m["weight_privacy"]) for m in models], dtype=np.int64)
+        self.weights = {
+            category: np.array([m[category] for m in models], dtype=np.float64)
+            for category in ("weight_latency", "weight_accuracy", "weight_cost", "weight_quality")
+        }
+        self.tags, self.tag_matrix, self.tag_count = TokenClassifier.tag_matrix(models)
+        self.descriptions = [m.get("description") for m in models]
 
 
 @singleton
@@ -36,9 +81,10 @@ class ClassificationManager:
 
     def __init__(self, models) -> None:
         self.models = models
+        self.features = _ModelFeatures(models)
         self.laura = LauraEmbeddingClassifier()
         self.laura.remove_db()
-        self.filtered = models  # For debugging
+        self.__laura_lock = threading.Lock()
         if not self.laura.model_db:
             for model in self.models:
                 if model["description"] is not None:
@@ -46,60 +92,99 @@ class ClassificationManager:
 
     def update_manager(self, models):
         self.models = models
+        self.features = _ModelFeatures(models)
         for model in self.models:
             if model["description"] is not None:
                 self.laura.register_model(model["id"], model["description"])
 
-    def classify(self, prompt: str, policy: dict, allowed=None, classifier=None, system=None) -> List[Tuple[int, int, int, int]]:
+    def classify(self, prompt: str, policy: dict, allowed=None, classifier=None, system=None) -> List[Tuple[int, float, int, int]]:
         """
         Classify prompts and assign them to a model.
         Returns a sorted list with the best suited model-id at the front together with
         a weight describing how well the LLM is suited for the given prompt
         and a priority of the given policy.
         """
-        if allowed is None:
-            allowed = list()
-        else:
-            self.models = [model for model in self.models if model["id"] in allowed]
+        return list(self.classify_request(prompt, policy, allowed, classifier, system).ranking)
+
+    def classify_request(self, prompt: str, policy: dict, allowed=None, classifier=None, system=None) -> ClassificationResult:
+        """
+        Re-entrant classification. Works on a snapshot of the model features and does not modify shared state,
+        so it can run concurrently from a thread pool.
+        """
+        features = self.features
         if system is None:
             system = ""
-        adjusted_policy = deepcopy(policy)
-        if adjusted_policy["threshold_latency"] == 1024:
-            adjusted_policy["threshold_latency"] = self.get_special_weight("weight_latency", allowed=allowed)
-        elif adjusted_policy["threshold_latency"] == -1024:
-            adjusted_policy["threshold_latency"] = self.get_special_weight("weight_latency", maximum=False, allowed=allowed)
-        if adjusted_policy["threshold_accuracy"] == 1024:
-            adjusted_policy["threshold_accuracy"] = self.get_special_weight("weight_accuracy", allowed=allowed)
-        elif adjusted_policy["threshold_accuracy"] == -1024:
-            adjusted_policy["threshold_accuracy"] = self.get_special_weight("weight_accuracy", maximum=False, allowed=allowed)
-        if adjusted_policy["threshold_cost"] == 1024:
-            adjusted_policy["threshold_cost"] = self.get_special_weight("weight_cost", allowed=allowed)
-        elif adjusted_policy["threshold_cost"] == -1024:
-            adjusted_policy["threshold_cost"] = self.get_special_weight("weight_cost", maximum=False, allowed=allowed)
-        if adjusted_policy["threshold_quality"] == 1024:
-            adjusted_policy["threshold_quality"] = self.get_special_weight("weight_quality", allowed=allowed)
-        elif adjusted_policy["threshold_quality"] == -1024:
-            adjusted_policy["threshold_quality"] = self.get_special_weight("weight_quality", maximum=False, allowed=allowed)
-        logging.debug(f"Policy: {adjusted_policy['id']}")
+        mask = np.ones(len(features.ids), dtype=bool)
+        if allowed:
+            mask &= np.isin(features.ids, list(allowed))
+        thresholds = {
+            category: self.__resolve_threshold(policy[f"threshold_{category}"], features.weights[f"weight_{category}"], mask)
+            for category in ("latency", "accuracy", "cost", "quality")
+        }
+        logging.debug(f"Policy: {policy['id']}")
         logging.debug(f"Models: {allowed}")
+
+        latency = accuracy = quality = np.zeros(len(features.ids))
         if classifier is None or classifier == "policy":
-            filtered = PolicyClassifier(self.models).classify(prompt, adjusted_policy)
-        else:
-            filtered = [i for i in self.models]
-        logging.debug(f"Policy-Classification: {[model['id'] for model in filtered]}")
+            # Hard filtering by privacy and cost
+            mask &= PolicyClassifier.hard_filter(policy["threshold_privacy"], thresholds["cost"], features.privacy,
+                                                 features.weights["weight_cost"])
+            # Soft filtering by latency, accuracy and quality
+            latency = PolicyClassifier.soft_weight(features.weights["weight_latency"], thresholds["latency"])
+            accuracy = PolicyClassifier.soft_weight(features.weights["weight_accuracy"], thresholds["accuracy"])
+            quality = PolicyClassifier.soft_weight(features.weights["weight_quality"], thresholds["quality"])
+        logging.debug(f"Policy-Classification: {features.ids[mask].tolist()}")
+
+        token = np.zeros(len(features.ids))
         if classifier is None or classifier == "token":
             # Provide the system prompt instead of the normal user input
-            filtered = TokenClassifier(filtered).classify(system, adjusted_policy)
-        logging.debug(f"Token-Classification: {[model['id'] for model in filtered]}")
-        self.laura.allowed = allowed
+            token = TokenClassifier.weights(system, features.tags, features.tag_matrix, features.tag_count)
+
+        laura = np.zeros(len(features.ids))
         if classifier is None or classifier == "laura":
-            filtered = AIClassifier(filtered).classify(prompt, adjusted_policy, laura=self.laura)
-        logging.debug(f"AI-Classification: {[model['id'] for model in filtered]}")
-        self.laura.allowed = list()
-        self.filtered = filtered
-        return sorted(
-            [(i["id"], i["classification_weight"].get_weight(), adjusted_policy["priority"], i["parallel"]) for i in filtered],
-            key=lambda x: x[1], reverse=True)
+            laura = self.__laura_weights(features, prompt, mask, allowed)
+        logging.debug(f"AI-Classification: {features.ids[mask].tolist()}")
+
+        combined = (latency + accuracy + quality) * Balancer.POLICY_WEIGHT + token * Balancer.TOKEN_WEIGHT + \
+            laura * Balancer.LAURA_WEIGHT
+        rows = [int(i) for i in np.flatnonzero(mask)]
+        rows.sort(key=lambda i: combined[i], reverse=True)
+        uses_policy = classifier is None or classifier == "policy"
+        return ClassificationResult(
+            ranking=tuple(
+                (int(features.ids[i]), float(combined[i]), policy["priority"], features.parallel[i]) for i in rows
+            ),
+            scores=tuple(
+                ModelScore(
+                    model_id=int(features.ids[i]),
+                    latency_weight=float(latency[i]) if uses_policy else -1,
+                    accuracy_weight=float(accuracy[i]) if uses_policy else -1,
+                    quality_weight=float(quality[i]) if uses_policy else -1,
+                    token_weight=float(token[i]) if classifier is None or classifier == "token" else -1,
+                    laura_weight=float(laura[i]) if classifier is None or classifier == "laura" else -1,
+                    combined_weight=float(combined[i]),
+                )
+                for i in rows
+            ),
+        )
+
+    def __laura_weights(self, features: _ModelFeatures, prompt: str, mask: np.ndarray, allowed) -> np.ndarray:
+        with self.__laura_lock:
+            for i in np.flatnonzero(mask):
+                if features.ids[i] not in self.laura.model_db and features.descriptions[i] is not None:
+                    self.laura.register_model(int(features.ids[i]), features.descriptions[i])
+        return AIClassifier.weights(self.laura, prompt, features.ids, allowed)
+
+    @staticmethod
+    def __resolve_threshold(threshold: float, weights: np.ndarray, mask: np.ndarray) -> float:
+        """
+        Thresholds of 1024 / -1024 stand for the best / worst value among the allowed models.
+        """
+        if threshold not in (1024, -1024):
+            return threshold
+        if not mask.any():
+            return 0
+        return float(weights[mask].max() if threshold == 1024 else weights[mask].min())
 
     def calc_weight(self, model):
         """
@@ -109,14 +194,3 @@ class ClassificationManager:
             self.WEIGHT_COST * model["weight_cost"] + \
             self.WEIGHT_LATENCY * model["weight_latency"] + \
             self.WEIGHT_QUALITY * model["weight_quality"]
-
-    def get_special_weight(self, category: str, maximum=True, allowed=None):
-        weight = -1e10 if maximum else 1e10
-        found = False
-        for model in self.models:
-            if (not allowed or model["id"] in allowed) and ((model[category] > weight and maximum) or (model[category] < weight and not maximum)):
-                weight = model[category]
-                found = True
-        if not found:
-            return 0
-        return weight
@@ -3,6 +3,9 @@ Classifier using AI to classify prompts to keywords.
 """
 import logging
 from typing import List
+
+import numpy as np
+
 from logos.classification.classifier import Classifier
 from logos.classification.laura_embedding_classifier import LauraEmbeddingClassifier
 
@@ -12,14 +15,24 @@ class AIClassifier(Classifier):
         super().__init__(models)
         self.ids = {i["id"] for i in models}
 
+    @staticmethod
+    def weights(laura: LauraEmbeddingClassifier, prompt: str, ids, allowed=None) -> np.ndarray:
+        """
+        LAURA weight of each model id for the prompt, models outside of allowed get 0.
+        """
+        allowed = list(allowed) if allowed else list()
+        ranking = laura.classify_prompt(prompt, top_k=len(allowed) if allowed else len(laura.model_db),
+                                        allowed=allowed)
+        ranking = dict(ranking)
+        return np.array([ranking.get(int(idx), 0.) for idx in ids], dtype=np.float64)
+
     def classify(self, prompt: str, _: dict, *args, **kwargs) -> List:
         laura: LauraEmbeddingClassifier = kwargs["laura"]
         for model in self.models:
             if model["id"] not in laura.model_db:
                 laura.register_model(model["id"], model["description"])
-        ranking = laura.classify_prompt(prompt, top_k=len(laura.allowed) if laura.allowed else len(laura.model_db))
-        ranking = {idx: value for (idx, value) in ranking}
-        for model in self.models:
-            model["classification_weight"].add_weight(ranking[model["id"]], "ai")
-            logging.debug(f"Laura weight for model {model['id']} is: {ranking[model["id"]]}")
+        weights = self.weights(laura, prompt, [model["id"] for model in self.models], laura.allowed)
+        for model, weight in zip(self.models, weights):
+            model["classification_weight"].add_weight(float(weight), "ai")
+            logging.debug(f"Laura weight for model {model['id']} is: {weight}")
         return self.models
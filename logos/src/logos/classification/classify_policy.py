@@ -4,12 +4,13 @@ Module filtering available LLMs by a given policy.
 import logging
 from copy import deepcopy
 from typing import List
-import math
+
+import numpy as np
 
 from logos.classification.classifier import Classifier
 
 def sigmoid(x, t, k=0.0625):
-    return 1 / (1 + math.pow(math.e, -k*(x-t)))
+    return 1 / (1 + np.exp(-k * (np.asarray(x, dtype=np.float64) - t)))
 
 
 class PolicyClassifier(Classifier):
@@ -23,40 +24,43 @@ class PolicyClassifier(Classifier):
     def __init__(self, models: List[dict]) -> None:
         super().__init__(models)
 
+    @classmethod
+    def hard_filter(cls, threshold_privacy: str, threshold_cost: float, privacy: np.ndarray, cost: np.ndarray) -> np.ndarray:
+        """
+        Mask of the models passing the privacy and cost thresholds.
+        privacy holds the index of each model's privacy level in PolicyClassifier.privacy.
+        """
+        # Privacy
+        mask = cls.privacy.index(threshold_privacy) >= privacy
+        # Cost: The higher the value the cheaper
+        mask &= threshold_cost <= cost
+        return mask
+
+    @staticmethod
+    def soft_weight(weights: np.ndarray, threshold: float, strict=False) -> np.ndarray:
+        """
+        Weights of the models for a latency, accuracy or quality threshold. The higher the value the better.
+        """
+        weight = sigmoid(weights, threshold)
+        if strict:
+            weight = np.where(threshold <= weights, weight, 0.)
+        return weight
+
     def classify(self, _: str, policy: dict, strict=False, *args, **kwargs) -> List:
         models = deepcopy(self.models)
 
         # Hard Filtering
-        # Privacy
-        privacy = lambda x: self.privacy.index(policy["threshold_privacy"]) >= self.privacy.index(x["weight_privacy"])
-        models = [i for i in models if privacy(i)]
-        # Cost: The higher the value the cheaper
-        cost = lambda x: policy["threshold_cost"] <= x["weight_cost"]
-        models = [i for i in models if cost(i)]
+        mask = self.hard_filter(
+            policy["threshold_privacy"], policy["threshold_cost"],
+            np.array([self.privacy.index(model["weight_privacy"]) for model in models], dtype=np.int64),
+            np.array([model["weight_cost"] for model in models], dtype=np.float64))
+        models = [model for model, allowed in zip(models, mask) if allowed]
 
         # Soft Filtering
-        # Latency: The higher the value the shorter the response time per token
-        for model in models:
-            if not strict or policy["threshold_latency"] <= model["weight_latency"]:
-                weight = sigmoid(model["weight_latency"], policy["threshold_latency"])
-            else:
-                weight = 0
-            logging.debug(f"Latency weight for model {model['id']} is: {weight}")
-            model["classification_weight"].add_weight(weight, "policy")
-        # Accuracy: The higher the value the better the result accuracy
-        for model in models:
-            if not strict or policy["threshold_accuracy"] <= model["weight_accuracy"]:
-                weight = sigmoid(model["weight_accuracy"], policy["threshold_accuracy"])
-            else:
-                weight = 0
-            model["classification_weight"].add_weight(weight, "policy")
-            logging.debug(f"Accuracy weight for model {model['id']} is: {weight}")
-        # Quality: The higher the value the higher the result quality
-        for model in models:
-            if not strict or policy["threshold_quality"] <= model["weight_quality"]:
-                weight = sigmoid(model["weight_quality"], policy["threshold_quality"])
-            else:
-                weight = 0
-            model["classification_weight"].add_weight(weight, "policy")
-            logging.debug(f"Quality weight for model {model['id']} is: {weight}")
+        for category in ("latency", "accuracy", "quality"):
+            weights = self.soft_weight(np.array([model[f"weight_{category}"] for model in models], dtype=np.float64),
+                                       policy[f"threshold_{category}"], strict)
+            for model, weight in zip(models, weights):
+                model["classification_weight"].add_weight(float(weight), "policy")
+                logging.debug(f"{category.capitalize()} weight for model {model['id']} is: {weight}")
         return models
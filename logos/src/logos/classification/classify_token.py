@@ -2,7 +2,10 @@
 Classifier using keywords in prompts.
 """
 import logging
-from typing import List
+from typing import List, Tuple
+
+import numpy as np
+
 from logos.classification.classifier import Classifier
 
 
@@ -10,11 +13,32 @@ class TokenClassifier(Classifier):
     def __init__(self, models: List[dict]) -> None:
         super().__init__(models)
 
+    @staticmethod
+    def tag_matrix(models: List[dict]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Unique lower-case tags of the models, their membership matrix (models x tags) and the number of tags per model.
+        """
+        tags = [(model["tags"] or "").split(" ") for model in models]
+        unique = sorted({tag.lower() for model_tags in tags for tag in model_tags})
+        column = {tag: i for i, tag in enumerate(unique)}
+        matrix = np.zeros((len(models), len(unique)), dtype=np.float64)
+        for row, model_tags in enumerate(tags):
+            for tag in model_tags:
+                matrix[row, column[tag.lower()]] += 1
+        return unique, matrix, np.array([len(model_tags) for model_tags in tags], dtype=np.float64)
+
+    @staticmethod
+    def weights(prompt: str, tags: List[str], matrix: np.ndarray, count: np.ndarray) -> np.ndarray:
+        """
+        Share of each model's tags contained in the prompt.
+        """
+        prompt = prompt.lower()
+        present = np.array([tag in prompt for tag in tags], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(count > 0, matrix @ present / count, 0.)
+
     def classify(self, prompt: str, _: dict, *args, **kwargs) -> List:
-        for model in self.models:
-            tags = model["tags"].split(" ")
-            matches = sum(1 for tag in tags if tag.lower() in prompt.lower())
-            relative = matches / len(tags) if tags else 0
-            model["classification_weight"].add_weight(relative, "token")
+        for model, relative in zip(self.models, self.weights(prompt, *self.tag_matrix(self.models))):
+            model["classification_weight"].add_weight(float(relative), "token")
             logging.debug(f"Token weight for model {model['id']} is: {relative}")
         return self.models
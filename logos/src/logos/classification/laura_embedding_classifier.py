@@ -1,4 +1,8 @@
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
 
 from sentence_transformers import SentenceTransformer, util
 import torch
@@ -6,81 +10,229 @@ import pickle
 import os
 
 
+class _EncodeBatcher:
+    """
+    Collects texts from concurrently classifying threads and encodes them in a single forward pass.
+    While one batch is being encoded, new texts queue up and are encoded together in the next pass. The leader
+    of a batch can additionally wait `window` seconds for others to join.
+    """
+    def __init__(self, encode, window=0.0, max_batch=64):
+        self.encode = encode
+        self.window = window
+        self.max_batch = max_batch
+        self.cond = threading.Condition()
+        self.pending = list()
+        self.leader = False
+
+    def __call__(self, text: str) -> torch.Tensor:
+        slot = {"text": text, "result": None, "error": None, "done": False}
+        with self.cond:
+            self.pending.append(slot)
+            self.cond.notify_all()
+            while not slot["done"]:
+                if self.leader:
+                    self.cond.wait()
+                else:
+                    self.__lead()
+        if slot["error"] is not None:
+            raise slot["error"]
+        return slot["result"]
+
+    def __lead(self):
+        # Called with the condition held. Releases it while the model is busy so the next batch can form.
+        self.leader = True
+        deadline = time.monotonic() + self.window
+        while len(self.pending) < self.max_batch and (remaining := deadline - time.monotonic()) > 0:
+            self.cond.wait(remaining)
+        batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+        self.cond.release()
+        try:
+            embeddings = self.encode([s["text"] for s in batch])
+            for s, embedding in zip(batch, embeddings):
+                s["result"] = embedding
+        except Exception as e:
+            for s in batch:
+                s["error"] = e
+        finally:
+            self.cond.acquire()
+            for s in batch:
+                s["done"] = True
+            self.leader = False
+            self.cond.notify_all()
+
+
 # noinspection PyTypeChecker
 class LauraEmbeddingClassifier:
-    def __init__(self, model_name="all-MiniLM-L6-v2", db_path="laura_embeddings.pkl", allowed=None):
+    """
+    Embedding based model ranking. Model embeddings are persisted in an append-only log of pickled records:
+    a full snapshot (dict) followed by (model_id, embedding) updates, where an embedding of None removes a model.
+    The log is compacted into a single snapshot once it holds `compact_factor` times more records than models.
+    """
+    def __init__(self, model_name="all-MiniLM-L6-v2", db_path="laura_embeddings.pkl", allowed=None,
+                 prompt_cache_size=4096, batch_window=0.0, compact_factor=4):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model = SentenceTransformer(model_name, device=str(self.device))
         self.db_path = db_path
+        self.compact_factor = compact_factor
+        self.log_records = 0
         self.model_db = self.load_db()
         self.allowed = allowed if allowed else []
+        self.prompt_cache_size = prompt_cache_size
+        self.prompt_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.batcher = _EncodeBatcher(self.encode_texts, window=batch_window)
+        # Guards model_db and the matrix built from it, re-entrant so that changes can invalidate the matrix
+        self.matrix_lock = threading.RLock()
+        self.matrix = None
+        self.matrix_ids = list()
+        self.matrix_index = dict()
 
     def remove_db(self):
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
-        self.model_db = {}
+        with self.matrix_lock:
+            if os.path.exists(self.db_path):
+                os.remove(self.db_path)
+            self.model_db = {}
+            self.log_records = 0
+            self.invalidate_matrix()
 
     def load_db(self):
-        if os.path.exists(self.db_path):
-            with open(self.db_path, "rb") as f:
-                return pickle.load(f)
-        return {}
+        db = {}
+        self.log_records = 0
+        if not os.path.exists(self.db_path):
+            return db
+        with open(self.db_path, "rb") as f:
+            while True:
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    break
+                except pickle.UnpicklingError:
+                    logging.warning("Truncated record in %s, ignoring the tail", self.db_path)
+                    break
+                self.log_records += 1
+                if isinstance(record, dict):
+                    db = record
+                else:
+                    model_id, embedding = record
+                    if embedding is None:
+                        db.pop(model_id, None)
+                    else:
+                        db[model_id] = embedding
+        return db
 
     def save_db(self):
-        with open(self.db_path, "wb") as f:
-            pickle.dump(self.model_db, f)
+        """Writes a compacted snapshot of the whole DB."""
+        tmp_path = f"{self.db_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({mid: emb.cpu() for mid, emb in self.model_db.items()}, f)
+        os.replace(tmp_path, self.db_path)
+        self.log_records = 1
+
+    def append_db(self, model_id, embedding):
+        """Appends a single update instead of rewriting the whole DB."""
+        with open(self.db_path, "ab") as f:
+            pickle.dump((model_id, embedding.cpu() if embedding is not None else None), f)
+        self.log_records += 1
+        if self.log_records > self.compact_factor * max(1, len(self.model_db)):
+            self.save_db()
+
+    def invalidate_matrix(self):
+        with self.matrix_lock:
+            self.matrix = None
+
+    def get_matrix(self):
+        """Returns the contiguous (N, D) matrix of model embeddings, rebuilt only after changes."""
+        with self.matrix_lock:
+            if self.matrix is None and self.model_db:
+                self.matrix_ids = list(self.model_db.keys())
+                self.matrix_index = {mid: i for i, mid in enumerate(self.matrix_ids)}
+                self.matrix = torch.stack([self.model_db[mid] for mid in self.matrix_ids]).to(self.device).contiguous()
+            return self.matrix, self.matrix_ids, self.matrix_index
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return re.sub(r"\s+", " ", text.strip())
+
+    def encode_texts(self, texts):
+        return self.model.encode(texts, convert_to_tensor=True, normalize_embeddings=True)
 
     def encode_text(self, text: str, prefix="query:") -> torch.Tensor:
-        full_text = f"{prefix} {text.strip()}"
-        embedding = self.model.encode(full_text, convert_to_tensor=True, normalize_embeddings=True)
+        full_text = f"{prefix} {self.normalize_text(text)}"
+        with self.cache_lock:
+            embedding = self.prompt_cache.get(full_text)
+            if embedding is not None:
+                self.prompt_cache.move_to_end(full_text)
+                return embedding
+        embedding = self.batcher(full_text)
+        with self.cache_lock:
+            self.prompt_cache[full_text] = embedding
+            if len(self.prompt_cache) > self.prompt_cache_size:
+                self.prompt_cache.popitem(last=False)
         return embedding
 
     def register_model(self, model_id: str, description: str):
         """Register or update a model with a 'passage:' embedding."""
         embedding = self.encode_text(description, prefix="passage:")
-        self.model_db[model_id] = embedding
-        self.save_db()
+        with self.matrix_lock:
+            self.model_db[model_id] = embedding
+            self.invalidate_matrix()
+            self.append_db(model_id, embedding)
 
     def remove_model(self, model_id: str):
-        if model_id in self.model_db:
-            del self.model_db[model_id]
-            self.save_db()
+        with self.matrix_lock:
+            if model_id in self.model_db:
+                del self.model_db[model_id]
+                self.invalidate_matrix()
+                self.append_db(model_id, None)
 
-    def classify_prompt(self, prompt: str, top_k: int = 1):
+    def classify_prompt(self, prompt: str, top_k: int = 1, allowed=None):
         """Returns top-k most similar model IDs for a given prompt."""
         if not self.model_db:
             return []
+        allowed = self.allowed if allowed is None else allowed
         query_emb = self.encode_text(prompt, prefix="query:")
-        logging.debug(f"Allowed: {self.allowed}")
-        logging.debug(f"Keys: {list(self.model_db.keys())}")
-        model_ids = list(i for i in self.model_db.keys() if i in self.allowed or not self.allowed)
-        model_matrix = torch.stack([self.model_db[mid] for mid in model_ids])
-        sims = util.cos_sim(query_emb, model_matrix).squeeze(0)  # shape: (N,)
-        top_indices = torch.topk(sims, k=min(top_k, len(model_ids))).indices.tolist()
-        return [(model_ids[i], sims[i].item()) for i in top_indices]
+        logging.debug(f"Allowed: {allowed}")
+        matrix, model_ids, index = self.get_matrix()
+        sims = util.cos_sim(query_emb, matrix).squeeze(0)  # shape: (N,)
+        if allowed:
+            rows = [index[mid] for mid in allowed if mid in index]
+            if not rows:
+                return []
+            model_ids = [model_ids[i] for i in rows]
+            sims = sims[torch.tensor(rows, device=sims.device)]
+        top = torch.topk(sims, k=min(top_k, len(model_ids)))
+        return [(model_ids[i], value) for i, value in zip(top.indices.tolist(), top.values.tolist())]
 
     def update_feedback(self, prompt: str, correct_model_id: str, alpha: float = 0.05):
         """Adjusts the embedding of a model based on positive feedback using weighted average."""
         if correct_model_id not in self.model_db:
             return
         prompt_emb = self.encode_text(prompt, prefix="query:")
-        existing_emb = self.model_db[correct_model_id]
-        updated_emb = torch.nn.functional.normalize(
-            (1 - alpha) * existing_emb + alpha * prompt_emb,
-            p=2, dim=0
-        )
-        self.model_db[correct_model_id] = updated_emb
-        self.save_db()
+        with self.matrix_lock:
+            existing_emb = self.model_db.get(correct_model_id)
+            if existing_emb is None:
+                return
+            updated_emb = torch.nn.functional.normalize(
+                (1 - alpha) * existing_emb + alpha * prompt_emb,
+                p=2, dim=0
+            )
+            self.model_db[correct_model_id] = updated_emb
+            self.invalidate_matrix()
+            self.append_db(correct_model_id, updated_emb)
 
     def update_negative_feedback(self, prompt: str, wrong_model_id: str, alpha: float = 0.05):
         """Reduces the similarity of a model with a prompt through negative feedback."""
         if wrong_model_id not in self.model_db:
             return
         prompt_emb = self.encode_text(prompt, prefix="query:")
-        model_emb = self.model_db[wrong_model_id]
-        updated_emb = torch.nn.functional.normalize(
-            (1 + alpha) * model_emb - alpha * prompt_emb,
-            p=2, dim=0
-        )
-        self.model_db[wrong_model_id] = updated_emb
-        self.save_db()
+        with self.matrix_lock:
+            model_emb = self.model_db.get(wrong_model_id)
+            if model_emb is None:
+                return
+            updated_emb = torch.nn.functional.normalize(
+                (1 + alpha) * model_emb - alpha * prompt_emb,
+                p=2, dim=0
+            )
+            self.model_db[wrong_model_id] = updated_emb
+            self.invalidate_matrix()
+            self.append_db(wrong_model_id, updated_emb)
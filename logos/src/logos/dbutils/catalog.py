@@ -0,0 +1,132 @@
+"""
+Read-through in-memory cache of the Logos catalog (models, providers, provider configs, api keys and policies).
+
+The request hot path reads its routing data from here instead of the database. Every mutation endpoint under
+/logosdb/* invalidates the cache explicitly, entries additionally expire after a TTL as a fallback for changes
+made directly in the database. Lookups that found nothing are not cached, and callers get their own copy of every
+value, so they cannot change the cached one.
+"""
+import copy
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Union
+
+from logos.dbutils.dbmanager import DBManager
+from logos.singleton import singleton
+
+CATALOG_TTL = float(os.getenv("LOGOS_CATALOG_TTL", "60"))
+
+
+def is_error(value: Any) -> bool:
+    """
+    Whether a loaded value stands for a failed lookup, like the {"error": ...} dicts of DBManager.
+    """
+    return value is None or (isinstance(value, dict) and "error" in value)
+
+
+@singleton
+class Catalog:
+    def __init__(self, ttl: float = CATALOG_TTL) -> None:
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__entries: Dict[tuple, tuple] = dict()
+        self.__generation = 0
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def cached(self, namespace: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns a copy of the cached value for (namespace, key) or loads and stores it.
+        Failed lookups (see is_error) are returned without being stored.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get((namespace, key))
+            if entry is not None and entry[0] > now:
+                self.hits[namespace] += 1
+                return copy.deepcopy(entry[1])
+            self.misses[namespace] += 1
+            generation = self.__generation
+        value = loader()
+        if is_error(value):
+            return value
+        with self.__lock:
+            # Do not store values loaded before a concurrent invalidation
+            if generation == self.__generation:
+                self.__entries[(namespace, key)] = (now + self.ttl, value)
+        return copy.deepcopy(value)
+
+    def invalidate(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.__lock:
+            namespaces = set(self.hits) | set(self.misses)
+            return {
+                "entries": len(self.__entries),
+                "ttl": self.ttl,
+                "namespaces": {
+                    ns: {
+                        "hits": self.hits[ns],
+                        "misses": self.misses[ns],
+                        "hit_rate": self.hits[ns] / (self.hits[ns] + self.misses[ns]),
+                    }
+                    for ns in sorted(namespaces)
+                },
+            }
+
+    def __load_models(self) -> Dict[int, dict]:
+        with DBManager() as db:
+            return {model["id"]: model for model in db.get_all_model_entries()}
+
+    def get_all_models(self) -> List[dict]:
+        return list(self.cached("models", None, self.__load_models).values())
+
+    def get_model(self, model_id: int) -> Union[dict, None]:
+        return self.cached("models", None, self.__load_models).get(int(model_id))
+
+    def get_provider(self, provider_id: int) -> Union[dict, None]:
+        def load():
+            with DBManager() as db:
+                return db.get_provider(provider_id)
+        return self.cached("providers", int(provider_id), load)
+
+    def get_provider_to_model(self, model_id: int) -> Union[dict, None]:
+        def load():
+            with DBManager() as db:
+                return db.get_provider_to_model(model_id)
+        return self.cached("model_providers", int(model_id), load)
+
+    def get_key_to_model_provider(self, model_id: int, provider_id: int) -> Union[str, None]:
+        def load():
+            with DBManager() as db:
+                return db.get_key_to_model_provider(model_id, provider_id)
+        return self.cached("api_keys", (int(model_id), int(provider_id)), load)
+
+    def get_policy(self, logos_key: str, policy_id: int) -> dict:
+        def load():
+            with DBManager() as db:
+                return db.get_policy(logos_key, policy_id)
+        return self.cached("policies", (logos_key, int(policy_id)), load)
+
+    def get_models_with_key(self, logos_key: str) -> List[int]:
+        def load():
+            with DBManager() as db:
+                return db.get_models_with_key(logos_key)
+        return self.cached("key_models", logos_key, load)
+
+    def get_models_by_profile(self, logos_key: str, profile_id: int) -> List[int]:
+        def load():
+            with DBManager() as db:
+                return db.get_models_by_profile(logos_key, profile_id)
+        return self.cached("profile_models", (logos_key, int(profile_id)), load)
+
+    def get_providers(self, logos_key: str) -> List[int]:
+        def load():
+            with DBManager() as db:
+                return db.get_providers(logos_key)
+        return self.cached("key_providers", logos_key, load)
@@ -0,0 +1,232 @@
+"""
+Background writer for request logs and usage accounting.
+
+Timestamps and response payloads of proxied requests are put into an in-memory queue and written by a worker
+thread in batches, so logging never adds database latency to the proxied response.
+"""
+import asyncio
+import atexit
+import collections
+import datetime
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Tuple
+
+from logos.dbutils.dbmanager import DBManager
+from logos.singleton import singleton
+
+LOG_QUEUE_SIZE = int(os.getenv("LOGOS_LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOGOS_LOG_BATCH_SIZE", "200"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOGOS_LOG_FLUSH_INTERVAL", "0.5"))
+# "drop": drop every entry if the queue is full
+# "block": wait up to LOGOS_LOG_BLOCK_TIMEOUT seconds for space, then drop
+# "prefer_billing": drop timestamp updates right away, but wait for space for payloads carrying token usage
+# On the event loop thread nothing waits, entries that would wait are kept in an overflow of the same size instead
+LOG_DROP_POLICY = os.getenv("LOGOS_LOG_DROP_POLICY", "prefer_billing")
+LOG_BLOCK_TIMEOUT = float(os.getenv("LOGOS_LOG_BLOCK_TIMEOUT", "0.05"))
+
+_STOP = object()
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+@singleton
+class UsageLogWriter:
+    def __init__(self, max_queue: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, drop_policy: str = LOG_DROP_POLICY) -> None:
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.overflow = collections.deque()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.token_type_cache: Dict[str, int] = dict()
+        self.__thread = None
+        self.__lock = threading.Lock()
+        self.__stopped = False
+        self.counters = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written": 0,
+            "failed": 0,
+            "flushes": 0,
+            "last_flush_seconds": 0.0,
+            "max_flush_seconds": 0.0,
+            "total_flush_seconds": 0.0,
+        }
+
+    def start(self):
+        with self.__lock:
+            if self.__thread is not None and self.__thread.is_alive():
+                return
+            self.__stopped = False
+            self.__thread = threading.Thread(target=self.__run, name="UsageLogWriter", daemon=True)
+            self.__thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Flushes everything still queued and stops the worker. Called on application shutdown.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                return
+            self.__stopped = True
+            thread, self.__thread = self.__thread, None
+        self.queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logging.error("Usage log writer did not finish flushing within %.1fs", timeout)
+        logging.info("Usage log writer stopped: %s", self.stats())
+
+    def set_time_at_first_token(self, log_id: int):
+        self.__put(("time_at_first_token", log_id, _now()))
+
+    def set_forward_timestamp(self, log_id: int):
+        self.__put(("timestamp_forwarding", log_id, _now()))
+
+    def set_response_timestamp(self, log_id: int):
+        self.__put(("timestamp_response", log_id, _now()))
+
+    def set_response_payload(self, log_id: int, payload: dict, provider_id=None, model_id=None, usage=None,
+                             policy_id=-1, classified=None):
+        self.__put(("payload", log_id, {
+            "log_id": log_id,
+            "payload": payload,
+            "provider_id": provider_id,
+            "model_id": model_id,
+            "usage": usage,
+            "policy_id": policy_id,
+            "classified": classified,
+            "timestamp": _now(),
+        }))
+
+    def stats(self) -> Dict[str, Any]:
+        flushes = self.counters["flushes"]
+        return {
+            **self.counters,
+            "queue_depth": self.queue.qsize(),
+            "avg_flush_seconds": self.counters["total_flush_seconds"] / flushes if flushes else 0.0,
+        }
+
+    def __put(self, item: Tuple[str, int, Any]):
+        if item[1] is None:
+            return
+        if self.__stopped:
+            # Shutdown already started, write directly
+            self.flush([item])
+            return
+        if self.__thread is None:
+            self.start()
+        block = self.drop_policy == "block" or (self.drop_policy == "prefer_billing" and item[0] == "payload")
+        # Waiting for space would stall every request served by the event loop
+        overflow = block and _on_event_loop()
+        try:
+            self.queue.put(item, block=block and not overflow, timeout=LOG_BLOCK_TIMEOUT if block else None)
+            self.counters["enqueued"] += 1
+            return
+        except queue.Full:
+            pass
+        if overflow and len(self.overflow) < self.queue.maxsize:
+            # deque.append is thread-safe, the worker takes these entries before the queued ones
+            self.overflow.append(item)
+            self.counters["enqueued"] += 1
+            return
+        self.counters["dropped"] += 1
+        logging.warning("Usage log queue full, dropped %s for log entry %s", item[0], item[1])
+
+    def __take_overflow(self, batch: List[Tuple[str, int, Any]], limit: int):
+        while len(batch) < limit:
+            try:
+                batch.append(self.overflow.popleft())
+            except IndexError:
+                return
+
+    def __run(self):
+        stop = False
+        while not stop:
+            batch = list()
+            self.__take_overflow(batch, self.batch_size)
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            if stop:
+                # Drain whatever is left before exiting
+                while True:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+                self.__take_overflow(batch, len(batch) + len(self.overflow))
+            for start in range(0, len(batch), self.batch_size):
+                self.flush(batch[start:start + self.batch_size])
+
+    def flush(self, batch: List[Tuple[str, int, Any]]):
+        """
+        Writes a batch of log operations in a single transaction. If the transaction fails, the batch is split and
+        written in halves, so only the entries that fail on their own are dropped.
+        """
+        if not batch:
+            return
+        start = time.perf_counter()
+        failed = self.__write(batch)
+        self.counters["written"] += len(batch) - failed
+        self.counters["failed"] += failed
+        elapsed = time.perf_counter() - start
+        self.counters["flushes"] += 1
+        self.counters["last_flush_seconds"] = elapsed
+        self.counters["total_flush_seconds"] += elapsed
+        self.counters["max_flush_seconds"] = max(self.counters["max_flush_seconds"], elapsed)
+
+    def __write(self, batch: List[Tuple[str, int, Any]]) -> int:
+        """Writes the batch and returns the number of dropped entries."""
+        timestamps = dict()
+        payloads = list()
+        for kind, log_id, value in batch:
+            if kind == "payload":
+                payloads.append(value)
+            else:
+                timestamps.setdefault(kind, list()).append((log_id, value))
+        try:
+            self.write_batch(timestamps, payloads)
+            return 0
+        except Exception as e:
+            # Token types might have been created in the rolled back transaction
+            self.token_type_cache.clear()
+            if len(batch) == 1:
+                logging.error("Could not write %s for log entry %s: %s", batch[0][0], batch[0][1], e)
+                return 1
+        middle = len(batch) // 2
+        return self.__write(batch[:middle]) + self.__write(batch[middle:])
+
+    def write_batch(self, timestamps: Dict[str, List[Tuple[int, datetime.datetime]]], payloads: List[Dict[str, Any]]):
+        with DBManager() as db:
+            try:
+                for column, entries in timestamps.items():
+                    db.set_log_timestamps(column, entries)
+                db.set_response_payloads(payloads, self.token_type_cache)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 import os
@@ -11,12 +12,17 @@ from grpclocal import model_pb2_grpc
 from grpclocal.grpc_server import LogosServicer
 from logos.classification.classification_balancer import Balancer
 from logos.classification.classification_manager import ClassificationManager
-from logos.dbutils.dbmanager import DBManager
+from logos.dbutils.catalog import Catalog
+from logos.dbutils.dbmanager import DBManager, get_metadata, dispose_engine
+from logos.dbutils.usage_log_writer import UsageLogWriter
 from logos.dbutils.dbrequest import *
 from logos.responses import get_streaming_response, get_standard_response, get_client_ip, request_setup, \
     proxy_behaviour, resource_behaviour
+from logos.scheduling.scheduler import Scheduler
 from logos.scheduling.scheduling_fcfs import FCFSScheduler
+from logos.scheduling.scheduling_priority import PriorityScheduler
 from logos.scheduling.scheduling_manager import SchedulingManager
+from logos.upstream_clients import close_clients
 from scripts import setup_proxy
 
 from scripts.setup_proxy import setup
@@ -38,6 +44,19 @@ app.add_middleware(
 )
 
 
+def invalidates_catalog(endpoint):
+    """
+    Clears the catalog cache after a mutating /logosdb endpoint has run.
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            Catalog().invalidate()
+    return wrapper
+
+
 @app.on_event("startup")
 async def start_grpc():
     global _grpc_server
@@ -65,31 +84,48 @@ async def start_grpc():
 @app.on_event("startup")
 async def start_handlers():
     global _scheduler
-    _scheduler = SchedulingManager(FCFSScheduler())
+    # Create the shared connection pool and reflect the schema once before serving requests
+    get_metadata()
+    UsageLogWriter().start()
+    _scheduler = SchedulingManager(scheduler())
     classifier()
 
 
+def scheduler() -> Scheduler:
+    """
+    Selects the scheduling strategy via LOGOS_SCHEDULER ("fcfs" or "priority").
+    """
+    if os.getenv("LOGOS_SCHEDULER", "fcfs").lower() == "priority":
+        return PriorityScheduler(
+            aging_interval=float(os.getenv("LOGOS_SCHEDULER_AGING_INTERVAL", "5")),
+            max_wait=float(os.getenv("LOGOS_SCHEDULER_MAX_WAIT", "60")),
+            fallback_depth=int(os.getenv("LOGOS_SCHEDULER_FALLBACK_DEPTH", "3")),
+        )
+    return FCFSScheduler()
+
+
 def classifier():
     mdls = list()
-    with DBManager() as db:
-        for model in db.get_all_models():
-            tpl = db.get_model(model)
-            model = {
-                "id": tpl["id"],
-                "name": tpl["name"],
-                "endpoint": tpl["endpoint"],
-                "api_id": tpl["api_id"],
-                "weight_privacy": tpl["weight_privacy"],
-                "weight_latency": tpl["weight_latency"],
-                "weight_accuracy": tpl["weight_accuracy"],
-                "weight_cost": tpl["weight_cost"],
-                "weight_quality": tpl["weight_quality"],
-                "tags": tpl["tags"],
-                "parallel": tpl["parallel"],
-                "description": tpl["description"],
-                "classification_weight": Balancer(),
-            }
-            mdls.append(model)
+    # Read from the database, the catalog is only invalidated once the mutating endpoint has returned
+    with DBManager() as db:
+        entries = db.get_all_model_entries()
+    for tpl in entries:
+        model = {
+            "id": tpl["id"],
+            "name": tpl["name"],
+            "endpoint": tpl["endpoint"],
+            "api_id": tpl["api_id"],
+            "weight_privacy": tpl["weight_privacy"],
+            "weight_latency": tpl["weight_latency"],
+            "weight_accuracy": tpl["weight_accuracy"],
+            "weight_cost": tpl["weight_cost"],
+            "weight_quality": tpl["weight_quality"],
+            "tags": tpl["tags"],
+            "parallel": tpl["parallel"],
+            "description": tpl["description"],
+            "classification_weight": Balancer(),
+        }
+        mdls.append(model)
     global _classifier
     _classifier = ClassificationManager(mdls)
     _classifier.update_manager(mdls)
@@ -102,9 +138,13 @@ async def stop_grpc():
         await _grpc_server.stop(0)
     sm = SchedulingManager(FCFSScheduler())
     sm.stop()
+    await close_clients()
+    UsageLogWriter().stop()
+    dispose_engine()
 
 
 @app.post("/logosdb/setup")
+@invalidates_catalog
 async def setup_db(data: LogosSetupRequest):
     try:
         logging.info("Receiving setup request...")
@@ -123,6 +163,7 @@ async def setup_db(data: LogosSetupRequest):
 
 
 @app.post("/logosdb/add_service_proxy")
+@invalidates_catalog
 async def add_service_proxy(data: AddServiceProxyRequest):
     try:
         with DBManager() as db:
@@ -138,6 +179,7 @@ async def add_service_proxy(data: AddServiceProxyRequest):
 
 
 @app.post("/logosdb/set_log")
+@invalidates_catalog
 async def set_log(data: SetLogRequest):
     with DBManager() as db:
         check, code = db.get_process_id(data.dict()["logos_key"])
@@ -149,54 +191,63 @@ async def set_log(data: SetLogRequest):
 
 
 @app.post("/logosdb/add_provider")
+@invalidates_catalog
 async def add_provider(data: AddProviderRequest):
     with DBManager() as db:
         return db.add_provider(**data.dict())
 
 
 @app.post("/logosdb/add_profile")
+@invalidates_catalog
 async def add_profile(data: AddProfileRequest):
     with DBManager() as db:
         return db.add_profile(**data.dict())
 
 
 @app.post("/logosdb/connect_process_provider")
+@invalidates_catalog
 async def connect_process_provider(data: ConnectProcessProviderRequest):
     with DBManager() as db:
         return db.connect_process_provider(**data.dict())
 
 
 @app.post("/logosdb/connect_process_model")
+@invalidates_catalog
 async def connect_process_model(data: ConnectProcessModelRequest):
     with DBManager() as db:
         return db.connect_process_model(**data.dict())
 
 
 @app.post("/logosdb/connect_profile_model")
+@invalidates_catalog
 async def connect_profile_model(data: ConnectProcessModelRequest):
     with DBManager() as db:
         return db.connect_profile_model(**data.dict())
 
 
 @app.post("/logosdb/connect_service_process")
+@invalidates_catalog
 async def connect_service_process(data: ConnectServiceProcessRequest):
     with DBManager() as db:
         return db.connect_service_process(**data.dict())
 
 
 @app.post("/logosdb/connect_model_provider")
+@invalidates_catalog
 async def connect_model_provider(data: ConnectModelProviderRequest):
     with DBManager() as db:
         return db.connect_model_provider(**data.dict())
 
 
 @app.post("/logosdb/connect_model_api")
+@invalidates_catalog
 async def connect_model_api(data: ConnectModelApiRequest):
     with DBManager() as db:
         return db.connect_model_api(**data.dict())
 
 
 @app.post("/logosdb/add_model")
+@invalidates_catalog
 async def add_model(data: AddModelRequest):
     with DBManager() as db:
         back = db.add_model(**data.dict())
@@ -205,12 +256,14 @@ async def add_model(data: AddModelRequest):
 
 
 @app.post("/logosdb/add_full_model")
+@invalidates_catalog
 async def add_full_model(data: AddFullModelRequest):
     with DBManager() as db:
         return db.add_full_model(**data.dict())
 
 
 @app.post("/logosdb/update_model")
+@invalidates_catalog
 async def update_model(data: GiveFeedbackRequest):
     with DBManager() as db:
         back = db.update_model_weights(**data.dict())
@@ -219,6 +272,7 @@ async def update_model(data: GiveFeedbackRequest):
 
 
 @app.post("/logosdb/delete_model")
+@invalidates_catalog
 async def delete_model(data: DeleteModelRequest):
     with DBManager() as db:
         return db.delete_model(**data.dict())
@@ -231,18 +285,21 @@ async def get_model(data: GetModelRequest):
 
 
 @app.post("/logosdb/add_policy")
+@invalidates_catalog
 async def add_policy(data: AddPolicyRequest):
     with DBManager() as db:
         return db.add_policy(**data.dict())
 
 
 @app.post("/logosdb/update_policy")
+@invalidates_catalog
 async def update_policy(data: UpdatePolicyRequest):
     with DBManager() as db:
         return db.update_policy(**data.dict())
 
 
 @app.post("/logosdb/delete_policy")
+@invalidates_catalog
 async def delete_policy(data: DeletePolicyRequest):
     with DBManager() as db:
         return db.delete_policy(**data.dict())
@@ -255,6 +312,7 @@ async def add_model(data: GetPolicyRequest):
 
 
 @app.post("/logosdb/add_service")
+@invalidates_catalog
 async def add_service(data: AddServiceRequest):
     with DBManager() as db:
         return db.add_service(**data.dict())
@@ -315,11 +373,28 @@ async def export(data: LogosKeyModel):
 
 
 @app.post("/logosdb/import")
+@invalidates_catalog
 async def import_json(data: GetImportDataRequest):
     with DBManager() as db:
         return db.import_from_json(**data.dict())
 
 
+@app.post("/logosdb/get_log_writer_stats")
+async def get_log_writer_stats(data: LogosKeyModel):
+    with DBManager() as db:
+        if not db.check_authorization(data.logos_key):
+            return {"error": "Statistics only available for root user."}, 500
+    return UsageLogWriter().stats(), 200
+
+
+@app.post("/logosdb/get_catalog_stats")
+async def get_catalog_stats(data: LogosKeyModel):
+    with DBManager() as db:
+        if not db.check_authorization(data.logos_key):
+            return {"error": "Statistics only available for root user."}, 500
+    return Catalog().stats(), 200
+
+
 @app.get("/forward_host")
 def route_handler(request: Request):
     host = request.headers.get("x-forwarded-host") or request.headers.get("forwarded")
@@ -355,6 +430,7 @@ async def logos_service(path: str, request: Request):
         headers["Authorization"].replace("Bearer ", "") if "Authorization" in headers else "")
     with DBManager() as db:
         r, c = db.get_process_id(logos_key)
+        privacy_level = None
         if c != 200:
             logging.info("Error while logging a request: %s", r)
             usage_id = None
@@ -364,12 +440,12 @@ async def logos_service(path: str, request: Request):
                 usage_id = None
             else:
                 usage_id = int(r["log-id"])
+                privacy_level = r["privacy-level"]
     # Check if Logos is used as proxy or resource
     models = request_setup(headers, logos_key)
     if not models:
-        with DBManager() as db:
-            # Get available providers for this key
-            providers = db.get_providers(logos_key)
+        # Get available providers for this key
+        providers = Catalog().get_providers(logos_key)
         # Find most suitable provider
         out = proxy_behaviour(headers, providers, path)
         if isinstance(out[0], dict) and "error" in out[0]:
@@ -380,23 +456,23 @@ async def logos_service(path: str, request: Request):
         policy_id = -1
         classified = dict()
     else:
-        out = resource_behaviour(logos_key, headers, json_data, models)
+        out = await resource_behaviour(logos_key, headers, json_data, models)
         if isinstance(out[0], dict) and "error" in out[0]:
             return out
         proxy_headers, forward_url, model_id, model_name, provider_id, provider_name, policy_id, classified = out
     # OpenWebUI expects the model name not in the endpoint but in the data
     if "openwebui" in provider_name.lower():
         json_data["model"] = model_name
-    with DBManager() as db:
-        if usage_id is not None:
-            db.set_forward_timestamp(usage_id)
+    if usage_id is not None:
+        UsageLogWriter().set_forward_timestamp(usage_id)
     # Forward Request
     # Try multiple requesting methods. Start with streaming
     try:
         if "stream" not in json_data or json_data["stream"]:
             logging.info("Sending Streaming Request")
             json_data["stream"] = True
-            return get_streaming_response(forward_url, proxy_headers, json_data, usage_id, provider_id, model_id, policy_id, classified)
+            return get_streaming_response(forward_url, proxy_headers, json_data, usage_id, provider_id, model_id,
+                                          policy_id, classified, privacy_level)
     except:
         traceback.print_exc()
     # Fall back to naive request method
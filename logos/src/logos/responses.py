@@ -1,11 +1,8 @@
-import datetime
-import json
+import asyncio
 import logging
 import time
-from typing import Union
 
 from fastapi.responses import StreamingResponse
-import httpx
 import grpc
 import yaml
 from requests import JSONDecodeError, Response
@@ -13,49 +10,35 @@ from starlette.requests import Request
 
 from logos.classification.classification_manager import ClassificationManager
 from logos.classification.proxy_policy import ProxyPolicy
-from logos.dbutils.dbmanager import DBManager
+from logos.dbutils.catalog import Catalog
+from logos.dbutils.usage_log_writer import UsageLogWriter
 from logos.scheduling.scheduling_fcfs import FCFSScheduler
 from logos.scheduling.scheduling_manager import SchedulingManager
+from logos.stream_accounting import StreamAccounting
+from logos.upstream_clients import get_client, STANDARD_TIMEOUT
 
 
-def get_streaming_response(forward_url, proxy_headers, json_data, log_id, provider_id, model_id, policy_id, classified):
+def get_streaming_response(forward_url, proxy_headers, json_data, log_id, provider_id, model_id, policy_id, classified,
+                           privacy_level="FULL"):
     json_data = json_data.copy()
     json_data["stream"] = True
     json_data["stream_options"] = {"include_usage": True}
 
-    full_text = ""
-    response: Union[None, dict] = None
-    first_response = None
-    ttft = None
+    # Response text is only needed for logs with privacy level FULL
+    accounting = StreamAccounting(
+        keep_text=log_id is not None and privacy_level == "FULL",
+        on_first_token=(lambda: UsageLogWriter().set_time_at_first_token(log_id)) if log_id is not None else None,
+    )
 
     async def streamer():
-        nonlocal full_text, response, first_response, ttft
         try:
-            async with httpx.AsyncClient(timeout=None) as client:
-                async with client.stream("POST", forward_url, headers=proxy_headers, json=json_data) as resp:
-                    async for raw_line in resp.aiter_lines():
-                        if not raw_line:
-                            continue
-                        if raw_line.startswith("data: "):
-                            if ttft is None:
-                                ttft = datetime.datetime.now(datetime.timezone.utc)
-                                with DBManager() as db:
-                                    db.set_time_at_first_token(log_id)
-                            payload = raw_line.removeprefix("data: ").strip()
-                            if payload == "[DONE]":
-                                break
-                            try:
-                                blob = json.loads(payload)
-                                response = blob
-                                if "choices" in blob and blob["choices"] and "delta" in blob["choices"][0] and "content" in blob["choices"][0]["delta"]:
-                                    content = blob["choices"][0]["delta"]["content"]
-                                    if first_response is None:
-                                        first_response = blob
-                                    if content:
-                                        full_text += content
-                            except:
-                                pass
-                        yield (raw_line + "\n").encode()
+            client = get_client(forward_url)
+            async with client.stream("POST", forward_url, headers=proxy_headers, json=json_data) as resp:
+                # Forward the decoded upstream bytes, accounting only inspects them
+                async for chunk in resp.aiter_bytes():
+                    accounting.feed(chunk)
+                    yield chunk
+            accounting.close()
         finally:
             after_streaming()
 
@@ -67,32 +50,34 @@ def get_streaming_response(forward_url, proxy_headers, json_data, log_id, provid
         if log_id is None:
             return
 
-        with DBManager() as db:
-            nonlocal response, ttft, first_response
-            if first_response is not None:
-                usage = response["usage"] if response is not None else dict()
-                first_response["choices"][0]["delta"]["content"] = full_text
-                usage_tokens = dict()
-                for name in usage:
-                    if "tokens_details" in name:
-                        continue
-                    if name in {"approximate_total", "eval_count", "eval_duration", "load_duration", "prompt_eval_count", "prompt_eval_duration", "prompt_token/s", "response_token/s", "total_duration"} or "/s" in name:
-                        continue
-                    usage_tokens[name] = usage[name]
-                if "prompt_tokens_details" in usage:
-                    for name in usage["prompt_tokens_details"]:
-                        usage_tokens["prompt_" + name] = usage["prompt_tokens_details"][name]
-                if "completion_tokens_details" in usage:
-                    for name in usage["completion_tokens_details"]:
-                        usage_tokens["completion_" + name] = usage["completion_tokens_details"][name]
-                first_response["usage"] = response["usage"]
-            else:
-                response = {"content": full_text}
-                first_response = {"content": full_text}
-                usage_tokens = dict()
-            if ttft is None:
-                db.set_time_at_first_token(log_id)
-            db.set_response_payload(log_id, first_response, provider_id, model_id, usage_tokens, policy_id, classified)
+        first_response = accounting.first_response
+        full_text = accounting.text()
+        if first_response is not None:
+            usage = accounting.usage
+            first_response["choices"][0]["delta"]["content"] = full_text
+            usage_tokens = dict()
+            for name in usage:
+                if "tokens_details" in name:
+                    continue
+                if name in {"approximate_total", "eval_count", "eval_duration", "load_duration", "prompt_eval_count", "prompt_eval_duration", "prompt_token/s", "response_token/s", "total_duration"} or "/s" in name:
+                    continue
+                usage_tokens[name] = usage[name]
+            if "prompt_tokens_details" in usage:
+                for name in usage["prompt_tokens_details"]:
+                    usage_tokens["prompt_" + name] = usage["prompt_tokens_details"][name]
+            if "completion_tokens_details" in usage:
+                for name in usage["completion_tokens_details"]:
+                    usage_tokens["completion_" + name] = usage["completion_tokens_details"][name]
+            first_response["usage"] = usage
+            if accounting.truncated:
+                first_response["truncated"] = True
+        else:
+            first_response = {"content": full_text}
+            usage_tokens = dict()
+        writer = UsageLogWriter()
+        if accounting.ttft is None:
+            writer.set_time_at_first_token(log_id)
+        writer.set_response_payload(log_id, first_response, provider_id, model_id, usage_tokens, policy_id, classified)
 
     # Response + call_on_close
     return StreamingResponse(streamer(), media_type="application/json")
@@ -100,14 +85,13 @@ def get_streaming_response(forward_url, proxy_headers, json_data, log_id, provid
 
 async def get_standard_response(forward_url, proxy_headers, json_data, log_id, provider_id, model_id, policy_id, classified):
     try:
-        async with httpx.AsyncClient() as client:
-            response: Response = await client.request(
-                method="POST",
-                url=forward_url,
-                json=json_data,
-                headers=proxy_headers,
-                timeout=30,
-            )
+        response: Response = await get_client(forward_url).request(
+            method="POST",
+            url=forward_url,
+            json=json_data,
+            headers=proxy_headers,
+            timeout=STANDARD_TIMEOUT,
+        )
         try:
             response: dict = response.json()
         except JSONDecodeError:
@@ -127,10 +111,10 @@ async def get_standard_response(forward_url, proxy_headers, json_data, log_id, p
             if "completion_tokens_details" in usage:
                 for name in usage["completion_tokens_details"]:
                     usage_tokens[name] = usage["completion_tokens_details"][name]
-            with DBManager() as db:
-                db.set_time_at_first_token(log_id)
-                db.set_response_timestamp(log_id)
-                db.set_response_payload(log_id, response, provider_id, model_id, usage_tokens, policy_id, classified)
+            writer = UsageLogWriter()
+            writer.set_time_at_first_token(log_id)
+            writer.set_response_timestamp(log_id)
+            writer.set_response_payload(log_id, response, provider_id, model_id, usage_tokens, policy_id, classified)
         return response
     finally:
         if model_id is not None:
@@ -153,6 +137,10 @@ def get_client_ip_address_from_context(context: grpc.ServicerContext) -> str:
 
 
 def parse_provider_config(name):
+    return Catalog().cached("provider_configs", name, lambda: load_provider_config(name))
+
+
+def load_provider_config(name):
     with open(f"./logos/config/config-{name}.yaml") as stream:
         try:
             return yaml.safe_load(stream)
@@ -172,8 +160,7 @@ def proxy_behaviour(headers, providers, path):
     proxy_headers = None
     forward_url = None
     for provider in providers:
-        with DBManager() as db:
-            provider_info = db.get_provider(provider)
+        provider_info = Catalog().get_provider(provider)
 
         if "azure" in provider_info["name"].lower():
             config = parse_provider_config("azure")
@@ -208,30 +195,19 @@ def proxy_behaviour(headers, providers, path):
     return proxy_headers, forward_url, int(provider_info["id"])
 
 
-def resource_behaviour(logos_key, headers, data, models):
+async def resource_behaviour(logos_key, headers, data, models):
     # The interesting part: Classification and scheduling
     # First, retrieve our used policy. If no one is given, use default ProxyPolicy
     if "policy" in headers:
-        with DBManager() as db:
-            policy = db.get_policy(logos_key, int(headers["policy"]))
+        policy = Catalog().get_policy(logos_key, int(headers["policy"]))
     else:
         policy = ProxyPolicy()
     if isinstance(policy, dict) and "error" in policy:
         return {"error": "Could not identify suitable policy."}, 500
     # Get Model name (in case the application already defined which model to use)
     mdl = extract_model(data)
-    tmp_mdls = list()
-    with DBManager() as db:
-        for model in db.get_all_models():
-            tpl = db.get_model(model)
-            model = {
-                "id": tpl["id"],
-                "name": tpl["name"],
-                "parallel": tpl["parallel"],
-            }
-            tmp_mdls.append(model)
     found = False
-    for model in tmp_mdls:
+    for model in Catalog().get_all_models():
         if mdl == model["name"]:
             found = (model["id"], 1024, policy["priority"], model["parallel"])
             break
@@ -241,29 +217,15 @@ def resource_behaviour(logos_key, headers, data, models):
         prompts = extract_prompt(data)
         user_prompt, system_prompt = prompts["user"], prompts["system"]
         start = time.time()
-        mdls = select.classify(user_prompt, policy, allowed=models, system=system_prompt)
+        # Classification is CPU-bound (embeddings), run it in a worker thread to keep the event loop free
+        result = await asyncio.to_thread(select.classify_request, user_prompt, policy, models, None, system_prompt)
         end = time.time()
+        mdls = list(result.ranking)
         if not mdls:
             return {"error": "Could not identify suitable model."}, 500
         logging.info(f"Model weights after classification: {[(i, j) for i, j, _, _ in mdls]}")
-        # Get IDs of classified models
-        classified = {i for i, _, _, _ in mdls}
         classified = {
-            "classification_data": [
-                {
-                    "latency_weight": model["classification_weight"].weights["policy"][0] if len(model["classification_weight"].weights["policy"]) > 0 else -1,
-                    "accuracy_weight": model["classification_weight"].weights["policy"][1] if len(model["classification_weight"].weights["policy"]) > 1 else -1,
-                    "quality_weight": model["classification_weight"].weights["policy"][2] if len(model["classification_weight"].weights["policy"]) > 2 else -1,
-                    "token_weight": model["classification_weight"].weights["token"][0] if len(model["classification_weight"].weights["token"]) > 0 else -1,
-                    "laura_weight": model["classification_weight"].weights["ai"][0] if len(model["classification_weight"].weights["ai"]) > 0 else -1,
-                    "laura_factor": model["classification_weight"].LAURA_WEIGHT,
-                    "token_factor": model["classification_weight"].TOKEN_WEIGHT,
-                    "combined_weight": model["classification_weight"].get_weight(),
-                    "model_id": model["id"],
-                }
-                for model in select.filtered
-                if model["id"] in classified
-            ],
+            "classification_data": result.classification_data(),
             "classification_time": end - start,
         }
     else:
@@ -289,11 +251,8 @@ def resource_behaviour(logos_key, headers, data, models):
     sm.run()
     tid = sm.add_request(data, mdls)
 
-    # Wait for this task to be executed
-    while not sm.is_finished(tid):
-        pass
-
-    out = sm.get_result()
+    # Suspend until a model slot is assigned to this task. Other requests keep being served meanwhile
+    out = await sm.wait_for(tid)
     if out is None:
         return {"error": f"No executable found for task {tid}"}, 500
     model_id = -1
@@ -304,10 +263,10 @@ def resource_behaviour(logos_key, headers, data, models):
             logging.error(f"No executable found for task {tid}")
             out.models = out.models[1:]
             continue
-        with DBManager() as db:
-            model = db.get_model(model_id)
-            provider = db.get_provider_to_model(model_id)
-            api_key = db.get_key_to_model_provider(model_id, provider["id"])
+        catalog = Catalog()
+        model = catalog.get_model(model_id)
+        provider = catalog.get_provider_to_model(model_id)
+        api_key = catalog.get_key_to_model_provider(model_id, provider["id"])
         if api_key is None:
             logging.error(f"No api_key found for task {tid} with model {model_id} and provider {provider["name"]}")
             out.models = out.models[1:]
@@ -342,12 +301,11 @@ def merge_url(base_url, endpoint):
 def request_setup(headers: dict, logos_key: str):
     try:
         # Check if Logos is used as proxy or resource
-        with DBManager() as db:
-            # Get available models for this key
-            if "use_profile" in headers:
-                models = db.get_models_by_profile(logos_key, int(headers["use_profile"]))
-            else:
-                models = db.get_models_with_key(logos_key)
+        # Get available models for this key
+        if "use_profile" in headers:
+            models = Catalog().get_models_by_profile(logos_key, int(headers["use_profile"]))
+        else:
+            models = Catalog().get_models_with_key(logos_key)
         if not models or "proxy" in headers:
             return list()
         else:
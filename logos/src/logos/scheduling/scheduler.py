@@ -1,6 +1,7 @@
 """
 Base scheduler for requests.
 """
+import time
 from collections import deque, defaultdict
 from typing import Dict, List, Tuple
 
@@ -10,6 +11,7 @@ class Task:
         self.data = data
         self.models = models
         self.__id = task_id
+        self.enqueued_at = time.monotonic()
 
     def get_id(self):
         return self.__id
@@ -19,6 +21,11 @@ class Task:
             return None
         return self.models[0][0]
 
+    def get_priority(self):
+        if len(self.models) == 0:
+            return 0
+        return max(priority for _, _, priority, _ in self.models)
+
 
 class Scheduler:
     def __init__(self) -> None:
@@ -32,3 +39,12 @@ class Scheduler:
     
     def is_empty(self):
         return all(len(q) == 0 for q in self.tasks.values())
+
+    def remove(self, task_id: int) -> bool:
+        """Removes a waiting task, returns False if it is not waiting (anymore)."""
+        for queue in self.tasks.values():
+            for task in queue:
+                if task.get_id() == task_id:
+                    queue.remove(task)
+                    return True
+        return False
@@ -1,100 +1,158 @@
 """
 Module handling all scheduling tasks in Logos.
 """
-import functools
+import asyncio
 import logging
-import time
-from threading import Thread, Event
-from typing import Union, List, Tuple
+from threading import RLock, Event
+from typing import Union, List, Tuple, Dict
 
 from logos.scheduling.scheduler import Scheduler, Task
+from logos.singleton import singleton
 
 
-def singleton(cls):
+class _Waiter:
     """
-    A decorator to make a class a Singleton.
+    Completion handle of a single scheduled request. Can be awaited from asyncio or waited on from threads.
     """
-    instances = {}
+    def __init__(self) -> None:
+        self.event = Event()
+        self.task: Union[Task, None] = None
+        self.loop: Union[asyncio.AbstractEventLoop, None] = None
+        self.future: Union[asyncio.Future, None] = None
 
-    @functools.wraps(cls)
-    def get_instance(*args, **kwargs):
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
+    def complete(self, task: Union[Task, None]):
+        self.task = task
+        self.event.set()
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(self.__resolve)
 
-    return get_instance
+    def __resolve(self):
+        if not self.future.done():
+            self.future.set_result(self.task)
 
 
 @singleton
 class SchedulingManager:
+    """
+    Event-driven scheduling manager. Tasks are dispatched as soon as they are enqueued or a model slot is freed,
+    every waiting request owns its own completion handle.
+    """
     def __init__(self, scheduler: Scheduler):
         self.__scheduler = scheduler
-        self.__thread = None
-        self.__return_value = None
-        self.__has_finished = False
+        self.__lock = RLock()
         self.__running = False
-        self.__stop_event = Event()
         self.__ticket = 0
-        self.__finished_ticket = -1
         self.__is_free = dict()
+        self.__waiters: Dict[int, _Waiter] = dict()
 
     def add_request(self, data: dict, models: List[Tuple[int, float, int, int]]):
-        for (mid, _, _, par) in models:
-            if mid not in self.__is_free:
-                self.__is_free[mid] = par
-        self.__scheduler.enqueue(Task(data, models, self.__ticket))
-        self.__ticket += 1
-        return self.__ticket - 1
+        with self.__lock:
+            for (mid, _, _, par) in models:
+                if mid not in self.__is_free:
+                    self.__is_free[mid] = par
+            tid = self.__ticket
+            self.__ticket += 1
+            self.__waiters[tid] = _Waiter()
+            self.__scheduler.enqueue(Task(data, models, tid))
+            self.__dispatch()
+        return tid
+
+    async def schedule(self, data: dict, models: List[Tuple[int, float, int, int]]) -> Union[Task, None]:
+        """
+        Enqueues a request and suspends the calling coroutine until a model slot has been assigned to it.
+        """
+        return await self.wait_for(self.add_request(data, models))
+
+    async def wait_for(self, tid: int) -> Union[Task, None]:
+        with self.__lock:
+            waiter = self.__waiters.get(tid)
+            if waiter is None:
+                return None
+            if not waiter.event.is_set():
+                waiter.loop = asyncio.get_running_loop()
+                waiter.future = waiter.loop.create_future()
+        try:
+            if waiter.future is not None:
+                return await waiter.future
+            return waiter.task
+        except asyncio.CancelledError:
+            # The client disconnected or timed out, the request must not keep or take a model slot
+            self.cancel(tid)
+            raise
+        finally:
+            with self.__lock:
+                self.__waiters.pop(tid, None)
+
+    def wait(self, tid: int, timeout: Union[float, None] = None) -> Union[Task, None]:
+        """
+        Blocking counterpart of wait_for() for callers outside the event loop. A request that is not scheduled within
+        the timeout is cancelled.
+        """
+        waiter = self.__waiters.get(tid)
+        if waiter is None:
+            return None
+        if not waiter.event.wait(timeout):
+            self.cancel(tid)
+            return None
+        return self.get_result(tid)
+
+    def cancel(self, tid: int):
+        """
+        Withdraws a request whose caller stopped waiting for it. If a model slot was already assigned to the request,
+        the slot is freed again.
+        """
+        with self.__lock:
+            waiter = self.__waiters.pop(tid, None)
+            if self.__scheduler.remove(tid):
+                return
+            if waiter is not None and waiter.task is not None:
+                self.set_free(waiter.task.get_best_model_id())
 
     def run(self):
-        if self.__running:
-            return
-        self.__thread = Thread(target=self.__run)
-        self.__thread.start()
         self.__running = True
 
     def stop(self):
-        """Signal the thread to stop and wait for it to finish."""
-        self.__stop_event.set()
-        if self.__thread:
-            self.__thread.join()  # Wait for thread to exit gracefully
-        self.__running = False
+        """Release all requests still waiting for a model."""
+        with self.__lock:
+            self.__running = False
+            waiters = [w for w in self.__waiters.values() if not w.event.is_set()]
+        for waiter in waiters:
+            waiter.complete(None)
         logging.info("Scheduling Manager stopped.")
 
-    def __run(self):
+    def __dispatch(self):
         """
-        Main loop for processing requests.
+        Assigns free model slots to as many queued tasks as possible.
         """
-        while not self.__stop_event.is_set():
-            try:
-                if not self.__scheduler.is_empty() and not self.__has_finished:
+        with self.__lock:
+            while not self.__scheduler.is_empty():
+                try:
                     task = self.__scheduler.schedule(self.__is_free)
-                    if task is not None:
-                        mid = task.get_best_model_id()
-                        self.__return_value = task
-                        self.__has_finished = True
-                        self.__finished_ticket = task.get_id()
-                        self.__is_free[mid] -= 1
-                        logging.info(f"Task {task.get_id()} scheduled for model {mid}")
-                else:
-                    # No tasks in queue
-                    time.sleep(0.1)
-            except Exception as e:
-                logging.error(f"Error in scheduling loop: {e}")
-                self.__has_finished = False
-                time.sleep(1)
-
-    def get_result(self) -> Union[Task, None]:
-        try:
-            if not self.__has_finished:
+                except Exception as e:
+                    logging.error(f"Error in scheduling loop: {e}")
+                    return
+                if task is None:
+                    return
+                mid = task.get_best_model_id()
+                self.__is_free[mid] -= 1
+                logging.info(f"Task {task.get_id()} scheduled for model {mid}")
+                waiter = self.__waiters.get(task.get_id())
+                if waiter is not None:
+                    waiter.complete(task)
+
+    def get_result(self, tid: int) -> Union[Task, None]:
+        with self.__lock:
+            waiter = self.__waiters.get(tid)
+            if waiter is None or not waiter.event.is_set():
                 return None
-            return self.__return_value
-        finally:
-            self.__has_finished = False
-            self.__finished_ticket = -1
+            del self.__waiters[tid]
+            return waiter.task
 
     def set_free(self, model_id: int):
-        self.__is_free[model_id] += 1
+        with self.__lock:
+            self.__is_free[model_id] = self.__is_free.get(model_id, 0) + 1
+            self.__dispatch()
 
     def is_finished(self, tid: int) -> bool:
-        return self.__has_finished and self.__finished_ticket == tid
+        waiter = self.__waiters.get(tid)
+        return waiter is not None and waiter.event.is_set()
@@ -0,0 +1,62 @@
+"""
+Module implementing a priority- and deadline-aware multi-model scheduler for requests.
+"""
+import time
+from typing import Callable, Dict, List
+
+from logos.scheduling.scheduler import Scheduler, Task
+
+
+class PriorityScheduler(Scheduler):
+    """
+    Schedules the waiting task with the highest effective priority first.
+
+    The effective priority is the policy priority plus an aging bonus that grows with the time a task has been
+    waiting, so low-priority work is not starved. Tasks waiting longer than `max_wait` seconds have passed their
+    deadline and are served before everything else (oldest first).
+    If the best ranked model of a task has no free slot, the task falls back to the next-ranked model of its
+    classification result with a free slot, as long as that model lies within the first `fallback_depth` ranks.
+    """
+    def __init__(self, aging_interval: float = 5.0, max_wait: float = 60.0, fallback_depth: int = 3,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+        self.aging_interval = aging_interval
+        self.max_wait = max_wait
+        self.fallback_depth = fallback_depth
+        self.clock = clock
+        self.pending: List[Task] = list()
+
+    def enqueue(self, task: Task):
+        task.enqueued_at = self.clock()
+        self.pending.append(task)
+
+    def is_empty(self):
+        return len(self.pending) == 0
+
+    def remove(self, task_id: int) -> bool:
+        for task in self.pending:
+            if task.get_id() == task_id:
+                self.pending.remove(task)
+                return True
+        return False
+
+    def effective_priority(self, task: Task, now: float) -> float:
+        waited = now - task.enqueued_at
+        if waited >= self.max_wait:
+            return float("inf")
+        return task.get_priority() + waited / self.aging_interval
+
+    def schedule(self, work_table: Dict[int, int]) -> Task | None:
+        if not self.pending:
+            return None
+        now = self.clock()
+        ordered = sorted(self.pending, key=lambda t: (-self.effective_priority(t, now), t.enqueued_at))
+        for task in ordered:
+            for rank, model in enumerate(task.models[:max(1, self.fallback_depth)]):
+                if work_table.get(model[0], 0) > 0:
+                    self.pending.remove(task)
+                    if rank > 0:
+                        # Move the selected model to the front, callers use Task.get_best_model_id()
+                        task.models = [model] + task.models[:rank] + task.models[rank + 1:]
+                    return task
+        return None
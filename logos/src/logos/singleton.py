@@ -0,0 +1,19 @@
+"""
+Singleton decorator shared by the process-wide managers of Logos.
+"""
+import functools
+
+
+def singleton(cls):
+    """
+    A decorator to make a class a Singleton.
+    """
+    instances = {}
+
+    @functools.wraps(cls)
+    def get_instance(*args, **kwargs):
+        if cls not in instances:
+            instances[cls] = cls(*args, **kwargs)
+        return instances[cls]
+
+    return get_instance
@@ -0,0 +1,101 @@
+"""
+Incremental accounting for proxied SSE streams.
+
+Upstream chunks are forwarded untouched. StreamAccounting only looks at complete "data:" lines and decodes JSON
+where accounting needs it: the first content delta (log payload template), the usage block and, if the request is
+logged in FULL privacy mode, the response text, which is kept in a bounded text buffer.
+"""
+import datetime
+import io
+import json
+import logging
+import os
+from typing import Callable, Union
+
+STREAM_LOG_MAX_CHARS = int(os.getenv("LOGOS_STREAM_LOG_MAX_CHARS", "1000000"))
+
+_DATA = b"data:"
+_DONE = b"[DONE]"
+_decoder = json.JSONDecoder()
+
+
+class StreamAccounting:
+    def __init__(self, keep_text: bool = True, max_chars: int = STREAM_LOG_MAX_CHARS,
+                 on_first_token: Union[Callable[[], None], None] = None) -> None:
+        self.keep_text = keep_text
+        self.max_chars = max_chars
+        self.on_first_token = on_first_token
+        self.ttft: Union[datetime.datetime, None] = None
+        self.first_response: Union[dict, None] = None
+        self.usage_response: Union[dict, None] = None
+        self.done = False
+        self.truncated = False
+        self.__text = io.StringIO()
+        self.chars = 0
+        self.__partial = b""
+
+    def feed(self, chunk: bytes):
+        """
+        Processes a raw chunk of the upstream stream. Lines split across chunks are completed on the next call.
+        """
+        if self.done:
+            return
+        if self.__partial:
+            chunk = self.__partial + chunk
+        *lines, self.__partial = chunk.split(b"\n")
+        for line in lines:
+            if not line.startswith(_DATA):
+                continue
+            self.__line(line)
+            if self.done:
+                self.__partial = b""
+                return
+
+    def close(self):
+        if self.__partial.startswith(_DATA) and not self.done:
+            self.__line(self.__partial)
+        self.__partial = b""
+
+    def __line(self, line: bytes):
+        if self.ttft is None:
+            self.ttft = datetime.datetime.now(datetime.timezone.utc)
+            if self.on_first_token is not None:
+                self.on_first_token()
+        payload = line[5:].strip()
+        if payload == _DONE:
+            self.done = True
+            return
+        has_usage = b'"usage"' in payload
+        has_content = b'"content"' in payload
+        needs_text = has_content and self.keep_text and not self.truncated
+        if not (has_usage or needs_text or (has_content and self.first_response is None)):
+            return
+        try:
+            blob = _decoder.decode(payload.decode())
+        except ValueError:
+            logging.debug("Could not decode stream chunk: %s", payload[:200])
+            return
+        if has_usage and blob.get("usage"):
+            self.usage_response = blob
+        choices = blob.get("choices")
+        delta = choices[0].get("delta") if choices else None
+        if not delta or "content" not in delta:
+            return
+        if self.first_response is None:
+            self.first_response = blob
+        content = delta["content"]
+        if needs_text and content:
+            if self.chars + len(content) > self.max_chars:
+                content = content[:self.max_chars - self.chars]
+                self.truncated = True
+            self.__text.write(content)
+            self.chars += len(content)
+
+    @property
+    def usage(self) -> dict:
+        if self.usage_response is None:
+            return dict()
+        return self.usage_response.get("usage") or dict()
+
+    def text(self) -> str:
+        return self.__text.getvalue()
@@ -0,0 +1,67 @@
+"""
+Registry of long-lived HTTP clients used to forward requests to LLM providers.
+
+One httpx.AsyncClient is kept per provider origin (scheme, host and port) so that connections are reused across
+requests instead of paying the TCP and TLS handshake for every LLM call.
+"""
+import asyncio
+import logging
+import os
+from typing import Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP2 = os.getenv("LOGOS_HTTP2", "true").lower() == "true"
+MAX_CONNECTIONS = int(os.getenv("LOGOS_HTTP_MAX_CONNECTIONS", "200"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LOGOS_HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+KEEPALIVE_EXPIRY = float(os.getenv("LOGOS_HTTP_KEEPALIVE_EXPIRY", "60"))
+CONNECT_TIMEOUT = float(os.getenv("LOGOS_HTTP_CONNECT_TIMEOUT", "10"))
+# Streaming responses may legitimately stay silent for a long time, so no read timeout by default
+READ_TIMEOUT = float(os.getenv("LOGOS_HTTP_READ_TIMEOUT", "0")) or None
+STANDARD_TIMEOUT = float(os.getenv("LOGOS_HTTP_STANDARD_TIMEOUT", "30"))
+SSL_VERIFY = os.getenv("LOGOS_HTTP_SSL_VERIFY", "true").lower() == "true"
+
+_clients: Dict[str, httpx.AsyncClient] = dict()
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_client(url: str) -> httpx.AsyncClient:
+    """
+    Returns the shared client for the provider serving the given URL, creating it on first use.
+    """
+    origin = _origin(url)
+    client = _clients.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            verify=SSL_VERIFY,
+        )
+        _clients[origin] = client
+        logging.info("Created upstream client for %s (http2=%s)", origin, HTTP2 and HTTP2_AVAILABLE)
+    return client
+
+
+async def close_clients():
+    """
+    Closes all upstream clients and their pooled connections. Called on application shutdown.
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
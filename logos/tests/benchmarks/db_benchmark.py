@@ -0,0 +1,73 @@
+"""
+Microbenchmark for the per-request database overhead of DBManager.
+
+Compares the former behaviour (new engine + schema reflection in every `with DBManager()` block)
+against the shared, pooled engine with cached metadata. Runs against a temporary SQLite database,
+so no running Postgres instance is required:
+
+    poetry run python tests/benchmarks/db_benchmark.py
+"""
+import os
+import tempfile
+import time
+
+_db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("LOGOS_DB_URL", f"sqlite:///{_db_file.name}")
+
+from sqlalchemy import MetaData, create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from logos.dbutils import dbmanager  # noqa: E402
+from logos.dbutils.dbmanager import DBManager  # noqa: E402
+
+# Number of DBManager contexts a single proxied request opens in logos/main.py and logos/responses.py
+CONTEXTS_PER_REQUEST = 8
+REQUESTS = 200
+
+
+class LegacyDBManager(DBManager):
+    """
+    DBManager as it was before the shared engine: every context builds its own engine and reflects the schema.
+    """
+    def __enter__(self):
+        self.engine = create_engine(dbmanager.DB_URL)
+        self.metadata = MetaData()
+        self.metadata.reflect(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.session = self.Session()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.session.close()
+        self.engine.dispose()
+
+
+def setup_schema():
+    with DBManager() as db:
+        db.create_all()
+
+
+def simulate_request(manager_cls):
+    for _ in range(CONTEXTS_PER_REQUEST):
+        with manager_cls() as db:
+            db.session.execute(text("SELECT id FROM models")).fetchall()
+            db.insert("token_types", {"name": f"bench-{time.perf_counter_ns()}", "description": ""})
+
+
+def run(manager_cls) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        simulate_request(manager_cls)
+    return (time.perf_counter() - start) / REQUESTS * 1000
+
+
+if __name__ == "__main__":
+    setup_schema()
+    legacy = run(LegacyDBManager)
+    pooled = run(DBManager)
+    print(f"DB overhead per request ({CONTEXTS_PER_REQUEST} contexts, {REQUESTS} requests)")
+    print(f"  engine + reflection per context: {legacy:8.2f} ms")
+    print(f"  shared pooled engine:            {pooled:8.2f} ms")
+    print(f"  speedup:                         {legacy / pooled:8.1f}x")
+    dbmanager.dispose_engine()
+    os.unlink(_db_file.name)
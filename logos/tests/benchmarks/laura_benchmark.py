@@ -0,0 +1,72 @@
+"""
+Classification latency of the LAURA embedding classifier vs. number of registered models.
+
+Compares the former per-call torch.stack over all model embeddings with the cached model matrix, and
+measures the prompt-embedding cache. With --stub-encoder the sentence transformer is replaced by a random
+projection so that only the ranking overhead is measured (no model download needed):
+
+    poetry run python tests/benchmarks/laura_benchmark.py --stub-encoder
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import torch
+from sentence_transformers import util
+
+from logos.classification import laura_embedding_classifier
+from logos.classification.laura_embedding_classifier import LauraEmbeddingClassifier
+
+
+class StubEncoder:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def encode(self, texts, convert_to_tensor=True, normalize_embeddings=True):
+        single = isinstance(texts, str)
+        out = torch.nn.functional.normalize(torch.randn(1 if single else len(texts), 384), dim=1)
+        return out[0] if single else out
+
+
+def legacy_classify(laura: LauraEmbeddingClassifier, prompt: str, top_k: int):
+    """classify_prompt as it was before: encode every prompt and stack all model embeddings per call."""
+    query_emb = laura.encode_texts([f"query: {prompt.strip()}"])[0]
+    model_ids = list(i for i in laura.model_db.keys() if i in laura.allowed or not laura.allowed)
+    model_matrix = torch.stack([laura.model_db[mid] for mid in model_ids])
+    sims = util.cos_sim(query_emb, model_matrix).squeeze(0)
+    top_indices = torch.topk(sims, k=min(top_k, len(model_ids))).indices.tolist()
+    return [(model_ids[i], sims[i].item()) for i in top_indices]
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for i in range(repeats):
+        fn(i)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stub-encoder", action="store_true")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+    if args.stub_encoder:
+        laura_embedding_classifier.SentenceTransformer = StubEncoder
+
+    db_path = os.path.join(tempfile.mkdtemp(), "laura_embeddings.pkl")
+    laura = LauraEmbeddingClassifier(db_path=db_path)
+    prompts = [f"Explain topic number {i} in detail" for i in range(32)]
+    print(f"{'models':>7} | {'legacy':>10} | {'cached matrix':>13} | {'+ prompt cache':>14} | register")
+    registered = 0
+    for n in [1, 10, 50, 100, 500, 1000]:
+        start = time.perf_counter()
+        while registered < n:
+            laura.register_model(registered, f"model {registered}: coding, maths, chat, writing")
+            registered += 1
+        register = (time.perf_counter() - start) * 1000
+        legacy = timed(lambda i: legacy_classify(laura, f"{prompts[i % 32]} {i}", n), args.repeats)
+        cached = timed(lambda i: laura.classify_prompt(f"{prompts[i % 32]} {i}", top_k=n), args.repeats)
+        warm = timed(lambda i: laura.classify_prompt(prompts[i % 32], top_k=n), args.repeats)
+        print(f"{n:>7} | {legacy:>8.3f}ms | {cached:>11.3f}ms | {warm:>12.3f}ms | {register:.1f}ms total")
+    laura.remove_db()
@@ -0,0 +1,98 @@
+"""
+Load-test harness for the event-driven SchedulingManager.
+
+Starts a local stub upstream that streams SSE chunks, then fires many concurrent streaming requests through
+the scheduler (acquire slot -> stream from upstream -> set_free) and reports queueing latency percentiles
+and the event-loop lag observed while the requests are waiting:
+
+    poetry run python tests/benchmarks/scheduling_load_benchmark.py --streams 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from logos.scheduling.scheduling_fcfs import FCFSScheduler
+from logos.scheduling.scheduling_manager import SchedulingManager
+
+CHUNKS = 20
+CHUNK_DELAY = 0.005
+
+
+async def stub_upstream(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    Minimal OpenAI-like streaming endpoint: answers every request with CHUNKS SSE data lines.
+    """
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+    for i in range(CHUNKS + 1):
+        line = b'data: {"choices":[{"delta":{"content":"tok"}}]}\n\n' if i < CHUNKS else b"data: [DONE]\n\n"
+        writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        await writer.drain()
+        await asyncio.sleep(CHUNK_DELAY)
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+    writer.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def main(streams: int, models: int, parallel: int):
+    server = await asyncio.start_server(stub_upstream, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/v1/chat/completions"
+    sm = SchedulingManager(FCFSScheduler())
+    sm.run()
+    queueing = list()
+    lag = list()
+    running = True
+
+    async def heartbeat():
+        # Measures how long the event loop is blocked while requests wait for a slot
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag.append(time.perf_counter() - start - 0.01)
+
+    async def request(i, client):
+        mdls = [(m, 1.0, 0, parallel) for m in range(1, models + 1)]
+        mdls = mdls[i % models:] + mdls[:i % models]
+        start = time.perf_counter()
+        task = await sm.schedule({"id": i}, mdls)
+        queueing.append(time.perf_counter() - start)
+        try:
+            async with client.stream("POST", url, json={"stream": True}) as resp:
+                async for _ in resp.aiter_lines():
+                    pass
+        finally:
+            sm.set_free(task.get_best_model_id())
+
+    hb = asyncio.create_task(heartbeat())
+    limits = httpx.Limits(max_connections=models * parallel, max_keepalive_connections=models * parallel)
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        await asyncio.gather(*(request(i, client) for i in range(streams)))
+    total = time.perf_counter() - start
+    running = False
+    await hb
+    server.close()
+    sm.stop()
+
+    print(f"{streams} concurrent streams, {models} models x {parallel} slots, total {total:.2f}s")
+    print(f"  queueing latency p50: {percentile(queueing, 50) * 1000:8.2f} ms")
+    print(f"  queueing latency p99: {percentile(queueing, 99) * 1000:8.2f} ms")
+    print(f"  event-loop lag mean:  {statistics.mean(lag) * 1000:8.2f} ms, max {max(lag) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--models", type=int, default=3)
+    parser.add_argument("--parallel", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.streams, args.models, args.parallel))
@@ -0,0 +1,112 @@
+"""
+Discrete-event simulation comparing FCFSScheduler and PriorityScheduler.
+
+Requests arrive as a Poisson process with a random policy priority and a ranked list of candidate models.
+Each model has a fixed number of parallel slots and its own service time. The simulation drives both
+schedulers through the same Scheduler interface with a simulated clock and reports throughput and latency:
+
+    poetry run python tests/benchmarks/scheduling_simulation.py --requests 5000 --rate 30
+"""
+import argparse
+import heapq
+import random
+from collections import defaultdict
+
+from logos.scheduling.scheduler import Task
+from logos.scheduling.scheduling_fcfs import FCFSScheduler
+from logos.scheduling.scheduling_priority import PriorityScheduler
+
+# model id -> (parallel slots, mean service time in seconds)
+MODELS = {1: (4, 0.5), 2: (6, 0.8), 3: (8, 1.2)}
+PRIORITIES = [0, 0, 0, 1, 5]
+
+
+def workload(requests: int, rate: float, seed: int):
+    rng = random.Random(seed)
+    now = 0.0
+    jobs = list()
+    for i in range(requests):
+        now += rng.expovariate(rate)
+        priority = rng.choice(PRIORITIES)
+        # Most requests prefer the fastest model, which is what saturates it
+        ranking = [1, 2, 3] if rng.random() < 0.7 else rng.sample([1, 2, 3], 3)
+        models = [(mid, 100.0 - rank * 10, priority, MODELS[mid][0]) for rank, mid in enumerate(ranking)]
+        services = {mid: rng.expovariate(1 / MODELS[mid][1]) for mid in MODELS}
+        jobs.append((now, i, models, services))
+    return jobs
+
+
+def simulate(scheduler_factory, jobs):
+    clock = [0.0]
+    scheduler = scheduler_factory(clock)
+    free = {mid: slots for mid, (slots, _) in MODELS.items()}
+    events = [(arrival, 0, i) for arrival, i, _, _ in jobs]
+    heapq.heapify(events)
+    arrivals = {i: (arrival, models, services) for arrival, i, models, services in jobs}
+    latency = dict()
+    wait_by_priority = defaultdict(list)
+    first_choice = 0
+
+    def dispatch():
+        nonlocal first_choice
+        while not scheduler.is_empty():
+            task = scheduler.schedule(free)
+            if task is None:
+                return
+            i = task.get_id()
+            arrival, models, services = arrivals[i]
+            mid = task.get_best_model_id()
+            free[mid] -= 1
+            first_choice += mid == models[0][0]
+            wait_by_priority[task.get_priority()].append(clock[0] - arrival)
+            heapq.heappush(events, (clock[0] + services[mid], 1, (i, mid)))
+
+    while events:
+        clock[0], kind, payload = heapq.heappop(events)
+        if kind == 0:
+            _, models, _ = arrivals[payload]
+            scheduler.enqueue(Task({}, list(models), payload))
+        else:
+            i, mid = payload
+            free[mid] += 1
+            latency[i] = clock[0] - arrivals[i][0]
+        dispatch()
+
+    makespan = clock[0]
+    return len(latency) / makespan, sorted(latency.values()), wait_by_priority, first_choice / len(latency)
+
+
+def fcfs(clock):
+    scheduler = FCFSScheduler()
+    enqueue = scheduler.enqueue
+
+    def timed_enqueue(task):
+        task.enqueued_at = clock[0]
+        enqueue(task)
+
+    scheduler.enqueue = timed_enqueue
+    return scheduler
+
+
+def priority(clock):
+    return PriorityScheduler(aging_interval=5, max_wait=60, fallback_depth=3, clock=lambda: clock[0])
+
+
+def pct(values, p):
+    return values[min(len(values) - 1, int(p / 100 * (len(values) - 1)))] if values else float("nan")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=20.0, help="Arrivals per second")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    jobs = workload(args.requests, args.rate, args.seed)
+    for name, factory in [("FCFS", fcfs), ("Priority", priority)]:
+        throughput, latency, waits, first = simulate(factory, jobs)
+        print(f"{name:<9} throughput {throughput:6.2f} req/s | latency p50 {pct(latency, 50):7.2f}s "
+              f"p99 {pct(latency, 99):7.2f}s | first-choice model {first * 100:5.1f}%")
+        for prio in sorted(waits):
+            w = sorted(waits[prio])
+            print(f"          priority {prio}: queue wait p50 {pct(w, 50):7.2f}s p99 {pct(w, 99):7.2f}s")
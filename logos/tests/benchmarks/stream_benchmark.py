@@ -0,0 +1,88 @@
+"""
+CPU per token and peak memory of stream accounting for long responses.
+
+Replays a synthetic 50k-token SSE stream (split into network-sized chunks) through the former line-based
+streamer logic (json.loads per chunk, full_text +=, one write per line) and through StreamAccounting in FULL and
+BILLING mode:
+
+    poetry run python tests/benchmarks/stream_benchmark.py --tokens 50000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from logos.stream_accounting import StreamAccounting
+
+
+def synthetic_stream(tokens: int, chunk_size: int):
+    lines = [f'data: {json.dumps({"id": "x", "choices": [{"index": 0, "delta": {"content": f"tok{i % 97} "}}]})}\n\n'
+             for i in range(tokens)]
+    lines.append(f'data: {json.dumps({"choices": [], "usage": {"prompt_tokens": 10, "completion_tokens": tokens}})}\n\n')
+    lines.append("data: [DONE]\n\n")
+    raw = "".join(lines).encode()
+    return [raw[i:i + chunk_size] for i in range(0, len(raw), chunk_size)]
+
+
+def legacy(chunks):
+    """The former streamer(): decode lines, json.loads every data line, grow full_text and re-encode lines."""
+    full_text = ""
+    response = None
+    writes = 0
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.decode()
+        *lines, buffer = buffer.split("\n")
+        for raw_line in lines:
+            if not raw_line:
+                continue
+            if raw_line.startswith("data: "):
+                payload = raw_line.removeprefix("data: ").strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    blob = json.loads(payload)
+                    response = blob
+                    if blob["choices"] and "content" in blob["choices"][0]["delta"]:
+                        full_text += blob["choices"][0]["delta"]["content"]
+                except ValueError:
+                    pass
+            (raw_line + "\n").encode()
+            writes += 1
+    return writes
+
+
+def accounting(chunks, keep_text):
+    acc = StreamAccounting(keep_text=keep_text, max_chars=10 ** 9)
+    writes = 0
+    for chunk in chunks:
+        acc.feed(chunk)
+        writes += 1
+    acc.close()
+    acc.text()
+    return writes
+
+
+def measure(name, fn, chunks, tokens):
+    start = time.process_time()
+    writes = fn(chunks)
+    cpu = time.process_time() - start
+    # Measured in a second run, tracing allocations would distort the CPU time
+    tracemalloc.start()
+    fn(chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {name:<26} {cpu / tokens * 1e6:7.2f} us/token  peak {peak / 1024 / 1024:7.2f} MiB  "
+          f"{writes} writes to the client")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    args = parser.parse_args()
+    chunks = synthetic_stream(args.tokens, args.chunk_size)
+    print(f"{args.tokens} tokens, {len(chunks)} chunks of {args.chunk_size} bytes")
+    measure("line-based + json.loads", legacy, chunks, args.tokens)
+    measure("pass-through, FULL", lambda c: accounting(c, True), chunks, args.tokens)
+    measure("pass-through, BILLING", lambda c: accounting(c, False), chunks, args.tokens)
@@ -0,0 +1,110 @@
+"""
+Time-to-first-byte benchmark for upstream forwarding.
+
+Compares a fresh httpx.AsyncClient per request (former behaviour) with the shared per-provider clients from
+logos.upstream_clients against a local mock upstream. Pass --certfile/--keyfile to serve the mock via TLS,
+which makes the saved handshake cost visible:
+
+    poetry run python tests/benchmarks/upstream_pool_benchmark.py --requests 300 --concurrency 4
+"""
+import argparse
+import asyncio
+import ssl
+import statistics
+import time
+
+import httpx
+
+from logos import upstream_clients
+
+CHUNK = b'data: {"choices":[{"delta":{"content":"tok"}}]}\n\n'
+
+
+async def mock_upstream(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    Keep-alive capable HTTP/1.1 endpoint answering every POST with a short SSE stream.
+    """
+    try:
+        while True:
+            length = 0
+            line = await reader.readline()
+            if not line:
+                break
+            while line not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+                line = await reader.readline()
+            await reader.readexactly(length)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+            for line in (CHUNK, CHUNK, b"data: [DONE]\n\n"):
+                writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def ttfb(client: httpx.AsyncClient, url: str) -> float:
+    start = time.perf_counter()
+    elapsed = None
+    async with client.stream("POST", url, json={"stream": True}) as resp:
+        async for _ in resp.aiter_bytes():
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+    return elapsed
+
+
+async def fresh_client(url: str, verify) -> float:
+    async with httpx.AsyncClient(timeout=None, verify=verify) as client:
+        return await ttfb(client, url)
+
+
+async def run(fn, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            return await fn()
+
+    return sorted(await asyncio.gather(*(one() for _ in range(requests))))
+
+
+def report(name, values):
+    p99 = values[int(0.99 * (len(values) - 1))]
+    print(f"  {name:<28} mean {statistics.mean(values) * 1000:7.2f} ms  p50 {statistics.median(values) * 1000:7.2f} ms"
+          f"  p99 {p99 * 1000:7.2f} ms")
+
+
+async def main(args):
+    context = None
+    if args.certfile:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(args.certfile, args.keyfile)
+    server = await asyncio.start_server(mock_upstream, "127.0.0.1", 0, ssl=context)
+    scheme = "https" if context else "http"
+    url = f"{scheme}://127.0.0.1:{server.sockets[0].getsockname()[1]}/v1/chat/completions"
+    verify = False if context else True
+
+    fresh = await run(lambda: fresh_client(url, verify), args.requests, args.concurrency)
+    upstream_clients.SSL_VERIFY = verify
+    shared = upstream_clients.get_client(url)
+    # Warm the pool once, as it would be after the first requests to a provider
+    await run(lambda: ttfb(shared, url), args.concurrency, args.concurrency)
+    pooled = await run(lambda: ttfb(shared, url), args.requests, args.concurrency)
+    await upstream_clients.close_clients()
+    server.close()
+
+    print(f"Time to first byte, {args.requests} requests, concurrency {args.concurrency}, {scheme}")
+    report("new client per request:", fresh)
+    report("shared provider client:", pooled)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--certfile")
+    parser.add_argument("--keyfile")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,53 @@
+from logos.dbutils.catalog import Catalog
+
+
+def test_catalog_read_through_and_invalidation():
+    catalog = Catalog()
+    loads = list()
+
+    def loader():
+        loads.append(1)
+        return {"id": 1, "name": "gpt-4o"}
+
+    assert catalog.cached("test_models", 1, loader)["name"] == "gpt-4o"
+    assert catalog.cached("test_models", 1, loader)["name"] == "gpt-4o"
+    assert len(loads) == 1
+    assert catalog.stats()["namespaces"]["test_models"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    catalog.invalidate()
+    catalog.cached("test_models", 1, loader)
+    assert len(loads) == 2
+
+
+def test_catalog_ttl_expiry():
+    catalog = Catalog()
+    ttl, catalog.ttl = catalog.ttl, 0
+    try:
+        loads = list()
+        catalog.cached("test_ttl", 1, lambda: loads.append(1))
+        catalog.cached("test_ttl", 1, lambda: loads.append(1))
+        assert len(loads) == 2
+    finally:
+        catalog.ttl = ttl
+
+
+def test_catalog_does_not_cache_failed_lookups():
+    catalog = Catalog()
+    loads = list()
+
+    def loader():
+        loads.append(1)
+        return {"error": "Not Found"}
+
+    assert catalog.cached("test_errors", 1, loader) == {"error": "Not Found"}
+    assert catalog.cached("test_errors", 1, loader) == {"error": "Not Found"}
+    assert catalog.cached("test_errors", 2, lambda: loads.append(1)) is None
+    assert len(loads) == 3
+
+
+def test_catalog_values_are_copies():
+    catalog = Catalog()
+    policy = catalog.cached("test_copies", 1, lambda: {"id": 1, "threshold_cost": 10})
+    policy["threshold_cost"] = 1024
+
+    assert catalog.cached("test_copies", 1, lambda: None)["threshold_cost"] == 10
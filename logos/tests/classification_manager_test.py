@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import data
+from logos.classification.classification_balancer import Balancer
+from logos.classification.classification_manager import ClassificationManager
+from logos.classification.classify_policy import PolicyClassifier
+from logos.classification.classify_token import TokenClassifier
+
+
+def models():
+    return [dict(model, description=None, tags="#coding #math", classification_weight=Balancer())
+            for model in data.models]
+
+
+def test_classify_request_matches_policy_and_token_classifiers():
+    manager = ClassificationManager(models())
+    manager.update_manager(models())
+    result = manager.classify_request("", data.policy, classifier="policy")
+
+    expected = PolicyClassifier(models()).classify("", data.policy)
+    assert [score.model_id for score in result.scores] == \
+        sorted([m["id"] for m in expected], key=lambda i: -{m["id"]: m["classification_weight"].get_weight()
+                                                             for m in expected}[i])
+    for model in expected:
+        score = next(s for s in result.scores if s.model_id == model["id"])
+        assert abs(score.combined_weight - model["classification_weight"].get_weight()) < 1e-9
+
+    system = "Please help me with some #coding"
+    expected = TokenClassifier(models()).classify(system, data.policy)
+    result = manager.classify_request("", data.policy, classifier="token", system=system)
+    for model in expected:
+        score = next(s for s in result.scores if s.model_id == model["id"])
+        assert abs(score.token_weight - model["classification_weight"].weights["token"][0]) < 1e-9
+
+
+def test_classify_request_is_reentrant():
+    manager = ClassificationManager(models())
+    manager.update_manager(models())
+
+    def classify(allowed):
+        return allowed, manager.classify_request("", data.policy, allowed=allowed, classifier="policy")
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(classify, [[1], [2, 3], [1, 2, 3], [3]] * 25))
+    for allowed, result in results:
+        assert {model_id for model_id, _, _, _ in result.ranking} <= set(allowed)
+    # Shared state is untouched by classification
+    assert [m["id"] for m in manager.models] == [1, 2, 3]
+    assert all(not w for m in manager.models for w in m["classification_weight"].weights.values())
@@ -1,10 +1,15 @@
+import asyncio
 import time
 from threading import Thread
 
+import pytest
+
 from logos.classification.classification_manager import ClassificationManager
 from logos.classification.proxy_policy import ProxyPolicy
 import data
+from logos.scheduling.scheduler import Task
 from logos.scheduling.scheduling_fcfs import FCFSScheduler
+from logos.scheduling.scheduling_priority import PriorityScheduler
 from logos.scheduling.scheduling_manager import SchedulingManager
 
 
@@ -18,10 +23,7 @@ def test_scheduling_manager():
         sm = SchedulingManager(FCFSScheduler())
         sm.run()
         tid = sm.add_request(data, models)
-        while not sm.is_finished(tid):
-            pass
-
-        out = sm.get_result()
+        out = sm.wait(tid)
         # -- DO SOMETHING --
         if out.models[0][0] == 2:
             time.sleep(1)
@@ -45,5 +47,67 @@ def test_scheduling_manager():
     sm.stop()
 
 
+@pytest.mark.asyncio
+async def test_async_scheduling_wakes_waiters():
+    sm = SchedulingManager(FCFSScheduler())
+    sm.run()
+    # Model 101 allows two parallel requests, so two tasks are dispatched at once and the third waits
+    waiters = [asyncio.create_task(sm.schedule(name, [(101, 1.0, 0, 2)])) for name in ["a", "b", "c"]]
+    await asyncio.sleep(0)
+    done = [w for w in waiters if w.done()]
+    assert len(done) == 2
+
+    sm.set_free(101)
+    out = await asyncio.wait_for(waiters[2], timeout=1)
+    assert out.data == "c"
+    sm.set_free(101)
+    sm.set_free(101)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_releases_its_model_slot():
+    sm = SchedulingManager(FCFSScheduler())
+    sm.run()
+    holder = await sm.schedule("holder", [(102, 1.0, 0, 1)])
+    # A client disconnects while its request still waits for the only slot of model 102
+    waiting = asyncio.create_task(sm.schedule("gone", [(102, 1.0, 0, 1)]))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+
+    # The cancelled request left the queue, so the freed slot goes to the next request
+    sm.set_free(holder.get_best_model_id())
+    out = await asyncio.wait_for(sm.schedule("next", [(102, 1.0, 0, 1)]), timeout=1)
+    assert out.data == "next"
+
+    # A request that timed out after being dispatched gives its slot back
+    late = sm.add_request("late", [(102, 1.0, 0, 1)])
+    sm.set_free(102)
+    sm.cancel(late)
+    out = await asyncio.wait_for(sm.schedule("after", [(102, 1.0, 0, 1)]), timeout=1)
+    assert out.data == "after"
+    sm.set_free(102)
+
+
+def test_priority_scheduler():
+    now = [0.0]
+    scheduler = PriorityScheduler(aging_interval=10, max_wait=100, clock=lambda: now[0])
+    scheduler.enqueue(Task("low", [(1, 10.0, 0, 1), (2, 5.0, 0, 1)], 0))
+    scheduler.enqueue(Task("high", [(1, 10.0, 5, 1), (2, 5.0, 5, 1)], 1))
+
+    # Higher priority wins the contested model, the other task falls back to its second-ranked model
+    first = scheduler.schedule({1: 1, 2: 1})
+    assert first.data == "high" and first.get_best_model_id() == 1
+    second = scheduler.schedule({1: 0, 2: 1})
+    assert second.data == "low" and second.get_best_model_id() == 2
+    assert scheduler.is_empty()
+
+    # Aging lets a long-waiting low-priority task overtake fresh high-priority work
+    scheduler.enqueue(Task("old", [(1, 1.0, 0, 1)], 2))
+    now[0] = 60.0
+    scheduler.enqueue(Task("new", [(1, 1.0, 5, 1)], 3))
+    assert scheduler.schedule({1: 1}).data == "old"
+
+
 if __name__ == "__main__":
     test_scheduling_manager()
@@ -0,0 +1,40 @@
+import json
+
+from logos.stream_accounting import StreamAccounting
+
+
+def sse_stream(tokens):
+    lines = [f'data: {json.dumps({"choices": [{"delta": {"content": t}}], "usage": None})}\n\n' for t in tokens]
+    lines.append(f'data: {json.dumps({"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": len(tokens)}})}\n\n')
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode()
+
+
+def feed_in_pieces(accounting, raw, size):
+    for start in range(0, len(raw), size):
+        accounting.feed(raw[start:start + size])
+    accounting.close()
+
+
+def test_stream_accounting_handles_split_chunks():
+    tokens = ["Hello", " wor", "ld", "!"] * 10
+    first_token = list()
+    accounting = StreamAccounting(on_first_token=lambda: first_token.append(1))
+    feed_in_pieces(accounting, sse_stream(tokens), 7)
+
+    assert accounting.text() == "".join(tokens)
+    assert accounting.usage == {"prompt_tokens": 3, "completion_tokens": 40}
+    assert accounting.first_response["choices"][0]["delta"]["content"] == "Hello"
+    assert accounting.done and first_token == [1]
+
+
+def test_stream_accounting_bounds_and_skips_text():
+    tokens = ["abc"] * 100
+    bounded = StreamAccounting(max_chars=10)
+    feed_in_pieces(bounded, sse_stream(tokens), 64)
+    assert bounded.text() == "abcabcabca" and bounded.truncated
+
+    billing = StreamAccounting(keep_text=False)
+    feed_in_pieces(billing, sse_stream(tokens), 64)
+    assert billing.text() == "" and billing.usage["completion_tokens"] == 100
+    assert billing.first_response is not None
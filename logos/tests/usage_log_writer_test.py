@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from logos.dbutils.usage_log_writer import LOG_BLOCK_TIMEOUT, UsageLogWriter
+
+
+def test_usage_log_writer_batches_and_flushes_on_stop():
+    writer = UsageLogWriter()
+    batches = list()
+    writer.write_batch = lambda timestamps, payloads: batches.append((timestamps, payloads))
+    writer.flush_interval = 60
+
+    writer.set_forward_timestamp(1)
+    writer.set_time_at_first_token(1)
+    writer.set_response_payload(1, {"content": "a"}, 1, 2, {"prompt_tokens": 3}, 1, dict())
+    writer.set_response_payload(2, {"content": "b"}, 1, 2, {"prompt_tokens": 4}, 1, dict())
+    writer.set_response_payload(None, {"content": "ignored"})
+    writer.stop()
+
+    # Everything still queued is written in a single batch on shutdown
+    assert len(batches) == 1
+    timestamps, payloads = batches[0]
+    assert [log_id for log_id, _ in timestamps["timestamp_forwarding"]] == [1]
+    assert [log_id for log_id, _ in timestamps["time_at_first_token"]] == [1]
+    assert [p["log_id"] for p in payloads] == [1, 2]
+    stats = writer.stats()
+    assert stats["written"] == 4 and stats["dropped"] == 0 and stats["queue_depth"] == 0
+
+
+def test_failed_batch_drops_only_the_failing_entry():
+    writer = UsageLogWriter.__wrapped__()
+    written = list()
+
+    def write_batch(timestamps, payloads):
+        if any(p["log_id"] == 3 for p in payloads):
+            raise ValueError("payload of log entry 3 cannot be serialized")
+        written.extend(p["log_id"] for p in payloads)
+
+    writer.write_batch = write_batch
+    writer.flush([("payload", log_id, {"log_id": log_id}) for log_id in range(1, 7)])
+
+    assert sorted(written) == [1, 2, 4, 5, 6]
+    assert writer.stats()["written"] == 5 and writer.stats()["failed"] == 1
+
+
+def test_full_queue_does_not_block_the_event_loop():
+    writer = UsageLogWriter.__wrapped__(max_queue=1, drop_policy="block")
+    writer.start = lambda: None
+
+    async def log():
+        start = time.perf_counter()
+        for log_id in range(1, 4):
+            writer.set_response_payload(log_id, {"content": "a"})
+        return time.perf_counter() - start
+
+    # The entries that do not fit are kept in the overflow instead of waiting for the stopped worker
+    assert asyncio.run(log()) < LOG_BLOCK_TIMEOUT
+    assert writer.queue.qsize() == 1 and len(writer.overflow) == 1
+    assert writer.stats()["dropped"] == 1
@@ -426,8 +426,11 @@ class MemoryCreationPipeline:
                     deduplicator.deduplicate(learnings, **kwargs)
                 )
 
-        for learning in deduplicated_learnings:
-            learning.vectors = self._vectorizer.vectorize(learning.content)
+        vectors = self._vectorizer.vectorize_many(
+            [learning.content for learning in deduplicated_learnings]
+        )
+        for learning, learning_vectors in zip(deduplicated_learnings, vectors):
+            learning.vectors = learning_vectors
 
         saved_learnings = self._learning_repository.save_all(
             tenant=tenant, entities=deduplicated_learnings
@@ -437,8 +440,11 @@ class MemoryCreationPipeline:
             learnings=saved_learnings, tenant=tenant, **kwargs
         )
 
-        for memory in memories:
-            memory.vectors = self._vectorizer.vectorize(memory.content)
+        vectors = self._vectorizer.vectorize_many(
+            [memory.content for memory in memories]
+        )
+        for memory, memory_vectors in zip(memories, vectors):
+            memory.vectors = memory_vectors
 
         saved_memories = self._memory_repository.save_all(
             tenant=tenant, entities=memories
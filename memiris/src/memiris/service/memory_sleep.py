@@ -520,10 +520,15 @@ class MemorySleeper:
                     new_memory.title,
                     new_memory.content,
                 )
-                # Vectorize the new memory
-                new_memory.vectors = self.vectorizer.vectorize(new_memory.content)
                 deduplicated_results.append(new_memory)
 
+            # Vectorize the new memories together, one request per embedding model
+            vectors = self.vectorizer.vectorize_many(
+                [new_memory.content for new_memory in deduplicated_results]
+            )
+            for new_memory, memory_vectors in zip(deduplicated_results, vectors):
+                new_memory.vectors = memory_vectors
+
             for memory_id in used_memory_ids:
                 self.memory_cache[memory_id].slept_on = True  # type: ignore
                 self.memory_cache[memory_id].deleted = True  # type: ignore
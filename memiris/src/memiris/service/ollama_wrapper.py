@@ -184,16 +184,18 @@ class OllamaService:
             )
         return WrappedChatResponse.from_ollama_response(response)
 
-    def embed(self, model: str, text: str) -> WrappedEmbeddingResponse:
+    def embed(
+        self, model: str, text: Union[str, Sequence[str]]
+    ) -> WrappedEmbeddingResponse:
         """
-        Generate embeddings for a text.
+        Generate embeddings for a text or a batch of texts.
 
         Args:
             model: The name of the embedding model to use.
-            text: The text to embed.
+            text: The text to embed, or a list of texts to embed in one request.
 
         Returns:
-            WrappedEmbeddingResponse: The embeddings for the text.
+            WrappedEmbeddingResponse: The embeddings for the texts, in the order of the texts.
         """
         response = self.client.embed(model, text)
         return WrappedEmbeddingResponse.from_ollama_response(response)
@@ -1,3 +1,8 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import LRUCache
 from langfuse import observe
 from typing_extensions import Sequence
 
@@ -7,36 +12,103 @@ from memiris.service.ollama_wrapper import OllamaService
 class Vectorizer:
     """
     A class to handle vectorization of text data for various models.
+    Embeddings are requested in batches per model, the models are queried concurrently and the embeddings are cached
+    per model and text.
     """
 
     vector_models: dict[str, str]
     ollama_service: OllamaService
+    batch_size: int
 
-    def __init__(self, vector_models: list[str], ollama_service: OllamaService) -> None:
+    def __init__(
+        self,
+        vector_models: list[str],
+        ollama_service: OllamaService,
+        batch_size: int = 32,
+        cache_size: int = 4096,
+    ) -> None:
         """
         Initialize the Vectorizer with a dictionary of vector models.
 
         Args:
             vector_models (list[str]): A list of model names to be used for vectorization.
             ollama_service (OllamaService): The Ollama service to use for embeddings.
+            batch_size (int): The maximum number of texts embedded in one request to Ollama.
+            cache_size (int): The maximum number of cached embeddings over all models.
         """
         self.vector_models = {
             f"vector_{i}": vector_models[i] for i in range(len(vector_models))
         }
         self.ollama_service = ollama_service
+        self.batch_size = batch_size
+        self._cache: LRUCache = LRUCache(maxsize=cache_size)
+        self._cache_lock = threading.Lock()
 
     @observe(name="vectorization")
     def vectorize(self, query: str) -> dict[str, Sequence[float]]:
         """
         Vectorize the given query using the specified models.
         """
-        result: dict[str, Sequence[float]] = {}
-        for vector_name, model_name in self.vector_models.items():
+        return self.vectorize_many([query])[0]
+
+    @observe(name="batch-vectorization")
+    def vectorize_many(self, texts: list[str]) -> list[dict[str, Sequence[float]]]:
+        """
+        Vectorize the given texts using the specified models.
+
+        Args:
+            texts (list[str]): The texts to vectorize.
+
+        Returns:
+            list[dict[str, Sequence[float]]]: The vectors of each text, in the order of the texts.
+        """
+        if not texts or not self.vector_models:
+            return [{} for _ in texts]
+
+        with ThreadPoolExecutor(max_workers=len(self.vector_models)) as executor:
+            embeddings = dict(
+                zip(
+                    self.vector_models.keys(),
+                    executor.map(
+                        lambda model_name: self._embed_texts(model_name, texts),
+                        self.vector_models.values(),
+                    ),
+                )
+            )
+
+        return [
+            {vector_name: embeddings[vector_name][i] for vector_name in embeddings}
+            for i in range(len(texts))
+        ]
+
+    def _embed_texts(self, model_name: str, texts: list[str]) -> list[Sequence[float]]:
+        """
+        Embed the texts with one model, requesting only the texts that are not cached yet.
+        """
+        keys = [
+            (model_name, hashlib.sha256(text.encode()).hexdigest()) for text in texts
+        ]
+        with self._cache_lock:
+            found = {key: self._cache[key] for key in keys if key in self._cache}
+
+        missing = list(
+            {key: text for key, text in zip(keys, texts) if key not in found}.items()
+        )
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
             try:
-                embedding_response = self.ollama_service.embed(model_name, query)
-                result[vector_name] = embedding_response.embeddings[0]
+                embedding_response = self.ollama_service.embed(
+                    model_name, [text for _, text in batch]
+                )
+                batch_embeddings = dict(
+                    zip((key for key, _ in batch), embedding_response.embeddings)
+                )
             except Exception as e:
-                # Log the error and continue with other models
-                print(f"Error generating embedding for {model_name}: {e}")
-                result[vector_name] = []
-        return result
+                # Log the error and continue with the other batches
+                print(f"Error generating embeddings for {model_name}: {e}")
+                continue
+            found.update(batch_embeddings)
+            with self._cache_lock:
+                self._cache.update(batch_embeddings)
+
+        return [found.get(key, []) for key in keys]
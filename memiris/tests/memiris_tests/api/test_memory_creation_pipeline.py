@@ -36,7 +36,9 @@ class TestMemoryCreationPipeline:
 
     @pytest.fixture
     def mock_vectorizer(self, mocker):
-        return mocker.Mock(spec=Vectorizer)
+        vectorizer = mocker.Mock(spec=Vectorizer)
+        vectorizer.vectorize_many.side_effect = lambda texts: [{} for _ in texts]
+        return vectorizer
 
     def test_build_adds_default_deduplicator_if_missing(
         self,
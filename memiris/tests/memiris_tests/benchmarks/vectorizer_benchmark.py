@@ -0,0 +1,105 @@
+"""
+Embedding requests of the memiris memory creation: a local fake Ollama server answers /api/embed after a fixed round
+trip time plus a time per embedded text. Vectorizes the contents of the extracted learnings and of the created
+memories with the embedding models Iris configures for memiris (or --models), once text by text and model by model (the former
+behavior of Vectorizer.vectorize) and once with Vectorizer.vectorize_many, which batches the texts per model and
+queries the models concurrently. A repeated run shows the cache:
+
+    poetry run python tests/memiris_tests/benchmarks/vectorizer_benchmark.py --rtt 0.02 --texts 20
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from memiris.service.ollama_wrapper import OllamaService
+from memiris.service.vectorizer import Vectorizer
+
+# The embedding models of the memiris setup in Iris
+EMBEDDING_MODELS = ["mxbai-embed-large:latest", "nomic-embed-text:latest"]
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rtt: float, text_time: float):
+        super().__init__(("127.0.0.1", 0), FakeOllamaHandler)
+        self.rtt = rtt
+        self.text_time = text_time
+        self.requests = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # noqa: N802
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        texts = request["input"]
+        texts = [texts] if isinstance(texts, str) else texts
+        self.server.requests += 1
+        time.sleep(self.server.rtt + self.server.text_time * len(texts))
+        data = json.dumps(
+            {
+                "model": request["model"],
+                "embeddings": [[float(len(text))] * 8 for text in texts],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def former_vectorize(vectorizer: Vectorizer, texts: list[str]):
+    return [
+        {
+            vector_name: vectorizer.ollama_service.embed(model_name, text).embeddings[0]
+            for vector_name, model_name in vectorizer.vector_models.items()
+        }
+        for text in texts
+    ]
+
+
+def measure(server: FakeOllamaServer, vectorize, texts: list[str]):
+    server.requests = 0
+    start = time.perf_counter()
+    vectorize(texts)
+    return time.perf_counter() - start, server.requests
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=0.02)
+    parser.add_argument("--text-time", type=float, default=0.002)
+    parser.add_argument("--texts", type=int, default=20)
+    parser.add_argument("--models", nargs="+", default=EMBEDDING_MODELS)
+    args = parser.parse_args()
+    server = FakeOllamaServer(args.rtt, args.text_time)
+    contents = [
+        f"The user prefers examples in exercise {i}." for i in range(args.texts)
+    ]
+    print(
+        f"{args.rtt * 1000:.0f} ms per request + {args.text_time * 1000:.0f} ms per text, "
+        f"{args.texts} texts, models {', '.join(args.models)}"
+    )
+
+    vectorizer = Vectorizer(args.models, OllamaService(host=server.base_url))
+    runs = [
+        ("former", lambda texts: former_vectorize(vectorizer, texts)),
+        ("vectorize_many", vectorizer.vectorize_many),
+        ("cached", vectorizer.vectorize_many),
+    ]
+    for name, vectorize in runs:
+        seconds, requests = measure(server, vectorize, contents)
+        print(f"  {name:15} {seconds * 1000:7.1f} ms  {requests:3d} Ollama requests")
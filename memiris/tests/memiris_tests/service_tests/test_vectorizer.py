@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from memiris.service.ollama_wrapper import OllamaService, WrappedEmbeddingResponse
+from memiris.service.vectorizer import Vectorizer
+
+
+class TestVectorizer:
+    """Test suite for the Vectorizer class."""
+
+    @pytest.fixture
+    def mock_ollama_service(self):
+        """Create a mock OllamaService that embeds a text as its length per model."""
+        mock_service = MagicMock(spec=OllamaService)
+        mock_service.embed.side_effect = lambda model, texts: WrappedEmbeddingResponse(
+            embeddings=[[float(len(model)), float(len(text))] for text in texts],
+            model=model,
+            raw_response=None,
+        )
+        return mock_service
+
+    def test_vectorize_many_batches_texts_per_model(self, mock_ollama_service):
+        """Test that every model embeds the texts in batches and the vectors keep the order of the texts."""
+        vectorizer = Vectorizer(
+            ["model-a", "model-bb"], mock_ollama_service, batch_size=2
+        )
+
+        vectors = vectorizer.vectorize_many(["a", "bb", "ccc"])
+
+        assert vectors == [
+            {"vector_0": [7.0, 1.0], "vector_1": [8.0, 1.0]},
+            {"vector_0": [7.0, 2.0], "vector_1": [8.0, 2.0]},
+            {"vector_0": [7.0, 3.0], "vector_1": [8.0, 3.0]},
+        ]
+        assert sorted(
+            (call.args[0], tuple(call.args[1]))
+            for call in mock_ollama_service.embed.call_args_list
+        ) == [
+            ("model-a", ("a", "bb")),
+            ("model-a", ("ccc",)),
+            ("model-bb", ("a", "bb")),
+            ("model-bb", ("ccc",)),
+        ]
+
+    def test_vectorize_many_embeds_each_text_once(self, mock_ollama_service):
+        """Test that duplicate and previously embedded texts are served from the cache."""
+        vectorizer = Vectorizer(["model-a"], mock_ollama_service)
+
+        vectorizer.vectorize_many(["a", "a", "bb"])
+        vector = vectorizer.vectorize("bb")
+
+        assert vector == {"vector_0": [7.0, 2.0]}
+        mock_ollama_service.embed.assert_called_once_with("model-a", ["a", "bb"])
+
+    def test_failed_model_returns_empty_vectors(self, mock_ollama_service):
+        """Test that a failing model yields empty vectors, which are not cached."""
+        vectorizer = Vectorizer(["model-a"], mock_ollama_service)
+        mock_ollama_service.embed.side_effect = RuntimeError("Ollama is down")
+
+        assert vectorizer.vectorize_many(["a"]) == [{"vector_0": []}]
+        assert vectorizer.vectorize_many(["a"]) == [{"vector_0": []}]
+        assert mock_ollama_service.embed.call_count == 2